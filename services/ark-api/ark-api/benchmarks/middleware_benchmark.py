@@ -0,0 +1,149 @@
+"""Benchmark the ark-api middleware stack.
+
+Compares the pure ASGI AuthMiddleware and SessionAwareMiddleware against
+BaseHTTPMiddleware based equivalents (the previous implementation) on:
+
+- requests/sec for a small JSON endpoint
+- first-byte latency for an SSE endpoint whose first chunk is immediate
+  and whose remaining chunks are delayed
+
+The app is driven directly through ASGI so that the numbers only reflect
+middleware overhead, not socket or HTTP parsing costs.
+
+Usage:
+    AUTH_MODE=open uv run python benchmarks/middleware_benchmark.py [--requests N]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from ark_api.auth.middleware import AuthMiddleware
+from ark_api.core.middleware import SessionAwareMiddleware, extract_session_context, logger
+
+
+class BaseHTTPAuthMiddleware(BaseHTTPMiddleware):
+    """Previous BaseHTTPMiddleware shape, sharing the same authentication logic."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.auth = AuthMiddleware(app)
+
+    async def dispatch(self, request: Request, call_next):
+        error_response = await self.auth.authenticate(request)
+        if error_response is not None:
+            return error_response
+        return await call_next(request)
+
+
+async def base_http_session_middleware(request: Request, call_next):
+    """Previous @app.middleware("http") session middleware."""
+    start_time = time.time()
+    otel_ctx, session_id = extract_session_context(request)
+    session_info = f"session={session_id}" if session_id else "no-session"
+    logger.info(f"Request: {request.method} {request.url.path} - {session_info} - Query: {dict(request.query_params)}")
+    response = await call_next(request)
+    process_time = time.time() - start_time
+    logger.info(f"Response: {request.method} {request.url.path} - {session_info} - Status: {response.status_code} - Time: {process_time:.3f}s")
+    return response
+
+
+def build_app(pure_asgi: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json")
+    async def json_endpoint():
+        return {"items": [{"name": f"item-{i}"} for i in range(10)]}
+
+    @app.get("/stream")
+    async def stream_endpoint():
+        async def generate():
+            yield "data: first\n\n"
+            for _ in range(3):
+                await asyncio.sleep(0.01)
+                yield "data: next\n\n"
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    if pure_asgi:
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(SessionAwareMiddleware)
+    else:
+        app.add_middleware(BaseHTTPAuthMiddleware)
+        app.middleware("http")(base_http_session_middleware)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 12345),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+    }
+
+
+async def _request(app, path: str) -> float:
+    """Send one request, returning the time to the first non-empty body chunk."""
+    start = time.perf_counter()
+    first_byte = None
+    disconnect = asyncio.Event()
+
+    async def receive():
+        if not disconnect.is_set():
+            disconnect.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_byte
+        if first_byte is None and message["type"] == "http.response.body" and message.get("body"):
+            first_byte = time.perf_counter() - start
+
+    await app(_scope(path), receive, send)
+    return first_byte or 0.0
+
+
+async def run(requests: int) -> None:
+    # Request logging is identical in both variants; keep it out of the numbers
+    logging.disable(logging.INFO)
+    for label, pure_asgi in (("BaseHTTPMiddleware (before)", False), ("pure ASGI (after)", True)):
+        app = build_app(pure_asgi)
+        # Warm up middleware stack construction
+        await _request(app, "/json")
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            await _request(app, "/json")
+        rps = requests / (time.perf_counter() - start)
+
+        first_bytes = [await _request(app, "/stream") for _ in range(max(requests // 20, 10))]
+        p50 = statistics.median(first_bytes) * 1000
+        p99 = sorted(first_bytes)[int(len(first_bytes) * 0.99) - 1] * 1000
+
+        print(f"{label:30s} {rps:10.0f} req/s   SSE first byte p50={p50:.3f}ms p99={p99:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Number of JSON requests per variant")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark JSON serialization of a large query list.
+
+Compares the previous list path (a QueryResponse model per query, returned
+as a QueryListResponse that FastAPI validates against the response model and
+serializes with the default JSONResponse) against the current one (plain
+dicts from query_to_item returned in an ORJSONResponse).
+
+Both variants are driven directly through ASGI with the same in-memory
+queries, so the numbers only reflect conversion and serialization cost.
+
+Usage:
+    uv run python benchmarks/serialization_benchmark.py [--items N] [--requests N]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from ark_api.api.v1.queries import query_to_item, query_to_response
+from ark_api.core.responses import ORJSONResponse
+from ark_api.models.queries import QueryListResponse
+
+
+def make_queries(count: int) -> list:
+    return [
+        {
+            "metadata": {
+                "name": f"query-{i}",
+                "namespace": "default",
+                "creationTimestamp": "2025-01-01T00:00:00Z",
+                "resourceVersion": str(i),
+            },
+            "spec": {
+                "type": "user",
+                "input": "Summarise the latest deployment report " * 4,
+                "targets": [{"type": "agent", "name": "assistant"}],
+                "sessionId": f"session-{i % 50}",
+            },
+            "status": {
+                "phase": "done",
+                "responses": [{"target": {"type": "agent", "name": "assistant"}, "content": "x" * 400}],
+                "tokenUsage": {"promptTokens": 120, "completionTokens": 80, "totalTokens": 200},
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(queries: list, fast: bool) -> FastAPI:
+    if fast:
+        app = FastAPI(default_response_class=ORJSONResponse)
+
+        @app.get("/queries", response_model=QueryListResponse)
+        async def list_fast():
+            items = [query_to_item(query) for query in queries]
+            return ORJSONResponse({"items": items, "count": len(items), "continue": None})
+    else:
+        app = FastAPI()
+
+        @app.get("/queries", response_model=QueryListResponse)
+        async def list_models():
+            items = [query_to_response(query) for query in queries]
+            return QueryListResponse(items=items, count=len(items))
+
+    return app
+
+
+async def _request(app) -> bytes:
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 12345),
+        "root_path": "",
+        "path": "/queries",
+        "raw_path": b"/queries",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+    }
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def run(items: int, requests: int) -> None:
+    queries = make_queries(items)
+    bodies = {}
+    for label, fast in (("response models (before)", False), ("dicts + orjson (after)", True)):
+        app = build_app(queries, fast)
+        bodies[fast] = await _request(app)
+
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await _request(app)
+            timings.append(time.perf_counter() - start)
+
+        p50 = statistics.median(timings) * 1000
+        print(f"{label:28s} {items} items: p50={p50:.1f}ms min={min(timings) * 1000:.1f}ms "
+              f"({len(bodies[fast]) / 1024:.0f} KiB)")
+
+    if json.loads(bodies[False]) != json.loads(bodies[True]):
+        raise SystemExit("Responses differ between variants")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000, help="Queries in the listed collection")
+    parser.add_argument("--requests", type=int, default=20, help="Requests timed per variant")
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""Prometheus metrics endpoint."""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from ..core.metrics import REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose metrics in the Prometheus text format."""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
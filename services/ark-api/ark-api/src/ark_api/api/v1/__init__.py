@@ -19,6 +19,8 @@ from .evaluations import router as evaluations_router
 from .evaluators import router as evaluators_router
 from .api_keys import router as api_keys_router
 from .a2a_tasks import router as a2a_tasks_router
+from .summary import router as summary_router
+from .watch import router as watch_router
 
 router = APIRouter(prefix="/v1", tags=["v1"])
 
@@ -33,6 +35,8 @@ router.include_router(tools_router)
 router.include_router(mcp_servers_router)
 router.include_router(a2a_servers_router)
 router.include_router(a2a_tasks_router)
+router.include_router(summary_router)
+router.include_router(watch_router)
 router.include_router(memories_router)
 router.include_router(memory_messages_router)
 router.include_router(sessions_router)
@@ -3,8 +3,8 @@ import logging
 import json
 import re
 
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, Query, Request, Response
+from typing import List, Optional
 from ark_sdk.models.agent_v1alpha1 import AgentV1alpha1
 
 from ark_sdk.client import with_ark_client
@@ -19,6 +19,10 @@ from ...models.agents import (
 )
 from ...models.common import extract_availability_from_conditions
 from ...constants.annotations import A2A_SERVER_ADDRESS_ANNOTATION
+from ...core.responses import ORJSONResponse
+from ...utils.delta import list_delta
+from ...utils.etag import not_modified, resource_versions_etag
+from ...utils.single_flight import request_key, single_flight
 from .exceptions import handle_k8s_errors
 
 logger = logging.getLogger(__name__)
@@ -101,29 +105,52 @@ def agent_to_detail_response(agent: dict) -> AgentDetailResponse:
     )
 
 
+async def _list_agents(namespace: Optional[str]) -> List[dict]:
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        return [agent.to_dict() for agent in await ark_client.agents.a_list()]
+
+
 @router.get("", response_model=AgentListResponse)
 @handle_k8s_errors(operation="list", resource_type="agent")
-async def list_agents(namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> AgentListResponse:
+async def list_agents(
+    request: Request,
+    response: Response,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)")
+) -> AgentListResponse:
     """
     List all Agent CRs in a namespace.
 
     Args:
         namespace: The namespace to list agents from (defaults to current context)
+        since: Only return the changes since this resourceVersion (delta sync)
         
     Returns:
         AgentListResponse: List of all agents in the namespace
+        (or the changes since `since`, see utils/delta.py)
     """
-    async with with_ark_client(namespace, VERSION) as ark_client:
-        agents = await ark_client.agents.a_list()
-        
-        agent_list = []
-        for agent in agents:
-            agent_list.append(agent_to_response(agent.to_dict()))
-        
-        return AgentListResponse(
-            items=agent_list,
-            count=len(agent_list)
-        )
+    if since is not None:
+        return ORJSONResponse(await list_delta("agents", namespace, since, agent_to_response))
+
+    # Identical concurrent polls share one list call
+    agents = await single_flight("agents.list").do(
+        request_key(request, namespace), lambda: _list_agents(namespace)
+    )
+
+    # Unchanged since the client's last poll: skip building the response
+    etag = resource_versions_etag(agents, request.url.query)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    agent_list = []
+    for agent in agents:
+        agent_list.append(agent_to_response(agent))
+    
+    return AgentListResponse(
+        items=agent_list,
+        count=len(agent_list)
+    )
 
 
 @router.post("", response_model=AgentDetailResponse)
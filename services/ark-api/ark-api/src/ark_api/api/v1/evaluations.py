@@ -1,10 +1,11 @@
 """API routes for Evaluation resources."""
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 from ark_sdk.models.evaluation_v1alpha1 import EvaluationV1alpha1
 from ...core.constants import GROUP
+from ...core.responses import ORJSONResponse
 from ark_sdk.client import with_ark_client
-from typing import Union, Optional
+from typing import List, Union, Optional
 
 from ...models.evaluations import (
     EvaluationListResponse,
@@ -14,11 +15,14 @@ from ...models.evaluations import (
     EvaluationDetailResponse,
     EnhancedEvaluationDetailResponse,
     EvaluationType,
-    evaluation_to_response,
+    evaluation_to_item,
     evaluation_to_detail_response,
     enhanced_evaluation_to_response,
     enhanced_evaluation_to_detail_response
 )
+from ...utils.delta import list_delta
+from ...utils.etag import not_modified, resource_versions_etag
+from ...utils.single_flight import request_key, single_flight
 from .exceptions import handle_k8s_errors
 
 router = APIRouter(
@@ -30,39 +34,64 @@ router = APIRouter(
 VERSION = "v1alpha1"
 
 
+def _matches_query_ref(evaluation: dict, query_ref: str) -> bool:
+    """Check if an evaluation has a queryRef that matches."""
+    return evaluation.get('spec', {}).get('config', {}).get('queryRef', {}).get('name') == query_ref
+
+
+async def _list_evaluations(namespace: Optional[str]) -> List[dict]:
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        return [item.to_dict() for item in await ark_client.evaluations.a_list()]
+
+
 @router.get("")
 @handle_k8s_errors(operation="list", resource_type="evaluation")
 async def list_evaluations(
+    request: Request,
+    response: Response,
     enhanced: bool = Query(False, description="Include enhanced metadata from annotations"),
     query_ref: str = Query(None, description="Filter evaluations by query reference name"),
-    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)")
 ) -> Union[EvaluationListResponse, EnhancedEvaluationListResponse]:
-    """List all evaluations in a namespace."""
-    async with with_ark_client(namespace, VERSION) as ark_client:
-        result = await ark_client.evaluations.a_list()
-        
-        # Filter by query_ref if provided
-        if query_ref:
-            filtered_result = []
-            for item in result:
-                item_dict = item.to_dict()
-                # Check if this evaluation has a queryRef that matches
-                if (item_dict.get('spec', {}).get('config', {}).get('queryRef', {}).get('name') == query_ref):
-                    filtered_result.append(item)
-            result = filtered_result
-        
-        if enhanced:
-            evaluations = [enhanced_evaluation_to_response(item.to_dict()) for item in result]
-            return EnhancedEvaluationListResponse(
-                items=evaluations,
-                count=len(evaluations)
-            )
-        else:
-            evaluations = [evaluation_to_response(item.to_dict()) for item in result]
-            return EvaluationListResponse(
-                items=evaluations,
-                count=len(evaluations)
-            )
+    """List all evaluations in a namespace, or with `since` the changes since a resourceVersion."""
+    if since is not None:
+        return ORJSONResponse(await list_delta(
+            "evaluations",
+            namespace,
+            since,
+            enhanced_evaluation_to_response if enhanced else evaluation_to_item,
+            include=(lambda item: _matches_query_ref(item, query_ref)) if query_ref else None
+        ))
+
+    # Identical concurrent polls share one list call
+    result = await single_flight("evaluations.list").do(
+        request_key(request, namespace), lambda: _list_evaluations(namespace)
+    )
+    
+    # Filter by query_ref if provided
+    if query_ref:
+        result = [item_dict for item_dict in result if _matches_query_ref(item_dict, query_ref)]
+
+    # Unchanged since the client's last poll: skip building the response
+    etag = resource_versions_etag(result, request.url.query)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    
+    # Returned as a response so FastAPI does not revalidate the items
+    if enhanced:
+        evaluations = [enhanced_evaluation_to_response(item) for item in result]
+        return ORJSONResponse(EnhancedEvaluationListResponse(
+            items=evaluations,
+            count=len(evaluations)
+        ))
+    else:
+        evaluations = [evaluation_to_item(item) for item in result]
+        return ORJSONResponse({
+            "items": evaluations,
+            "count": len(evaluations)
+        })
 
 
 @router.post("", response_model=EvaluationDetailResponse)
@@ -1,14 +1,19 @@
 """Kubernetes events API endpoints."""
 import logging
-from typing import Optional
+import os
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from kubernetes_asyncio import client
 from kubernetes_asyncio.client.api_client import ApiClient
 from kubernetes_asyncio.client.rest import ApiException
 from ark_sdk.k8s import get_context
 
 from ...models.events import EventListResponse, EventResponse, event_to_response
+from ...utils.pagination import decode_continue_token, encode_continue_token
+from ...utils.shared_watch import SharedWatch, shared_watches
+from ...utils.streaming import format_sse
 from .exceptions import handle_k8s_errors
 
 logger = logging.getLogger(__name__)
@@ -16,43 +21,85 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-def _matches_type_filter(event_dict: dict, type_filter: Optional[str]) -> bool:
-    """Check if event matches type filter."""
-    return not type_filter or event_dict.get("type") == type_filter
+# Upper bound on events examined per request when filtering by name, so that
+# a sparse name match cannot turn one page into a scan of the whole history
+MAX_SCANNED_EVENTS = 5000
+# Chunk size used when events are filtered locally by name
+NAME_FILTER_CHUNK_SIZE = 500
+# Events buffered per streaming client before the oldest are dropped
+EVENT_STREAM_BUFFER_SIZE = int(os.getenv("EVENT_STREAM_BUFFER_SIZE", "256"))
+# Interval for SSE keep-alive comments on idle streams
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
 
 
-def _matches_kind_filter(event_dict: dict, kind_filter: Optional[str]) -> bool:
-    """Check if event matches kind filter."""
-    if not kind_filter:
-        return True
-    involved_object = event_dict.get("involved_object", {})
-    return involved_object.get("kind") == kind_filter
+def _build_field_selector(type_filter: Optional[str], kind_filter: Optional[str]) -> Optional[str]:
+    """Build a Kubernetes field selector for the type and kind filters."""
+    selectors = []
+    if type_filter:
+        selectors.append(f"type={type_filter}")
+    if kind_filter:
+        selectors.append(f"involvedObject.kind={kind_filter}")
+    return ",".join(selectors) or None
 
 
-def _matches_name_filter(event_dict: dict, name_filter: Optional[str]) -> bool:
+def _matches_name_filter(event, name_filter: Optional[str]) -> bool:
     """Check if event matches name filter."""
     if not name_filter:
         return True
-    involved_object = event_dict.get("involved_object", {})
-    object_name = involved_object.get("name", "").lower()
-    return name_filter.lower() in object_name
+    object_name = (event.involved_object.name if event.involved_object else None) or ""
+    return name_filter.lower() in object_name.lower()
+
+
+async def _list_events_page(
+    v1: client.CoreV1Api,
+    namespace: str,
+    field_selector: Optional[str],
+    name_filter: Optional[str],
+    limit: int,
+    continue_token: Optional[str],
+) -> Tuple[list, Optional[str], Optional[int]]:
+    """Read one page of events using limit/continue against the API server.
+
+    Without a name filter every event in a chunk is returned, so a chunk is a
+    page. With a name filter chunks are matched while they are read and the
+    page may end part way through a chunk, which the returned token records.
+
+    Returns:
+        Tuple of (events, next continue token, remaining item count if known)
+    """
+    k8s_continue, skip = decode_continue_token(continue_token)
+    chunk_size = limit if not name_filter else max(limit, NAME_FILTER_CHUNK_SIZE)
+    items = []
+    scanned = 0
 
+    while True:
+        chunk = await v1.list_namespaced_event(
+            namespace=namespace,
+            field_selector=field_selector,
+            limit=chunk_size,
+            _continue=k8s_continue
+        )
+        chunk_items = chunk.items or []
+        next_k8s_continue = chunk.metadata._continue if chunk.metadata else None
 
-def _should_include_event(event_dict: dict, type_filter: Optional[str], 
-                         kind_filter: Optional[str], name_filter: Optional[str]) -> bool:
-    """Check if event should be included based on all filters."""
-    return (_matches_type_filter(event_dict, type_filter) and
-            _matches_kind_filter(event_dict, kind_filter) and
-            _matches_name_filter(event_dict, name_filter))
+        for index in range(skip, len(chunk_items)):
+            event = chunk_items[index]
+            scanned += 1
+            if not _matches_name_filter(event, name_filter):
+                continue
+            items.append(event)
+            if len(items) == limit:
+                if index + 1 < len(chunk_items):
+                    return items, encode_continue_token(k8s_continue, index + 1), None
+                break
 
+        if not next_k8s_continue:
+            return items, None, 0
+        if len(items) == limit or scanned >= MAX_SCANNED_EVENTS:
+            remaining = chunk.metadata.remaining_item_count if not name_filter else None
+            return items, encode_continue_token(next_k8s_continue), remaining
 
-def _paginate_events(events: list, page_num: int, limit_num: int) -> tuple[list, int]:
-    """Apply pagination to events list and return paginated events with total count."""
-    total_count = len(events)
-    start_index = (page_num - 1) * limit_num
-    end_index = start_index + limit_num
-    paginated_events = events[start_index:end_index]
-    return paginated_events, total_count
+        k8s_continue, skip = next_k8s_continue, 0
 
 
 @router.get("", response_model=EventListResponse)
@@ -62,11 +109,17 @@ async def list_events(
     type_filter: Optional[str] = Query(None, alias="type", description="Filter by event type (Normal, Warning)"),
     kind_filter: Optional[str] = Query(None, alias="kind", description="Filter by involved object kind"),
     name_filter: Optional[str] = Query(None, alias="name", description="Filter by involved object name"),
-    limit: Optional[int] = Query(500, description="Maximum number of events to return"),
-    page: Optional[int] = Query(1, description="Page number for pagination (1-based)")
+    limit: Optional[int] = Query(500, ge=1, description="Maximum number of events to return"),
+    page: Optional[int] = Query(1, ge=1, description="Page number for pagination (1-based). Prefer 'continue' for large namespaces"),
+    continue_token: Optional[str] = Query(None, alias="continue", description="Continue token from a previous response")
 ) -> EventListResponse:
     """
-    List all Kubernetes events in a namespace with optional filtering.
+    List Kubernetes events in a namespace with optional filtering.
+
+    Type and kind filters are applied by the API server as field selectors,
+    the name filter is applied while events are read. Pages are read with
+    limit/continue, so each page costs work proportional to its size. Events
+    are returned in API server order, sorted newest first within a page.
 
     Args:
         namespace: The namespace to list events from
@@ -74,10 +127,13 @@ async def list_events(
         kind_filter: Filter by involved object kind (Agent, Team, Query, etc.)
         name_filter: Filter by involved object name
         limit: Maximum number of events to return (default: 500)
-        page: Page number for pagination (1-based, default: 1)
+        page: Page number for pagination (1-based, default: 1), ignored when
+            a continue token is given
+        continue_token: Opaque token returned as 'continue' by the previous page
 
     Returns:
-        EventListResponse: List of events in the namespace
+        EventListResponse: Events in the namespace, with a continue token if
+        more events are available
     """
     if namespace is None:
         namespace = get_context()["namespace"]
@@ -86,25 +142,37 @@ async def list_events(
         v1 = client.CoreV1Api(api_client)
         
         try:
-            page_num = page or 1
-            limit_num = limit or 200
-                        
-            events = await v1.list_namespaced_event(namespace=namespace)
-                        
-            filtered_events = []
-            for event in events.items:
-                event_dict = event.to_dict()
-                
-                if _should_include_event(event_dict, type_filter, kind_filter, name_filter):
-                    filtered_events.append(event_to_response(event_dict))
-                        
-            filtered_events.sort(key=lambda x: x.creation_timestamp, reverse=True)
+            limit_num = limit or 500
+            field_selector = _build_field_selector(type_filter, kind_filter)
+
+            # Page numbers are supported by walking the cursor forward
+            offset = 0
+            if not continue_token:
+                for _ in range((page or 1) - 1):
+                    skipped, continue_token, _ = await _list_events_page(
+                        v1, namespace, field_selector, name_filter, limit_num, continue_token
+                    )
+                    offset += len(skipped)
+                    if not continue_token:
+                        return EventListResponse(items=[], total=offset)
+
+            events, next_token, remaining = await _list_events_page(
+                v1, namespace, field_selector, name_filter, limit_num, continue_token
+            )
+
+            items = [event_to_response(event.to_dict()) for event in events]
+            items.sort(key=lambda x: x.creation_timestamp, reverse=True)
+
+            # Exact when the API server reports the remaining count, otherwise a
+            # lower bound that still lets page based clients move forward
+            total = offset + len(items)
+            if next_token:
+                total += remaining if remaining else 1
             
-            paginated_events, total_count = _paginate_events(filtered_events, page_num, limit_num)
-                        
             return EventListResponse(
-                items=paginated_events,
-                total=total_count
+                items=items,
+                total=total,
+                continue_=next_token
             )
             
         except ApiException as e:
@@ -112,6 +180,88 @@ async def list_events(
             raise
 
 
+def _to_stream_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a watch event once, before it is fanned out to subscribers."""
+    return {"type": event["type"], "event": event_to_response(event["object"].to_dict())}
+
+
+def _get_event_watch(namespace: str) -> SharedWatch:
+    """Get the shared event watch for a namespace."""
+    return shared_watches.get_or_create(
+        ("events", namespace),
+        lambda: SharedWatch(
+            f"events/{namespace}",
+            lambda api: client.CoreV1Api(api).list_namespaced_event,
+            transform=_to_stream_event,
+            namespace=namespace
+        )
+    )
+
+
+@router.get("/stream")
+async def stream_events(
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    type_filter: Optional[str] = Query(None, alias="type", description="Filter by event type (Normal, Warning)"),
+    kind_filter: Optional[str] = Query(None, alias="kind", description="Filter by involved object kind"),
+    name_filter: Optional[str] = Query(None, alias="name", description="Filter by involved object name")
+) -> StreamingResponse:
+    """
+    Stream new and updated Kubernetes events as Server-Sent Events.
+
+    All clients streaming a namespace share a single Kubernetes watch. Each
+    client has a bounded buffer; if a client falls behind, the oldest
+    buffered events are dropped and a 'dropped' event reports how many, so
+    the client can re-list with GET /v1/events.
+
+    Each message is a JSON object with the watch event type (ADDED, MODIFIED,
+    DELETED) and the event in the same shape as GET /v1/events items.
+
+    Args:
+        namespace: The namespace to stream events from
+        type_filter: Filter by event type (Normal, Warning)
+        kind_filter: Filter by involved object kind (Agent, Team, Query, etc.)
+        name_filter: Filter by involved object name
+
+    Returns:
+        StreamingResponse: text/event-stream of events
+    """
+    if namespace is None:
+        namespace = get_context()["namespace"]
+
+    name_match = name_filter.lower() if name_filter else None
+    subscription = _get_event_watch(namespace).subscribe(EVENT_STREAM_BUFFER_SIZE)
+
+    def matches(event: EventResponse) -> bool:
+        return ((not type_filter or event.type == type_filter) and
+                (not kind_filter or event.involved_object_kind == kind_filter) and
+                (not name_match or name_match in event.involved_object_name.lower()))
+
+    async def generate():
+        reported_drops = 0
+        try:
+            yield ": connected\n\n"
+            while True:
+                item = await subscription.get(timeout=EVENT_STREAM_HEARTBEAT_SECONDS)
+                if subscription.dropped > reported_drops:
+                    yield format_sse({"count": subscription.dropped - reported_drops}, event="dropped")
+                    reported_drops = subscription.dropped
+                if item is None:
+                    if subscription.closed:
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if matches(item["event"]):
+                    yield format_sse({"type": item["type"], "event": item["event"].model_dump(mode="json")})
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{event_name}", response_model=EventResponse)
 @handle_k8s_errors(operation="get", resource_type="event")
 async def get_event(
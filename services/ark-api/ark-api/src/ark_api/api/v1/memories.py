@@ -1,12 +1,15 @@
 """Kubernetes memories API endpoints."""
 import logging
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, Query
+import httpx
+from fastapi import APIRouter, Depends, Query, Request
 from ark_sdk.models.memory_v1alpha1 import MemoryV1alpha1
 
 from ark_sdk.client import with_ark_client
 
+from ...core.http import get_http_client
+from ...core.responses import ORJSONResponse
 from ...models.memories import (
     MemoryResponse,
     MemoryListResponse,
@@ -14,12 +17,15 @@ from ...models.memories import (
     MemoryUpdateRequest,
     MemoryDetailResponse
 )
-from ...models.sessions import MemoryMessageResponse, MemoryMessageListResponse
+from ...models.sessions import MemoryMessageResponse, MemoryMessageListResponse, MemoryServiceError
 from ...utils.memory_client import (
     get_memory_service_address,
     fetch_memory_service_data,
-    get_all_memory_resources
+    get_all_memory_resources,
+    fan_out_to_memories
 )
+from ...utils.delta import list_delta
+from ...utils.single_flight import request_key, single_flight
 from .exceptions import handle_k8s_errors
 
 logger = logging.getLogger(__name__)
@@ -31,8 +37,8 @@ router = APIRouter(
 VERSION = "v1alpha1"
 
 
-def memory_to_response(memory) -> MemoryResponse:
-    """Convert a Kubernetes Memory CR to a response model."""
+def memory_to_item(memory) -> dict:
+    """Convert a Kubernetes Memory CR to a JSON ready MemoryResponse dict."""
     # Handle both dict and SDK model objects
     if hasattr(memory, 'to_dict'):
         memory_dict = memory.to_dict()
@@ -43,12 +49,17 @@ def memory_to_response(memory) -> MemoryResponse:
     spec = memory_dict.get("spec", {})
     status = memory_dict.get("status", {})
     
-    return MemoryResponse(
-        name=metadata.get("name", ""),
-        namespace=metadata.get("namespace", ""),
-        description=spec.get("description"),
-        status=status.get("phase")
-    )
+    return {
+        "name": metadata.get("name", ""),
+        "namespace": metadata.get("namespace", ""),
+        "description": spec.get("description"),
+        "status": status.get("phase")
+    }
+
+
+def memory_to_response(memory) -> MemoryResponse:
+    """Convert a Kubernetes Memory CR to a response model."""
+    return MemoryResponse.model_validate(memory_to_item(memory))
 
 
 def memory_to_detail_response(memory) -> MemoryDetailResponse:
@@ -72,15 +83,27 @@ def memory_to_detail_response(memory) -> MemoryDetailResponse:
     )
 
 
+async def _list_memories(namespace: Optional[str]) -> List[dict]:
+    async with with_ark_client(namespace, VERSION) as client:
+        return [memory.to_dict() for memory in await client.memories.a_list()]
+
+
 @router.get("", response_model=MemoryListResponse)
 @handle_k8s_errors(operation="list", resource_type="memory")
-async def list_memories(namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> MemoryListResponse:
-    """List all memories in a namespace."""
-    async with with_ark_client(namespace, VERSION) as client:
-        memories = await client.memories.a_list()
-        
-        memory_responses = [memory_to_response(memory.to_dict()) for memory in memories]
-        return MemoryListResponse(items=memory_responses)
+async def list_memories(
+    request: Request,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)")
+) -> MemoryListResponse:
+    """List all memories in a namespace, or with `since` the changes since a resourceVersion."""
+    if since is not None:
+        return ORJSONResponse(await list_delta("memories", namespace, since, memory_to_item))
+
+    # Identical concurrent polls share one list call
+    memories = await single_flight("memories.list").do(
+        request_key(request, namespace), lambda: _list_memories(namespace)
+    )
+    return ORJSONResponse({"items": [memory_to_item(memory) for memory in memories]})
 
 
 @router.get("/{name}", response_model=MemoryDetailResponse)
@@ -146,7 +169,12 @@ async def delete_memory(name: str, namespace: Optional[str] = Query(None, descri
 
 @router.get("/{name}/sessions/{session_id}/messages")
 @handle_k8s_errors(operation="get", resource_type="memory")
-async def get_memory_messages(name: str, session_id: str, namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> dict:
+async def get_memory_messages(
+    name: str,
+    session_id: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
+) -> dict:
     """Get messages for a specific session from a memory resource."""
     async with with_ark_client(namespace, VERSION) as client:
         memory = await client.memories.a_get(name)
@@ -155,7 +183,8 @@ async def get_memory_messages(name: str, session_id: str, namespace: Optional[st
         service_url = get_memory_service_address(memory_dict)
         
         return await fetch_memory_service_data(
-            service_url, 
+            http_client,
+            service_url,
             "/messages",
             params={"session_id": session_id},
             memory_name=name
@@ -172,51 +201,54 @@ async def list_memory_messages(
     namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
     memory: Optional[str] = Query(None, description="Filter by memory name"),
     session: Optional[str] = Query(None, description="Filter by session ID"),
-    query: Optional[str] = Query(None, description="Filter by query ID")
+    query: Optional[str] = Query(None, description="Filter by query ID"),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ) -> MemoryMessageListResponse:
-    """List all memory messages with context, optionally filtered."""
+    """List all memory messages with context, optionally filtered.
+    
+    Memory services are queried concurrently. Messages from memory services
+    that fail or time out are left out and the failures are listed in errors.
+    """
     async with with_ark_client(namespace, VERSION) as client:
         memory_dicts = await get_all_memory_resources(client, memory)
         
-        all_messages = []
+        # Build query parameters
+        params = {}
+        if session:
+            params["session_id"] = session
+        if query:
+            params["query_id"] = query
         
-        for memory_dict in memory_dicts:
-            memory_name = memory_dict.get("metadata", {}).get("name", "")
-            
-            try:
-                service_url = get_memory_service_address(memory_dict)
-                
-                # Build query parameters
-                params = {}
-                if session:
-                    params["session_id"] = session
-                if query:
-                    params["query_id"] = query
-                
-                data = await fetch_memory_service_data(
-                    service_url,
-                    "/messages",
-                    params=params,
-                    memory_name=memory_name
-                )
-                
-                messages = data.get("messages", [])
-                
-                # Convert each database record to response format
-                for msg_record in messages:
-                    all_messages.append(MemoryMessageResponse(
-                        timestamp=msg_record.get("timestamp"),
-                        memoryName=memory_name,
-                        sessionId=msg_record.get("session_id"),
-                        queryId=msg_record.get("query_id"),
-                        message=msg_record.get("message"),
-                        sequence=msg_record.get("sequence")
-                    ))
-            
-            except Exception as e:
-                logger.error(f"Failed to get messages from memory {memory_name}: {e}")
-                # Continue processing other memories
+        async def fetch_messages(memory_name: str, service_url: str) -> list:
+            data = await fetch_memory_service_data(
+                http_client,
+                service_url,
+                "/messages",
+                params=params,
+                memory_name=memory_name
+            )
+            return data.get("messages") or []
+        
+        results = await fan_out_to_memories(memory_dicts, fetch_messages)
+        
+        all_messages = []
+        errors = []
+        for result in results:
+            if result.error is not None:
+                logger.error(f"Failed to get messages from memory {result.memory_name}: {result.error_message}")
+                errors.append(MemoryServiceError(memoryName=result.memory_name, error=result.error_message))
                 continue
+            
+            # Convert each database record to response format
+            for msg_record in result.value:
+                all_messages.append(MemoryMessageResponse(
+                    timestamp=msg_record.get("timestamp"),
+                    memoryName=result.memory_name,
+                    sessionId=msg_record.get("session_id"),
+                    queryId=msg_record.get("query_id"),
+                    message=msg_record.get("message"),
+                    sequence=msg_record.get("sequence")
+                ))
         
         # Sort by sequence number descending (newest first) to maintain proper chronological order
         # This ensures messages appear in the correct order regardless of timestamp precision
@@ -224,5 +256,6 @@ async def list_memory_messages(
         
         return MemoryMessageListResponse(
             items=all_messages,
-            total=len(all_messages)
-        )
\ No newline at end of file
+            total=len(all_messages),
+            errors=errors
+        )
@@ -1,8 +1,8 @@
 """Kubernetes models API endpoints."""
 import logging
 
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, Query, Request, Response
+from typing import List, Optional
 
 from ark_sdk.client import with_ark_client
 
@@ -14,6 +14,10 @@ from ...models.models import (
     ModelDetailResponse
 )
 from ...models.common import extract_availability_from_conditions
+from ...core.responses import ORJSONResponse
+from ...utils.delta import list_delta
+from ...utils.etag import not_modified, resource_versions_etag
+from ...utils.single_flight import request_key, single_flight
 from .exceptions import handle_k8s_errors
 
 logger = logging.getLogger(__name__)
@@ -83,29 +87,52 @@ def model_to_detail_response(model: dict) -> ModelDetailResponse:
     )
 
 
+async def _list_models(namespace: Optional[str]) -> List[dict]:
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        return [model.to_dict() for model in await ark_client.models.a_list()]
+
+
 @router.get("", response_model=ModelListResponse)
 @handle_k8s_errors(operation="list", resource_type="model")
-async def list_models(namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> ModelListResponse:
+async def list_models(
+    request: Request,
+    response: Response,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)")
+) -> ModelListResponse:
     """
     List all Model CRs in a namespace.
     
     Args:
         namespace: The namespace to list models from
+        since: Only return the changes since this resourceVersion (delta sync)
         
     Returns:
         ModelListResponse: List of all models in the namespace
+        (or the changes since `since`, see utils/delta.py)
     """
-    async with with_ark_client(namespace, VERSION) as ark_client:
-        models = await ark_client.models.a_list()
-        
-        model_list = []
-        for model in models:
-            model_list.append(model_to_response(model.to_dict()))
-        
-        return ModelListResponse(
-            items=model_list,
-            count=len(model_list)
-        )
+    if since is not None:
+        return ORJSONResponse(await list_delta("models", namespace, since, model_to_response))
+
+    # Identical concurrent polls share one list call
+    models = await single_flight("models.list").do(
+        request_key(request, namespace), lambda: _list_models(namespace)
+    )
+
+    # Unchanged since the client's last poll: skip building the response
+    etag = resource_versions_etag(models, request.url.query)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    model_list = []
+    for model in models:
+        model_list.append(model_to_response(model))
+    
+    return ModelListResponse(
+        items=model_list,
+        count=len(model_list)
+    )
 
 
 @router.post("", response_model=ModelDetailResponse)
@@ -1,29 +1,50 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
 import time
 import uuid
+from typing import Optional
 
 import httpx
-from ark_sdk import QueryV1alpha1Spec
+from ark_sdk import QueryV1alpha1Spec, QueryV1alpha1SpecTargetsInner
 from ark_sdk.client import with_ark_client
 from ark_sdk.k8s import get_namespace
 from ark_sdk.models.query_v1alpha1 import QueryV1alpha1
-from ark_sdk.streaming_config import get_streaming_base_url, get_streaming_config
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from kubernetes_asyncio import client as k8s_client
 from openai.types import Model
 from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
 from pydantic import BaseModel, ValidationError
 
 from ...constants.annotations import STREAMING_ENABLED_ANNOTATION
+from ...core.constants import GROUP
+from ...core.http import get_http_client
+from ...core.metrics import record_cache_lookup
 from ...models.queries import ArkOpenAICompletionsMetadata
+from ...services.model_passthrough import (
+    OPENAI_MODEL_PASSTHROUGH,
+    ResolvedModel,
+    build_request_body,
+    resolve_model,
+    schedule_audit,
+)
+from ...utils.completion_cache import (
+    completion_cache_key,
+    completion_cache_ttl,
+    get_cached_completion,
+    store_completion,
+)
+from ...utils.etag import compute_etag, etag_matches
 from ...utils.parse_duration import parse_duration_to_seconds
 from ...utils.query_targets import parse_model_to_query_target
 from ...utils.query_watch import watch_query_completion
 from ...utils.streaming import StreamingErrorResponse, create_single_chunk_sse_response
+from ...utils.streaming_endpoint import streaming_endpoints
+from ...utils.ttl_cache import TTLCache
 
 router = APIRouter(prefix="/openai/v1", tags=["OpenAI"])
 logger = logging.getLogger(__name__)
@@ -31,6 +52,21 @@ logger = logging.getLogger(__name__)
 # Constants
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
+# How long the /models listing is reused per namespace (0 disables caching)
+OPENAI_MODELS_CACHE_TTL_SECONDS = float(os.getenv("OPENAI_MODELS_CACHE_TTL_SECONDS", "10"))
+
+# Resources exposed as OpenAI models: (model id prefix, plural)
+MODEL_SOURCES = (("agent", "agents"), ("team", "teams"), ("model", "models"), ("tool", "tools"))
+
+_models_cache: TTLCache[tuple[dict, str]] = TTLCache(OPENAI_MODELS_CACHE_TTL_SECONDS, max_entries=256)
+
+# Server-Sent Events (SSE) headers for streaming responses
+# These headers ensure the connection stays open and data is not cached
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+}
+
 
 def _parse_timestamp(metadata: dict) -> int:
     """Parse creationTimestamp from metadata, returning current time if not found."""
@@ -98,87 +134,104 @@ def process_request_metadata(
     return None
 
 
-# See https://github.com/mckinsey/agents-at-scale-ark/issues/415 for potential improvement:
-# Start streaming first, wait for the first chunk/response, and use the status code of that to respond with
-async def proxy_streaming_response(streaming_url: str):
-    """Proxy streaming chunks from memory service."""
+async def open_streaming_response(streaming_url: str, http_client: httpx.AsyncClient) -> httpx.Response:
+    """Open the upstream stream and return once its status and headers arrive."""
     timeout = httpx.Timeout(10.0, read=None)  # 10s connect, infinite read
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        async with client.stream("GET", streaming_url) as response:
-            if response.status_code != 200:
-                # Read error response with expected structure
-                # We control the error format, so read it directly and fail if invalid
-                try:
-                    response_text = await response.aread()
-                    response_json = json.loads(response_text.decode("utf-8"))
-
-                    # Expected structure: {"error": {"message": "...", "type": "...", "code": "..."}}
-                    if (
-                        not isinstance(response_json, dict)
-                        or "error" not in response_json
-                    ):
-                        raise ValueError("Response missing 'error' field")
-
-                    error_obj = response_json["error"]
-                    if not isinstance(error_obj, dict):
-                        raise ValueError("'error' field must be an object")
-
-                    if "message" not in error_obj or not isinstance(
-                        error_obj["message"], str
-                    ):
-                        raise ValueError("'error.message' field missing or invalid")
-
-                    if "type" not in error_obj or not isinstance(
-                        error_obj["type"], str
-                    ):
-                        raise ValueError("'error.type' field missing or invalid")
-
-                    # Use the error structure from response, with status code added
-                    error_data: StreamingErrorResponse = {
-                        "error": {
-                            "status": response.status_code,
-                            "message": error_obj["message"],
-                            "type": error_obj["type"],
-                            "code": error_obj.get("code", "server_error"),
-                        }
-                    }
-                except (json.JSONDecodeError, ValueError, KeyError) as e:
-                    # If we can't parse the expected structure, create a default error
-                    logger.warning(
-                        f"Failed to parse error response structure: {e}, using default error format"
-                    )
-                    error_data: StreamingErrorResponse = {
-                        "error": {
-                            "status": response.status_code,
-                            "message": f"{response.status_code} {response.reason_phrase}",
-                            "type": "server_error",
-                            "code": "server_error",
-                        }
-                    }
+    request = http_client.build_request("GET", streaming_url, timeout=timeout)
+    return await http_client.send(request, stream=True)
 
-                # Forward the error response as an SSE error event
-                yield f"data: {json.dumps(error_data)}\n\n"
-                return  # Streaming failed, exit generator
-            # Use aiter_lines() for line-by-line streaming without buffering
-            async for line in response.aiter_lines():
-                if line.strip():  # Skip empty lines
-                    # SSE format: each chunk is on its own line
-                    yield line + "\n\n"  # Add back SSE double newline separator
 
+async def read_streaming_error(response: httpx.Response) -> StreamingErrorResponse:
+    """Read a failed upstream stream into an OpenAI error body and close it."""
+    # Read error response with expected structure
+    # We control the error format, so read it directly and fail if invalid
+    try:
+        response_text = await response.aread()
+        response_json = json.loads(response_text.decode("utf-8"))
+
+        # Expected structure: {"error": {"message": "...", "type": "...", "code": "..."}}
+        if not isinstance(response_json, dict) or "error" not in response_json:
+            raise ValueError("Response missing 'error' field")
+
+        error_obj = response_json["error"]
+        if not isinstance(error_obj, dict):
+            raise ValueError("'error' field must be an object")
+
+        if "message" not in error_obj or not isinstance(error_obj["message"], str):
+            raise ValueError("'error.message' field missing or invalid")
+
+        if "type" not in error_obj or not isinstance(error_obj["type"], str):
+            raise ValueError("'error.type' field missing or invalid")
+
+        # Use the error structure from response, with status code added
+        return {
+            "error": {
+                "status": response.status_code,
+                "message": error_obj["message"],
+                "type": error_obj["type"],
+                "code": error_obj.get("code", "server_error"),
+            }
+        }
+    except (json.JSONDecodeError, ValueError, KeyError) as e:
+        # If we can't parse the expected structure, create a default error
+        logger.warning(
+            f"Failed to parse error response structure: {e}, using default error format"
+        )
+        return {
+            "error": {
+                "status": response.status_code,
+                "message": f"{response.status_code} {response.reason_phrase}",
+                "type": "server_error",
+                "code": "server_error",
+            }
+        }
+    finally:
+        await response.aclose()
 
-@router.post("/chat/completions")
-async def chat_completions(request: ChatCompletionRequest) -> ChatCompletion:
-    model = request.model
-    messages = request.messages
 
-    target = parse_model_to_query_target(model)
-    query_name = f"openai-query-{uuid.uuid4().hex[:8]}"
+async def relay_streaming_response(response: httpx.Response):
+    """Relay chunks of an open upstream stream, closing it when done."""
+    try:
+        # Use aiter_lines() for line-by-line streaming without buffering
+        async for line in response.aiter_lines():
+            if line.strip():  # Skip empty lines
+                # SSE format: each chunk is on its own line
+                yield line + "\n\n"  # Add back SSE double newline separator
+    finally:
+        await response.aclose()
+
+
+async def _discard_streaming_response(stream_task: asyncio.Task) -> None:
+    """Cancel a pending upstream stream, closing it if it already opened."""
+    stream_task.cancel()
+    try:
+        response = await stream_task
+    except (asyncio.CancelledError, Exception):
+        return
+    await response.aclose()
 
-    # Get the current namespace
-    namespace = get_namespace()
 
+def build_chat_query(
+    request: ChatCompletionRequest,
+    target: QueryV1alpha1SpecTargetsInner,
+    query_name: str,
+    namespace: str,
+    annotations: dict[str, str] | None = None,
+) -> tuple[QueryV1alpha1, int]:
+    """Build the Query resource for a chat completion request.
+
+    `annotations` are the Ark annotations from the request's metadata.ark.
+
+    Returns:
+        Tuple of (query resource, query timeout in seconds)
+
+    Raises:
+        ValidationError: If the request does not produce a valid Query
+    """
     # Build metadata for the query resource
     metadata = {"name": query_name, "namespace": namespace}
+    if annotations:
+        metadata["annotations"] = dict(annotations)
 
     session_id = None
     if request.metadata and "sessionId" in request.metadata:
@@ -206,70 +259,232 @@ async def chat_completions(request: ChatCompletionRequest) -> ChatCompletion:
             metadata["annotations"] = {}
         metadata["annotations"][STREAMING_ENABLED_ANNOTATION] = "true"
 
-    try:
-        # Build query spec with optional sessionId and timeout
-        query_spec_dict = {"type": "messages", "input": messages, "targets": [target]}
-        if session_id:
-            query_spec_dict["sessionId"] = session_id
-        if timeout:
-            query_spec_dict["timeout"] = timeout
-
-        # Create the QueryV1alpha1 object with type="messages"
-        # Pass messages directly without json.dumps() - SDK handles serialization
-        query_resource = QueryV1alpha1(
-            metadata=metadata,
-            spec=QueryV1alpha1Spec(**query_spec_dict),
+    # Build query spec with optional sessionId and timeout
+    query_spec_dict = {"type": "messages", "input": request.messages, "targets": [target]}
+    if session_id:
+        query_spec_dict["sessionId"] = session_id
+    if timeout:
+        query_spec_dict["timeout"] = timeout
+
+    # Create the QueryV1alpha1 object with type="messages"
+    # Pass messages directly without json.dumps() - SDK handles serialization
+    query_resource = QueryV1alpha1(
+        metadata=metadata,
+        spec=QueryV1alpha1Spec(**query_spec_dict),
+    )
+
+    # Extract timeout from query spec
+    query_timeout_str = query_resource.spec.timeout
+    timeout_seconds = parse_duration_to_seconds(query_timeout_str) or 300
+    return query_resource, timeout_seconds
+
+
+async def run_chat_completion(request: ChatCompletionRequest, namespace: str) -> ChatCompletion:
+    """Create a Query for a non-streaming request and wait for its completion."""
+    target = parse_model_to_query_target(request.model)
+    query_name = f"openai-query-{uuid.uuid4().hex[:8]}"
+    query_resource, timeout_seconds = build_chat_query(request, target, query_name, namespace)
+    async with with_ark_client(namespace, "v1alpha1") as ark_client:
+        await ark_client.queries.a_create(query_resource)
+        logger.info(f"Created query: {query_name}")
+        return await watch_query_completion(
+            ark_client, query_name, request.model, request.messages, timeout_seconds
         )
 
-        async with with_ark_client(namespace, "v1alpha1") as ark_client:
-            # Create the query using QueryV1alpha1 object like queries API
-            await ark_client.queries.a_create(query_resource)
-            logger.info(f"Created query: {query_name}")
 
-            # Extract timeout from query spec
-            query_timeout_str = query_resource.spec.timeout
-            timeout_seconds = parse_duration_to_seconds(query_timeout_str) or 300
+def _cached_completion_response(completion: dict, stream: bool) -> JSONResponse | StreamingResponse:
+    """Return a cached completion in the format the client asked for."""
+    if stream:
+        sse_lines = create_single_chunk_sse_response(ChatCompletion.model_validate(completion))
+        return StreamingResponse(
+            iter(sse_lines),
+            media_type="text/event-stream",
+            headers={**SSE_HEADERS, "X-Ark-Cache": "hit"},
+        )
+    return JSONResponse(content=completion, headers={"X-Ark-Cache": "hit"})
 
-            # If the caller didn't request streaming, we can simply poll for
-            # the response.
-            if not request.stream:
-                return await watch_query_completion(
-                    ark_client, query_name, model, messages, timeout_seconds
-                )
 
-            # Streaming was requested - check if streaming backend is available
-            # Define Server-Sent Events (SSE) headers for streaming responses
-            # These headers ensure the connection stays open and data is not cached
-            sse_headers = {
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            }
+def _requires_query(request: ChatCompletionRequest) -> bool:
+    """Whether the request relies on Query features (sessions, query annotations)."""
+    return bool(request.metadata) and any(key in request.metadata for key in ("sessionId", "queryAnnotations"))
 
-            api = k8s_client.ApiClient()
-            v1 = k8s_client.CoreV1Api(api)
-            streaming_config = await get_streaming_config(v1, namespace)
 
-            # If no config or not enabled, fall back to polling
-            if not streaming_config or not streaming_config.enabled:
-                logger.info("No streaming backend configured, falling back to polling")
-                completion = await watch_query_completion(
-                    ark_client, query_name, model, messages, timeout_seconds
-                )
-                sse_lines = create_single_chunk_sse_response(completion)
+async def passthrough_chat_completion(
+    request: ChatCompletionRequest,
+    resolved_model: ResolvedModel,
+    http_client: httpx.AsyncClient,
+    cache_entry: tuple[str, float] | None = None,
+) -> JSONResponse | StreamingResponse:
+    """Serve a model/<name> completion by calling the model's provider directly.
+
+    `cache_entry` is the (key, TTL) to store a non-streamed completion under.
+    """
+    timeout_seconds = None
+    if request.metadata and "timeout" in request.metadata:
+        timeout_seconds = parse_duration_to_seconds(request.metadata["timeout"])
+    timeout = httpx.Timeout(10.0, read=timeout_seconds or 300)
+
+    started = time.monotonic()
+    upstream = await http_client.send(
+        http_client.build_request(
+            "POST",
+            resolved_model.url,
+            json=build_request_body(resolved_model, request.messages, request.stream),
+            headers=resolved_model.headers,
+            timeout=timeout,
+        ),
+        stream=True,
+    )
+    if upstream.status_code != 200:
+        error_data = await read_streaming_error(upstream)
+        schedule_audit(
+            resolved_model,
+            f"Direct chat completion for {request.model} failed with status {upstream.status_code}",
+            succeeded=False,
+        )
+        return JSONResponse(status_code=upstream.status_code, content=error_data)
+
+    if request.stream:
+        schedule_audit(resolved_model, f"Streaming chat completion for {request.model} served directly")
+        return StreamingResponse(
+            relay_streaming_response(upstream),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS,
+        )
+
+    try:
+        completion = json.loads(await upstream.aread())
+    finally:
+        await upstream.aclose()
+    # Report the requested target, as the Query path does
+    completion["model"] = request.model
+    if cache_entry:
+        store_completion(cache_entry[0], completion, cache_entry[1])
+        completion["ark"] = {**(completion.get("ark") or {}), "cache": {"hit": False}}
+    total_tokens = (completion.get("usage") or {}).get("total_tokens", 0)
+    schedule_audit(
+        resolved_model,
+        f"Chat completion for {request.model} served directly in "
+        f"{int((time.monotonic() - started) * 1000)}ms ({total_tokens} tokens)",
+    )
+    return JSONResponse(content=completion)
+
+
+@router.post("/chat/completions")
+async def chat_completions(
+    request: ChatCompletionRequest,
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+) -> ChatCompletion:
+    model = request.model
+    messages = request.messages
+
+    target = parse_model_to_query_target(model)
+    query_name = f"openai-query-{uuid.uuid4().hex[:8]}"
+
+    # Get the current namespace
+    namespace = get_namespace()
+
+    # Ark metadata: annotations for the query, including the completion cache opt-in
+    ark_metadata: dict = {}
+    error_response = process_request_metadata(request.metadata, ark_metadata)
+    if error_response:
+        return error_response
+    ark_annotations = ark_metadata.get("annotations", {})
+
+    # Opt-in exact-match completion cache. Session requests are never cached
+    # because the session history changes the answer.
+    cache_entry = None
+    if not (request.metadata and "sessionId" in request.metadata):
+        try:
+            cache_ttl = completion_cache_ttl(ark_annotations)
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "error": {
+                        "message": f"Invalid Ark metadata: {str(e)}",
+                        "type": "invalid_request_error",
+                        "code": "invalid_ark_metadata",
+                    }
+                },
+            )
+        if cache_ttl:
+            cache_key = completion_cache_key(
+                namespace, model, messages, request.temperature, request.max_tokens, ark_annotations
+            )
+            cached = get_cached_completion(cache_key)
+            if cached is not None:
+                logger.info(f"Completion cache hit for {model}")
+                return _cached_completion_response(cached, request.stream)
+            cache_entry = (cache_key, cache_ttl)
+
+    try:
+        # Opt-in fast path: call the model directly without creating a Query
+        if OPENAI_MODEL_PASSTHROUGH and target.type == "model" and not _requires_query(request):
+            try:
+                resolved_model = await resolve_model(namespace, target.name)
+            except Exception as e:
+                logger.info(f"Model passthrough unavailable for {model}, using a query: {e}")
+            else:
+                return await passthrough_chat_completion(request, resolved_model, http_client, cache_entry)
+
+        query_resource, timeout_seconds = build_chat_query(
+            request, target, query_name, namespace, ark_annotations
+        )
+
+        # Resolve the streaming backend up front (cached, no API calls on a hit)
+        streaming_base_url = None
+        if request.stream:
+            streaming_base_url = await streaming_endpoints.get_base_url(namespace)
+
+        async with with_ark_client(namespace, "v1alpha1") as ark_client:
+            if streaming_base_url:
+                # The streaming backend waits for the query to appear, so the
+                # upstream stream is opened while the query is being created
+                streaming_url = f"{streaming_base_url}/stream/{query_name}?from-beginning=true&wait-for-query={timeout_seconds}"
+                stream_task = asyncio.create_task(open_streaming_response(streaming_url, http_client))
+                try:
+                    await ark_client.queries.a_create(query_resource)
+                except BaseException:
+                    await _discard_streaming_response(stream_task)
+                    raise
+                logger.info(f"Created query: {query_name}")
+
+                # Respond with the status of the upstream stream rather than
+                # always answering 200 and reporting failures in-band
+                upstream = await stream_task
+                if upstream.status_code != 200:
+                    error_data = await read_streaming_error(upstream)
+                    return JSONResponse(status_code=upstream.status_code, content=error_data)
+
+                logger.info(f"Streaming available for query: {query_name}")
                 return StreamingResponse(
-                    iter(sse_lines), media_type="text/event-stream", headers=sse_headers
+                    relay_streaming_response(upstream),
+                    media_type="text/event-stream",
+                    headers=SSE_HEADERS,
                 )
 
-            # Streaming is enabled - get the base URL and construct full URL
-            base_url = await get_streaming_base_url(streaming_config, namespace, v1)
-            streaming_url = f"{base_url}/stream/{query_name}?from-beginning=true&wait-for-query={timeout_seconds}"
+            # Create the query using QueryV1alpha1 object like queries API
+            await ark_client.queries.a_create(query_resource)
+            logger.info(f"Created query: {query_name}")
+
+            completion = await watch_query_completion(
+                ark_client, query_name, model, messages, timeout_seconds
+            )
+            if cache_entry:
+                store_completion(cache_entry[0], completion.model_dump(), cache_entry[1])
+                completion.ark = {**(getattr(completion, "ark", None) or {}), "cache": {"hit": False}}
+
+            # If the caller didn't request streaming, return the completion
+            if not request.stream:
+                return completion
 
-            # Proxy to the streaming endpoint
-            logger.info(f"Streaming available for query: {query_name}")
+            # Streaming was requested but no backend is configured: send the
+            # completed response as a single chunk
+            logger.info("No streaming backend configured, falling back to polling")
+            sse_lines = create_single_chunk_sse_response(completion)
             return StreamingResponse(
-                proxy_streaming_response(streaming_url),
-                media_type="text/event-stream",
-                headers=sse_headers,
+                iter(sse_lines), media_type="text/event-stream", headers=SSE_HEADERS
             )
 
     except ValidationError as e:
@@ -299,46 +514,52 @@ async def chat_completions(request: ChatCompletionRequest) -> ChatCompletion:
         )
 
 
+async def _list_model_entries(custom_api: k8s_client.CustomObjectsApi, namespace: str, kind: str, plural: str) -> list[dict]:
+    """List one resource kind as OpenAI model entries, reading raw objects."""
+    response = await custom_api.list_namespaced_custom_object(
+        group=GROUP, version="v1alpha1", namespace=namespace, plural=plural
+    )
+    return [
+        _create_model_entry(f"{kind}/{item['metadata']['name']}", item["metadata"]).model_dump()
+        for item in response.get("items", [])
+    ]
+
+
 @router.get("/models")
-async def list_models():
+async def list_models(
+    request: Request,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
     """List available models in OpenAI format, including ARK agents, teams, models, and tools."""
-    models_list = []
+    namespace = namespace or get_namespace()
+
+    cached = _models_cache.get(namespace)
+    record_cache_lookup("openai_models", cached is not None)
+    if cached is None:
+        async with k8s_client.ApiClient() as api:
+            custom_api = k8s_client.CustomObjectsApi(api)
+            results = await asyncio.gather(
+                *(_list_model_entries(custom_api, namespace, kind, plural) for kind, plural in MODEL_SOURCES),
+                return_exceptions=True,
+            )
 
-    async with with_ark_client("default", "v1alpha1") as ark_client:
-        # Get agents
-        try:
-            agents = await ark_client.agents.a_list()
-            for agent in agents:
-                name = agent.metadata["name"]
-                models_list.append(_create_model_entry(f"agent/{name}", agent.metadata))
-        except Exception as e:
-            logger.error(f"Failed to list agents: {e}")
-
-        # Get teams
-        try:
-            teams = await ark_client.teams.a_list()
-            for team in teams:
-                name = team.metadata["name"]
-                models_list.append(_create_model_entry(f"team/{name}", team.metadata))
-        except Exception as e:
-            logger.error(f"Failed to list teams: {e}")
-
-        # Get models
-        try:
-            models = await ark_client.models.a_list()
-            for model in models:
-                name = model.metadata["name"]
-                models_list.append(_create_model_entry(f"model/{name}", model.metadata))
-        except Exception as e:
-            logger.error(f"Failed to list models: {e}")
-
-        # Get tools
-        try:
-            tools = await ark_client.tools.a_list()
-            for tool in tools:
-                name = tool.metadata["name"]
-                models_list.append(_create_model_entry(f"tool/{name}", tool.metadata))
-        except Exception as e:
-            logger.error(f"Failed to list tools: {e}")
-
-    return {"object": "list", "data": models_list}
+        models_list = []
+        complete = True
+        for (kind, plural), result in zip(MODEL_SOURCES, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to list {plural}: {result}")
+                complete = False
+                continue
+            models_list.extend(result)
+
+        payload = {"object": "list", "data": models_list}
+        cached = (payload, compute_etag(payload))
+        # Partial results are served but not cached, so the next call retries
+        if complete:
+            _models_cache.put(namespace, cached)
+
+    payload, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
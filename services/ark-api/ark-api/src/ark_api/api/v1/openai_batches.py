@@ -0,0 +1,202 @@
+"""OpenAI Batch API compatible endpoints (files and batches)."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from ark_sdk.k8s import get_namespace
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel, ValidationError
+
+from ...services.openai_batches import BatchAPIError, OpenAIBatchService
+from .openai import ChatCompletionRequest, run_chat_completion
+
+router = APIRouter(prefix="/openai/v1", tags=["OpenAI"])
+logger = logging.getLogger(__name__)
+
+_batch_service: Optional[OpenAIBatchService] = None
+
+
+class CreateBatchRequest(BaseModel):
+    input_file_id: str
+    endpoint: str
+    completion_window: str
+    metadata: dict[str, str] | None = None
+
+
+def _openai_error(status_code: int, message: str, code: str) -> dict[str, Any]:
+    error_type = "invalid_request_error" if status_code < 500 else "server_error"
+    return {"error": {"message": message, "type": error_type, "code": code}}
+
+
+def _error_response(e: BatchAPIError) -> JSONResponse:
+    return JSONResponse(status_code=e.status_code, content=_openai_error(e.status_code, e.message, e.code))
+
+
+async def execute_batch_request(body: dict[str, Any], namespace: str) -> tuple[int, dict[str, Any]]:
+    """Run one batch line's chat completion body and return (status code, response body)."""
+    try:
+        # Batch requests are never streamed
+        request = ChatCompletionRequest.model_validate({**body, "stream": False})
+        completion = await run_chat_completion(request, namespace)
+        return 200, completion.model_dump()
+    except ValidationError as e:
+        return 400, _openai_error(400, str(e), "invalid_value")
+    except HTTPException as e:
+        message = e.detail.get("message", str(e.detail)) if isinstance(e.detail, dict) else str(e.detail)
+        return e.status_code, _openai_error(e.status_code, message, "query_failed")
+
+
+def _scope(request: Request, namespace: Optional[str]) -> dict[str, Any]:
+    """Namespace and principal that files and batches are scoped to."""
+    return {"namespace": namespace or get_namespace(), "owner": getattr(request.state, "principal", None)}
+
+
+def get_batch_service() -> OpenAIBatchService:
+    """Get or create the OpenAI batch service instance."""
+    global _batch_service
+    if _batch_service is None:
+        _batch_service = OpenAIBatchService(executor=execute_batch_request)
+    return _batch_service
+
+
+@router.post("/files")
+async def create_file(
+    request: Request,
+    file: UploadFile = File(...),
+    purpose: str = Form(...),
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Upload a JSONL file of batch requests."""
+    try:
+        return await get_batch_service().create_file(file, purpose, **_scope(request, namespace))
+    except BatchAPIError as e:
+        return _error_response(e)
+
+
+@router.get("/files")
+async def list_files(
+    request: Request,
+    purpose: Optional[str] = Query(None, description="Only return files with this purpose"),
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """List uploaded and result files."""
+    files = await get_batch_service().list_files(purpose=purpose, **_scope(request, namespace))
+    return {"object": "list", "data": files}
+
+
+@router.get("/files/{file_id}")
+async def get_file(
+    request: Request,
+    file_id: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Get a file's metadata."""
+    try:
+        return await get_batch_service().get_file(file_id, **_scope(request, namespace))
+    except BatchAPIError as e:
+        return _error_response(e)
+
+
+@router.get("/files/{file_id}/content")
+async def get_file_content(
+    request: Request,
+    file_id: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Download a file's content (JSONL)."""
+    try:
+        service = get_batch_service()
+        scope = _scope(request, namespace)
+        file_object = await service.get_file(file_id, **scope)
+        return FileResponse(
+            await service.file_content_path(file_id, **scope),
+            media_type="application/jsonl",
+            filename=file_object.filename,
+        )
+    except BatchAPIError as e:
+        return _error_response(e)
+
+
+@router.delete("/files/{file_id}")
+async def delete_file(
+    request: Request,
+    file_id: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Delete a file."""
+    try:
+        await get_batch_service().delete_file(file_id, **_scope(request, namespace))
+        return {"id": file_id, "object": "file", "deleted": True}
+    except BatchAPIError as e:
+        return _error_response(e)
+
+
+@router.post("/batches")
+async def create_batch(
+    request: Request,
+    body: CreateBatchRequest,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Create a batch from an uploaded input file and start executing it."""
+    try:
+        return await get_batch_service().create_batch(
+            input_file_id=body.input_file_id,
+            endpoint=body.endpoint,
+            completion_window=body.completion_window,
+            metadata=body.metadata,
+            **_scope(request, namespace),
+        )
+    except BatchAPIError as e:
+        return _error_response(e)
+
+
+@router.get("/batches")
+async def list_batches(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of batches to return"),
+    after: Optional[str] = Query(None, description="Return batches after this batch ID"),
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """List batches, newest first."""
+    try:
+        batches, has_more = await get_batch_service().list_batches(
+            limit=limit, after=after, **_scope(request, namespace)
+        )
+    except BatchAPIError as e:
+        return _error_response(e)
+    return {
+        "object": "list",
+        "data": batches,
+        "first_id": batches[0].id if batches else None,
+        "last_id": batches[-1].id if batches else None,
+        "has_more": has_more,
+    }
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch(
+    request: Request,
+    batch_id: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Get a batch and its progress."""
+    try:
+        return await get_batch_service().get_batch(batch_id, **_scope(request, namespace))
+    except BatchAPIError as e:
+        return _error_response(e)
+
+
+@router.post("/batches/{batch_id}/cancel")
+async def cancel_batch(
+    request: Request,
+    batch_id: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+):
+    """Cancel a batch. Requests already running are allowed to finish."""
+    try:
+        return await get_batch_service().cancel_batch(batch_id, **_scope(request, namespace))
+    except BatchAPIError as e:
+        return _error_response(e)
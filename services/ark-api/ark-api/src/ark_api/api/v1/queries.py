@@ -1,21 +1,48 @@
 """API routes for Query resources."""
 
-from datetime import datetime
-from fastapi import APIRouter, Query
-from typing import Optional
+import asyncio
+import json
+import logging
+import os
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, List, Optional, Tuple
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.rest import ApiException
+from kubernetes.client.exceptions import ApiException as SyncApiException
 from ark_sdk.models.query_v1alpha1 import QueryV1alpha1
 from ark_sdk.models.query_v1alpha1_spec import QueryV1alpha1Spec
 
 from ark_sdk.client import with_ark_client
+from ark_sdk.k8s import get_namespace
 
 from ...models.queries import (
     QueryResponse,
     QueryListResponse,
     QueryCreateRequest,
     QueryUpdateRequest,
-    QueryDetailResponse
+    QueryDetailResponse,
+    QueryBatchCreateRequest,
+    QueryCancelRequest,
+    QueryBulkItemResult,
+    QueryBulkResponse
 )
-from .exceptions import handle_k8s_errors
+from ...constants.annotations import QUERY_CALLBACK_ANNOTATION
+from ...core.constants import GROUP
+from ...core.responses import ORJSONResponse
+from ...services.query_callbacks import CallbackURLError, query_callbacks, validate_callback_url
+from ...utils.delta import list_delta
+from ...utils.informer import Informer, custom_resource_informer
+from ...utils.pagination import decode_continue_token, encode_continue_token
+from ...utils.parse_duration import parse_duration_to_seconds
+from ...utils.projection import parse_fields, project
+from ...utils.query_watch import get_query_watch
+from ...utils.single_flight import request_key, single_flight
+from ...utils.streaming import format_sse
+from .exceptions import _extract_error_detail, handle_k8s_errors
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/queries",
@@ -25,30 +52,52 @@ router = APIRouter(
 # CRD configuration
 VERSION = "v1alpha1"
 
+# Serve query lists from an in-memory informer instead of the API server
+QUERY_LIST_INFORMER = os.getenv("QUERY_LIST_INFORMER", "false").lower() == "true"
+# Queries created or cancelled at once by the bulk endpoints
+QUERY_BULK_CONCURRENCY = int(os.getenv("QUERY_BULK_CONCURRENCY", "20"))
+# Maximum queries per bulk request
+QUERY_BULK_MAX_ITEMS = int(os.getenv("QUERY_BULK_MAX_ITEMS", "5000"))
+# Longest a client may block on GET /v1/queries/{name}/wait
+QUERY_WAIT_MAX_SECONDS = int(os.getenv("QUERY_WAIT_MAX_SECONDS", "300"))
+# Interval for SSE keep-alive comments on idle query event streams
+QUERY_EVENTS_HEARTBEAT_SECONDS = 15
+# How long the events stream waits for the shared query watch to start
+QUERY_WATCH_READY_SECONDS = 10
 
-def query_to_response(query: dict) -> QueryResponse:
-    """Convert a Kubernetes query object to response model."""
-    creation_timestamp = None
-    if "creationTimestamp" in query["metadata"]:
-        creation_timestamp = datetime.fromisoformat(
-            query["metadata"]["creationTimestamp"].replace("Z", "+00:00")
-        )
-    
-    # Get query type and determine input field
+# Phases after which cancelling a query has no effect
+TERMINAL_QUERY_PHASES = ("done", "error", "canceled")
+
+
+def query_to_item(query: dict) -> dict:
+    """Convert a Kubernetes query object to a JSON ready QueryResponse dict.
+
+    List endpoints return these directly, without building and revalidating
+    a QueryResponse per query.
+    """
+    metadata = query["metadata"]
     spec = query["spec"]
+
+    # Get query type and determine input field
     query_type = spec.get('type', 'user')
     input_value = spec.get("input", "" if query_type == 'user' else [])
-    
-    return QueryResponse(
-        name=query["metadata"]["name"],
-        namespace=query["metadata"]["namespace"],
-        type=query_type,
-        input=input_value,
-        memory=spec.get("memory"),
-        sessionId=spec.get("sessionId"),
-        status=query.get("status"),
-        creationTimestamp=creation_timestamp
-    )
+    memory = spec.get("memory")
+
+    return {
+        "name": metadata["name"],
+        "namespace": metadata["namespace"],
+        "type": query_type,
+        "input": input_value,
+        "memory": {"name": memory["name"], "namespace": memory.get("namespace")} if memory else None,
+        "sessionId": spec.get("sessionId"),
+        "status": query.get("status"),
+        "creationTimestamp": metadata.get("creationTimestamp")
+    }
+
+
+def query_to_response(query: dict) -> QueryResponse:
+    """Convert a Kubernetes query object to response model."""
+    return QueryResponse.model_validate(query_to_item(query))
 
 
 def query_to_detail_response(query: dict) -> QueryDetailResponse:
@@ -80,19 +129,252 @@ def query_to_detail_response(query: dict) -> QueryDetailResponse:
     )
 
 
-@router.get("", response_model=QueryListResponse)
-@handle_k8s_errors(operation="list", resource_type="query")
-async def list_queries(namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> QueryListResponse:
-    """List all queries in a namespace."""
+def get_query_informer(namespace: str) -> Informer:
+    """Get the (started) query informer for a namespace."""
+    return custom_resource_informer("queries", namespace, VERSION)
+
+
+def _sort_key(query: dict, sort: Optional[str]) -> Tuple[str, ...]:
+    metadata = query["metadata"]
+    if sort:
+        return (metadata.get("creationTimestamp") or "", metadata["name"])
+    return (metadata["name"],)
+
+
+def _memory_page_key(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """The sort key recorded in a continue token issued by _page_in_memory.
+
+    Returns None for tokens issued by the API server path, whose payload is
+    a Kubernetes continue token rather than a JSON list.
+    """
+    try:
+        key = json.loads(value) if value else None
+    except ValueError:
+        return None
+    return tuple(key) if isinstance(key, list) else None
+
+
+def _page_in_memory(
+    queries: List[dict],
+    sort: Optional[str],
+    limit: Optional[int],
+    continue_token: Optional[str],
+) -> Tuple[List[dict], Optional[str]]:
+    """Sort and page a complete list of queries.
+
+    The continue token records the sort key of the last query returned, so
+    queries created or deleted between requests do not shift later pages.
+    A token from the API server path (issued before the informer synced)
+    restarts the list from the first page.
+    """
+    descending = sort == "-creationTimestamp"
+    queries = sorted(queries, key=lambda q: _sort_key(q, sort), reverse=descending)
+
+    after, _ = decode_continue_token(continue_token)
+    after_key = _memory_page_key(after)
+    if after_key is not None:
+        if descending:
+            queries = [q for q in queries if _sort_key(q, sort) < after_key]
+        else:
+            queries = [q for q in queries if _sort_key(q, sort) > after_key]
+
+    if limit is None or len(queries) <= limit:
+        return queries, None
+    page = queries[:limit]
+    return page, encode_continue_token(json.dumps(list(_sort_key(page[-1], sort))))
+
+
+async def _list_live_page(
+    namespace: str,
+    limit: Optional[int],
+    continue_token: Optional[str],
+    label_selector: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Read one page of queries from the API server with limit/continue.
+
+    A token from the in-memory path (issued while the informer was synced)
+    restarts the list from the first page.
+    """
+    k8s_continue, _ = decode_continue_token(continue_token)
+    if _memory_page_key(k8s_continue) is not None:
+        k8s_continue = None
+    async with ApiClient() as api:
+        result = await client.CustomObjectsApi(api).list_namespaced_custom_object(
+            group=GROUP,
+            version=VERSION,
+            namespace=namespace,
+            plural="queries",
+            label_selector=label_selector,
+            limit=limit,
+            _continue=k8s_continue
+        )
+    next_continue = (result.get("metadata") or {}).get("continue")
+    return result.get("items", []), encode_continue_token(next_continue) if next_continue else None
+
+
+async def _list_page(
+    namespace: Optional[str],
+    limit: Optional[int],
+    continue_token: Optional[str],
+    sort: Optional[str],
+) -> Tuple[List[dict], Optional[str]]:
+    """Read the requested page of queries, from the informer once it has synced."""
+    informer = get_query_informer(namespace or get_namespace()) if QUERY_LIST_INFORMER else None
+    if informer is not None and informer.synced:
+        return _page_in_memory(informer.items(), sort, limit, continue_token)
+    if sort is None and (limit is not None or continue_token):
+        return await _list_live_page(namespace or get_namespace(), limit, continue_token)
+
     async with with_ark_client(namespace, VERSION) as ark_client:
         result = await ark_client.queries.a_list()
-        
-        queries = [query_to_response(item.to_dict()) for item in result]
-        
-        return QueryListResponse(
-            items=queries,
-            count=len(queries)
-        )
+    queries = [item.to_dict() for item in result]
+    if sort:
+        return _page_in_memory(queries, sort, limit, continue_token)
+    return queries, None
+
+
+@router.get("", response_model=QueryListResponse)
+@handle_k8s_errors(operation="list", resource_type="query")
+async def list_queries(
+    request: Request,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of queries to return"),
+    continue_token: Optional[str] = Query(None, alias="continue", description="Continue token from a previous response"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. name,status.phase,creationTimestamp"),
+    sort: Optional[str] = Query(None, pattern="^-?creationTimestamp$", description="Sort by creationTimestamp, or -creationTimestamp for newest first"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)"),
+) -> QueryListResponse:
+    """
+    List queries in a namespace.
+
+    Without parameters every query is returned in full. `limit` and
+    `continue` page through the list, `sort` orders it by creation time and
+    `fields` returns only the listed fields of each query, e.g.
+    `fields=name,status.phase,creationTimestamp` for a dashboard table.
+
+    When QUERY_LIST_INFORMER is enabled the list is served from an
+    in-memory informer once it has synced, otherwise from the API server.
+    Unsorted pages from the API server are read with limit/continue; sorted
+    lists have to be read in full first.
+
+    With `since` only the queries added, modified or deleted since that
+    resourceVersion are returned (see utils/delta.py); `fields` still
+    applies, `limit`, `continue` and `sort` do not.
+    """
+    paths = parse_fields(fields, QueryResponse.model_fields)
+
+    if since is not None:
+        def to_item(query: dict) -> dict:
+            item = query_to_item(query)
+            return project(item, paths) if paths else item
+        return ORJSONResponse(await list_delta("queries", namespace, since, to_item))
+
+    # Identical concurrent polls share one list call
+    queries, next_token = await single_flight("queries.list").do(
+        request_key(request, namespace), lambda: _list_page(namespace, limit, continue_token, sort)
+    )
+
+    items = [query_to_item(query) for query in queries]
+    if paths:
+        items = [project(item, paths) for item in items]
+
+    return ORJSONResponse({
+        "items": items,
+        "count": len(items),
+        "continue": next_token
+    })
+
+
+def build_query_resource(query: QueryCreateRequest, namespace: Optional[str]) -> QueryV1alpha1:
+    """Build the Query resource for a create request."""
+    # Determine input type and build spec accordingly
+    spec = {
+        "type": getattr(query, 'type', 'user')
+    }
+    
+    # Handle input based on type - pass raw data for RawExtension
+    if spec["type"] == "user":
+        # For string input, pass as string
+        spec["input"] = query.input if isinstance(query.input, str) else str(query.input)
+    else:
+        # Messages are already dicts (ChatCompletionMessageParam), pass through as-is
+        spec["input"] = query.input
+    
+    if query.memory:
+        spec["memory"] = query.memory.model_dump()
+    if query.parameters:
+        spec["parameters"] = [p.model_dump() for p in query.parameters]
+    if query.selector:
+        spec["selector"] = query.selector.model_dump()
+    if query.serviceAccount:
+        spec["serviceAccount"] = query.serviceAccount
+    if query.sessionId:
+        spec["sessionId"] = query.sessionId
+    if query.targets:
+        spec["targets"] = [t.model_dump() for t in query.targets]
+    if query.timeout:
+        spec["timeout"] = query.timeout
+    if query.ttl:
+        spec["ttl"] = query.ttl
+    if query.cancel is not None:
+        spec["cancel"] = query.cancel
+    if query.overrides:
+        spec["overrides"] = [o.model_dump() for o in query.overrides]
+
+    # Create the QueryV1alpha1 object
+    metadata = {
+        "name": query.name,
+        "namespace": namespace
+    }
+    # The incoming query may contain additional metadata such as annotations (e.g. streaming annotation)
+    if query.metadata:
+        metadata.update(query.metadata)
+    if query.callback:
+        metadata["annotations"] = {
+            **(metadata.get("annotations") or {}),
+            QUERY_CALLBACK_ANNOTATION: str(query.callback)
+        }
+
+    return QueryV1alpha1(
+        metadata=metadata,
+        spec=QueryV1alpha1Spec(**spec)
+    )
+
+
+def _callback_url(query: QueryCreateRequest) -> Optional[str]:
+    """The callback URL a query will be created with, from callback or its raw annotation."""
+    if query.callback:
+        return str(query.callback)
+    annotations = (query.metadata or {}).get("annotations") or {}
+    return annotations.get(QUERY_CALLBACK_ANNOTATION) if isinstance(annotations, dict) else None
+
+
+async def _validate_callback(query: QueryCreateRequest) -> Optional[str]:
+    """Check a query's callback URL before it is created.
+
+    Raises:
+        HTTPException: 400 if the URL is not allowed
+    """
+    url = _callback_url(query)
+    if url is not None:
+        try:
+            await validate_callback_url(url)
+        except CallbackURLError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return url
+
+
+async def _register_callback_namespace(namespace: str) -> None:
+    """Hand a namespace with callbacks to the leader worker, which delivers them.
+
+    Raises:
+        HTTPException: 503 if it cannot be recorded, so no callback is lost
+    """
+    try:
+        await query_callbacks.register_namespace(namespace)
+    except OSError as e:
+        logger.error(f"Failed to record callback namespace {namespace}: {e}")
+        raise HTTPException(status_code=503, detail="Query callbacks are temporarily unavailable")
 
 
 @router.post("", response_model=QueryDetailResponse)
@@ -101,61 +383,133 @@ async def create_query(
     query: QueryCreateRequest,
     namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
 ) -> QueryDetailResponse:
-    """Create a new query."""
-    async with with_ark_client(namespace, VERSION) as ark_client:
-        # Determine input type and build spec accordingly
-        spec = {
-            "type": getattr(query, 'type', 'user')
-        }
-        
-        # Handle input based on type - pass raw data for RawExtension
-        if spec["type"] == "user":
-            # For string input, pass as string
-            spec["input"] = query.input if isinstance(query.input, str) else str(query.input)
-        else:
-            # Messages are already dicts (ChatCompletionMessageParam), pass through as-is
-            spec["input"] = query.input
-        
-        if query.memory:
-            spec["memory"] = query.memory.model_dump()
-        if query.parameters:
-            spec["parameters"] = [p.model_dump() for p in query.parameters]
-        if query.selector:
-            spec["selector"] = query.selector.model_dump()
-        if query.serviceAccount:
-            spec["serviceAccount"] = query.serviceAccount
-        if query.sessionId:
-            spec["sessionId"] = query.sessionId
-        if query.targets:
-            spec["targets"] = [t.model_dump() for t in query.targets]
-        if query.timeout:
-            spec["timeout"] = query.timeout
-        if query.ttl:
-            spec["ttl"] = query.ttl
-        if query.cancel is not None:
-            spec["cancel"] = query.cancel
-        if query.overrides:
-            spec["overrides"] = [o.model_dump() for o in query.overrides]
+    """Create a new query.
 
-        # Create the QueryV1alpha1 object
-        metadata = {
-            "name": query.name,
-            "namespace": namespace
-        }
-        # The incoming query may contain additional metadata such as annotations (e.g. streaming annotation)
-        if query.metadata:
-            metadata.update(query.metadata)
+    If a callback URL is given, the query's final status is POSTed to it
+    when the query finishes. Its host must be in QUERY_CALLBACK_ALLOWED_HOSTS
+    and resolve to a public address, otherwise the request fails with 400.
+    """
+    if await _validate_callback(query):
+        await _register_callback_namespace(namespace or get_namespace())
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        query_resource = build_query_resource(query, namespace)
 
-        query_resource = QueryV1alpha1(
-            metadata=metadata,
-            spec=QueryV1alpha1Spec(**spec)
-        )
-        
         created = await ark_client.queries.a_create(query_resource)
         
         return query_to_detail_response(created.to_dict())
 
 
+async def _run_bulk(
+    names: List[str],
+    operation: Callable[[int], Awaitable[Optional[QueryDetailResponse]]],
+) -> QueryBulkResponse:
+    """Run operation(index) for every item with bounded concurrency.
+
+    Failures are reported per item and do not stop the other items.
+    """
+    semaphore = asyncio.Semaphore(QUERY_BULK_CONCURRENCY)
+
+    async def run(index: int, name: str) -> QueryBulkItemResult:
+        async with semaphore:
+            try:
+                query = await operation(index)
+                return QueryBulkItemResult(name=name, success=True, statusCode=200, query=query)
+            except HTTPException as e:
+                return QueryBulkItemResult(name=name, success=False, statusCode=e.status_code, error=str(e.detail))
+            except (ApiException, SyncApiException) as e:
+                return QueryBulkItemResult(name=name, success=False, statusCode=e.status or 500, error=_extract_error_detail(e))
+            except Exception as e:
+                logger.warning(f"Bulk operation on query {name} failed: {e}")
+                return QueryBulkItemResult(name=name, success=False, statusCode=500, error=str(e))
+
+    items = await asyncio.gather(*(run(index, name) for index, name in enumerate(names)))
+    succeeded = sum(1 for item in items if item.success)
+    return QueryBulkResponse(items=items, succeeded=succeeded, failed=len(items) - succeeded)
+
+
+def _check_bulk_size(count: int) -> None:
+    if count > QUERY_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many queries: {count} (maximum {QUERY_BULK_MAX_ITEMS} per request)"
+        )
+
+
+@router.post(":batch", response_model=QueryBulkResponse)
+@handle_k8s_errors(operation="create", resource_type="query")
+async def create_queries_batch(
+    request: QueryBatchCreateRequest,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+) -> QueryBulkResponse:
+    """
+    Create many queries in one call.
+
+    Queries are created concurrently (up to QUERY_BULK_CONCURRENCY at a
+    time). Each item reports its own result, so one invalid or duplicate
+    query does not fail the others.
+    """
+    _check_bulk_size(len(request.queries))
+    if any(_callback_url(query) for query in request.queries):
+        await _register_callback_namespace(namespace or get_namespace())
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        async def create(index: int) -> QueryDetailResponse:
+            await _validate_callback(request.queries[index])
+            created = await ark_client.queries.a_create(build_query_resource(request.queries[index], namespace))
+            return query_to_detail_response(created.to_dict())
+
+        return await _run_bulk([query.name for query in request.queries], create)
+
+
+async def _select_queries_to_cancel(
+    namespace: str, label_selector: Optional[str], session_id: Optional[str]
+) -> List[str]:
+    """Names of unfinished queries matching a label selector or session."""
+    names = []
+    continue_token = None
+    while True:
+        queries, continue_token = await _list_live_page(namespace, 500, continue_token, label_selector)
+        for query in queries:
+            if session_id is not None and query.get("spec", {}).get("sessionId") != session_id:
+                continue
+            if (query.get("status") or {}).get("phase") in TERMINAL_QUERY_PHASES:
+                continue
+            names.append(query["metadata"]["name"])
+        if not continue_token:
+            return names
+
+
+@router.post(":cancel", response_model=QueryBulkResponse)
+@handle_k8s_errors(operation="update", resource_type="query")
+async def cancel_queries(
+    request: QueryCancelRequest,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+) -> QueryBulkResponse:
+    """
+    Cancel many queries in one call.
+
+    Queries are selected by exactly one of: a list of names, a label
+    selector or a sessionId. Selector and session matches skip queries that
+    have already finished. Cancellations run concurrently and each item
+    reports its own result.
+    """
+    selectors = [request.names is not None, request.labelSelector is not None, request.sessionId is not None]
+    if sum(selectors) != 1:
+        raise HTTPException(status_code=400, detail="Specify exactly one of names, labelSelector or sessionId")
+
+    namespace = namespace or get_namespace()
+    if request.names is not None:
+        names = request.names
+    else:
+        names = await _select_queries_to_cancel(namespace, request.labelSelector, request.sessionId)
+    _check_bulk_size(len(names))
+
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        async def cancel(index: int) -> None:
+            await ark_client.queries.a_patch(names[index], {"spec": {"cancel": True}})
+
+        return await _run_bulk(names, cancel)
+
+
 @router.get("/{query_name}", response_model=QueryDetailResponse)
 @handle_k8s_errors(operation="get", resource_type="query")
 async def get_query(query_name: str, namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> QueryDetailResponse:
@@ -166,6 +520,143 @@ async def get_query(query_name: str, namespace: Optional[str] = Query(None, desc
         return query_to_detail_response(result.to_dict())
 
 
+def _query_phase(query: dict) -> Optional[str]:
+    return (query.get("status") or {}).get("phase")
+
+
+async def _read_query(namespace: str, query_name: str) -> dict:
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        result = await ark_client.queries.a_get(query_name)
+        return result.to_dict()
+
+
+@router.get("/{query_name}/wait", response_model=QueryDetailResponse)
+@handle_k8s_errors(operation="get", resource_type="query")
+async def wait_for_query(
+    query_name: str,
+    timeout: str = Query("30s", description="How long to wait, e.g. 30s or 5m"),
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+) -> QueryDetailResponse:
+    """
+    Wait for a query to finish.
+
+    Returns as soon as the query reaches a terminal phase (done, error or
+    canceled), or with the query as it is when the timeout expires; check
+    status.phase to tell the two apart. The wait is capped at
+    QUERY_WAIT_MAX_SECONDS. All waiting clients in a namespace share one
+    Kubernetes watch.
+    """
+    try:
+        timeout_seconds = min(parse_duration_to_seconds(timeout) or 0, QUERY_WAIT_MAX_SECONDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    namespace = namespace or get_namespace()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+
+    # Read once the watch has its starting point so that no change between the two is missed
+    async with get_query_watch(namespace).subscribe() as subscription:
+        await subscription.ready(timeout=max(deadline - loop.time(), 0))
+        query = await _read_query(namespace, query_name)
+        reported_drops = 0
+        while _query_phase(query) not in TERMINAL_QUERY_PHASES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(timeout=remaining)
+            if subscription.dropped > reported_drops:
+                # Events for this query may have been dropped, read it again
+                reported_drops = subscription.dropped
+                query = await _read_query(namespace, query_name)
+                continue
+            if event is None:
+                break
+            if event["object"].get("metadata", {}).get("name") != query_name:
+                continue
+            if event["type"] == "DELETED":
+                raise HTTPException(status_code=404, detail=f"Query '{query_name}' was deleted")
+            query = event["object"]
+
+    return query_to_detail_response(query)
+
+
+@router.get("/{query_name}/events")
+@handle_k8s_errors(operation="get", resource_type="query")
+async def stream_query_events(
+    query_name: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+) -> StreamingResponse:
+    """
+    Stream a query's phase transitions as Server-Sent Events.
+
+    The first 'phase' event reports the current phase, then one is sent for
+    every phase change, each with the query's status. The stream ends after
+    a terminal phase (done, error or canceled), or with a 'deleted' event if
+    the query is deleted. All streaming clients in a namespace share one
+    Kubernetes watch.
+    """
+    namespace = namespace or get_namespace()
+
+    # Read once the watch has its starting point so that no change between the two is missed
+    subscription = get_query_watch(namespace).subscribe()
+    try:
+        if not await subscription.ready(timeout=QUERY_WATCH_READY_SECONDS):
+            raise HTTPException(status_code=503, detail="Query watch is not available, retry shortly")
+        query = await _read_query(namespace, query_name)
+    except BaseException:
+        subscription.close()
+        raise
+
+    async def generate():
+        current = query
+        last_phase = None
+        reported_drops = 0
+        try:
+            while True:
+                phase = _query_phase(current)
+                if phase != last_phase:
+                    yield format_sse(
+                        {"name": query_name, "phase": phase, "previousPhase": last_phase, "status": current.get("status")},
+                        event="phase"
+                    )
+                    last_phase = phase
+                if phase in TERMINAL_QUERY_PHASES:
+                    break
+
+                event = await subscription.get(timeout=QUERY_EVENTS_HEARTBEAT_SECONDS)
+                if subscription.dropped > reported_drops:
+                    # Events for this query may have been dropped, read it again
+                    reported_drops = subscription.dropped
+                    try:
+                        current = await _read_query(namespace, query_name)
+                    except (ApiException, SyncApiException) as e:
+                        if e.status != 404:
+                            raise
+                        yield format_sse({"name": query_name}, event="deleted")
+                        break
+                    continue
+                if event is None:
+                    if subscription.closed:
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if event["object"].get("metadata", {}).get("name") != query_name:
+                    continue
+                if event["type"] == "DELETED":
+                    yield format_sse({"name": query_name}, event="deleted")
+                    break
+                current = event["object"]
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.put("/{query_name}", response_model=QueryDetailResponse)
 @handle_k8s_errors(operation="update", resource_type="query")
 async def update_query(
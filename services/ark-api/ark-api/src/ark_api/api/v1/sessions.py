@@ -1,15 +1,18 @@
 """Sessions API endpoints."""
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ark_sdk.client import with_ark_client
 
-from ...models.sessions import SessionResponse, SessionListResponse
+from ...core.http import get_http_client
+from ...models.sessions import MemoryServiceError, SessionResponse, SessionListResponse
 from ...utils.memory_client import (
-    get_memory_service_address,
+    MEMORY_SERVICE_TIMEOUT_SECONDS,
+    MemoryCallResult,
+    fan_out_to_memories,
     fetch_memory_service_data,
     get_all_memory_resources
 )
@@ -24,51 +27,120 @@ router = APIRouter(
 VERSION = "v1alpha1"
 
 
+async def _delete_from_memories(
+    http_client: httpx.AsyncClient,
+    memory_dicts: List[Dict[str, Any]],
+    path: str,
+    database_error_detail: str,
+    description: str
+) -> Tuple[int, List[MemoryCallResult]]:
+    """
+    Send a DELETE to every memory service concurrently.
+    
+    Returns:
+        Tuple of (number of services that deleted, results for unreachable services)
+        
+    Raises:
+        HTTPException: 500 if any memory service reports a database error,
+            503 if no memory service could be reached
+    """
+    async def delete(memory_name: str, service_url: str) -> bool:
+        response = await http_client.delete(
+            f"{service_url}{path}",
+            timeout=MEMORY_SERVICE_TIMEOUT_SECONDS
+        )
+        
+        if response.is_success:
+            # Any 2xx response indicates successful deletion
+            return True
+        if response.status_code == httpx.codes.NOT_FOUND:
+            # Idempotent deletion: not found in this memory service is acceptable
+            logger.debug(f"Nothing to delete for {description} in memory {memory_name}")
+        elif response.status_code == httpx.codes.INTERNAL_SERVER_ERROR:
+            # Database errors require failure as they indicate backend problems
+            raise HTTPException(
+                status_code=httpx.codes.INTERNAL_SERVER_ERROR,
+                detail=database_error_detail
+            )
+        return False
+    
+    results = await fan_out_to_memories(memory_dicts, delete)
+    
+    failed = []
+    for result in results:
+        if result.error is None:
+            continue
+        if isinstance(result.error, HTTPException) and result.error.status_code == httpx.codes.INTERNAL_SERVER_ERROR:
+            raise result.error
+        # Network errors and timeouts don't stop processing of other memory services
+        logger.error(f"Failed to delete {description} from memory {result.memory_name}: {result.error_message}")
+        failed.append(result)
+    
+    deleted_count = sum(1 for result in results if result.value)
+    if memory_dicts and not deleted_count and failed:
+        raise HTTPException(
+            status_code=httpx.codes.SERVICE_UNAVAILABLE,
+            detail=f"Could not reach any memory services: {', '.join(result.memory_name for result in failed)}"
+        )
+    
+    return deleted_count, failed
+
+
+def _deletion_response(message: str, failed: List[MemoryCallResult]) -> dict:
+    response = {"message": message}
+    if failed:
+        response["errors"] = [
+            {"memoryName": result.memory_name, "error": result.error_message} for result in failed
+        ]
+    return response
+
+
 @router.get("", response_model=SessionListResponse)
 @handle_k8s_errors(operation="list", resource_type="sessions")
 async def list_sessions(
     namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
-    memory: Optional[str] = Query(None, description="Filter by memory name")
+    memory: Optional[str] = Query(None, description="Filter by memory name"),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ) -> SessionListResponse:
-    """List all sessions in a namespace, optionally filtered by memory."""
+    """List all sessions in a namespace, optionally filtered by memory.
+    
+    Memory services are queried concurrently. Sessions from memory services
+    that fail or time out are left out and the failures are listed in errors.
+    """
     async with with_ark_client(namespace, VERSION) as client:
         memory_dicts = await get_all_memory_resources(client, memory)
         
-        all_sessions = []
+        async def fetch_sessions(memory_name: str, service_url: str) -> list:
+            data = await fetch_memory_service_data(
+                http_client,
+                service_url,
+                "/sessions",
+                memory_name=memory_name
+            )
+            # Handle null sessions (empty database)
+            return data.get("sessions") or []
         
-        for memory_dict in memory_dicts:
-            memory_name = memory_dict.get("metadata", {}).get("name", "")
-            
-            try:
-                service_url = get_memory_service_address(memory_dict)
-                
-                data = await fetch_memory_service_data(
-                    service_url,
-                    "/sessions", 
-                    memory_name=memory_name
-                )
-                
-                sessions = data.get("sessions", [])
-                
-                # Handle null sessions (empty database)
-                if sessions is None:
-                    sessions = []
-                
-                # Convert to our response format - only include actual data
-                for session_id in sessions:
-                    all_sessions.append(SessionResponse(
-                        sessionId=session_id,
-                        memoryName=memory_name
-                    ))
-                        
-            except Exception as e:
-                logger.error(f"Failed to get sessions from memory {memory_name}: {e}")
-                # Continue processing other memories
+        results = await fan_out_to_memories(memory_dicts, fetch_sessions)
+        
+        all_sessions = []
+        errors = []
+        for result in results:
+            if result.error is not None:
+                logger.error(f"Failed to get sessions from memory {result.memory_name}: {result.error_message}")
+                errors.append(MemoryServiceError(memoryName=result.memory_name, error=result.error_message))
                 continue
+            
+            # Convert to our response format - only include actual data
+            for session_id in result.value:
+                all_sessions.append(SessionResponse(
+                    sessionId=session_id,
+                    memoryName=result.memory_name
+                ))
         
         return SessionListResponse(
             items=all_sessions,
-            total=len(all_sessions)
+            total=len(all_sessions),
+            errors=errors
         )
 
 
@@ -76,106 +148,49 @@ async def list_sessions(
 @handle_k8s_errors(operation="delete", resource_type="session")
 async def delete_session(
     session_id: str,
-    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ) -> dict:
     """Delete a specific session and all its messages."""
     async with with_ark_client(namespace, VERSION) as client:
         # Process all memory services to ensure session is removed from all potential locations
         memory_dicts = await get_all_memory_resources(client)
         
-        deleted_count = 0
-        failed_services = []
-        
-        for memory_dict in memory_dicts:
-            memory_name = memory_dict.get("metadata", {}).get("name", "")
-            
-            try:
-                service_url = get_memory_service_address(memory_dict)
-                
-                async with httpx.AsyncClient() as http_client:
-                    response = await http_client.delete(
-                        f"{service_url}/sessions/{session_id}",
-                        timeout=30.0
-                    )
-                    
-                    if response.is_success:
-                        # Any 2xx response indicates successful deletion
-                        deleted_count += 1
-                    elif response.status_code == httpx.codes.NOT_FOUND:
-                        # Idempotent deletion: session not found in this memory service is acceptable
-                        logger.debug(f"Session {session_id} not found in memory {memory_name}")
-                    elif response.status_code == httpx.codes.INTERNAL_SERVER_ERROR:
-                        # Database errors require immediate failure as they indicate backend problems
-                        raise HTTPException(
-                            status_code=httpx.codes.INTERNAL_SERVER_ERROR,
-                            detail=f"Failed to delete session {session_id} from database"
-                        )
-                        
-            except HTTPException:
-                raise
-            except Exception as e:
-                # Network errors don't stop processing: continue attempting other memory services
-                logger.error(f"Failed to delete session {session_id} from memory {memory_name}: {e}")
-                failed_services.append(memory_name)
-        
-        if len(memory_dicts) > 0 and deleted_count == 0 and failed_services:
-            raise HTTPException(
-                status_code=httpx.codes.SERVICE_UNAVAILABLE,
-                detail=f"Could not reach any memory services: {', '.join(failed_services)}"
-            )
+        deleted_count, failed = await _delete_from_memories(
+            http_client,
+            memory_dicts,
+            f"/sessions/{session_id}",
+            database_error_detail=f"Failed to delete session {session_id} from database",
+            description=f"session {session_id}"
+        )
         
-        return {"message": f"Session {session_id} deleted successfully from {deleted_count} memory service(s)"}
+        return _deletion_response(
+            f"Session {session_id} deleted successfully from {deleted_count} memory service(s)", failed
+        )
 
 
 @router.delete("")
 @handle_k8s_errors(operation="delete", resource_type="sessions")
 async def delete_all_sessions(
-    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ) -> dict:
     """Delete all sessions and their messages."""
     async with with_ark_client(namespace, VERSION) as client:
         # Process all memory services to ensure complete cleanup across the namespace
         memory_dicts = await get_all_memory_resources(client)
         
-        deleted_count = 0
-        failed_services = []
-        
-        for memory_dict in memory_dicts:
-            memory_name = memory_dict.get("metadata", {}).get("name", "")
-            
-            try:
-                service_url = get_memory_service_address(memory_dict)
-                
-                async with httpx.AsyncClient() as http_client:
-                    response = await http_client.delete(
-                        f"{service_url}/sessions",
-                        timeout=30.0
-                    )
-                    
-                    if response.is_success:
-                        # Any 2xx response indicates successful deletion
-                        deleted_count += 1
-                    elif response.status_code == httpx.codes.INTERNAL_SERVER_ERROR:
-                        # Database errors require immediate failure as they indicate backend problems
-                        raise HTTPException(
-                            status_code=httpx.codes.INTERNAL_SERVER_ERROR,
-                            detail="Failed to delete all sessions from database"
-                        )
-                        
-            except HTTPException:
-                raise
-            except Exception as e:
-                # Network errors don't stop processing: continue attempting other memory services
-                logger.error(f"Failed to delete all sessions from memory {memory_name}: {e}")
-                failed_services.append(memory_name)
-        
-        if len(memory_dicts) > 0 and deleted_count == 0 and failed_services:
-            raise HTTPException(
-                status_code=httpx.codes.SERVICE_UNAVAILABLE,
-                detail=f"Could not reach any memory services: {', '.join(failed_services)}"
-            )
+        deleted_count, failed = await _delete_from_memories(
+            http_client,
+            memory_dicts,
+            "/sessions",
+            database_error_detail="Failed to delete all sessions from database",
+            description="all sessions"
+        )
         
-        return {"message": f"All sessions deleted successfully from {deleted_count} memory service(s)"}
+        return _deletion_response(
+            f"All sessions deleted successfully from {deleted_count} memory service(s)", failed
+        )
 
 
 @router.delete("/{session_id}/queries/{query_id}/messages")
@@ -183,49 +198,22 @@ async def delete_all_sessions(
 async def delete_query_messages(
     session_id: str,
     query_id: str,
-    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    http_client: httpx.AsyncClient = Depends(get_http_client)
 ) -> dict:
     """Delete messages for a specific query within a session."""
     async with with_ark_client(namespace, VERSION) as client:
         # Process all memory services to ensure query messages are removed from all potential locations
         memory_dicts = await get_all_memory_resources(client)
         
-        deleted_count = 0
-        failed_services = []
-        
-        for memory_dict in memory_dicts:
-            memory_name = memory_dict.get("metadata", {}).get("name", "")
-            
-            try:
-                service_url = get_memory_service_address(memory_dict)
-                
-                async with httpx.AsyncClient() as http_client:
-                    response = await http_client.delete(
-                        f"{service_url}/sessions/{session_id}/queries/{query_id}/messages",
-                        timeout=30.0
-                    )
-                    
-                    if response.is_success:
-                        # Any 2xx response indicates successful deletion
-                        deleted_count += 1
-                    elif response.status_code == httpx.codes.INTERNAL_SERVER_ERROR:
-                        # Database errors require immediate failure as they indicate backend problems
-                        raise HTTPException(
-                            status_code=httpx.codes.INTERNAL_SERVER_ERROR,
-                            detail=f"Failed to delete query {query_id} messages from database"
-                        )
-                        
-            except HTTPException:
-                raise
-            except Exception as e:
-                # Network errors don't stop processing: continue attempting other memory services
-                logger.error(f"Failed to delete query {query_id} messages from session {session_id} in memory {memory_name}: {e}")
-                failed_services.append(memory_name)
-        
-        if memory_dicts and not deleted_count and failed_services:
-            raise HTTPException(
-                status_code=httpx.codes.SERVICE_UNAVAILABLE,
-                detail=f"Could not reach any memory services: {', '.join(failed_services)}"
-            )
+        deleted_count, failed = await _delete_from_memories(
+            http_client,
+            memory_dicts,
+            f"/sessions/{session_id}/queries/{query_id}/messages",
+            database_error_detail=f"Failed to delete query {query_id} messages from database",
+            description=f"query {query_id} messages from session {session_id}"
+        )
         
-        return {"message": f"Query {query_id} messages deleted successfully from {deleted_count} memory service(s)"}
\ No newline at end of file
+        return _deletion_response(
+            f"Query {query_id} messages deleted successfully from {deleted_count} memory service(s)", failed
+        )
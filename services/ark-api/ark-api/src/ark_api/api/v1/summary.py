@@ -0,0 +1,173 @@
+"""Namespace summary for the dashboard home page."""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Query, Request
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.rest import ApiException
+from ark_sdk.k8s import get_namespace
+
+from ...core.constants import GROUP
+from ...core.responses import ORJSONResponse
+from ...models.common import AvailabilityStatus, extract_availability_from_conditions
+from ...models.summary import KindSummary, ResourceFailure, SummaryResponse
+from ...utils.informer import INFORMER_LIST_CHUNK_SIZE
+from ...utils.single_flight import request_key, single_flight
+from .exceptions import handle_k8s_errors
+from .queries import QUERY_LIST_INFORMER, get_query_informer
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/summary", tags=["summary"])
+
+# CRD configuration
+VERSION = "v1alpha1"
+
+# Failures listed per kind, most recent first
+SUMMARY_RECENT_FAILURES = int(os.getenv("SUMMARY_RECENT_FAILURES", "5"))
+
+# (summary key, plural, condition reporting availability or None)
+SUMMARY_KINDS = (
+    ("agents", "agents", "Available"),
+    ("teams", "teams", "Available"),
+    ("models", "models", "ModelAvailable"),
+    ("tools", "tools", None),
+    ("mcpServers", "mcpservers", "Available"),
+    ("memories", "memories", None),
+    ("queries", "queries", None),
+    ("evaluations", "evaluations", None),
+)
+
+# Phases counted as failures
+FAILED_PHASES = ("error", "failed")
+
+
+def _failure(item: Dict[str, Any], condition_type: Optional[str]) -> Optional[ResourceFailure]:
+    """Describe why an item failed, or None if it has not."""
+    metadata = item.get("metadata") or {}
+    status = item.get("status") or {}
+    conditions = status.get("conditions") or []
+
+    phase = status.get("phase")
+    if phase in FAILED_PHASES:
+        transitions = [c["lastTransitionTime"] for c in conditions if c.get("lastTransitionTime")]
+        return ResourceFailure(
+            name=metadata.get("name", ""),
+            reason=phase,
+            message=status.get("message"),
+            timestamp=max(transitions) if transitions else metadata.get("creationTimestamp")
+        )
+
+    if condition_type and extract_availability_from_conditions(conditions, condition_type) == AvailabilityStatus.FALSE:
+        condition = next(c for c in conditions if c.get("type") == condition_type)
+        return ResourceFailure(
+            name=metadata.get("name", ""),
+            reason=condition.get("reason"),
+            message=condition.get("message"),
+            timestamp=condition.get("lastTransitionTime") or metadata.get("creationTimestamp")
+        )
+    return None
+
+
+def summarize_kind(items: List[Dict[str, Any]], condition_type: Optional[str]) -> KindSummary:
+    """Count, phase and availability histograms and recent failures, in one pass."""
+    phases: Dict[str, int] = {}
+    availability = {status.value: 0 for status in AvailabilityStatus} if condition_type else None
+    failures = []
+
+    for item in items:
+        status = item.get("status") or {}
+        phase = status.get("phase")
+        if phase:
+            phases[phase] = phases.get(phase, 0) + 1
+        if availability is not None:
+            available = extract_availability_from_conditions(status.get("conditions") or [], condition_type)
+            availability[available.value] += 1
+        failure = _failure(item, condition_type)
+        if failure is not None:
+            failures.append(failure)
+
+    failures.sort(key=lambda f: f.timestamp or "", reverse=True)
+    return KindSummary(
+        count=len(items),
+        phases=phases,
+        availability=availability,
+        recentFailures=failures[:SUMMARY_RECENT_FAILURES]
+    )
+
+
+async def _list_kind(api: ApiClient, namespace: str, plural: str) -> List[Dict[str, Any]]:
+    """Read every object of a kind, from the query informer where one is synced."""
+    if plural == "queries" and QUERY_LIST_INFORMER:
+        informer = get_query_informer(namespace)
+        if informer.synced:
+            return informer.items()
+
+    items: List[Dict[str, Any]] = []
+    continue_token = None
+    while True:
+        result = await client.CustomObjectsApi(api).list_namespaced_custom_object(
+            group=GROUP,
+            version=VERSION,
+            namespace=namespace,
+            plural=plural,
+            limit=INFORMER_LIST_CHUNK_SIZE,
+            _continue=continue_token
+        )
+        items.extend(result.get("items", []))
+        continue_token = (result.get("metadata") or {}).get("continue")
+        if not continue_token:
+            return items
+
+
+async def build_summary(namespace: str) -> SummaryResponse:
+    """List every kind concurrently and summarize each.
+
+    A kind that cannot be listed (e.g. its CRD is not installed) reports an
+    error instead of failing the whole summary.
+    """
+    async with ApiClient() as api:
+        results = await asyncio.gather(
+            *(_list_kind(api, namespace, plural) for _, plural, _ in SUMMARY_KINDS),
+            return_exceptions=True
+        )
+
+    kinds = {}
+    for (key, plural, condition_type), result in zip(SUMMARY_KINDS, results):
+        if isinstance(result, ApiException):
+            logger.warning(f"Failed to list {plural} in {namespace} for summary: {result.status} {result.reason}")
+            kinds[key] = KindSummary(error=f"{result.status} {result.reason}")
+        elif isinstance(result, Exception):
+            logger.warning(f"Failed to list {plural} in {namespace} for summary: {result}")
+            kinds[key] = KindSummary(error=str(result))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            kinds[key] = summarize_kind(result, condition_type)
+    return SummaryResponse(namespace=namespace, kinds=kinds)
+
+
+@router.get("", response_model=SummaryResponse)
+@handle_k8s_errors(operation="get", resource_type="summary")
+async def get_summary(
+    request: Request,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")
+) -> SummaryResponse:
+    """
+    Summarize every ARK kind in a namespace in one call.
+
+    For agents, teams, models, tools, MCP servers, memories, queries and
+    evaluations this returns the count, a status.phase histogram, an
+    availability histogram for kinds with an availability condition, and
+    the most recent failures. The kinds are listed concurrently and
+    identical concurrent requests share one summary.
+    """
+    namespace = namespace or get_namespace()
+    summary = await single_flight("summary.get").do(
+        request_key(request, namespace), lambda: build_summary(namespace)
+    )
+    return ORJSONResponse(summary)
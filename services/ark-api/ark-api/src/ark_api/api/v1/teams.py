@@ -1,8 +1,8 @@
 """Kubernetes teams API endpoints."""
 import logging
 
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, Query, Request, Response
+from typing import List, Optional
 from ark_sdk.models.team_v1alpha1 import TeamV1alpha1
 
 from ark_sdk.client import with_ark_client
@@ -15,6 +15,10 @@ from ...models.teams import (
     TeamDetailResponse
 )
 from ...models.common import extract_availability_from_conditions
+from ...core.responses import ORJSONResponse
+from ...utils.delta import list_delta
+from ...utils.etag import not_modified, resource_versions_etag
+from ...utils.single_flight import request_key, single_flight
 from .exceptions import handle_k8s_errors
 
 logger = logging.getLogger(__name__)
@@ -70,29 +74,52 @@ def team_to_detail_response(team: dict) -> TeamDetailResponse:
     )
 
 
+async def _list_teams(namespace: Optional[str]) -> List[dict]:
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        return [team.to_dict() for team in await ark_client.teams.a_list()]
+
+
 @router.get("", response_model=TeamListResponse)
 @handle_k8s_errors(operation="list", resource_type="team")
-async def list_teams(namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> TeamListResponse:
+async def list_teams(
+    request: Request,
+    response: Response,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)")
+) -> TeamListResponse:
     """
     List all Team CRs in a namespace.
     
     Args:
         namespace: The namespace to list teams from
+        since: Only return the changes since this resourceVersion (delta sync)
         
     Returns:
         TeamListResponse: List of all teams in the namespace
+        (or the changes since `since`, see utils/delta.py)
     """
-    async with with_ark_client(namespace, VERSION) as ark_client:
-        teams = await ark_client.teams.a_list()
-        
-        team_list = []
-        for team in teams:
-            team_list.append(team_to_response(team.to_dict()))
-        
-        return TeamListResponse(
-            items=team_list,
-            count=len(team_list)
-        )
+    if since is not None:
+        return ORJSONResponse(await list_delta("teams", namespace, since, team_to_response))
+
+    # Identical concurrent polls share one list call
+    teams = await single_flight("teams.list").do(
+        request_key(request, namespace), lambda: _list_teams(namespace)
+    )
+
+    # Unchanged since the client's last poll: skip building the response
+    etag = resource_versions_etag(teams, request.url.query)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    team_list = []
+    for team in teams:
+        team_list.append(team_to_response(team))
+    
+    return TeamListResponse(
+        items=team_list,
+        count=len(team_list)
+    )
 
 
 @router.post("", response_model=TeamDetailResponse)
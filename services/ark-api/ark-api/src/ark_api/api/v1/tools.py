@@ -1,8 +1,8 @@
 """Kubernetes tools API endpoints."""
 import logging
 
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, Query, Request, Response
+from typing import List, Optional
 from ark_sdk.models.tool_v1alpha1 import ToolV1alpha1
 from ark_sdk.models.tool_v1alpha1_spec import ToolV1alpha1Spec
 
@@ -15,6 +15,10 @@ from ...models.tools import (
     ToolUpdateRequest,
     ToolDetailResponse
 )
+from ...core.responses import ORJSONResponse
+from ...utils.delta import list_delta
+from ...utils.etag import not_modified, resource_versions_etag
+from ...utils.single_flight import request_key, single_flight
 from .exceptions import handle_k8s_errors
 
 logger = logging.getLogger(__name__)
@@ -57,29 +61,52 @@ def tool_to_detail_response(tool: dict) -> ToolDetailResponse:
     )
 
 
+async def _list_tools(namespace: Optional[str]) -> List[dict]:
+    async with with_ark_client(namespace, VERSION) as ark_client:
+        return [tool.to_dict() for tool in await ark_client.tools.a_list()]
+
+
 @router.get("", response_model=ToolListResponse)
 @handle_k8s_errors(operation="list", resource_type="tool")
-async def list_tools(namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)")) -> ToolListResponse:
+async def list_tools(
+    request: Request,
+    response: Response,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    since: Optional[str] = Query(None, description="Only return changes since this resourceVersion (delta sync)")
+) -> ToolListResponse:
     """
     List all Tool CRs in a namespace.
     
     Args:
         namespace: The namespace to list tools from
+        since: Only return the changes since this resourceVersion (delta sync)
         
     Returns:
         ToolListResponse: List of all tools in the namespace
+        (or the changes since `since`, see utils/delta.py)
     """
-    async with with_ark_client(namespace, VERSION) as ark_client:
-        tools = await ark_client.tools.a_list()
-        
-        tool_list = []
-        for tool in tools:
-            tool_list.append(tool_to_response(tool.to_dict()))
-        
-        return ToolListResponse(
-            items=tool_list,
-            total=len(tool_list)
-        )
+    if since is not None:
+        return ORJSONResponse(await list_delta("tools", namespace, since, tool_to_response))
+
+    # Identical concurrent polls share one list call
+    tools = await single_flight("tools.list").do(
+        request_key(request, namespace), lambda: _list_tools(namespace)
+    )
+
+    # Unchanged since the client's last poll: skip building the response
+    etag = resource_versions_etag(tools, request.url.query)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+
+    tool_list = []
+    for tool in tools:
+        tool_list.append(tool_to_response(tool))
+    
+    return ToolListResponse(
+        items=tool_list,
+        total=len(tool_list)
+    )
 
 
 @router.post("", response_model=ToolDetailResponse, include_in_schema=False)
@@ -0,0 +1,240 @@
+"""Watch gateway: live updates for ARK resources over SSE or WebSocket.
+
+Every subscriber of a (namespace, kind) pair shares one upstream Kubernetes
+watch. Label and field selectors are applied per subscriber. Each subscriber
+has a bounded buffer: a subscriber that falls behind loses the oldest
+buffered events and is told how many with a 'dropped' message, after which
+it should catch up with `GET /v1/<kind>?since=<resourceVersion>`.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from starlette.websockets import WebSocketState
+from ark_sdk.k8s import get_namespace
+
+from ...core.metrics import WATCH_CONNECTIONS, WATCH_CONNECTIONS_REJECTED, WATCH_EVENTS_DROPPED, WATCH_EVENTS_SENT
+from ...utils.selectors import parse_field_selector, parse_label_selector
+from ...utils.shared_watch import Subscription, custom_resource_watch
+from ...utils.streaming import format_sse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/watch", tags=["watch"])
+
+# Events buffered per subscriber before the oldest are dropped
+WATCH_SUBSCRIBER_BUFFER_SIZE = int(os.getenv("WATCH_SUBSCRIBER_BUFFER_SIZE", "256"))
+# Open watch connections allowed per process
+WATCH_MAX_CONNECTIONS = int(os.getenv("WATCH_MAX_CONNECTIONS", "1000"))
+# Interval for keep-alive messages on idle connections
+WATCH_HEARTBEAT_SECONDS = 15
+
+# Kind in the URL -> custom resource plural
+WATCH_KINDS = {
+    "agents": "agents",
+    "teams": "teams",
+    "models": "models",
+    "tools": "tools",
+    "queries": "queries",
+    "evaluations": "evaluations",
+    "memories": "memories",
+    "mcp-servers": "mcpservers",
+    "a2a-tasks": "a2atasks",
+}
+
+# Subscriptions of open connections, counted against WATCH_MAX_CONNECTIONS
+_open_subscriptions: Set[Subscription] = set()
+
+Matcher = Callable[[Dict[str, Any]], bool]
+
+
+def _build_matcher(kind: str, label_selector: Optional[str], field_selector: Optional[str]) -> Optional[Matcher]:
+    """Validate the request and combine its selectors.
+
+    Raises:
+        HTTPException: 404 for an unknown kind, 400 for an invalid selector
+    """
+    if kind not in WATCH_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown kind '{kind}', expected one of: {', '.join(WATCH_KINDS)}")
+    try:
+        matchers: List[Matcher] = [
+            m for m in (parse_label_selector(label_selector), parse_field_selector(field_selector)) if m
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not matchers:
+        return None
+    return lambda obj: all(m(obj) for m in matchers)
+
+
+def _subscribe(kind: str, namespace: Optional[str]) -> Subscription:
+    """Join the shared watch of a kind, if the connection limit allows.
+
+    The connection counts against the limit until _release is called.
+
+    Raises:
+        HTTPException: 503 when WATCH_MAX_CONNECTIONS are already open
+    """
+    if len(_open_subscriptions) >= WATCH_MAX_CONNECTIONS:
+        WATCH_CONNECTIONS_REJECTED.labels("limit").inc()
+        raise HTTPException(status_code=503, detail="Too many watch connections, retry later")
+    subscription = custom_resource_watch(WATCH_KINDS[kind], namespace or get_namespace()).subscribe(
+        WATCH_SUBSCRIBER_BUFFER_SIZE
+    )
+    _open_subscriptions.add(subscription)
+    return subscription
+
+
+def _release(subscription: Subscription) -> None:
+    """Leave the shared watch and free the connection. Safe to call more than once."""
+    subscription.close()
+    _open_subscriptions.discard(subscription)
+
+
+class _WatchStreamingResponse(StreamingResponse):
+    """Releases its subscription even if the client left before the stream started."""
+
+    def __init__(self, content: AsyncIterator[str], subscription: Subscription, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _release(self.subscription)
+
+
+async def watch_messages(
+    subscription: Subscription,
+    kind: str,
+    transport: str,
+    matches: Optional[Matcher],
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """Messages for one subscriber: events, 'dropped' notices and None for keep-alives.
+
+    Counts the connection and its sent and dropped events in the watch
+    metrics, and closes the subscription when the consumer stops.
+    """
+    connections = WATCH_CONNECTIONS.labels(kind, transport)
+    connections.inc()
+    sent = WATCH_EVENTS_SENT.labels(kind, transport)
+    reported_drops = 0
+    try:
+        while True:
+            event = await subscription.get(timeout=WATCH_HEARTBEAT_SECONDS)
+            if subscription.dropped > reported_drops:
+                dropped = subscription.dropped - reported_drops
+                reported_drops = subscription.dropped
+                WATCH_EVENTS_DROPPED.labels(kind, transport).inc(dropped)
+                yield {"type": "DROPPED", "count": dropped}
+            if event is None:
+                if subscription.closed:
+                    return
+                yield None
+                continue
+            obj = event["object"]
+            if matches is None or matches(obj):
+                sent.inc()
+                yield {"type": event["type"], "object": obj}
+    finally:
+        _release(subscription)
+        connections.dec()
+
+
+@router.get("/{kind}")
+async def watch_sse(
+    kind: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    label_selector: Optional[str] = Query(None, alias="labelSelector", description="Only objects matching this label selector"),
+    field_selector: Optional[str] = Query(None, alias="fieldSelector", description="Only objects matching this field selector, e.g. status.phase=done"),
+) -> StreamingResponse:
+    """
+    Stream changes to a kind of ARK resource as Server-Sent Events.
+
+    Kinds: agents, teams, models, tools, queries, evaluations, memories,
+    mcp-servers and a2a-tasks. Each message is a JSON object with the watch
+    event type (ADDED, MODIFIED, DELETED) and the raw object. A 'dropped'
+    event reports how many events this client missed by falling behind.
+
+    The same stream is available over WebSocket at the same path.
+    """
+    matches = _build_matcher(kind, label_selector, field_selector)
+    subscription = _subscribe(kind, namespace)
+
+    async def generate():
+        try:
+            yield ": connected\n\n"
+            async for message in watch_messages(subscription, kind, "sse", matches):
+                if message is None:
+                    yield ": keep-alive\n\n"
+                elif message["type"] == "DROPPED":
+                    yield format_sse({"count": message["count"]}, event="dropped")
+                else:
+                    yield format_sse(message)
+        finally:
+            # Also when the client leaves before the first event
+            _release(subscription)
+
+    return _WatchStreamingResponse(
+        generate(),
+        subscription,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{kind}")
+async def watch_websocket(
+    websocket: WebSocket,
+    kind: str,
+    namespace: Optional[str] = Query(None, description="Namespace for this request (defaults to current context)"),
+    label_selector: Optional[str] = Query(None, alias="labelSelector", description="Only objects matching this label selector"),
+    field_selector: Optional[str] = Query(None, alias="fieldSelector", description="Only objects matching this field selector, e.g. status.phase=done"),
+) -> None:
+    """
+    Stream changes to a kind of ARK resource over a WebSocket.
+
+    Messages are JSON objects: watch events ({"type", "object"}),
+    {"type": "DROPPED", "count"} when the client fell behind and
+    {"type": "HEARTBEAT"} on idle connections. Invalid requests are refused
+    with close code 1008 before the connection is accepted.
+    """
+    try:
+        matches = _build_matcher(kind, label_selector, field_selector)
+        subscription = _subscribe(kind, namespace)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+
+    async def wait_for_disconnect():
+        # Clients do not send anything; reading is how a disconnect is noticed
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
+            subscription.close()
+
+    try:
+        await websocket.accept()
+    except Exception:
+        _release(subscription)
+        raise
+    reader = asyncio.create_task(wait_for_disconnect())
+    try:
+        async for message in watch_messages(subscription, kind, "websocket", matches):
+            await websocket.send_json(message if message is not None else {"type": "HEARTBEAT"})
+        # The watch ended without the client leaving (e.g. on shutdown)
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        _release(subscription)
@@ -10,18 +10,98 @@ All routes except PUBLIC_ROUTES require authentication when auth is enabled.
 Both JWT and API key authentication work on all authenticated routes.
 """
 
-from typing import Set
+import os
+from dataclasses import dataclass
+from typing import Callable, Set
+
+from .constants import AuthMode
 
 # Routes that should NOT be authenticated (public endpoints)
 # All other routes will be protected by default
 PUBLIC_ROUTES: Set[str] = {
     "/health",
     "/ready",
+    "/metrics",
     "/docs",
     "/openapi.json",
     "/redoc"
 }
 
+
+def compile_public_route_matcher() -> Callable[[str], bool]:
+    """
+    Precompile a matcher for PUBLIC_ROUTES.
+
+    The returned callable is a bound frozenset lookup, so matching a path
+    costs a single hash lookup and allocates nothing per request.
+    """
+    return frozenset(PUBLIC_ROUTES).__contains__
+
+
+_is_public_route = compile_public_route_matcher()
+
+
+@dataclass(frozen=True)
+class ResolvedAuthConfig:
+    """Authentication configuration resolved once from the environment."""
+    mode: AuthMode
+    oidc_issuer_url: str
+    oidc_application_id: str
+
+    @property
+    def jwt_enabled(self) -> bool:
+        return self.mode in (AuthMode.SSO, AuthMode.HYBRID)
+
+    @property
+    def basic_enabled(self) -> bool:
+        return self.mode in (AuthMode.BASIC, AuthMode.HYBRID)
+
+    @property
+    def auth_disabled(self) -> bool:
+        return self.mode == AuthMode.OPEN
+
+
+def resolve_auth_config() -> ResolvedAuthConfig:
+    """
+    Read and validate the authentication environment variables.
+
+    Raises:
+        ValueError: If AUTH_MODE is unknown or required OIDC settings are missing
+    """
+    auth_mode = os.getenv("AUTH_MODE", "").lower()
+    oidc_issuer = os.getenv("OIDC_ISSUER_URL", "")
+    oidc_app_id = os.getenv("OIDC_APPLICATION_ID", "")
+
+    # Validate auth mode
+    valid_auth_modes = [AuthMode.SSO, AuthMode.BASIC, AuthMode.HYBRID, AuthMode.OPEN]
+    if auth_mode and auth_mode not in valid_auth_modes:
+        raise ValueError(
+            f"Invalid AUTH_MODE '{auth_mode}'. "
+            f"Valid values are: {', '.join(valid_auth_modes)}"
+        )
+
+    # If SSO or HYBRID mode, require OIDC configuration
+    if auth_mode in [AuthMode.SSO, AuthMode.HYBRID]:
+        missing_params = []
+        if not oidc_issuer:
+            missing_params.append("OIDC_ISSUER_URL")
+        if not oidc_app_id:
+            missing_params.append("OIDC_APPLICATION_ID")
+
+        if missing_params:
+            raise ValueError(
+                f"AUTH_MODE is set to '{auth_mode}' but the following required "
+                f"environment variables are missing: {', '.join(missing_params)}. "
+                f"Please set these variables or change AUTH_MODE."
+            )
+
+    return ResolvedAuthConfig(
+        mode=AuthMode(auth_mode or AuthMode.OPEN),
+        oidc_issuer_url=oidc_issuer,
+        oidc_application_id=oidc_app_id,
+    )
+
+
 def is_route_authenticated(path: str) -> bool:
     """
     Check if a route path requires authentication.
@@ -35,11 +115,8 @@ def is_route_authenticated(path: str) -> bool:
         True if the route requires authentication, False otherwise
     """
     # Check if it's explicitly public - if so, don't authenticate
-    if path in PUBLIC_ROUTES:
-        return False
-    
     # All other routes are protected by default
-    return True
+    return not _is_public_route(path)
 
 def get_public_routes() -> Set[str]:
     """Get all public routes that don't require authentication."""
@@ -47,8 +124,12 @@ def get_public_routes() -> Set[str]:
 
 def add_public_route(path: str) -> None:
     """Add a route to the public routes set (exceptions to authentication)."""
+    global _is_public_route
     PUBLIC_ROUTES.add(path)
+    _is_public_route = compile_public_route_matcher()
 
 def remove_public_route(path: str) -> None:
     """Remove a route from the public routes set (will make it protected)."""
+    global _is_public_route
     PUBLIC_ROUTES.discard(path)
+    _is_public_route = compile_public_route_matcher()
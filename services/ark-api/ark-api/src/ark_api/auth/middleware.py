@@ -12,22 +12,26 @@ Environment Variables:
 Note: JWKS URL is automatically derived from the issuer URL
 """
 
+import json
 import logging
-import os
-from fastapi import Request, APIRouter
+from typing import Optional
+from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
 
-from .config import is_route_authenticated
-from .constants import AuthMode, AuthHeader
+from .config import is_route_authenticated, resolve_auth_config
+from .constants import AuthHeader
+from .validator import CachingTokenValidator
 
 # Import from ark_sdk
 from ark_sdk.auth.exceptions import TokenValidationError
-from ark_sdk.auth.validator import TokenValidator
 from ark_sdk.auth.basic import BasicAuthValidator
 
 # Import API key service
 from ..services.api_keys import APIKeyService
+from ..core.metrics import AUTH_REQUESTS
 
 # Re-export for convenience
 __all__ = ['AuthMiddleware', 'TokenValidationError']
@@ -35,7 +39,7 @@ __all__ = ['AuthMiddleware', 'TokenValidationError']
 logger = logging.getLogger(__name__)
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """
     Middleware that automatically protects all routes except those in PUBLIC_ROUTES.
     Supports multiple authentication modes:
@@ -43,79 +47,85 @@ class AuthMiddleware(BaseHTTPMiddleware):
     - basic: API key basic auth only  
     - hybrid: Both OIDC/JWT and basic auth
     - open: No authentication (development)
+
+    Implemented as a pure ASGI middleware so that responses (including SSE
+    streams) are passed through untouched instead of being re-wrapped in the
+    task and memory-stream machinery of BaseHTTPMiddleware.
+
+    The auth mode and the JWT validator are resolved once at startup: the
+    validator (and its JWKS cache) is shared by all requests, and open mode
+    or public routes are passed through without building a connection.
     """
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         # API keys are always stored in current context namespace for security
         self.api_key_service = APIKeyService()
         
-        # Validate configuration at startup
-        self._validate_auth_config()
-    
-    def _validate_auth_config(self):
-        """
-        Validate authentication configuration at startup.
-        Fail fast with clear error messages if configuration is invalid.
-        """
-        auth_mode = os.getenv("AUTH_MODE", "").lower()
-        oidc_issuer = os.getenv("OIDC_ISSUER_URL", "")
-        oidc_app_id = os.getenv("OIDC_APPLICATION_ID", "")
-        
-        # Validate auth mode
-        valid_auth_modes = [AuthMode.SSO, AuthMode.BASIC, AuthMode.HYBRID, AuthMode.OPEN]
-        if auth_mode and auth_mode not in valid_auth_modes:
-            raise ValueError(
-                f"Invalid AUTH_MODE '{auth_mode}'. "
-                f"Valid values are: {', '.join(valid_auth_modes)}"
-            )
-        
-        # If SSO or HYBRID mode, require OIDC configuration
-        if auth_mode in [AuthMode.SSO, AuthMode.HYBRID]:
-            missing_params = []
-            if not oidc_issuer:
-                missing_params.append("OIDC_ISSUER_URL")
-            if not oidc_app_id:
-                missing_params.append("OIDC_APPLICATION_ID")
-            
-            if missing_params:
-                raise ValueError(
-                    f"AUTH_MODE is set to '{auth_mode}' but the following required "
-                    f"environment variables are missing: {', '.join(missing_params)}. "
-                    f"Please set these variables or change AUTH_MODE."
-                )
+        # Validate configuration at startup (fails fast on invalid configuration)
+        self.config = resolve_auth_config()
+        self.token_validator = CachingTokenValidator() if self.config.jwt_enabled else None
+        self.invalid_header_error = self._invalid_header_error()
         
-        logger.info(f"Authentication middleware initialized with mode: {auth_mode or 'open (default)'}")
+        logger.info(f"Authentication middleware initialized with mode: {self.config.mode}")
     
-    async def dispatch(self, request: Request, call_next):
-        # Get the path from the request
-        path = request.url.path
-        
-        # Get authentication mode (validated at startup)
-        auth_mode = os.getenv("AUTH_MODE", "").lower() or AuthMode.OPEN
+    def _invalid_header_error(self) -> str:
+        """Error returned for unsupported authorization header types."""
+        if self.config.jwt_enabled and self.config.basic_enabled:
+            return f"Invalid authorization header. Use '{AuthHeader.BEARER}<token>' or '{AuthHeader.BASIC}<credentials>'"
+        if self.config.jwt_enabled:
+            return f"Invalid authorization header. Use '{AuthHeader.BEARER}<token>'"
+        if self.config.basic_enabled:
+            return f"Invalid authorization header. Use '{AuthHeader.BASIC}<credentials>'"
+        return "No authentication methods configured"
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # HTTP requests and websocket handshakes are authenticated, lifespan
+        # passes through. Open mode and public routes take the fast path
+        # without building a connection.
+        if (
+            scope["type"] not in ("http", "websocket")
+            or self.config.auth_disabled
+            or not is_route_authenticated(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        error_response = await self.authenticate(HTTPConnection(scope))
+        if error_response is not None:
+            if scope["type"] == "websocket":
+                # Refuse the handshake; the reason carries the 401 detail
+                detail = json.loads(error_response.body)["detail"]
+                await WebSocketClose(code=1008, reason=detail)(scope, receive, send)
+            else:
+                await error_response(scope, receive, send)
+            return
         
-        # Log authentication configuration
-        logger.debug(f"Auth mode: {auth_mode}, Path: {path}")
+        # Authentication successful, continue to the next middleware/route handler
+        await self.app(scope, receive, send)
+    
+    async def authenticate(self, request: HTTPConnection) -> Optional[JSONResponse]:
+        """
+        Authenticate a request or websocket handshake.
         
-        # Determine which auth methods are enabled
-        jwt_enabled = auth_mode in [AuthMode.SSO, AuthMode.HYBRID]
-        basic_enabled = auth_mode in [AuthMode.BASIC, AuthMode.HYBRID]
-        auth_disabled = auth_mode == AuthMode.OPEN
+        Returns:
+            None if the request may proceed, otherwise the 401 response to send
+        """
+        path = request.url.path
         
-        if auth_disabled:
+        if self.config.auth_disabled:
             logger.debug("Authentication disabled")
-            response = await call_next(request)
-            return response
+            return None
         
         # Check if this route should be authenticated
         if not is_route_authenticated(path):
             logger.debug(f"Route {path} is public, skipping authentication")
-            response = await call_next(request)
-            return response
+            return None
         
         # Route requires authentication
         auth_header = request.headers.get("Authorization")
         if not auth_header:
+            AUTH_REQUESTS.labels("none", "failure").inc()
             return JSONResponse(
                 status_code=401,
                 content={"detail": "Missing authorization header"}
@@ -124,18 +134,20 @@ class AuthMiddleware(BaseHTTPMiddleware):
         # Try different authentication methods based on auth mode
         auth_success = False
         auth_error = "Authentication failed"
+        auth_method = "none"
         
         # Try JWT authentication if enabled
-        if jwt_enabled and auth_header.startswith(AuthHeader.BEARER):
+        if self.config.jwt_enabled and auth_header.startswith(AuthHeader.BEARER):
+            auth_method = "jwt"
             try:
                 token = auth_header[len(AuthHeader.BEARER):]  # Remove "Bearer " prefix
                 if not token:
                     auth_error = "Missing token"
                 else:
-                    # Validate JWT token using ark_sdk validator
-                    validator = TokenValidator()
-                    await validator.validate_token(token)
+                    # Validate JWT token using the shared validator
+                    claims = await self.token_validator.validate_token(token)
                     auth_success = True
+                    request.state.principal = f"jwt:{claims.get('sub')}"
                     logger.debug("JWT authentication successful")
                     
             except TokenValidationError as e:
@@ -146,7 +158,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 auth_error = "JWT authentication failed"
         
         # Try basic authentication if enabled (JWT block not executed)
-        elif basic_enabled and auth_header.startswith(AuthHeader.BASIC):
+        elif self.config.basic_enabled and auth_header.startswith(AuthHeader.BASIC):
+            auth_method = "api_key"
             try:
                 # Parse basic auth credentials
                 credentials = BasicAuthValidator.parse_basic_auth_header(auth_header)
@@ -164,6 +177,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
                         
                         # Add API key context to request (optional)
                         request.state.api_key = api_key_data
+                        request.state.principal = f"api-key:{public_key}"
                     else:
                         auth_error = f"Invalid API key credentials or key not found in namespace {self.api_key_service.namespace}"
                         
@@ -173,26 +187,18 @@ class AuthMiddleware(BaseHTTPMiddleware):
         
         else:
             # Unsupported auth type or no auth methods enabled
-            if jwt_enabled and basic_enabled:
-                auth_error = f"Invalid authorization header. Use '{AuthHeader.BEARER}<token>' or '{AuthHeader.BASIC}<credentials>'"
-            elif jwt_enabled:
-                auth_error = f"Invalid authorization header. Use '{AuthHeader.BEARER}<token>'"
-            elif basic_enabled:
-                auth_error = f"Invalid authorization header. Use '{AuthHeader.BASIC}<credentials>'"
-            else:
-                auth_error = "No authentication methods configured"
+            auth_error = self.invalid_header_error
         
         # Check authentication result
+        AUTH_REQUESTS.labels(auth_method, "success" if auth_success else "failure").inc()
         if not auth_success:
-            logger.warning(f"Authentication failed for {request.method} {path}: {auth_error}")
+            logger.warning(f"Authentication failed for {request.scope.get('method', 'WEBSOCKET')} {path}: {auth_error}")
             return JSONResponse(
                 status_code=401,
                 content={"detail": auth_error}
             )
         
-        # Authentication successful, continue to the next middleware/route handler
-        response = await call_next(request)
-        return response
+        return None
 
 
 def add_auth_to_routes(router: APIRouter) -> None:
@@ -0,0 +1,110 @@
+"""Shared JWT validator for ARK API.
+
+The ark_sdk TokenValidator caches JWKS per instance and fetches it with a
+blocking HTTP call. ARK API keeps a single validator for the lifetime of the
+process, so this subclass adds what a long-lived instance needs:
+
+- JWKS is fetched off the event loop and refreshed after JWKS_CACHE_TTL_SECONDS
+- an unknown key id triggers a (rate limited) refresh to pick up key rotation
+- concurrent requests share one refresh, and a failed fetch is not retried
+  for JWKS_FAILURE_BACKOFF_SECONDS; stale keys stay in use meanwhile
+- the base validator's blocking fetch is never used: without JWKS, tokens
+  are rejected with TokenValidationError
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from jose import jwt
+
+from ark_sdk.auth.exceptions import TokenValidationError
+from ark_sdk.auth.validator import TokenValidator
+
+logger = logging.getLogger(__name__)
+
+# How long fetched JWKS are trusted before being refreshed
+JWKS_CACHE_TTL_SECONDS = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "3600"))
+# Minimum interval between refreshes triggered by unknown key ids
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = 30
+# How long to wait after a failed JWKS fetch before trying again
+JWKS_FAILURE_BACKOFF_SECONDS = 10
+
+
+class CachingTokenValidator(TokenValidator):
+    """TokenValidator with a refreshing, event-loop friendly JWKS cache."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._jwks_fetched_at: float = 0.0
+        self._jwks_failed_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+
+    def _known_key_ids(self) -> set:
+        if self._jwks_cache is None:
+            return set()
+        return {key.get("kid") for key in self._jwks_cache.get("keys", [])}
+
+    def _get_jwks(self) -> Dict[str, Any]:
+        # Called by the base validator; JWKS is only ever fetched by _refresh_jwks
+        if self._jwks_cache is None:
+            raise TokenValidationError("JWKS not available")
+        return self._jwks_cache
+
+    async def _refresh_jwks(self, max_age: float, kid: Optional[str] = None) -> None:
+        """Fetch JWKS in a worker thread and replace the cached copy.
+
+        Skipped if, once the lock is held, the cached JWKS is younger than
+        max_age or knows kid, i.e. a concurrent request already refreshed it.
+
+        Raises:
+            TokenValidationError: if the fetch fails or failed too recently
+        """
+        async with self._refresh_lock:
+            now = time.monotonic()
+            if self._jwks_cache is not None and (
+                now - self._jwks_fetched_at <= max_age or (kid and kid in self._known_key_ids())
+            ):
+                return
+            if self._jwks_failed_at is not None and now - self._jwks_failed_at < JWKS_FAILURE_BACKOFF_SECONDS:
+                raise TokenValidationError("JWKS unavailable, retrying later")
+            try:
+                jwks = await asyncio.to_thread(self._fetch_jwks)
+            except Exception as e:
+                self._jwks_failed_at = time.monotonic()
+                if isinstance(e, TokenValidationError):
+                    raise
+                raise TokenValidationError(f"Failed to fetch JWKS: {e}") from e
+            self._jwks_cache = jwks
+            self._jwks_fetched_at = time.monotonic()
+            self._jwks_failed_at = None
+            logger.info(f"Refreshed JWKS ({len(jwks.get('keys', []))} keys)")
+
+    async def _ensure_jwks(self, token: str) -> None:
+        """Make sure the cached JWKS can validate the token's key id."""
+        age = time.monotonic() - self._jwks_fetched_at
+        if self._jwks_cache is None or age > JWKS_CACHE_TTL_SECONDS:
+            await self._refresh_jwks(JWKS_CACHE_TTL_SECONDS)
+            return
+
+        kid: Optional[str] = None
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except Exception:
+            # Malformed tokens are rejected by validate_token itself
+            return
+
+        if kid and kid not in self._known_key_ids() and age > JWKS_MIN_REFRESH_INTERVAL_SECONDS:
+            logger.info(f"Unknown JWKS key id {kid}, refreshing JWKS")
+            await self._refresh_jwks(JWKS_MIN_REFRESH_INTERVAL_SECONDS, kid)
+
+    async def validate_token(self, token: str) -> Dict[str, Any]:
+        try:
+            await self._ensure_jwks(token)
+        except TokenValidationError as e:
+            if self._jwks_cache is None:
+                raise
+            logger.error(f"Failed to refresh JWKS, using cached keys: {e}")
+        return await super().validate_token(token)
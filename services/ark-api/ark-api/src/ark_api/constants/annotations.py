@@ -23,4 +23,12 @@ LOCALHOST_GATEWAY_PORT_ANNOTATION = ARK_PREFIX + "localhost-gateway-port"
 
 # Streaming annotations
 STREAMING_ENABLED_ANNOTATION = ARK_PREFIX + "streaming-enabled"
-MEMORY_EVENT_STREAM_ENABLED_ANNOTATION = ARK_PREFIX + "memory-event-stream-enabled"
\ No newline at end of file
+MEMORY_EVENT_STREAM_ENABLED_ANNOTATION = ARK_PREFIX + "memory-event-stream-enabled"
+
+# OpenAI completion cache annotations (set through the request's metadata.ark)
+COMPLETION_CACHE_ANNOTATION = ARK_PREFIX + "completion-cache"
+COMPLETION_CACHE_TTL_ANNOTATION = ARK_PREFIX + "completion-cache-ttl"
+
+# Query completion callback annotations
+QUERY_CALLBACK_ANNOTATION = ARK_PREFIX + "completion-callback"
+QUERY_CALLBACK_STATUS_ANNOTATION = ARK_PREFIX + "completion-callback-status"
@@ -0,0 +1,123 @@
+"""Negotiated response compression (brotli or gzip).
+
+Large JSON list responses compress very well. The middleware compresses a
+response when the client accepts it, the body is big enough and the content
+type is compressible. Only bodies sent in a single message (JSONResponse and
+other buffered responses) are compressed; streamed responses such as SSE and
+file downloads pass through untouched.
+
+Brotli is used when the optional `brotli` package is installed and the
+client prefers it, otherwise gzip.
+"""
+
+import gzip
+import os
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+# gzip level (1-9) and brotli quality (0-11), favouring speed
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/css", "application/javascript")
+
+
+def _accepted_encodings(accept_encoding: str) -> List[str]:
+    """Encodings the client accepts (q > 0), in the order it prefers them."""
+    encodings = []
+    for position, part in enumerate(accept_encoding.split(",")):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if name and quality > 0:
+            encodings.append((-quality, position, name.strip().lower()))
+    return [name for _, _, name in sorted(encodings)]
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the response encoding for an Accept-Encoding header, if any."""
+    for name in _accepted_encodings(accept_encoding):
+        if name == "br" and brotli is not None:
+            return "br"
+        if name == "gzip":
+            return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing buffered, compressible responses."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "").split(";")[0].strip()
+                if "content-encoding" in headers or content_type not in COMPRESSIBLE_TYPES:
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Wait for the body to decide
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            passthrough = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            # The compressed bytes differ, so a strong validator becomes weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,96 @@
+"""Shared outbound HTTP client.
+
+ARK API calls memory services and the streaming backend on behalf of most
+dashboard requests. A single pooled httpx.AsyncClient is created for the
+lifetime of the application so those calls reuse keep-alive connections
+instead of paying for DNS, TCP (and TLS) setup on every request.
+
+Routers get the client through the get_http_client dependency.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Connection pool tuning
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS", "30"))
+# Default timeouts, individual calls may override them
+HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS", "10"))
+HTTP_CLIENT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", "30"))
+# HTTP/2 multiplexes requests to the same backend over one connection
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "false").lower() == "true"
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an AsyncClient configured from the HTTP_CLIENT_* settings."""
+    limits = httpx.Limits(
+        max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(HTTP_CLIENT_TIMEOUT_SECONDS, connect=HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS)
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=HTTP_CLIENT_HTTP2)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the application lifespan)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+        logger.info(
+            f"Shared HTTP client started (max_connections={HTTP_CLIENT_MAX_CONNECTIONS}, "
+            f"max_keepalive={HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS}, http2={HTTP_CLIENT_HTTP2})"
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared client.
+
+    The client is created on first use if the lifespan has not started it,
+    for example when the app is used without running its lifespan.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool utilisation of the shared client.
+
+    httpx does not expose pool statistics, so they are read from the
+    underlying httpcore pool when available.
+    """
+    stats = {
+        "max_connections": HTTP_CLIENT_MAX_CONNECTIONS,
+        "active": 0,
+        "idle": 0,
+        "waiting": 0,
+    }
+    pool = getattr(getattr(_http_client, "_transport", None), "_pool", None)
+    if pool is None:
+        return stats
+    for connection in list(getattr(pool, "connections", [])):
+        if connection.is_idle():
+            stats["idle"] += 1
+        else:
+            stats["active"] += 1
+    stats["waiting"] = sum(1 for request in list(getattr(pool, "_requests", [])) if request.is_queued())
+    return stats
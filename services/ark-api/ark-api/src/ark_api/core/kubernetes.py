@@ -0,0 +1,71 @@
+"""Metrics for Kubernetes API calls.
+
+Every kubernetes_asyncio call (from ark-api and from ark_sdk) goes through
+RESTClientObject.request. instrument_kubernetes_client wraps it once at
+startup to count requests and observe their latency by verb (get, list,
+watch, create, update, patch, delete, deletecollection) and resource, e.g.
+`queries` or `secrets`, with subresources as `queries/status`.
+"""
+
+import functools
+import time
+from typing import Any, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from kubernetes_asyncio.client.rest import ApiException, RESTClientObject
+
+from .metrics import KUBERNETES_REQUEST_DURATION_SECONDS, KUBERNETES_REQUESTS
+
+_WRITE_VERBS = {"POST": "create", "PUT": "update", "PATCH": "patch"}
+
+
+def request_labels(method: str, url: str, query_params: Optional[Sequence[Tuple[str, Any]]] = None) -> Tuple[str, str]:
+    """The (verb, resource) of a Kubernetes API request."""
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    # /api/<version>/... for the core group, /apis/<group>/<version>/... otherwise
+    if parts[:1] == ["api"]:
+        parts = parts[2:]
+    elif parts[:1] == ["apis"]:
+        parts = parts[3:]
+    if len(parts) > 2 and parts[0] == "namespaces":
+        parts = parts[2:]
+    if not parts:
+        return method.lower(), "unknown"
+
+    resource = "/".join([parts[0]] + parts[2:3])
+    named = len(parts) > 1
+    method = method.upper()
+    if method == "GET":
+        watching = any(key == "watch" and str(value).lower() == "true" for key, value in query_params or ())
+        verb = "watch" if watching else "get" if named else "list"
+    elif method == "DELETE":
+        verb = "delete" if named else "deletecollection"
+    else:
+        verb = _WRITE_VERBS.get(method, method.lower())
+    return verb, resource
+
+
+def instrument_kubernetes_client() -> None:
+    """Record metrics for every Kubernetes API request. Safe to call more than once."""
+    original = RESTClientObject.request
+    if getattr(original, "_ark_instrumented", False):
+        return
+
+    @functools.wraps(original)
+    async def request(self, method, url, query_params=None, **kwargs):
+        verb, resource = request_labels(method, url, query_params)
+        start_time = time.perf_counter()
+        code = "error"
+        try:
+            response = await original(self, method, url, query_params=query_params, **kwargs)
+            code = str(response.status)
+            return response
+        except ApiException as e:
+            code = str(e.status)
+            raise
+        finally:
+            KUBERNETES_REQUESTS.labels(verb, resource, code).inc()
+            KUBERNETES_REQUEST_DURATION_SECONDS.labels(verb, resource).observe(time.perf_counter() - start_time)
+
+    request._ark_instrumented = True
+    RESTClientObject.request = request
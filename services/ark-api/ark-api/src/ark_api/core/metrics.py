@@ -0,0 +1,201 @@
+"""Prometheus metrics for ARK API.
+
+Metrics are registered on a dedicated registry and served from /metrics.
+Values that are cheap to read on demand (such as connection pool usage) are
+collected at scrape time rather than updated on every request.
+"""
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from ..utils.shared_watch import shared_watches
+from .http import get_pool_stats
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+
+class HTTPClientPoolCollector:
+    """Exposes connection pool utilisation of the shared HTTP client."""
+
+    def collect(self):
+        stats = get_pool_stats()
+
+        connections = GaugeMetricFamily(
+            "ark_api_http_client_connections",
+            "Connections held by the shared outbound HTTP client pool",
+            labels=["state"],
+        )
+        connections.add_metric(["active"], stats["active"])
+        connections.add_metric(["idle"], stats["idle"])
+        yield connections
+
+        yield GaugeMetricFamily(
+            "ark_api_http_client_max_connections",
+            "Maximum connections allowed in the shared outbound HTTP client pool",
+            value=stats["max_connections"],
+        )
+        yield GaugeMetricFamily(
+            "ark_api_http_client_requests_waiting",
+            "Outbound requests waiting for a pooled connection",
+            value=stats["waiting"],
+        )
+
+
+REGISTRY.register(HTTPClientPoolCollector())
+
+
+class SharedWatchCollector:
+    """Exposes the upstream Kubernetes watches shared by streaming clients."""
+
+    def collect(self):
+        upstream = GaugeMetricFamily(
+            "ark_api_shared_watches",
+            "Running upstream Kubernetes watches shared by streaming clients",
+            labels=["resource"],
+        )
+        subscribers = GaugeMetricFamily(
+            "ark_api_shared_watch_subscribers",
+            "Subscribers of shared Kubernetes watches",
+            labels=["resource"],
+        )
+        running: dict = {}
+        subscribed: dict = {}
+        for key, shared_watch in shared_watches.watches().items():
+            resource = key[0] if isinstance(key, tuple) else str(key)
+            running[resource] = running.get(resource, 0) + (1 if shared_watch.running else 0)
+            subscribed[resource] = subscribed.get(resource, 0) + shared_watch.subscriber_count
+        for resource in sorted(running):
+            upstream.add_metric([resource], running[resource])
+            subscribers.add_metric([resource], subscribed[resource])
+        yield upstream
+        yield subscribers
+
+
+REGISTRY.register(SharedWatchCollector())
+
+
+# Inbound HTTP requests (core/middleware.py), labelled by route template
+HTTP_REQUESTS = Counter(
+    "ark_api_http_requests_total",
+    "HTTP requests by method, route template and status code",
+    labelnames=["method", "route", "status"],
+    registry=REGISTRY,
+)
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "ark_api_http_request_duration_seconds",
+    "Time until the response started, by method and route template",
+    labelnames=["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    registry=REGISTRY,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "ark_api_http_requests_in_flight",
+    "HTTP requests being handled, including responses still streaming",
+    registry=REGISTRY,
+)
+SSE_STREAMS = Gauge(
+    "ark_api_sse_streams",
+    "Open Server-Sent Events responses by route template",
+    labelnames=["route"],
+    registry=REGISTRY,
+)
+
+
+# Kubernetes API calls (core/kubernetes.py)
+KUBERNETES_REQUESTS = Counter(
+    "ark_api_kubernetes_requests_total",
+    "Kubernetes API requests by verb, resource and status code",
+    labelnames=["verb", "resource", "code"],
+    registry=REGISTRY,
+)
+KUBERNETES_REQUEST_DURATION_SECONDS = Histogram(
+    "ark_api_kubernetes_request_duration_seconds",
+    "Kubernetes API request latency by verb and resource (until headers for watches)",
+    labelnames=["verb", "resource"],
+    registry=REGISTRY,
+)
+
+
+# Authentication outcomes (auth/middleware.py)
+AUTH_REQUESTS = Counter(
+    "ark_api_auth_requests_total",
+    "Authentication attempts by method (jwt, api_key, none) and outcome (success, failure)",
+    labelnames=["method", "outcome"],
+    registry=REGISTRY,
+)
+
+
+# In-process caches; the hit rate is hit / (hit + miss)
+CACHE_REQUESTS = Counter(
+    "ark_api_cache_requests_total",
+    "Cache lookups by cache and result (hit, miss)",
+    labelnames=["cache", "result"],
+    registry=REGISTRY,
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+# Query completion callbacks
+QUERY_CALLBACK_ATTEMPTS = Counter(
+    "ark_api_query_callback_attempts_total",
+    "Query completion callback HTTP attempts",
+    labelnames=["outcome"],
+    registry=REGISTRY,
+)
+QUERY_CALLBACK_DELIVERIES = Counter(
+    "ark_api_query_callback_deliveries_total",
+    "Query completion callbacks by final result",
+    labelnames=["result"],
+    registry=REGISTRY,
+)
+QUERY_CALLBACK_DELIVERY_SECONDS = Histogram(
+    "ark_api_query_callback_delivery_seconds",
+    "Time from a query finishing being seen until its callback was delivered or given up",
+    registry=REGISTRY,
+)
+
+
+# Watch gateway (/v1/watch/{kind})
+WATCH_CONNECTIONS = Gauge(
+    "ark_api_watch_connections",
+    "Open watch gateway connections",
+    labelnames=["kind", "transport"],
+    registry=REGISTRY,
+)
+WATCH_CONNECTIONS_REJECTED = Counter(
+    "ark_api_watch_connections_rejected_total",
+    "Watch gateway connections refused",
+    labelnames=["reason"],
+    registry=REGISTRY,
+)
+WATCH_EVENTS_SENT = Counter(
+    "ark_api_watch_events_sent_total",
+    "Events sent to watch gateway subscribers",
+    labelnames=["kind", "transport"],
+    registry=REGISTRY,
+)
+WATCH_EVENTS_DROPPED = Counter(
+    "ark_api_watch_events_dropped_total",
+    "Events dropped because a watch gateway subscriber fell behind",
+    labelnames=["kind", "transport"],
+    registry=REGISTRY,
+)
+
+
+# Per-principal rate limits (core/rate_limit.py). Principals are not labels:
+# they would publish identities and grow the series without bound
+RATE_LIMIT_REQUESTS = Counter(
+    "ark_api_rate_limit_requests_total",
+    "Requests to rate limited route groups by outcome (allowed, rate_limited, concurrency_limited)",
+    labelnames=["group", "outcome"],
+    registry=REGISTRY,
+)
+RATE_LIMIT_IN_FLIGHT = Gauge(
+    "ark_api_rate_limit_in_flight",
+    "Requests in flight to rate limited route groups",
+    labelnames=["group"],
+    registry=REGISTRY,
+)
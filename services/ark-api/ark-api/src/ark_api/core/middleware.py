@@ -0,0 +1,136 @@
+"""ASGI middleware for request/session tracking and request metrics."""
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request
+from opentelemetry import baggage, propagate
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT, SSE_STREAMS
+
+logger = logging.getLogger(__name__)
+
+
+def extract_session_context(request: Request):
+    """Extract OTEL context and session ID from request headers"""
+    # Extract OTEL trace context from headers
+    ctx = propagate.extract(request.headers)
+    
+    # Extract session ID from custom header
+    session_id = request.headers.get("x-session-id")
+    if session_id:
+        # Add session to baggage
+        ctx = baggage.set_baggage("session.id", session_id, context=ctx)
+    
+    return ctx, session_id
+
+
+class SessionAwareMiddleware:
+    """Pure ASGI middleware for session tracking and request timing with OTEL context"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        request = Request(scope)
+
+        # Extract OTEL context and session ID
+        otel_ctx, session_id = extract_session_context(request)
+
+        # Add session info to logs
+        session_info = f"session={session_id}" if session_id else "no-session"
+        logger.info(
+            f"Request: {request.method} {request.url.path} - {session_info} - Query: {dict(request.query_params)}"
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            # Log once the response has started, as call_next() used to return
+            # at that point (streaming bodies are still being sent afterwards)
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                logger.info(
+                    f"Response: {request.method} {request.url.path} - {session_info} - Status: {message['status']} - Time: {process_time:.3f}s"
+                )
+            await send(message)
+
+        # Process request with OTEL context
+        await self.app(scope, receive, send_wrapper)
+
+
+def route_template(scope: Scope, root_path: str) -> str:
+    """Route template of a handled request, e.g. /v1/agents/{agent_name}.
+
+    Requests served by a mounted app (such as /a2a/agent) are labelled with
+    the mount path, and requests matching no route with 'unmatched', so raw
+    paths never become metric labels.
+    """
+    # Routes of included routers keep their own (relative) path; FastAPI
+    # records the full template of the matched route separately.
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path_format = getattr(context, "path_format", None)
+    if path_format:
+        return path_format
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format:
+        return path_format
+    mounted = scope.get("root_path", "")[len(root_path):]
+    return f"{mounted}/{{path}}" if mounted else "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request metrics by route template.
+
+    Latency is measured until the response starts, so streamed responses
+    report their time to first byte; they are counted as in flight (and SSE
+    responses as open streams) until the stream ends.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        method = scope["method"]
+        sse_route: Optional[str] = None
+        started = False
+
+        def record(status: int) -> str:
+            route = route_template(scope, root_path)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_REQUEST_DURATION_SECONDS.labels(method, route).observe(time.perf_counter() - start_time)
+            return route
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal sse_route, started
+            if message["type"] == "http.response.start":
+                started = True
+                route = record(message["status"])
+                content_type = Headers(raw=message.get("headers", [])).get("content-type", "")
+                if content_type.startswith("text/event-stream"):
+                    sse_route = route
+                    SSE_STREAMS.labels(route).inc()
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            if not started:
+                # The app raised before responding; the server sends a 500
+                record(500)
+            if sse_route is not None:
+                SSE_STREAMS.labels(sse_route).dec()
@@ -0,0 +1,181 @@
+"""Per-principal rate limits and in-flight quotas.
+
+Requests are grouped by route (see ROUTE_GROUPS) and limited per principal:
+the API key or JWT subject set by AuthMiddleware, or the client address
+when authentication is off. Each group can have a token bucket (a sustained
+rate in requests per second plus a burst) and a maximum number of requests
+in flight, which for streamed responses lasts until the stream ends.
+Requests over a limit get 429 with a Retry-After header.
+
+Limits are configured with RATE_LIMITS, a comma separated list of
+`group=rate:burst:in_flight` entries where trailing or empty fields are
+unlimited, e.g. `completions=5:20:10,queries=20:40,default=::100`. Groups
+without an entry, and public routes such as /health, are not limited.
+"""
+
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..auth.config import is_route_authenticated
+from ..utils.ttl_cache import TTLCache
+from .metrics import RATE_LIMIT_IN_FLIGHT, RATE_LIMIT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Per route group limits, e.g. "completions=5:20:10,default=::100"
+RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+# Principals whose token buckets are tracked per group
+RATE_LIMIT_MAX_PRINCIPALS = 10000
+
+# (path prefix, group), first match wins; other routes are in "default"
+ROUTE_GROUPS = (
+    ("/openai/v1/chat/completions", "completions"),
+    ("/openai/", "openai"),
+    ("/v1/queries", "queries"),
+    ("/v1/watch/", "watch"),
+    ("/a2a/", "a2a"),
+)
+DEFAULT_ROUTE_GROUP = "default"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Limits for one route group; None means unlimited."""
+    rate: Optional[float] = None
+    burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+
+def parse_rate_limits(value: str) -> Dict[str, RateLimit]:
+    """Parse RATE_LIMITS into group -> RateLimit, skipping invalid entries."""
+    limits: Dict[str, RateLimit] = {}
+    for part in value.split(","):
+        group, _, setting = part.strip().partition("=")
+        if not group or not setting:
+            continue
+        fields = (setting.split(":") + ["", "", ""])[:3]
+        try:
+            rate = float(fields[0]) if fields[0].strip() else None
+            burst = int(fields[1]) if fields[1].strip() else None
+            max_in_flight = int(fields[2]) if fields[2].strip() else None
+        except ValueError:
+            logger.warning(f"Ignoring invalid RATE_LIMITS setting for {group}: {setting}")
+            continue
+        if rate is not None and rate <= 0:
+            rate = None
+        if rate is not None and burst is None:
+            burst = max(1, math.ceil(rate))
+        limits[group.strip()] = RateLimit(rate=rate, burst=burst, max_in_flight=max_in_flight)
+    return limits
+
+
+def route_group(path: str) -> str:
+    for prefix, group in ROUTE_GROUPS:
+        if path.startswith(prefix):
+            return group
+    return DEFAULT_ROUTE_GROUP
+
+
+def _principal(scope: Scope) -> str:
+    principal = scope.get("state", {}).get("principal")
+    if principal:
+        return principal
+    client = scope.get("client")
+    return f"client:{client[0]}" if client else "anonymous"
+
+
+class RateLimiter:
+    """Token buckets and in-flight counts per (group, principal)."""
+
+    def __init__(self, limits: Dict[str, RateLimit]):
+        self.limits = limits
+        # (tokens, updated at); an expired bucket has refilled completely
+        self._buckets: TTLCache[Tuple[float, float]] = TTLCache(0, max_entries=RATE_LIMIT_MAX_PRINCIPALS)
+        self._in_flight: Dict[Tuple[str, str], int] = {}
+
+    def acquire(self, group: str, principal: str) -> Optional[Tuple[str, float]]:
+        """Admit a request.
+
+        Returns:
+            None if admitted (release() must follow), otherwise the outcome
+            ("rate_limited" or "concurrency_limited") and seconds to wait
+        """
+        limit = self.limits[group]
+        key = (group, principal)
+        in_flight = self._in_flight.get(key, 0)
+        if limit.max_in_flight is not None and in_flight >= limit.max_in_flight:
+            return "concurrency_limited", 1.0
+
+        if limit.rate is not None:
+            now = time.monotonic()
+            bucket = self._buckets.get(key)
+            tokens = limit.burst if bucket is None else min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            if tokens < 1:
+                return "rate_limited", (1 - tokens) / limit.rate
+            tokens -= 1
+            self._buckets.put(key, (tokens, now), ttl_seconds=(limit.burst - tokens) / limit.rate)
+
+        self._in_flight[key] = in_flight + 1
+        return None
+
+    def release(self, group: str, principal: str) -> None:
+        key = (group, principal)
+        remaining = self._in_flight.get(key, 1) - 1
+        if remaining > 0:
+            self._in_flight[key] = remaining
+        else:
+            self._in_flight.pop(key, None)
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing RateLimiter limits on HTTP requests.
+
+    Must run inside AuthMiddleware so the authenticated principal is known.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Optional[Dict[str, RateLimit]] = None):
+        self.app = app
+        self.limiter = RateLimiter(parse_rate_limits(RATE_LIMITS) if limits is None else limits)
+        if self.limiter.limits:
+            logger.info(f"Rate limits configured: {self.limiter.limits}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.limits:
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["path"])
+        if group not in self.limiter.limits or not is_route_authenticated(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        principal = _principal(scope)
+        rejected = self.limiter.acquire(group, principal)
+        if rejected is not None:
+            outcome, retry_after = rejected
+            RATE_LIMIT_REQUESTS.labels(group, outcome).inc()
+            logger.debug(f"Rate limited {principal} on {group} ({outcome}): {scope['method']} {scope['path']}")
+            detail = "Too many requests in flight" if outcome == "concurrency_limited" else "Rate limit exceeded"
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": f"{detail} for route group '{group}', retry later"},
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+            await response(scope, receive, send)
+            return
+
+        RATE_LIMIT_REQUESTS.labels(group, "allowed").inc()
+        in_flight = RATE_LIMIT_IN_FLIGHT.labels(group)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            in_flight.dec()
+            self.limiter.release(group, principal)
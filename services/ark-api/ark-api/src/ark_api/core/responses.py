@@ -0,0 +1,31 @@
+"""orjson backed JSON responses.
+
+ORJSONResponse is the application's default response class. Handlers for
+large lists return it directly with plain dicts built from the Kubernetes
+objects (already validated by the API server against the CRD schema), which
+skips FastAPI's response model validation and serialization passes.
+Pydantic models are still accepted and dumped straight to JSON.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    return jsonable_encoder(obj)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
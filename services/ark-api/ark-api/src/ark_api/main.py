@@ -1,5 +1,5 @@
+import asyncio
 import os
-import time
 from contextlib import asynccontextmanager
 from importlib.metadata import version, PackageNotFoundError
 from fastapi import FastAPI, Request
@@ -10,7 +10,7 @@ from fastapi.responses import JSONResponse
 from kubernetes_asyncio import client
 from dotenv import load_dotenv
 from typing import Dict, Any
-from opentelemetry import baggage, propagate, trace
+from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
@@ -19,13 +19,26 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
 from .api import router
+from .core.compression import CompressionMiddleware
+from .core.responses import ORJSONResponse
 from .core.config import setup_logging
+from .core.http import close_http_client, start_http_client
+from .core.kubernetes import instrument_kubernetes_client
+from .core.middleware import MetricsMiddleware, SessionAwareMiddleware
+from .core.rate_limit import RateLimitMiddleware
 from .auth.middleware import AuthMiddleware
 from .auth.constants import AuthMode
-from .auth.config import get_public_routes
+from .auth.config import get_public_routes, resolve_auth_config
 from .openapi.security import add_security_to_openapi
 from .api.v1.a2a_gateway import get_a2a_manager
-from ark_sdk.k8s import init_k8s
+from .api.v1.openai_batches import get_batch_service
+from .services.api_keys import start_api_key_background_tasks
+from .services.query_callbacks import query_callbacks
+from .utils.informer import informers
+from .utils.leader_election import leader_election
+from .utils.shared_watch import shared_watches
+from .utils.streaming_endpoint import streaming_endpoints
+from ark_sdk.k8s import get_namespace, init_k8s
 
 # Load environment variables from .env file
 load_dotenv()
@@ -67,20 +80,6 @@ def setup_telemetry():
     logger.info(f"Telemetry initialized for {service_name} -> {otel_endpoint}")
 
 
-def extract_session_context(request: Request):
-    """Extract OTEL context and session ID from request headers"""
-    # Extract OTEL trace context from headers
-    ctx = propagate.extract(request.headers)
-    
-    # Extract session ID from custom header
-    session_id = request.headers.get("x-session-id")
-    if session_id:
-        # Add session to baggage
-        ctx = baggage.set_baggage("session.id", session_id, context=ctx)
-    
-    return ctx, session_id
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -91,20 +90,70 @@ async def lifespan(app: FastAPI):
 
     await init_k8s()
     logger.info("Kubernetes clients initialized")
+
+    # Shared pooled HTTP client for memory and streaming services
+    await start_http_client()
     
-    # Initialize A2A manager and mount dynamic agent routes under /a2a
+    # Initialize A2A manager and mount dynamic agent routes under /a2a. Every
+    # worker syncs its own routes: they live in-process and the sync only reads
     a2a_manager = get_a2a_manager()
     await a2a_manager.initialize()
     app.mount("/a2a/agent", a2a_manager.app)
     logger.info("A2A Gateway initialized at /a2a")
+
+    # Background loops with side effects run in one worker per pod, the leader;
+    # every worker serves requests
+    batch_service = get_batch_service()
+
+    async def start_leader_loops():
+        # Resume OpenAI batches interrupted by a restart
+        await batch_service.start()
+
+        # Deliver completion callbacks, including those owed from before a restart
+        await query_callbacks.start(get_namespace())
+
+    election_task = asyncio.create_task(leader_election.run(start_leader_loops), name="leader-election")
+
+    # Keep the API key verification cache in sync and write back last used
+    # timestamps (per worker, as each verifies keys from its own cache)
+    background_tasks = []
+    if resolve_auth_config().basic_enabled:
+        background_tasks = start_api_key_background_tasks()
+        logger.info("API key cache watch started")
     
     yield
     # Shutdown
     logger.info("Shutting down ARK API...")
     
+    # Stop background tasks (flushes pending API key last used timestamps)
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    # Stop waiting for (or starting) the leader's loops
+    election_task.cancel()
+    await asyncio.gather(election_task, return_exceptions=True)
+
+    # Stop running OpenAI batches (resumed on next start)
+    await batch_service.close()
+
+    # Stop query completion callbacks (unfinished deliveries resume on next start)
+    await query_callbacks.close()
+
+    # Let another worker take over the background loops
+    leader_election.release()
+
+    # Stop shared watches and informers used by streaming endpoints and caches
+    await streaming_endpoints.close()
+    await shared_watches.close()
+    await informers.close()
+
     # Shutdown A2A manager
     await a2a_manager.shutdown()
     
+    # Close the shared HTTP client
+    await close_http_client()
+
     # Close all kubernetes async clients
     await client.ApiClient().close()
 
@@ -114,6 +163,7 @@ app = FastAPI(
     description="Agentic Runtime for Kubernetes API",
     version=VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     # Auto-detect root path from X-Forwarded-Prefix header  
     root_path_in_servers=True,
     openapi_url=None,  # Disable default openapi, we'll use custom one
@@ -124,6 +174,9 @@ app = FastAPI(
 FastAPIInstrumentor.instrument_app(app)
 HTTPXClientInstrumentor().instrument()
 
+# Count and time Kubernetes API calls for /metrics
+instrument_kubernetes_client()
+
 # Custom docs endpoint that respects X-Forwarded-Prefix header
 # The dashboard middleware and ingresses set this header to indicate the external path prefix
 # This allows the API to be served from any root (/, /api, /whatever) as long as the proxy sets the correct header
@@ -183,6 +236,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (brotli or gzip, as negotiated with the client)
+app.add_middleware(CompressionMiddleware)
+
 # Log CORS origins at startup
 if allowed_origins:
     logger.info(f"CORS origins configured: {allowed_origins}")
@@ -193,33 +249,18 @@ else:
 # Include routes
 app.include_router(router)
 
+# Per-principal rate limits and in-flight quotas (added before AuthMiddleware
+# so that it runs inside it, once the principal is known)
+app.add_middleware(RateLimitMiddleware)
+
 # Add global authentication middleware (protects all routes by default except PUBLIC_ROUTES)
 app.add_middleware(AuthMiddleware)
 
 
-@app.middleware("http")
-async def session_aware_middleware(request: Request, call_next):
-    """Middleware for session tracking and request timing with OTEL context"""
-    start_time = time.time()
-    
-    # Extract OTEL context and session ID
-    otel_ctx, session_id = extract_session_context(request)
-    
-    # Add session info to logs
-    session_info = f"session={session_id}" if session_id else "no-session"
-    logger.info(
-        f"Request: {request.method} {request.url.path} - {session_info} - Query: {dict(request.query_params)}"
-    )
-    
-    # Process request with OTEL context
-    response = await call_next(request)
-    
-    process_time = time.time() - start_time
-    logger.info(
-        f"Response: {request.method} {request.url.path} - {session_info} - Status: {response.status_code} - Time: {process_time:.3f}s"
-    )
-    
-    return response
+app.add_middleware(SessionAwareMiddleware)
+
+# Request metrics by route template (outermost, so auth and rate limiting are included)
+app.add_middleware(MetricsMiddleware)
 
 
 # Custom exception handler for validation errors
@@ -216,21 +216,26 @@ def extract_unified_metadata_from_annotations(evaluation: dict) -> Optional[Unif
         return None
 
 
-def evaluation_to_response(evaluation: dict) -> EvaluationResponse:
-    """Convert a Kubernetes evaluation object to response model."""
+def evaluation_to_item(evaluation: dict) -> dict:
+    """Convert a Kubernetes evaluation object to a JSON ready EvaluationResponse dict."""
     spec = evaluation.get("spec", {})
     status = evaluation.get("status", {})
     
-    return EvaluationResponse(
-        name=evaluation["metadata"]["name"],
-        namespace=evaluation["metadata"]["namespace"],
-        type=spec.get("type", "direct"),
-        phase=status.get("phase"),
-        conditions=status.get("conditions"),
-        score=status.get("score"),
-        passed=status.get("passed"),
-        message=status.get("message")
-    )
+    return {
+        "name": evaluation["metadata"]["name"],
+        "namespace": evaluation["metadata"]["namespace"],
+        "type": spec.get("type", "direct"),
+        "phase": status.get("phase"),
+        "conditions": status.get("conditions"),
+        "score": status.get("score"),
+        "passed": status.get("passed"),
+        "message": status.get("message")
+    }
+
+
+def evaluation_to_response(evaluation: dict) -> EvaluationResponse:
+    """Convert a Kubernetes evaluation object to response model."""
+    return EvaluationResponse.model_validate(evaluation_to_item(evaluation))
 
 
 def evaluation_to_detail_response(evaluation: dict) -> EvaluationDetailResponse:
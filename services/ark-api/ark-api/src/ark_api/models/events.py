@@ -1,7 +1,7 @@
 """Event models for API responses."""
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class EventResponse(BaseModel):
@@ -25,9 +25,18 @@ class EventResponse(BaseModel):
 
 
 class EventListResponse(BaseModel):
-    """Response model for listing events."""
+    """Response model for listing events.
+
+    total is exact when the API server reports how many events remain,
+    otherwise it is a lower bound. continue is set when more events exist.
+    """
     items: List[EventResponse]
     total: int
+    continue_: Optional[str] = Field(None, alias="continue")
+
+    model_config = {
+        "populate_by_name": True
+    }
 
 
 def event_to_response(event_dict: Dict[str, Any]) -> EventResponse:
@@ -2,7 +2,7 @@
 
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, HttpUrl
 from enum import Enum
 from openai.types.chat import ChatCompletionMessageParam
 from .agents import Override
@@ -85,9 +85,18 @@ class QueryResponse(BaseModel):
 
 
 class QueryListResponse(BaseModel):
-    """Response for listing queries."""
+    """Response for listing queries.
+
+    count is the number of items in this page. continue is set when more
+    queries exist.
+    """
     items: List[QueryResponse]
     count: int
+    continue_: Optional[str] = Field(None, alias="continue")
+
+    model_config = {
+        "populate_by_name": True
+    }
 
 
 class QueryCreateRequest(BaseModel):
@@ -108,6 +117,8 @@ class QueryCreateRequest(BaseModel):
     evaluators: Optional[List[Memory]] = None
     evaluatorSelector: Optional[LabelSelector] = None
     metadata: Optional[Dict[str, Any]] = None
+    # URL that receives the query's final status when it finishes
+    callback: Optional[HttpUrl] = None
 
 
 class QueryUpdateRequest(BaseModel):
@@ -146,6 +157,37 @@ class QueryDetailResponse(BaseModel):
     status: Optional[Dict[str, Any]] = None
 
 
+class QueryBatchCreateRequest(BaseModel):
+    """Request body for creating many queries in one call."""
+    queries: List[QueryCreateRequest]
+
+
+class QueryCancelRequest(BaseModel):
+    """Request body for cancelling many queries.
+
+    Exactly one of names, labelSelector or sessionId selects the queries.
+    """
+    names: Optional[List[str]] = None
+    labelSelector: Optional[str] = None
+    sessionId: Optional[str] = None
+
+
+class QueryBulkItemResult(BaseModel):
+    """Outcome of one query in a bulk operation."""
+    name: str
+    success: bool
+    statusCode: int
+    error: Optional[str] = None
+    query: Optional[QueryDetailResponse] = None
+
+
+class QueryBulkResponse(BaseModel):
+    """Per-item results of a bulk create or cancel."""
+    items: List[QueryBulkItemResult]
+    succeeded: int
+    failed: int
+
+
 class ArkOpenAICompletionsMetadata(BaseModel):
     """Ark-specific metadata for OpenAI chat completions.
 
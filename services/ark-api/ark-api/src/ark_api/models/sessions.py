@@ -4,6 +4,12 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 
+class MemoryServiceError(BaseModel):
+    """A memory service that could not be queried."""
+    memoryName: str
+    error: str
+
+
 class SessionResponse(BaseModel):
     """Response model for a session."""
     sessionId: str
@@ -17,6 +23,7 @@ class SessionListResponse(BaseModel):
     """Response model for listing sessions."""
     items: List[SessionResponse]
     total: Optional[int] = None
+    errors: List[MemoryServiceError] = []
 
 
 class MemoryMessageResponse(BaseModel):
@@ -32,4 +39,5 @@ class MemoryMessageResponse(BaseModel):
 class MemoryMessageListResponse(BaseModel):
     """Response model for listing memory messages."""
     items: List[MemoryMessageResponse]
-    total: Optional[int] = None
\ No newline at end of file
+    total: Optional[int] = None
+    errors: List[MemoryServiceError] = []
\ No newline at end of file
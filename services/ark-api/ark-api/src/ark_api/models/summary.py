@@ -0,0 +1,32 @@
+"""Models for the namespace summary."""
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+class ResourceFailure(BaseModel):
+    """A resource that failed or is unavailable."""
+    name: str
+    reason: Optional[str] = None
+    message: Optional[str] = None
+    timestamp: Optional[str] = None
+
+
+class KindSummary(BaseModel):
+    """Counts and health of one resource kind.
+
+    phases is a histogram of status.phase. availability is a histogram of
+    the kind's availability condition (True, False, Unknown) and is only set
+    for kinds that report one. error is set, and the rest left empty, when
+    the kind could not be listed.
+    """
+    count: int = 0
+    phases: Dict[str, int] = {}
+    availability: Optional[Dict[str, int]] = None
+    recentFailures: List[ResourceFailure] = []
+    error: Optional[str] = None
+
+
+class SummaryResponse(BaseModel):
+    """Counts and health of every ARK kind in a namespace."""
+    namespace: str
+    kinds: Dict[str, KindSummary]
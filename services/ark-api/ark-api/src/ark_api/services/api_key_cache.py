@@ -0,0 +1,149 @@
+"""In-process caching for API key verification.
+
+Verifying an API key costs a Kubernetes secret read and a bcrypt check. This
+module holds the pieces that let APIKeyService skip both for keys it has
+recently verified:
+
+- APIKeyVerificationCache: TTL cache of verified keys, keyed on the public key
+  and a digest of the secret key (the plaintext secret is never stored)
+- LastUsedBuffer: coalesces last-used timestamps so they can be written back
+  periodically instead of on every request
+- bcrypt_executor: bounded thread pool so bcrypt never blocks the event loop
+"""
+
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How long a successful verification is reused without re-reading the secret
+API_KEY_CACHE_TTL_SECONDS = int(os.getenv("API_KEY_CACHE_TTL_SECONDS", "300"))
+# Upper bound on cached verifications, oldest entries are evicted first
+API_KEY_CACHE_MAX_ENTRIES = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", "10000"))
+# Number of threads available for bcrypt checks
+API_KEY_BCRYPT_WORKERS = int(os.getenv("API_KEY_BCRYPT_WORKERS", "4"))
+# Interval between last-used timestamp write backs
+API_KEY_LAST_USED_FLUSH_SECONDS = int(os.getenv("API_KEY_LAST_USED_FLUSH_SECONDS", "60"))
+
+CacheKey = Tuple[str, str]
+
+
+def _secret_digest(secret_key: str) -> str:
+    return hashlib.sha256(secret_key.encode("utf-8")).hexdigest()
+
+
+class APIKeyVerificationCache:
+    """TTL cache of successfully verified API keys."""
+
+    def __init__(self, ttl_seconds: int = API_KEY_CACHE_TTL_SECONDS, max_entries: int = API_KEY_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Insertion ordered, so the first entry is always the oldest
+        self._entries: Dict[CacheKey, Tuple[float, Dict[str, Any]]] = {}
+        # Bumped by every change, so a verification that read a secret before
+        # it changed is not cached (see generation and put)
+        self._generation = 0
+        self._changed_at: Dict[str, int] = {}
+        self._cleared_at = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, public_key: str, secret_key: str) -> Optional[Dict[str, Any]]:
+        """Return cached API key data if the credentials were verified recently."""
+        key = (public_key, _secret_digest(secret_key))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        cached_at, api_key_data = entry
+        expires_at = api_key_data.get("expires_at")
+        if time.monotonic() - cached_at > self.ttl_seconds or (
+            expires_at and expires_at < datetime.now(timezone.utc)
+        ):
+            del self._entries[key]
+            return None
+        return api_key_data
+
+    @property
+    def generation(self) -> int:
+        """Current generation, to be taken before reading the secret that is verified."""
+        return self._generation
+
+    def put(
+        self, public_key: str, secret_key: str, api_key_data: Dict[str, Any], generation: Optional[int] = None
+    ) -> None:
+        """Cache API key data for credentials that passed verification.
+
+        When generation is given, nothing is cached if the secret changed (or
+        the cache was cleared) since then, as the data may already be stale.
+        """
+        if generation is not None and max(
+            self._cleared_at, self._changed_at.get(api_key_data["secret_name"], 0)
+        ) > generation:
+            return
+        key = (public_key, _secret_digest(secret_key))
+        self._entries.pop(key, None)
+        while self.ttl_seconds > 0 and len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        if self.ttl_seconds > 0:
+            self._entries[key] = (time.monotonic(), api_key_data)
+
+    def update_secret(self, secret_name: str, api_key_data: Optional[Dict[str, Any]]) -> None:
+        """Apply a change to an API key secret.
+
+        Entries are dropped when the key is no longer valid or its secret hash
+        changed. Other changes (for example a last-used timestamp) only refresh
+        the cached data, so our own write backs do not empty the cache.
+        """
+        self._generation += 1
+        self._changed_at[secret_name] = self._generation
+        for key, (cached_at, cached) in list(self._entries.items()):
+            if cached["secret_name"] != secret_name:
+                continue
+            if api_key_data is None or api_key_data["secret_key_hash"] != cached["secret_key_hash"]:
+                del self._entries[key]
+            else:
+                self._entries[key] = (cached_at, api_key_data)
+
+    def invalidate_secret(self, secret_name: str) -> None:
+        """Drop all cached verifications backed by the given secret."""
+        self.update_secret(secret_name, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+        self._cleared_at = self._generation
+        self._changed_at.clear()
+
+
+class LastUsedBuffer:
+    """Collects last-used timestamps per secret until they are flushed."""
+
+    def __init__(self):
+        self._pending: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, secret_name: str, used_at: Optional[datetime] = None) -> None:
+        self._pending[secret_name] = used_at or datetime.now(timezone.utc)
+
+    def discard(self, secret_name: str) -> None:
+        self._pending.pop(secret_name, None)
+
+    def drain(self) -> Dict[str, datetime]:
+        """Return and reset the pending timestamps."""
+        pending, self._pending = self._pending, {}
+        return pending
+
+
+# Shared by every APIKeyService instance in the process
+verification_cache = APIKeyVerificationCache()
+last_used_buffer = LastUsedBuffer()
+bcrypt_executor = ThreadPoolExecutor(max_workers=API_KEY_BCRYPT_WORKERS, thread_name_prefix="bcrypt")
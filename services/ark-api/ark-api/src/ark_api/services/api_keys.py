@@ -1,5 +1,6 @@
 """API key management service."""
 
+import asyncio
 import secrets
 import bcrypt
 import base64
@@ -7,8 +8,8 @@ import json
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Optional, Tuple, Dict, Any
-from kubernetes_asyncio import client
+from typing import Optional, Tuple, Dict, Any, List
+from kubernetes_asyncio import client, watch
 from kubernetes_asyncio.client.api_client import ApiClient
 
 from ark_sdk.k8s import get_context
@@ -20,6 +21,13 @@ from ..models.auth import (
     APIKeyListResponse
 )
 from ..constants.annotations import ARK_PREFIX
+from ..core.metrics import record_cache_lookup
+from .api_key_cache import (
+    API_KEY_LAST_USED_FLUSH_SECONDS,
+    bcrypt_executor,
+    last_used_buffer,
+    verification_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,11 @@ API_KEY_ANNOTATION = ARK_PREFIX + "api-key-metadata"  # JSON annotation with all
 PUBLIC_KEY_TOKEN_LENGTH = 32  # bytes for public key token generation
 SECRET_KEY_TOKEN_LENGTH = 48  # bytes for secret key token generation
 
+# Server-side timeout for each API key secret watch, after which it reconnects
+API_KEY_WATCH_TIMEOUT_SECONDS = 300
+# Delay before reconnecting a failed API key secret watch
+API_KEY_WATCH_RETRY_SECONDS = 5
+
 
 class APIKeyService:
     """Service for managing API keys stored as Kubernetes secrets."""
@@ -327,6 +340,52 @@ class APIKeyService:
             count=len(api_keys)
         )
     
+    def _api_key_data_from_secret(self, secret: client.V1Secret) -> Optional[Dict[str, Any]]:
+        """Extract API key data from a secret if it holds a usable API key.
+        
+        Args:
+            secret: The Kubernetes secret
+            
+        Returns:
+            Dictionary with API key data, or None if the secret is not an API key
+            or the key is inactive, deleted or expired
+        """
+        # Check if it's an API key secret
+        if secret.type != API_KEY_TYPE:
+            return None
+        
+        # Parse data
+        data = secret.data or {}
+        annotations = secret.metadata.annotations or {}
+        
+        public_key = base64.b64decode(data.get("public_key", "")).decode('utf-8') if data.get("public_key") else ""
+        secret_key_hash = base64.b64decode(data.get("secret_key_hash", "")).decode('utf-8') if data.get("secret_key_hash") else ""
+        is_active = base64.b64decode(data.get("is_active", "")).decode('utf-8') == "true" if data.get("is_active") else True
+        
+        # Parse JSON annotation
+        api_key_json = annotations.get(API_KEY_ANNOTATION, "{}")
+        metadata = self._parse_api_key_annotation(api_key_json)
+        
+        # Check if key is active (not soft-deleted)
+        deleted_at = metadata["deleted_at"]
+        if not is_active or deleted_at is not None:
+            return None
+        
+        # Check expiration
+        expires_at = metadata["expires_at"]
+        if expires_at and expires_at < datetime.now(timezone.utc):
+            return None
+        
+        return {
+            "id": str(secret.metadata.uid),
+            "name": metadata["name"],
+            "public_key": public_key,
+            "secret_key_hash": secret_key_hash,
+            "is_active": is_active,
+            "expires_at": expires_at,
+            "secret_name": secret.metadata.name
+        }
+    
     async def get_api_key_by_public_key(self, public_key: str) -> Optional[Dict[str, Any]]:
         """Get API key data by public key for authentication.
         
@@ -346,45 +405,10 @@ class APIKeyService:
                     namespace=self.namespace
                 )
             
-            # Check if it's an API key secret
-            if secret.type != API_KEY_TYPE:
-                return None
-            
-            # Parse data
-            data = secret.data or {}
-            annotations = secret.metadata.annotations or {}
-            
-            stored_public_key = base64.b64decode(data.get("public_key", "")).decode('utf-8') if data.get("public_key") else ""
-            secret_key_hash = base64.b64decode(data.get("secret_key_hash", "")).decode('utf-8') if data.get("secret_key_hash") else ""
-            is_active = base64.b64decode(data.get("is_active", "")).decode('utf-8') == "true" if data.get("is_active") else True
-            
-            # Parse JSON annotation
-            api_key_json = annotations.get(API_KEY_ANNOTATION, "{}")
-            metadata = self._parse_api_key_annotation(api_key_json)
-            
-            # Verify public key matches
-            if stored_public_key != public_key:
+            api_key_data = self._api_key_data_from_secret(secret)
+            if not api_key_data or api_key_data["public_key"] != public_key:
                 return None
-            
-            # Check if key is active (not soft-deleted)
-            deleted_at = metadata["deleted_at"]
-            if not is_active or deleted_at is not None:
-                return None
-            
-            # Check expiration
-            expires_at = metadata["expires_at"]
-            if expires_at and expires_at < datetime.now(timezone.utc):
-                return None
-            
-            return {
-                "id": str(secret.metadata.uid),
-                "name": metadata["name"],
-                "public_key": public_key,
-                "secret_key_hash": secret_key_hash,
-                "is_active": is_active,
-                "expires_at": expires_at,
-                "secret_name": secret_name
-            }
+            return api_key_data
             
         except client.rest.ApiException as e:
             if e.status == 404:
@@ -398,6 +422,10 @@ class APIKeyService:
     async def verify_api_key(self, public_key: str, secret_key: str) -> Optional[Dict[str, Any]]:
         """Verify API key credentials.
         
+        Recently verified credentials are served from the verification cache.
+        The last used timestamp is buffered and written back by
+        flush_last_used.
+        
         Args:
             public_key: The public key
             secret_key: The secret key
@@ -405,27 +433,50 @@ class APIKeyService:
         Returns:
             API key data if valid, None otherwise
         """
-        api_key_data = await self.get_api_key_by_public_key(public_key)
-        if not api_key_data:
-            return None
-        
-        # Verify secret key
-        if not self._verify_secret_key(secret_key, api_key_data["secret_key_hash"]):
-            return None
+        api_key_data = verification_cache.get(public_key, secret_key)
+        record_cache_lookup("api_key_verification", api_key_data is not None)
+        if api_key_data is None:
+            # A revocation seen while the secret is read and checked must not be cached over
+            generation = verification_cache.generation
+            api_key_data = await self.get_api_key_by_public_key(public_key)
+            if not api_key_data:
+                return None
+            
+            # Verify secret key off the event loop
+            loop = asyncio.get_running_loop()
+            is_valid = await loop.run_in_executor(
+                bcrypt_executor, self._verify_secret_key, secret_key, api_key_data["secret_key_hash"]
+            )
+            if not is_valid:
+                return None
+            
+            verification_cache.put(public_key, secret_key, api_key_data, generation)
         
-        # Update last used timestamp
-        await self._update_last_used(api_key_data["secret_name"])
+        # Record last used timestamp for the next flush
+        last_used_buffer.record(api_key_data["secret_name"])
         
         return api_key_data
     
-    async def _update_last_used(self, secret_name: str) -> None:
+    async def flush_last_used(self) -> None:
+        """Write buffered last used timestamps back to their secrets."""
+        pending = last_used_buffer.drain()
+        if not pending:
+            return
+        await asyncio.gather(*(
+            self._update_last_used(secret_name, used_at)
+            for secret_name, used_at in pending.items()
+        ))
+        logger.debug(f"Flushed last used timestamps for {len(pending)} API keys")
+    
+    async def _update_last_used(self, secret_name: str, used_at: Optional[datetime] = None) -> None:
         """Update the last used timestamp for an API key.
         
         Args:
             secret_name: The Kubernetes secret name
+            used_at: When the key was last used (defaults to now)
         """
         try:
-            now = datetime.now(timezone.utc)
+            now = used_at or datetime.now(timezone.utc)
             
             async with ApiClient() as api:
                 v1 = client.CoreV1Api(api)
@@ -450,22 +501,57 @@ class APIKeyService:
                     deleted_at=metadata["deleted_at"]
                 )
                 
-                # Update annotations
-                if not secret.metadata.annotations:
-                    secret.metadata.annotations = {}
-                
-                secret.metadata.annotations[API_KEY_ANNOTATION] = updated_json
-                
-                # Patch the secret
+                # Patch only the metadata annotation
                 await v1.patch_namespaced_secret(
                     name=secret_name,
                     namespace=self.namespace,
-                    body=secret
+                    body={"metadata": {"annotations": {API_KEY_ANNOTATION: updated_json}}}
                 )
                 
         except Exception as e:
             logger.error(f"Error updating last used timestamp for {secret_name}: {e}")
     
+    async def watch_api_key_secrets(self) -> None:
+        """Keep the verification cache in sync with API key secrets.
+        
+        Runs until cancelled. The cache is cleared whenever the watch
+        (re)connects, since changes made while disconnected are not replayed.
+        """
+        while True:
+            try:
+                async with ApiClient() as api:
+                    v1 = client.CoreV1Api(api)
+                    w = watch.Watch()
+                    verification_cache.clear()
+                    async for event in w.stream(
+                        v1.list_namespaced_secret,
+                        namespace=self.namespace,
+                        label_selector=f"{API_KEY_TYPE}=true",
+                        timeout_seconds=API_KEY_WATCH_TIMEOUT_SECONDS
+                    ):
+                        secret = event["object"]
+                        if event["type"] == "DELETED":
+                            verification_cache.invalidate_secret(secret.metadata.name)
+                        else:
+                            verification_cache.update_secret(
+                                secret.metadata.name, self._api_key_data_from_secret(secret)
+                            )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"API key secret watch failed, retrying in {API_KEY_WATCH_RETRY_SECONDS}s: {e}")
+                await asyncio.sleep(API_KEY_WATCH_RETRY_SECONDS)
+    
+    async def run_last_used_flusher(self) -> None:
+        """Periodically flush buffered last used timestamps until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(API_KEY_LAST_USED_FLUSH_SECONDS)
+                await self.flush_last_used()
+        finally:
+            # Write what is left on shutdown
+            await asyncio.shield(self.flush_last_used())
+    
     async def delete_api_key(self, public_key: str) -> bool:
         """Soft delete an API key by marking it as inactive.
         
@@ -521,6 +607,8 @@ class APIKeyService:
                     body=secret
                 )
             
+            verification_cache.invalidate_secret(secret_name)
+            last_used_buffer.discard(secret_name)
             logger.info(f"Soft deleted API key {public_key}")
             return True
             
@@ -532,3 +620,16 @@ class APIKeyService:
         except Exception as e:
             logger.error(f"Error deleting API key {public_key}: {e}")
             return False
+
+
+def start_api_key_background_tasks() -> List[asyncio.Task]:
+    """Start the API key secret watch and last used flusher.
+    
+    Returns:
+        The started tasks, to be cancelled on shutdown
+    """
+    service = APIKeyService()
+    return [
+        asyncio.create_task(service.watch_api_key_secrets(), name="api-key-secret-watch"),
+        asyncio.create_task(service.run_last_used_flusher(), name="api-key-last-used-flush"),
+    ]
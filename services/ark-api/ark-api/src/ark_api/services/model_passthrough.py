@@ -0,0 +1,227 @@
+"""Direct model passthrough for OpenAI chat completions targeting `model/<name>`.
+
+A completion for a bare model does not need an agent, tools or memory, yet
+the Query path still writes a Query, waits for the controller to reconcile
+it and watches it to completion. When OPENAI_MODEL_PASSTHROUGH is enabled,
+ark-api resolves the Model resource itself (cached) and calls the provider's
+OpenAI compatible endpoint directly.
+
+Only 'openai' and 'azure' models are served this way; anything that cannot
+be resolved here (other model types, unsupported value sources) raises
+PassthroughUnavailable and the caller falls back to the Query path.
+
+Passthrough calls do not create Query resources: a Query created afterwards
+would be reconciled and run against the model a second time. When
+OPENAI_MODEL_PASSTHROUGH_AUDIT is enabled each call is instead recorded as
+a Kubernetes Event on the Model, written in the background.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.rest import ApiException
+
+from ..core.constants import GROUP
+from ..core.metrics import record_cache_lookup
+from ..utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Serve model/<name> chat completions directly instead of through a Query
+OPENAI_MODEL_PASSTHROUGH = os.getenv("OPENAI_MODEL_PASSTHROUGH", "false").lower() == "true"
+# Record each passthrough call as a Kubernetes Event on the Model
+OPENAI_MODEL_PASSTHROUGH_AUDIT = os.getenv("OPENAI_MODEL_PASSTHROUGH_AUDIT", "true").lower() == "true"
+# How long a resolved Model (including its secrets) is reused
+MODEL_PASSTHROUGH_CACHE_TTL_SECONDS = float(os.getenv("MODEL_PASSTHROUGH_CACHE_TTL_SECONDS", "30"))
+
+SUPPORTED_MODEL_TYPES = ("openai", "azure")
+AUDIT_EVENT_REASON = "PassthroughCompletion"
+
+
+class PassthroughUnavailable(Exception):
+    """The model cannot be called directly; use the Query path instead."""
+
+
+@dataclass(frozen=True)
+class ResolvedModel:
+    """A Model resource with every value source resolved."""
+    name: str
+    namespace: str
+    uid: Optional[str]
+    type: str
+    model: str
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    properties: Dict[str, str] = field(default_factory=dict)
+
+
+async def _resolve_value(v1: client.CoreV1Api, source: Any, namespace: str, what: str) -> str:
+    """Resolve a ValueSource (plain string, value, secretKeyRef or configMapKeyRef)."""
+    if isinstance(source, str):
+        return source
+    if not isinstance(source, dict):
+        raise PassthroughUnavailable(f"{what} is not set")
+    if source.get("value") is not None:
+        return source["value"]
+    value_from = source.get("valueFrom") or {}
+    if "secretKeyRef" in value_from:
+        ref = value_from["secretKeyRef"]
+        secret = await v1.read_namespaced_secret(name=ref["name"], namespace=namespace)
+        if not secret.data or ref["key"] not in secret.data:
+            raise PassthroughUnavailable(f"{what}: key {ref['key']} not found in secret {ref['name']}")
+        return base64.b64decode(secret.data[ref["key"]]).decode("utf-8")
+    if "configMapKeyRef" in value_from:
+        ref = value_from["configMapKeyRef"]
+        config_map = await v1.read_namespaced_config_map(name=ref["name"], namespace=namespace)
+        if not config_map.data or ref["key"] not in config_map.data:
+            raise PassthroughUnavailable(f"{what}: key {ref['key']} not found in configmap {ref['name']}")
+        return config_map.data[ref["key"]]
+    # queryParameterRef and friends only make sense within a Query
+    raise PassthroughUnavailable(f"{what} uses an unsupported value source")
+
+
+async def _load_model(namespace: str, name: str) -> ResolvedModel:
+    async with ApiClient() as api:
+        custom_api = client.CustomObjectsApi(api)
+        v1 = client.CoreV1Api(api)
+        try:
+            model = await custom_api.get_namespaced_custom_object(
+                group=GROUP, version="v1alpha1", namespace=namespace, plural="models", name=name
+            )
+        except ApiException as e:
+            raise PassthroughUnavailable(f"cannot read model {name}: {e.status} {e.reason}")
+
+        spec = model.get("spec", {})
+        model_type = spec.get("type") or spec.get("provider")
+        if model_type not in SUPPORTED_MODEL_TYPES:
+            raise PassthroughUnavailable(f"model type '{model_type}' is not supported for passthrough")
+        config = (spec.get("config") or {}).get(model_type) or {}
+
+        model_name = await _resolve_value(v1, spec.get("model"), namespace, "model")
+        base_url = (await _resolve_value(v1, config.get("baseUrl"), namespace, "baseUrl")).rstrip("/")
+        api_key = await _resolve_value(v1, config.get("apiKey"), namespace, "apiKey")
+
+        headers: Dict[str, str] = {}
+        for header in config.get("headers") or []:
+            headers[header["name"]] = await _resolve_value(v1, header.get("value"), namespace, f"header {header['name']}")
+
+        properties: Dict[str, str] = {}
+        for key, source in (config.get("properties") or {}).items():
+            properties[key] = await _resolve_value(v1, source, namespace, f"property {key}")
+
+        if model_type == "azure":
+            api_version = ""
+            if config.get("apiVersion") is not None:
+                api_version = await _resolve_value(v1, config["apiVersion"], namespace, "apiVersion")
+            url = f"{base_url}/openai/deployments/{model_name}/chat/completions"
+            if api_version:
+                url = f"{url}?api-version={api_version}"
+            headers["api-key"] = api_key
+        else:
+            url = f"{base_url}/chat/completions"
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        return ResolvedModel(
+            name=name,
+            namespace=namespace,
+            uid=model.get("metadata", {}).get("uid"),
+            type=model_type,
+            model=model_name,
+            url=url,
+            headers=headers,
+            properties=properties,
+        )
+
+
+_model_cache: TTLCache[ResolvedModel] = TTLCache(MODEL_PASSTHROUGH_CACHE_TTL_SECONDS, max_entries=512)
+_model_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+
+async def resolve_model(namespace: str, name: str) -> ResolvedModel:
+    """Resolve a Model for direct calls, using the cache when possible.
+
+    Raises:
+        PassthroughUnavailable: If the model cannot be called directly
+    """
+    key = (namespace, name)
+    resolved = _model_cache.get(key)
+    record_cache_lookup("passthrough_model", resolved is not None)
+    if resolved is not None:
+        return resolved
+    lock = _model_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        resolved = _model_cache.get(key)
+        if resolved is None:
+            resolved = await _load_model(namespace, name)
+            _model_cache.put(key, resolved)
+        return resolved
+
+
+def _property_value(value: str) -> Any:
+    """Model properties are strings; send numbers and booleans as JSON values."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def build_request_body(resolved: ResolvedModel, messages: list, stream: bool) -> Dict[str, Any]:
+    """Build the provider request body the controller would send for a Query.
+
+    Like the Query path, sampling parameters come from the Model's properties
+    (temperature and n default to 1), not from the client request.
+    """
+    body: Dict[str, Any] = {"model": resolved.model, "messages": messages, "temperature": 1.0, "n": 1}
+    for key, value in resolved.properties.items():
+        if value != "":
+            body[key] = _property_value(value)
+    if stream:
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
+    return body
+
+
+_audit_tasks: Set[asyncio.Task] = set()
+
+
+async def _record_audit_event(resolved: ResolvedModel, message: str, succeeded: bool) -> None:
+    now = datetime.now(timezone.utc)
+    event = client.CoreV1Event(
+        metadata=client.V1ObjectMeta(generate_name=f"{resolved.name}.", namespace=resolved.namespace),
+        involved_object=client.V1ObjectReference(
+            api_version=f"{GROUP}/v1alpha1",
+            kind="Model",
+            name=resolved.name,
+            namespace=resolved.namespace,
+            uid=resolved.uid,
+        ),
+        reason=AUDIT_EVENT_REASON,
+        message=message,
+        type="Normal" if succeeded else "Warning",
+        source=client.V1EventSource(component="ark-api"),
+        first_timestamp=now,
+        last_timestamp=now,
+        count=1,
+    )
+    try:
+        async with ApiClient() as api:
+            await client.CoreV1Api(api).create_namespaced_event(namespace=resolved.namespace, body=event)
+    except Exception as e:
+        logger.warning(f"Failed to record passthrough audit event for model {resolved.name}: {e}")
+
+
+def schedule_audit(resolved: ResolvedModel, message: str, succeeded: bool = True) -> None:
+    """Record a passthrough call in the background, if auditing is enabled."""
+    if not OPENAI_MODEL_PASSTHROUGH_AUDIT:
+        return
+    task = asyncio.create_task(_record_audit_event(resolved, message, succeeded))
+    _audit_tasks.add(task)
+    task.add_done_callback(_audit_tasks.discard)
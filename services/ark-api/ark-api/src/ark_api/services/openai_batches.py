@@ -0,0 +1,773 @@
+"""OpenAI Batch API support: local file store and batch runner.
+
+Input files are uploaded as JSONL, one chat completion request per line.
+A batch executes the requests of its input file with bounded concurrency
+(shared across all batches) and appends each result to an output or error
+JSONL file as soon as it is available, so results never accumulate in
+memory. Files and batch records live under OPENAI_BATCH_STORAGE_DIR; batches
+that were still running when the process stopped are resumed on start,
+skipping requests whose results were already written.
+
+Several workers can share the storage directory. A batch runs in the worker
+holding its run lock, so a batch is never executed twice; reads pick up
+files and batches written by other workers from disk, and a batch running
+elsewhere is cancelled through a marker file its runner checks. The worker
+that started (the leader) also checks every OPENAI_BATCH_RESUME_SECONDS for
+unfinished batches whose run lock is free, e.g. because the worker running
+them died, and resumes them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import aiofiles
+from fastapi import UploadFile
+from openai.types import Batch, FileObject
+from openai.types.batch import Errors
+from openai.types.batch_error import BatchError
+from openai.types.batch_request_counts import BatchRequestCounts
+
+from ..utils.leader_election import try_lock_file, unlock_file
+
+logger = logging.getLogger(__name__)
+
+# Directory holding uploaded files, result files and batch records
+OPENAI_BATCH_STORAGE_DIR = os.getenv(
+    "OPENAI_BATCH_STORAGE_DIR", os.path.join(tempfile.gettempdir(), "ark-api-batches")
+)
+# Maximum number of batch requests executed at once, across all batches
+OPENAI_BATCH_CONCURRENCY = int(os.getenv("OPENAI_BATCH_CONCURRENCY", "16"))
+# Upload limits (same defaults as the OpenAI Batch API)
+OPENAI_BATCH_MAX_FILE_BYTES = int(os.getenv("OPENAI_BATCH_MAX_FILE_BYTES", str(200 * 1024 * 1024)))
+OPENAI_BATCH_MAX_REQUESTS = int(os.getenv("OPENAI_BATCH_MAX_REQUESTS", "50000"))
+
+SUPPORTED_ENDPOINTS = ("/v1/chat/completions",)
+COMPLETION_WINDOW = "24h"
+COMPLETION_WINDOW_SECONDS = 24 * 60 * 60
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Validation errors reported per batch (the rest are counted, not listed)
+MAX_REPORTED_ERRORS = 100
+# How often the leader looks for unfinished batches no worker is running
+OPENAI_BATCH_RESUME_SECONDS = float(os.getenv("OPENAI_BATCH_RESUME_SECONDS", "10"))
+# How often a running batch saves its progress for other workers to read
+PROGRESS_SAVE_SECONDS = 1
+
+# Executes one request body in a namespace, returning (HTTP status code, response body)
+BatchRequestExecutor = Callable[[Dict[str, Any], str], Awaitable[Tuple[int, Dict[str, Any]]]]
+
+_UNFINISHED_STATUSES = ("validating", "in_progress", "finalizing", "cancelling")
+
+
+class BatchAPIError(Exception):
+    """Error returned to the client in OpenAI error format."""
+
+    def __init__(self, status_code: int, message: str, code: str = "invalid_request_error"):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.code = code
+
+
+@dataclass
+class _FileRecord:
+    file: FileObject
+    # Principal and namespace the file belongs to (None for files stored
+    # before files were scoped)
+    owner: Optional[str] = None
+    namespace: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"file": self.file.model_dump(), "owner": self.owner, "namespace": self.namespace}
+
+
+@dataclass
+class _BatchRecord:
+    batch: Batch
+    namespace: str
+    output_file_id: str
+    error_file_id: str
+    owner: Optional[str] = None
+    cancel_requested: asyncio.Event = field(default_factory=asyncio.Event)
+    write_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "batch": self.batch.model_dump(),
+            "namespace": self.namespace,
+            "owner": self.owner,
+            "output_file_id": self.output_file_id,
+            "error_file_id": self.error_file_id,
+        }
+
+
+# Identifies one version of a stored JSON file: (inode, mtime, size). Files
+# are replaced atomically, so every write produces a new key.
+StatKey = Tuple[int, int, int]
+
+
+def _stat_key(path: str) -> Optional[StatKey]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> Optional[StatKey]:
+    """Atomically replace a JSON file, returning the key of the new version."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    return _stat_key(path)
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_changed(path: str, known: Optional[StatKey]) -> Tuple[Optional[StatKey], Optional[Dict[str, Any]]]:
+    """Read a JSON file unless it is still the version identified by known.
+
+    Returns:
+        Tuple of (key, data): key is None if the file does not exist, data
+        is None if the file is unchanged
+    """
+    key = _stat_key(path)
+    if key is None or key == known:
+        return key, None
+    try:
+        return key, _read_json(path)
+    except FileNotFoundError:
+        return None, None
+
+
+def _scan_json_dir(
+    directory: str, known: Dict[str, StatKey]
+) -> Dict[str, Tuple[Optional[StatKey], Optional[Dict[str, Any]]]]:
+    """_read_changed for every JSON file in a directory, by id (file name without .json)."""
+    entries = {}
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            entry_id = name[:-len(".json")]
+            key, data = _read_changed(os.path.join(directory, name), known.get(entry_id))
+            if key is not None:
+                entries[entry_id] = (key, data)
+    return entries
+
+
+def _load_file_record(data: Dict[str, Any]) -> _FileRecord:
+    if "file" not in data:
+        # Stored before files were scoped to an owner and namespace
+        return _FileRecord(file=FileObject.model_validate(data))
+    return _FileRecord(
+        file=FileObject.model_validate(data["file"]),
+        owner=data.get("owner"),
+        namespace=data.get("namespace"),
+    )
+
+
+def _load_batch_record(data: Dict[str, Any]) -> _BatchRecord:
+    return _BatchRecord(
+        batch=Batch.model_validate(data["batch"]),
+        namespace=data["namespace"],
+        owner=data.get("owner"),
+        output_file_id=data["output_file_id"],
+        error_file_id=data["error_file_id"],
+    )
+
+
+def _visible(owner: Optional[str], namespace: Optional[str], request_owner: Optional[str], request_namespace: str) -> bool:
+    """Whether a file or batch belongs to the principal and namespace of a request."""
+    return owner == request_owner and namespace in (None, request_namespace)
+
+
+def _validation_error(line: int, message: str, code: str = "invalid_request") -> BatchError:
+    return BatchError(code=code, line=line, message=message)
+
+
+class OpenAIBatchService:
+    """Stores batch files and runs batches of chat completion requests.
+
+    Files and batches belong to the principal (API key or JWT subject, None
+    when authentication is off) and namespace that created them; other
+    principals and namespaces get 404 for them.
+    """
+
+    def __init__(
+        self,
+        executor: BatchRequestExecutor,
+        storage_dir: str = OPENAI_BATCH_STORAGE_DIR,
+        concurrency: int = OPENAI_BATCH_CONCURRENCY,
+        max_file_bytes: int = OPENAI_BATCH_MAX_FILE_BYTES,
+        max_requests: int = OPENAI_BATCH_MAX_REQUESTS,
+    ):
+        self._executor = executor
+        self.storage_dir = storage_dir
+        self.max_file_bytes = max_file_bytes
+        self.max_requests = max_requests
+        self._files_dir = os.path.join(storage_dir, "files")
+        self._batches_dir = os.path.join(storage_dir, "batches")
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._files: Dict[str, _FileRecord] = {}
+        self._batches: Dict[str, _BatchRecord] = {}
+        # Version of each record's JSON file last read or written
+        self._file_keys: Dict[str, StatKey] = {}
+        self._batch_keys: Dict[str, StatKey] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._resumer: Optional[asyncio.Task] = None
+        self._dirs_created = False
+
+    # Lifecycle
+
+    def _ensure_dirs(self) -> None:
+        if not self._dirs_created:
+            os.makedirs(self._files_dir, exist_ok=True)
+            os.makedirs(self._batches_dir, exist_ok=True)
+            self._dirs_created = True
+
+    # Stored state is re-read from disk, in a worker thread, to pick up files
+    # and batches written by other workers. Only JSON files that changed since
+    # they were last read are parsed again.
+
+    def _apply_file(self, file_id: str, key: Optional[StatKey], data: Optional[Dict[str, Any]]) -> None:
+        if key is None:
+            self._files.pop(file_id, None)
+            self._file_keys.pop(file_id, None)
+            return
+        if data is not None:
+            self._files[file_id] = _load_file_record(data)
+        self._file_keys[file_id] = key
+
+    def _apply_batch(self, batch_id: str, key: Optional[StatKey], data: Optional[Dict[str, Any]]) -> None:
+        if batch_id in self._tasks:
+            # Running here, memory is current
+            return
+        if key is None:
+            self._batches.pop(batch_id, None)
+            self._batch_keys.pop(batch_id, None)
+            return
+        if data is not None:
+            loaded = _load_batch_record(data)
+            record = self._batches.get(batch_id)
+            if record is None:
+                self._batches[batch_id] = loaded
+            else:
+                record.batch = loaded.batch
+        self._batch_keys[batch_id] = key
+
+    async def _refresh_file(self, file_id: str) -> None:
+        """Pick up a file stored or deleted by another worker."""
+        self._ensure_dirs()
+        path = os.path.join(self._files_dir, f"{file_id}.json")
+        self._apply_file(file_id, *await asyncio.to_thread(_read_changed, path, self._file_keys.get(file_id)))
+
+    async def _refresh_batch(self, batch_id: str) -> None:
+        """Pick up the state of a batch created or run by another worker."""
+        self._ensure_dirs()
+        if batch_id in self._tasks:
+            return
+        path = os.path.join(self._batches_dir, f"{batch_id}.json")
+        self._apply_batch(batch_id, *await asyncio.to_thread(_read_changed, path, self._batch_keys.get(batch_id)))
+
+    async def _refresh_all(self) -> None:
+        self._ensure_dirs()
+        # Records written here while the scan runs are not in the snapshots
+        # and so are never mistaken for deleted ones
+        for known, directory, apply in (
+            (dict(self._file_keys), self._files_dir, self._apply_file),
+            (dict(self._batch_keys), self._batches_dir, self._apply_batch),
+        ):
+            entries = await asyncio.to_thread(_scan_json_dir, directory, known)
+            for entry_id, (key, data) in entries.items():
+                apply(entry_id, key, data)
+            for entry_id in known.keys() - entries.keys():
+                apply(entry_id, None, None)
+
+    async def start(self) -> None:
+        """Resume batches interrupted by a restart, then keep resuming orphaned ones.
+
+        Called by the leader only: batches whose worker died are picked up
+        within OPENAI_BATCH_RESUME_SECONDS.
+        """
+        await self._resume_unfinished()
+        self._resumer = asyncio.create_task(self._resume_loop(), name="openai-batch-resume")
+
+    async def _resume_loop(self) -> None:
+        while True:
+            await asyncio.sleep(OPENAI_BATCH_RESUME_SECONDS)
+            try:
+                await self._resume_unfinished()
+            except Exception as e:
+                logger.warning(f"Failed to check for batches to resume: {e}")
+
+    async def _resume_unfinished(self) -> None:
+        """Run every unfinished batch that no worker holds the run lock of."""
+        await self._refresh_all()
+        for record in list(self._batches.values()):
+            if record.batch.status in _UNFINISHED_STATUSES and record.batch.id not in self._tasks:
+                await self._resume(record.batch.id)
+
+    async def _resume(self, batch_id: str) -> None:
+        lock = try_lock_file(os.path.join(self._batches_dir, f"{batch_id}.lock"))
+        if lock is None:
+            # Running in another worker
+            return
+        # The runner may have finished between the scan and the lock
+        path = os.path.join(self._batches_dir, f"{batch_id}.json")
+        self._apply_batch(batch_id, *await asyncio.to_thread(_read_changed, path, None))
+        record = self._batches.get(batch_id)
+        if record is None or record.batch.status not in _UNFINISHED_STATUSES or batch_id in self._tasks:
+            unlock_file(lock)
+            return
+        logger.info(f"Resuming batch {batch_id} ({record.batch.status})")
+        self._run_locked(record, lock)
+
+    async def close(self) -> None:
+        """Stop running batches; they are resumed on the next start."""
+        tasks = list(self._tasks.values())
+        if self._resumer is not None:
+            tasks.append(self._resumer)
+            self._resumer = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    # Files
+
+    def _content_path(self, file_id: str) -> str:
+        return os.path.join(self._files_dir, file_id)
+
+    async def _save_file_record(self, record: _FileRecord) -> None:
+        file_id = record.file.id
+        key = await asyncio.to_thread(_write_json, os.path.join(self._files_dir, f"{file_id}.json"), record.to_dict())
+        self._files[file_id] = record
+        self._file_keys[file_id] = key
+
+    async def create_file(self, upload: UploadFile, purpose: str, *, namespace: str, owner: Optional[str] = None) -> FileObject:
+        """Store an uploaded file, streaming it to disk in chunks."""
+        self._ensure_dirs()
+        if purpose != "batch":
+            raise BatchAPIError(400, f"Unsupported purpose '{purpose}', only 'batch' is supported")
+
+        file_id = f"file-{uuid.uuid4().hex}"
+        path = self._content_path(file_id)
+        size = 0
+        try:
+            async with aiofiles.open(path, "wb") as f:
+                while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > self.max_file_bytes:
+                        raise BatchAPIError(413, f"File exceeds the maximum size of {self.max_file_bytes} bytes")
+                    await f.write(chunk)
+        except BaseException:
+            await asyncio.to_thread(self._remove, path)
+            raise
+
+        file_object = FileObject(
+            id=file_id,
+            object="file",
+            bytes=size,
+            created_at=int(time.time()),
+            filename=upload.filename or file_id,
+            purpose="batch",
+            status="uploaded",
+        )
+        await self._save_file_record(_FileRecord(file=file_object, owner=owner, namespace=namespace))
+        logger.info(f"Stored batch input file {file_id} ({size} bytes) in namespace {namespace}")
+        return file_object
+
+    async def get_file(self, file_id: str, *, namespace: str, owner: Optional[str] = None) -> FileObject:
+        await self._refresh_file(file_id)
+        record = self._files.get(file_id)
+        if record is None or not _visible(record.owner, record.namespace, owner, namespace):
+            raise BatchAPIError(404, f"No such file: {file_id}", code="not_found")
+        return record.file
+
+    async def list_files(self, *, namespace: str, owner: Optional[str] = None, purpose: Optional[str] = None) -> List[FileObject]:
+        await self._refresh_all()
+        files = [
+            r.file for r in self._files.values()
+            if _visible(r.owner, r.namespace, owner, namespace) and (purpose is None or r.file.purpose == purpose)
+        ]
+        return sorted(files, key=lambda f: f.created_at, reverse=True)
+
+    async def file_content_path(self, file_id: str, *, namespace: str, owner: Optional[str] = None) -> str:
+        """Path of a stored file's content, for streaming it back to the client."""
+        await self.get_file(file_id, namespace=namespace, owner=owner)
+        return self._content_path(file_id)
+
+    async def delete_file(self, file_id: str, *, namespace: str, owner: Optional[str] = None) -> None:
+        await self.get_file(file_id, namespace=namespace, owner=owner)
+        await self._refresh_all()
+        for record in self._batches.values():
+            if record.batch.input_file_id == file_id and record.batch.status in _UNFINISHED_STATUSES:
+                raise BatchAPIError(409, f"File {file_id} is in use by batch {record.batch.id}", code="conflict")
+        self._files.pop(file_id, None)
+        self._file_keys.pop(file_id, None)
+        await asyncio.to_thread(self._remove, self._content_path(file_id))
+        await asyncio.to_thread(self._remove, os.path.join(self._files_dir, f"{file_id}.json"))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    # Batches
+
+    async def _save_batch(self, record: _BatchRecord) -> None:
+        key = await asyncio.to_thread(
+            _write_json, os.path.join(self._batches_dir, f"{record.batch.id}.json"), record.to_dict()
+        )
+        self._batch_keys[record.batch.id] = key
+
+    async def create_batch(
+        self,
+        input_file_id: str,
+        endpoint: str,
+        completion_window: str,
+        namespace: str,
+        owner: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Batch:
+        """Create a batch and start executing it in the background."""
+        if endpoint not in SUPPORTED_ENDPOINTS:
+            raise BatchAPIError(400, f"Unsupported endpoint '{endpoint}', supported: {', '.join(SUPPORTED_ENDPOINTS)}")
+        if completion_window != COMPLETION_WINDOW:
+            raise BatchAPIError(400, f"Unsupported completion_window '{completion_window}', only '{COMPLETION_WINDOW}' is supported")
+        input_file = await self.get_file(input_file_id, namespace=namespace, owner=owner)
+        if input_file.purpose != "batch":
+            raise BatchAPIError(400, f"File {input_file_id} does not have purpose 'batch'")
+
+        now = int(time.time())
+        record = _BatchRecord(
+            batch=Batch(
+                id=f"batch_{uuid.uuid4().hex}",
+                object="batch",
+                endpoint=endpoint,
+                input_file_id=input_file_id,
+                completion_window=completion_window,
+                status="validating",
+                created_at=now,
+                expires_at=now + COMPLETION_WINDOW_SECONDS,
+                request_counts=BatchRequestCounts(total=0, completed=0, failed=0),
+                metadata=metadata,
+            ),
+            namespace=namespace,
+            owner=owner,
+            output_file_id=f"file-{uuid.uuid4().hex}",
+            error_file_id=f"file-{uuid.uuid4().hex}",
+        )
+        self._batches[record.batch.id] = record
+        await self._save_batch(record)
+        self._start_runner(record)
+        logger.info(f"Created batch {record.batch.id} for file {input_file_id} in namespace {namespace}")
+        return record.batch
+
+    async def _get_record(self, batch_id: str, namespace: str, owner: Optional[str]) -> _BatchRecord:
+        await self._refresh_batch(batch_id)
+        record = self._batches.get(batch_id)
+        if record is None or not _visible(record.owner, record.namespace, owner, namespace):
+            raise BatchAPIError(404, f"No such batch: {batch_id}", code="not_found")
+        return record
+
+    async def get_batch(self, batch_id: str, *, namespace: str, owner: Optional[str] = None) -> Batch:
+        return (await self._get_record(batch_id, namespace, owner)).batch
+
+    async def list_batches(
+        self, *, namespace: str, owner: Optional[str] = None, limit: int = 20, after: Optional[str] = None
+    ) -> Tuple[List[Batch], bool]:
+        """List batches newest first, paginated by the id of the last batch seen.
+
+        Returns:
+            Tuple of (batches, has_more)
+        """
+        await self._refresh_all()
+        batches = sorted(
+            (r.batch for r in self._batches.values() if _visible(r.owner, r.namespace, owner, namespace)),
+            key=lambda b: (b.created_at, b.id),
+            reverse=True,
+        )
+        if after:
+            ids = [b.id for b in batches]
+            if after not in ids:
+                raise BatchAPIError(400, f"Invalid 'after' cursor: {after}")
+            batches = batches[ids.index(after) + 1:]
+        return batches[:limit], len(batches) > limit
+
+    async def cancel_batch(self, batch_id: str, *, namespace: str, owner: Optional[str] = None) -> Batch:
+        """Stop scheduling new requests; in flight requests are allowed to finish."""
+        record = await self._get_record(batch_id, namespace, owner)
+        if record.batch.status in ("validating", "in_progress"):
+            record.batch.status = "cancelling"
+            record.batch.cancelling_at = int(time.time())
+            record.cancel_requested.set()
+            await self._save_batch(record)
+            if batch_id not in self._tasks:
+                # Tell the worker running it
+                await asyncio.to_thread(_write_json, self._cancel_marker_path(batch_id), {})
+        elif record.batch.status != "cancelling":
+            raise BatchAPIError(409, f"Batch {batch_id} cannot be cancelled in status '{record.batch.status}'", code="conflict")
+        return record.batch
+
+    # Execution
+
+    def _cancel_marker_path(self, batch_id: str) -> str:
+        return os.path.join(self._batches_dir, f"{batch_id}.cancel")
+
+    def _start_runner(self, record: _BatchRecord) -> None:
+        batch_id = record.batch.id
+        lock = try_lock_file(os.path.join(self._batches_dir, f"{batch_id}.lock"))
+        if lock is None:
+            logger.info(f"Batch {batch_id} is running in another worker")
+            return
+        self._run_locked(record, lock)
+
+    def _run_locked(self, record: _BatchRecord, lock: int) -> None:
+        """Run a batch whose run lock this worker holds, releasing it when done."""
+        batch_id = record.batch.id
+        if record.batch.status == "cancelling":
+            record.cancel_requested.set()
+        task = asyncio.create_task(self._run(record), name=f"openai-batch-{batch_id}")
+        self._tasks[batch_id] = task
+
+        def done(_: asyncio.Task) -> None:
+            self._tasks.pop(batch_id, None)
+            unlock_file(lock)
+        task.add_done_callback(done)
+
+    def _poll_cancel(self, record: _BatchRecord) -> bool:
+        """Whether the batch was cancelled, in this worker or another one."""
+        if not record.cancel_requested.is_set() and os.path.exists(self._cancel_marker_path(record.batch.id)):
+            record.batch.status = "cancelling"
+            record.batch.cancelling_at = record.batch.cancelling_at or int(time.time())
+            record.cancel_requested.set()
+        return record.cancel_requested.is_set()
+
+    async def _validate(self, path: str) -> Tuple[int, List[BatchError]]:
+        """Check every line of an input file.
+
+        Returns:
+            Tuple of (number of requests, validation errors)
+        """
+        total = 0
+        errors: List[BatchError] = []
+        custom_ids: Set[str] = set()
+        line_number = 0
+        async with aiofiles.open(path, "r", encoding="utf-8") as f:
+            async for line in f:
+                line_number += 1
+                if not line.strip():
+                    continue
+                total += 1
+                if len(errors) >= MAX_REPORTED_ERRORS:
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as e:
+                    errors.append(_validation_error(line_number, f"Invalid JSON: {e}", "invalid_json_line"))
+                    continue
+                if not isinstance(item, dict):
+                    errors.append(_validation_error(line_number, "Each line must be a JSON object"))
+                    continue
+                custom_id = item.get("custom_id")
+                if not isinstance(custom_id, str) or not custom_id:
+                    errors.append(_validation_error(line_number, "Missing 'custom_id'"))
+                elif custom_id in custom_ids:
+                    errors.append(_validation_error(line_number, f"Duplicate custom_id '{custom_id}'", "duplicate_custom_id"))
+                else:
+                    custom_ids.add(custom_id)
+                if item.get("method") != "POST":
+                    errors.append(_validation_error(line_number, "'method' must be 'POST'"))
+                if item.get("url") not in SUPPORTED_ENDPOINTS:
+                    errors.append(_validation_error(line_number, f"Unsupported url '{item.get('url')}'", "invalid_url"))
+                if not isinstance(item.get("body"), dict):
+                    errors.append(_validation_error(line_number, "'body' must be an object"))
+        if total == 0:
+            errors.append(_validation_error(0, "Input file contains no requests", "empty_file"))
+        elif total > self.max_requests:
+            errors.append(_validation_error(0, f"Input file has {total} requests, the maximum is {self.max_requests}", "too_many_requests"))
+        return total, errors
+
+    async def _completed_custom_ids(self, record: _BatchRecord) -> Tuple[Set[str], int, int]:
+        """Read back results already written (when resuming a batch).
+
+        Returns:
+            Tuple of (custom ids with a result, completed count, failed count)
+        """
+        done: Set[str] = set()
+        counts = []
+        for file_id in (record.output_file_id, record.error_file_id):
+            count = 0
+            path = self._content_path(file_id)
+            if os.path.exists(path):
+                async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                    async for line in f:
+                        try:
+                            done.add(json.loads(line)["custom_id"])
+                            count += 1
+                        except (json.JSONDecodeError, KeyError):
+                            # Partially written last line, the request is run again
+                            continue
+            counts.append(count)
+        return done, counts[0], counts[1]
+
+    async def _run(self, record: _BatchRecord) -> None:
+        batch = record.batch
+        try:
+            input_path = self._content_path(batch.input_file_id)
+            if batch.status == "validating":
+                total, errors = await self._validate(input_path)
+                if errors:
+                    batch.status = "failed"
+                    batch.failed_at = int(time.time())
+                    batch.errors = Errors(object="list", data=errors)
+                    batch.request_counts = BatchRequestCounts(total=total, completed=0, failed=0)
+                    await self._save_batch(record)
+                    logger.info(f"Batch {batch.id} failed validation with {len(errors)} error(s)")
+                    return
+                # A cancel during validation leaves the batch in 'cancelling'
+                self._poll_cancel(record)
+                if batch.status == "validating":
+                    batch.status = "in_progress"
+                    batch.in_progress_at = int(time.time())
+                batch.request_counts = BatchRequestCounts(total=total, completed=0, failed=0)
+                await self._save_batch(record)
+
+            done, completed, failed = await self._completed_custom_ids(record)
+            batch.request_counts = BatchRequestCounts(total=batch.request_counts.total, completed=completed, failed=failed)
+
+            if batch.status in ("in_progress", "cancelling"):
+                await self._execute_requests(record, input_path, done)
+
+            await self._finalize(record)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Batch {batch.id} failed: {e}")
+            batch.status = "failed"
+            batch.failed_at = int(time.time())
+            batch.errors = Errors(object="list", data=[BatchError(code="server_error", message=str(e))])
+            await self._save_batch(record)
+
+    async def _execute_requests(self, record: _BatchRecord, input_path: str, done: Set[str]) -> None:
+        """Run every request without a result, at most `concurrency` at a time."""
+        batch = record.batch
+        pending: Set[asyncio.Task] = set()
+        saved_at = time.monotonic()
+        async with aiofiles.open(self._content_path(record.output_file_id), "a", encoding="utf-8") as output, \
+                aiofiles.open(self._content_path(record.error_file_id), "a", encoding="utf-8") as error_output:
+            try:
+                async with aiofiles.open(input_path, "r", encoding="utf-8") as f:
+                    async for line in f:
+                        if not line.strip():
+                            continue
+                        item = json.loads(line)
+                        if item["custom_id"] in done:
+                            continue
+                        if time.monotonic() - saved_at >= PROGRESS_SAVE_SECONDS:
+                            await self._save_batch(record)
+                            saved_at = time.monotonic()
+                        # Waiting for a slot here keeps the input file from being read ahead
+                        await self._semaphore.acquire()
+                        if self._poll_cancel(record) or time.time() >= batch.expires_at:
+                            self._semaphore.release()
+                            break
+                        task = asyncio.create_task(self._execute_request(record, item, output, error_output))
+                        pending.add(task)
+                        task.add_done_callback(pending.discard)
+                if pending:
+                    await asyncio.gather(*pending)
+            except asyncio.CancelledError:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise
+
+    async def _execute_request(self, record: _BatchRecord, item: Dict[str, Any], output, error_output) -> None:
+        try:
+            try:
+                status_code, body = await self._executor(item["body"], record.namespace)
+            except Exception as e:
+                logger.warning(f"Batch {record.batch.id} request {item['custom_id']} failed: {e}")
+                status_code = 500
+                body = {"error": {"message": str(e), "type": "server_error", "code": "internal_error"}}
+
+            result = {
+                "id": f"batch_req_{uuid.uuid4().hex}",
+                "custom_id": item["custom_id"],
+                "response": {"status_code": status_code, "body": body},
+                "error": None,
+            }
+            succeeded = status_code == 200
+            async with record.write_lock:
+                target = output if succeeded else error_output
+                await target.write(json.dumps(result) + "\n")
+                await target.flush()
+                counts = record.batch.request_counts
+                record.batch.request_counts = BatchRequestCounts(
+                    total=counts.total,
+                    completed=counts.completed + (1 if succeeded else 0),
+                    failed=counts.failed + (0 if succeeded else 1),
+                )
+        finally:
+            self._semaphore.release()
+
+    async def _register_result_file(self, record: _BatchRecord, file_id: str, filename: str) -> Optional[str]:
+        """Publish a result file of a batch if it has content, otherwise remove it."""
+        path = self._content_path(file_id)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size == 0:
+            await asyncio.to_thread(self._remove, path)
+            return None
+        await self._save_file_record(_FileRecord(
+            file=FileObject(
+                id=file_id,
+                object="file",
+                bytes=size,
+                created_at=int(time.time()),
+                filename=filename,
+                purpose="batch_output",
+                status="processed",
+            ),
+            owner=record.owner,
+            namespace=record.namespace,
+        ))
+        return file_id
+
+    async def _finalize(self, record: _BatchRecord) -> None:
+        batch = record.batch
+        cancelled = batch.status == "cancelling"
+        expired = not cancelled and time.time() >= batch.expires_at
+        batch.status = "finalizing"
+        batch.finalizing_at = int(time.time())
+        await self._save_batch(record)
+
+        batch.output_file_id = await self._register_result_file(record, record.output_file_id, f"{batch.id}_output.jsonl")
+        batch.error_file_id = await self._register_result_file(record, record.error_file_id, f"{batch.id}_error.jsonl")
+
+        now = int(time.time())
+        if cancelled:
+            batch.status = "cancelled"
+            batch.cancelled_at = now
+        elif expired:
+            batch.status = "expired"
+            batch.expired_at = now
+        else:
+            batch.status = "completed"
+            batch.completed_at = now
+        await self._save_batch(record)
+        await asyncio.to_thread(self._remove, self._cancel_marker_path(batch.id))
+        counts = batch.request_counts
+        logger.info(f"Batch {batch.id} {batch.status}: {counts.completed} completed, {counts.failed} failed of {counts.total}")
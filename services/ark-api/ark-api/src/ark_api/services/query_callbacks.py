@@ -0,0 +1,356 @@
+"""Completion callbacks (webhooks) for queries.
+
+A query created with a callback URL carries it in the completion-callback
+annotation. The notifier follows the shared query watch of each namespace
+that has callbacks and, once such a query reaches a terminal phase, POSTs
+its final status to the URL, retrying with exponential backoff.
+
+The outcome is written back to the query as the completion-callback-status
+annotation ('delivered' or 'failed'), so a query is notified once even
+across restarts. Deliveries interrupted by a shutdown are retried on the
+next start (delivery is at least once). Namespaces with callbacks are
+recorded in QUERY_CALLBACK_NAMESPACES_PATH and all of them are watched
+again on start, so callbacks owed in any namespace survive a restart (mount
+a persistent volume there for them to survive the pod being replaced).
+
+Only the leader worker (see utils/leader_election.py) watches and delivers.
+Other workers record the namespace of a new callback query in the same
+file, and the leader picks it up within QUERY_CALLBACK_NAMESPACES_POLL_SECONDS.
+
+Callbacks are POSTed from inside the cluster, so their URLs are
+restricted: the host must be listed in QUERY_CALLBACK_ALLOWED_HOSTS
+(callbacks are disabled while it is empty) and must resolve only to public
+addresses, never loopback, link-local or private ones. URLs are checked
+when a query is created and again before every delivery, and redirects are
+not followed.
+
+When QUERY_CALLBACK_SIGNING_SECRET is set each request carries
+X-Ark-Timestamp and X-Ark-Signature headers. The signature is
+"sha256=" + hex(HMAC-SHA256(secret, timestamp + "." + body)); receivers
+should recompute it and reject stale timestamps.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import re
+import socket
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from kubernetes_asyncio import client
+from kubernetes_asyncio.client.api_client import ApiClient
+
+from ..constants.annotations import QUERY_CALLBACK_ANNOTATION, QUERY_CALLBACK_STATUS_ANNOTATION
+from ..core.constants import GROUP
+from ..core.http import get_http_client
+from ..core.metrics import QUERY_CALLBACK_ATTEMPTS, QUERY_CALLBACK_DELIVERIES, QUERY_CALLBACK_DELIVERY_SECONDS
+from ..utils.query_watch import get_query_watch
+
+logger = logging.getLogger(__name__)
+
+# Hosts callbacks may be sent to, e.g. "hooks.example.com,*.example.org" (none when empty)
+QUERY_CALLBACK_ALLOWED_HOSTS = [
+    host.strip().lower() for host in os.getenv("QUERY_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+]
+# Namespaces with callbacks, one per line, watched again on start
+QUERY_CALLBACK_NAMESPACES_PATH = os.getenv(
+    "QUERY_CALLBACK_NAMESPACES_PATH", os.path.join(tempfile.gettempdir(), "ark-api-callback-namespaces")
+)
+# How often the leader checks the namespaces file for namespaces recorded by other workers
+QUERY_CALLBACK_NAMESPACES_POLL_SECONDS = float(os.getenv("QUERY_CALLBACK_NAMESPACES_POLL_SECONDS", "5"))
+# Secret used to sign callback requests (unsigned when empty)
+QUERY_CALLBACK_SIGNING_SECRET = os.getenv("QUERY_CALLBACK_SIGNING_SECRET", "")
+# Attempts per callback before it is marked as failed
+QUERY_CALLBACK_MAX_ATTEMPTS = int(os.getenv("QUERY_CALLBACK_MAX_ATTEMPTS", "5"))
+# Delay before the first retry, doubled for each further retry
+QUERY_CALLBACK_RETRY_BASE_SECONDS = float(os.getenv("QUERY_CALLBACK_RETRY_BASE_SECONDS", "1"))
+# Timeout for each callback request
+QUERY_CALLBACK_TIMEOUT_SECONDS = float(os.getenv("QUERY_CALLBACK_TIMEOUT_SECONDS", "10"))
+# Callback requests in flight at once
+QUERY_CALLBACK_CONCURRENCY = int(os.getenv("QUERY_CALLBACK_CONCURRENCY", "10"))
+
+TERMINAL_QUERY_PHASES = ("done", "error", "canceled")
+CALLBACK_EVENT = "query.completed"
+NAMESPACE_PATTERN = re.compile(r"^[a-z0-9]([-a-z0-9]{0,61}[a-z0-9])?$")
+
+
+class CallbackURLError(ValueError):
+    """A callback URL that ark-api will not send to."""
+
+
+def _host_allowed(host: str, allowed_hosts: List[str]) -> bool:
+    for allowed in allowed_hosts:
+        if allowed.startswith("*.") and host.endswith(allowed[1:]):
+            return True
+        if host == allowed:
+            return True
+    return False
+
+
+async def validate_callback_url(url: str) -> None:
+    """Check that a callback URL is allowed and resolves only to public addresses.
+
+    Raises:
+        CallbackURLError: with the reason the URL is refused
+    """
+    if not QUERY_CALLBACK_ALLOWED_HOSTS:
+        raise CallbackURLError("Query callbacks are disabled (QUERY_CALLBACK_ALLOWED_HOSTS is not set)")
+    try:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError as e:
+        raise CallbackURLError(f"Invalid callback URL: {e}")
+    host = (parts.hostname or "").lower()
+    if parts.scheme not in ("http", "https") or not host:
+        raise CallbackURLError("Callback URL must be an http(s) URL")
+    if not _host_allowed(host, QUERY_CALLBACK_ALLOWED_HOSTS):
+        raise CallbackURLError(f"Callback host '{host}' is not in QUERY_CALLBACK_ALLOWED_HOSTS")
+
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise CallbackURLError(f"Callback host '{host}' cannot be resolved: {e}")
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise CallbackURLError(f"Callback host '{host}' resolves to a non-public address ({address})")
+
+
+def _read_namespaces(path: str) -> List[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if NAMESPACE_PATTERN.match(line.strip())]
+    except FileNotFoundError:
+        return []
+
+
+def _append_namespace(path: str, namespace: str) -> None:
+    # A single O_APPEND write, so lines from concurrent workers do not interleave
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, f"{namespace}\n".encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def sign_callback(secret: str, timestamp: str, body: bytes) -> str:
+    """Signature header value for a callback body."""
+    digest = hmac.new(secret.encode("utf-8"), timestamp.encode("utf-8") + b"." + body, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+def _callback_payload(query: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = query["metadata"]
+    status = query.get("status") or {}
+    return {
+        "event": CALLBACK_EVENT,
+        "name": metadata["name"],
+        "namespace": metadata.get("namespace"),
+        "uid": metadata.get("uid"),
+        "phase": status.get("phase"),
+        "status": status,
+    }
+
+
+class QueryCallbackNotifier:
+    """Delivers completion callbacks for the namespaces it watches."""
+
+    def __init__(self):
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._deliveries: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._namespaces: Set[str] = set()
+        self._poller: Optional[asyncio.Task] = None
+
+    @property
+    def leading(self) -> bool:
+        """Whether this worker watches namespaces and delivers callbacks."""
+        return self._poller is not None
+
+    async def start(self, default_namespace: str) -> None:
+        """Become the worker that delivers callbacks (called by the leader only).
+
+        Watches the default namespace and every namespace recorded with
+        callbacks, and then the namespaces other workers record.
+        """
+        self.watch_namespace(default_namespace)
+        await self._watch_recorded_namespaces()
+        self._poller = asyncio.create_task(self._poll_namespaces(), name="query-callbacks-namespaces")
+
+    async def _watch_recorded_namespaces(self) -> None:
+        try:
+            namespaces = await asyncio.to_thread(_read_namespaces, QUERY_CALLBACK_NAMESPACES_PATH)
+        except OSError as e:
+            logger.warning(f"Failed to read callback namespaces: {e}")
+            return
+        self._namespaces.update(namespaces)
+        for namespace in namespaces:
+            self.watch_namespace(namespace)
+
+    async def _poll_namespaces(self) -> None:
+        while True:
+            await asyncio.sleep(QUERY_CALLBACK_NAMESPACES_POLL_SECONDS)
+            await self._watch_recorded_namespaces()
+
+    async def register_namespace(self, namespace: str) -> None:
+        """Record that a namespace has callbacks, watching it now if this worker leads.
+
+        Raises:
+            OSError: if the namespace could not be recorded for the leader
+        """
+        if not NAMESPACE_PATTERN.match(namespace):
+            return
+        if namespace not in self._namespaces:
+            await asyncio.to_thread(_append_namespace, QUERY_CALLBACK_NAMESPACES_PATH, namespace)
+            self._namespaces.add(namespace)
+        if self.leading:
+            self.watch_namespace(namespace)
+
+    def watch_namespace(self, namespace: str) -> None:
+        """Start delivering callbacks for queries in a namespace."""
+        task = self._watchers.get(namespace)
+        if task is None or task.done():
+            self._watchers[namespace] = asyncio.create_task(
+                self._follow(namespace), name=f"query-callbacks-{namespace}"
+            )
+
+    async def _follow(self, namespace: str) -> None:
+        """Consume the namespace's shared query watch."""
+        async with get_query_watch(namespace).subscribe() as subscription:
+            # Queries that finished before the watch started
+            await subscription.ready()
+            await self._scan(namespace)
+            reported_drops = 0
+            while True:
+                event = await subscription.get()
+                if subscription.dropped > reported_drops:
+                    # Completions may have been dropped with the buffered events
+                    reported_drops = subscription.dropped
+                    await self._scan(namespace)
+                if event is None:
+                    if subscription.closed:
+                        return
+                    continue
+                if event["type"] != "DELETED":
+                    self.notify(event["object"])
+
+    async def _scan(self, namespace: str) -> None:
+        """Notify every finished query in a namespace that is still owed a callback."""
+        try:
+            async with ApiClient() as api:
+                custom_api = client.CustomObjectsApi(api)
+                continue_token = None
+                while True:
+                    result = await custom_api.list_namespaced_custom_object(
+                        group=GROUP, version="v1alpha1", namespace=namespace, plural="queries",
+                        limit=500, _continue=continue_token
+                    )
+                    for query in result.get("items", []):
+                        self.notify(query)
+                    continue_token = (result.get("metadata") or {}).get("continue")
+                    if not continue_token:
+                        return
+        except Exception as e:
+            logger.warning(f"Failed to scan queries in {namespace} for pending callbacks: {e}")
+
+    def notify(self, query: Dict[str, Any]) -> None:
+        """Start delivering a query's callback if it is finished and still owed one."""
+        metadata = query.get("metadata") or {}
+        annotations = metadata.get("annotations") or {}
+        url = annotations.get(QUERY_CALLBACK_ANNOTATION)
+        if not url or annotations.get(QUERY_CALLBACK_STATUS_ANNOTATION):
+            return
+        if (query.get("status") or {}).get("phase") not in TERMINAL_QUERY_PHASES:
+            return
+        key = (metadata.get("namespace"), metadata.get("name"))
+        if key in self._deliveries:
+            return
+        task = asyncio.create_task(self._deliver(query, url))
+        self._deliveries[key] = task
+        task.add_done_callback(lambda _: self._deliveries.pop(key, None))
+
+    async def _post(self, url: str, body: bytes) -> str:
+        """Make one attempt and return its outcome: success, retry or rejected."""
+        headers = {"Content-Type": "application/json", "X-Ark-Event": CALLBACK_EVENT}
+        if QUERY_CALLBACK_SIGNING_SECRET:
+            timestamp = str(int(time.time()))
+            headers["X-Ark-Timestamp"] = timestamp
+            headers["X-Ark-Signature"] = sign_callback(QUERY_CALLBACK_SIGNING_SECRET, timestamp, body)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(QUERY_CALLBACK_CONCURRENCY)
+        try:
+            async with self._semaphore:
+                response = await get_http_client().post(
+                    url, content=body, headers=headers, timeout=QUERY_CALLBACK_TIMEOUT_SECONDS, follow_redirects=False
+                )
+        except httpx.HTTPError as e:
+            logger.info(f"Callback to {url} failed: {e}")
+            return "retry"
+        if response.is_success:
+            return "success"
+        # Server errors and rate limiting are worth retrying, other client errors are not
+        if response.status_code >= 500 or response.status_code == 429:
+            return "retry"
+        return "rejected"
+
+    async def _deliver(self, query: Dict[str, Any], url: str) -> None:
+        metadata = query["metadata"]
+        body = json.dumps(_callback_payload(query)).encode("utf-8")
+        started = time.monotonic()
+
+        outcome = "retry"
+        for attempt in range(1, QUERY_CALLBACK_MAX_ATTEMPTS + 1):
+            try:
+                # Also covers URLs set on the query directly and DNS changes since it was created
+                await validate_callback_url(url)
+            except CallbackURLError as e:
+                logger.warning(f"Not sending callback for query {metadata['name']}: {e}")
+                outcome = "rejected"
+                break
+            outcome = await self._post(url, body)
+            QUERY_CALLBACK_ATTEMPTS.labels(outcome).inc()
+            if outcome != "retry":
+                break
+            if attempt < QUERY_CALLBACK_MAX_ATTEMPTS:
+                await asyncio.sleep(QUERY_CALLBACK_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+
+        result = "delivered" if outcome == "success" else "failed"
+        QUERY_CALLBACK_DELIVERIES.labels(result).inc()
+        QUERY_CALLBACK_DELIVERY_SECONDS.observe(time.monotonic() - started)
+        if result == "failed":
+            logger.warning(f"Giving up on callback for query {metadata['name']} to {url}")
+        await self._record_result(metadata["namespace"], metadata["name"], result)
+
+    async def _record_result(self, namespace: str, name: str, result: str) -> None:
+        """Annotate the query so it is not notified again."""
+        try:
+            async with ApiClient() as api:
+                await client.CustomObjectsApi(api).patch_namespaced_custom_object(
+                    group=GROUP, version="v1alpha1", namespace=namespace, plural="queries", name=name,
+                    body={"metadata": {"annotations": {QUERY_CALLBACK_STATUS_ANNOTATION: result}}},
+                    _content_type="application/merge-patch+json"
+                )
+        except Exception as e:
+            logger.warning(f"Failed to record callback result for query {name}: {e}")
+
+    async def close(self) -> None:
+        """Stop watching and cancel deliveries in progress (retried on next start)."""
+        tasks = list(self._watchers.values()) + list(self._deliveries.values())
+        if self._poller is not None:
+            tasks.append(self._poller)
+            self._poller = None
+        self._watchers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+query_callbacks = QueryCallbackNotifier()
@@ -0,0 +1,82 @@
+"""Opt-in exact-match cache for OpenAI chat completions.
+
+Clients enable caching per request with the completion-cache annotation in
+`metadata.ark`. Entries are keyed by a hash of the namespace, target,
+messages, sampling parameters and remaining Ark annotations, so only
+byte-for-byte identical requests share a response.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..constants.annotations import (
+    COMPLETION_CACHE_ANNOTATION,
+    COMPLETION_CACHE_TTL_ANNOTATION,
+    STREAMING_ENABLED_ANNOTATION,
+)
+from ..core.metrics import record_cache_lookup
+from .parse_duration import parse_duration_to_seconds
+from .ttl_cache import TTLCache
+
+# Default lifetime of a cached completion (the TTL annotation overrides it per request)
+OPENAI_COMPLETION_CACHE_TTL_SECONDS = float(os.getenv("OPENAI_COMPLETION_CACHE_TTL_SECONDS", "3600"))
+# Maximum cached completions, least recently used are evicted first
+OPENAI_COMPLETION_CACHE_MAX_ENTRIES = int(os.getenv("OPENAI_COMPLETION_CACHE_MAX_ENTRIES", "1000"))
+
+# Annotations that control caching or transport rather than the completion itself
+_NON_KEY_ANNOTATIONS = (COMPLETION_CACHE_ANNOTATION, COMPLETION_CACHE_TTL_ANNOTATION, STREAMING_ENABLED_ANNOTATION)
+
+# Cached value: (time stored, completion as a dict)
+completion_cache: TTLCache[Tuple[float, Dict[str, Any]]] = TTLCache(
+    OPENAI_COMPLETION_CACHE_TTL_SECONDS, max_entries=OPENAI_COMPLETION_CACHE_MAX_ENTRIES
+)
+
+
+def completion_cache_ttl(annotations: Dict[str, str]) -> Optional[float]:
+    """Return the TTL to cache with, or None if the request did not opt in."""
+    if str(annotations.get(COMPLETION_CACHE_ANNOTATION, "")).lower() != "true":
+        return None
+    ttl = annotations.get(COMPLETION_CACHE_TTL_ANNOTATION)
+    if ttl:
+        return float(parse_duration_to_seconds(ttl) or 0)
+    return OPENAI_COMPLETION_CACHE_TTL_SECONDS
+
+
+def completion_cache_key(
+    namespace: str,
+    model: str,
+    messages: list,
+    temperature: float,
+    max_tokens: Optional[int],
+    annotations: Dict[str, str],
+) -> str:
+    """Canonical hash of everything that determines a completion."""
+    payload = {
+        "namespace": namespace,
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "annotations": {k: v for k, v in annotations.items() if k not in _NON_KEY_ANNOTATIONS},
+    }
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def get_cached_completion(key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached completion marked as a cache hit in its `ark` metadata."""
+    entry = completion_cache.get(key)
+    record_cache_lookup("completion", entry is not None)
+    if entry is None:
+        return None
+    stored_at, completion = entry
+    ark = dict(completion.get("ark") or {})
+    ark["cache"] = {"hit": True, "ageSeconds": int(time.time() - stored_at)}
+    return {**completion, "ark": ark}
+
+
+def store_completion(key: str, completion: Dict[str, Any], ttl_seconds: float) -> None:
+    completion_cache.put(key, (time.time(), completion), ttl_seconds=ttl_seconds)
@@ -0,0 +1,58 @@
+"""ETag helpers for conditional GET requests."""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def compute_etag(payload: Any) -> str:
+    """Compute a strong ETag from a JSON serialisable payload."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def resource_versions_etag(items: Iterable[Dict[str, Any]], *variant: Any) -> str:
+    """Weak ETag for a list response, from its items' names and resourceVersions.
+
+    The list's own resourceVersion moves with every write to the cluster, so
+    it would rarely match; the items' (name, resourceVersion) pairs change
+    only when a listed item does. `variant` covers anything else the
+    response depends on, such as the namespace and query parameters.
+    """
+    versions = sorted(
+        (item.get("metadata", {}).get("name") or "", item.get("metadata", {}).get("resourceVersion") or "")
+        for item in items
+    )
+    return f"W/{compute_etag([list(variant), versions])}"
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Set the ETag on a response, or return a 304 if the client has this version.
+
+    Cache-Control: no-cache makes browsers revalidate every time, which is
+    what turns repeated polls into 304s.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,291 @@
+"""In-memory informers: a listed and watched copy of a resource collection.
+
+List endpoints that are polled (the dashboard lists queries every few
+seconds) should not read every object from the API server on every request.
+An Informer lists a collection once, then applies watch events to an
+in-memory store keyed by name, relisting whenever its resourceVersion
+expires. Once synced, readers get the current items without an API call.
+An informer whose watch keeps failing (e.g. 403 or an unreachable API
+server) stops counting as synced until it recovers, so readers fall back
+to the API server rather than serving a frozen copy.
+
+Informers work with the raw dict APIs (CustomObjectsApi), like the rest of
+ark-api's custom resource access.
+
+Each informer also keeps a bounded changelog of the watch events it applied,
+so clients can ask for the changes since a resourceVersion they saw
+(changes_since). resourceVersions are compared as integers, which is how
+the API server (etcd) issues them; a version older than the changelog, or
+from before a relist, cannot be answered and the client has to resync.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from kubernetes_asyncio import client, watch
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.rest import ApiException
+
+from ..core.constants import GROUP
+from .shared_watch import WATCH_RETRY_SECONDS, WATCH_TIMEOUT_SECONDS, ListFunctionFactory
+
+logger = logging.getLogger(__name__)
+
+# Page size used when an informer lists its collection
+INFORMER_LIST_CHUNK_SIZE = int(os.getenv("INFORMER_LIST_CHUNK_SIZE", "500"))
+# Watch events each informer keeps for delta requests
+INFORMER_CHANGELOG_SIZE = int(os.getenv("INFORMER_CHANGELOG_SIZE", "1000"))
+# Consecutive list/watch failures after which an informer is no longer synced
+INFORMER_MAX_FAILURES = 3
+# Informers not read for this long are stopped
+INFORMER_IDLE_SECONDS = float(os.getenv("INFORMER_IDLE_SECONDS", "600"))
+# Informers kept per process; the least recently read is stopped beyond this
+INFORMER_MAX_COUNT = int(os.getenv("INFORMER_MAX_COUNT", "50"))
+
+
+def _parse_resource_version(resource_version: Optional[str]) -> Optional[int]:
+    try:
+        return int(resource_version) if resource_version else None
+    except ValueError:
+        return None
+
+
+class Informer:
+    """A synced, in-memory copy of one collection (e.g. queries in a namespace)."""
+
+    def __init__(self, name: str, list_function: ListFunctionFactory, **list_kwargs: Any):
+        """
+        Args:
+            name: Human readable name used in logs
+            list_function: Returns the list function to list and watch for an ApiClient
+            list_kwargs: Arguments for the list function (namespace, group, ...)
+        """
+        self.name = name
+        self._list_function = list_function
+        self._list_kwargs = list_kwargs
+        self._store: Dict[str, Dict[str, Any]] = {}
+        self._synced = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self.resource_version: Optional[str] = None
+        # (resourceVersion, event type, object) of applied watch events, oldest first
+        self._changelog: Deque[Tuple[int, str, Dict[str, Any]]] = deque(maxlen=INFORMER_CHANGELOG_SIZE)
+        # Changes after this resourceVersion are all in the changelog
+        self._changelog_start: Optional[int] = None
+
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start listing and watching, if not already running."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=f"informer-{self.name}")
+            logger.info(f"Started informer {self.name}")
+
+    async def wait_synced(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the initial list. Returns False if the timeout expired."""
+        try:
+            await asyncio.wait_for(self._synced.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Current objects, in no particular order."""
+        return list(self._store.values())
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._store.get(name)
+
+    def changes_since(self, resource_version: str) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        """Watch events (type, object) applied after resource_version, oldest first.
+
+        Returns None if the changes cannot be reconstructed: the version is
+        older than the changelog, newer than the informer, not numeric, or
+        the informer has not synced.
+        """
+        since = _parse_resource_version(resource_version)
+        current = _parse_resource_version(self.resource_version)
+        if since is None or current is None or self._changelog_start is None:
+            return None
+        if since < self._changelog_start or since > current:
+            return None
+        return [(event_type, obj) for rv, event_type, obj in self._changelog if rv > since]
+
+    def _apply(self, event_type: str, obj: Dict[str, Any]) -> None:
+        name = (obj.get("metadata") or {}).get("name")
+        if not name:
+            return
+        if event_type == "DELETED":
+            self._store.pop(name, None)
+        else:
+            self._store[name] = obj
+        resource_version = _parse_resource_version((obj.get("metadata") or {}).get("resourceVersion"))
+        if resource_version is None or self._changelog_start is None:
+            # Without an ordered version the changelog can no longer be trusted
+            self._changelog.clear()
+            self._changelog_start = None
+            return
+        if len(self._changelog) == self._changelog.maxlen:
+            # The evicted event is no longer available to delta requests
+            self._changelog_start = self._changelog[0][0]
+        self._changelog.append((resource_version, event_type, obj))
+
+    async def _list(self, api: ApiClient) -> None:
+        """Replace the store with a fresh, paged list of the collection."""
+        items: Dict[str, Dict[str, Any]] = {}
+        continue_token = None
+        while True:
+            result = await self._list_function(api)(
+                limit=INFORMER_LIST_CHUNK_SIZE, _continue=continue_token, **self._list_kwargs
+            )
+            for obj in result.get("items", []):
+                items[obj["metadata"]["name"]] = obj
+            metadata = result.get("metadata") or {}
+            continue_token = metadata.get("continue")
+            if not continue_token:
+                self.resource_version = metadata.get("resourceVersion")
+                break
+        self._store = items
+        # Changes made before the list cannot be told apart, start a new changelog
+        self._changelog.clear()
+        self._changelog_start = _parse_resource_version(self.resource_version)
+
+    def _healthy(self) -> None:
+        """The store is current: mark it synced."""
+        if not self._synced.is_set() and self._failures:
+            logger.info(f"Informer {self.name} recovered")
+        self._failures = 0
+        self._synced.set()
+
+    async def _failed(self, e: Exception) -> None:
+        """Count a list/watch failure and wait before retrying."""
+        self._failures += 1
+        if self._failures >= INFORMER_MAX_FAILURES and self._synced.is_set():
+            logger.warning(f"Informer {self.name} failed {self._failures} times, no longer serving from memory")
+            self._synced.clear()
+        logger.warning(f"Informer {self.name} failed, retrying in {WATCH_RETRY_SECONDS}s: {e}")
+        await asyncio.sleep(WATCH_RETRY_SECONDS)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with ApiClient() as api:
+                    if self.resource_version is None:
+                        await self._list(api)
+                        self._healthy()
+                        logger.info(f"Informer {self.name} synced {len(self._store)} objects")
+                    async with watch.Watch() as w:
+                        async for event in w.stream(
+                            self._list_function(api),
+                            resource_version=self.resource_version,
+                            allow_watch_bookmarks=True,
+                            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                            **self._list_kwargs
+                        ):
+                            obj = event["object"]
+                            self.resource_version = (obj.get("metadata") or {}).get("resourceVersion") or self.resource_version
+                            if event["type"] != "BOOKMARK":
+                                self._apply(event["type"], obj)
+                            self._healthy()
+                    # The watch timed out normally, so it was connected until now
+                    self._healthy()
+            except asyncio.CancelledError:
+                raise
+            except ApiException as e:
+                if e.status == 410:
+                    # Our resourceVersion is too old, relist
+                    logger.info(f"Informer {self.name} expired, relisting")
+                    self.resource_version = None
+                    continue
+                await self._failed(e)
+            except Exception as e:
+                await self._failed(e)
+
+    def stop(self) -> None:
+        """Stop listing and watching without waiting for the task to finish."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+        self._synced.clear()
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class InformerRegistry:
+    """Process wide registry of informers, keyed by resource and namespace.
+
+    Informers are created on demand, for namespaces chosen by clients, so
+    the registry is bounded: informers not read for idle_seconds are stopped,
+    and beyond max_count the least recently read one is.
+    """
+
+    def __init__(self, idle_seconds: float = INFORMER_IDLE_SECONDS, max_count: int = INFORMER_MAX_COUNT):
+        self.idle_seconds = idle_seconds
+        self.max_count = max_count
+        # key -> informer, least recently read first
+        self._informers: OrderedDict[Hashable, Informer] = OrderedDict()
+        self._read_at: Dict[Hashable, float] = {}
+
+    def _evict(self, key: Hashable, reason: str) -> None:
+        informer = self._informers.pop(key)
+        self._read_at.pop(key, None)
+        informer.stop()
+        logger.info(f"Stopped informer {informer.name} ({reason})")
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Informer]) -> Informer:
+        """Get the informer for key, creating and starting it if needed."""
+        now = time.monotonic()
+        for idle_key in [k for k in self._informers if k != key and now - self._read_at[k] > self.idle_seconds]:
+            self._evict(idle_key, "idle")
+
+        informer = self._informers.get(key)
+        if informer is None:
+            while len(self._informers) >= self.max_count:
+                self._evict(next(iter(self._informers)), "too many informers")
+            informer = factory()
+            self._informers[key] = informer
+        self._informers.move_to_end(key)
+        self._read_at[key] = now
+        informer.start()
+        return informer
+
+    def informers(self) -> Dict[Hashable, Informer]:
+        return dict(self._informers)
+
+    async def close(self) -> None:
+        """Stop every informer (used on application shutdown)."""
+        await asyncio.gather(*(i.close() for i in self._informers.values()), return_exceptions=True)
+        self._informers.clear()
+        self._read_at.clear()
+
+
+informers = InformerRegistry()
+
+
+def custom_resource_informer(plural: str, namespace: str, version: str = "v1alpha1") -> Informer:
+    """Get the (started) informer for an ARK resource kind in a namespace."""
+    return informers.get_or_create(
+        (plural, namespace),
+        lambda: Informer(
+            f"{plural}/{namespace}",
+            lambda api: client.CustomObjectsApi(api).list_namespaced_custom_object,
+            group=GROUP,
+            version=version,
+            namespace=namespace,
+            plural=plural
+        )
+    )
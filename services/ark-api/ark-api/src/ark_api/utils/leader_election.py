@@ -0,0 +1,88 @@
+"""Leader election between the worker processes of one pod.
+
+With several uvicorn workers (WEB_CONCURRENCY > 1) every worker serves
+requests, but background loops with side effects, such as resuming OpenAI
+batches and delivering query completion callbacks, must run only once. The
+worker holding an exclusive lock on LEADER_LOCK_PATH is the leader and runs
+them. The lock belongs to the process, so when the leader exits or dies it
+is released and another worker takes over within LEADER_RETRY_SECONDS.
+
+Locks are advisory flock(2) locks and only coordinate processes sharing the
+lock file, i.e. the workers of one pod.
+"""
+
+import asyncio
+import fcntl
+import logging
+import os
+import tempfile
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lock file shared by the workers of a pod
+LEADER_LOCK_PATH = os.getenv("LEADER_LOCK_PATH", os.path.join(tempfile.gettempdir(), "ark-api-leader.lock"))
+# How often a follower tries to become leader
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "5"))
+
+
+def try_lock_file(path: str) -> Optional[int]:
+    """Take an exclusive lock on a file without waiting.
+
+    Returns:
+        The open file descriptor holding the lock, or None if another open
+        file (in this or another process) holds it
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def unlock_file(fd: int) -> None:
+    """Release a lock taken with try_lock_file."""
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+class LeaderElection:
+    """Elects one leader among the processes sharing a lock file."""
+
+    def __init__(self, lock_path: str = LEADER_LOCK_PATH, retry_seconds: float = LEADER_RETRY_SECONDS):
+        self.lock_path = lock_path
+        self.retry_seconds = retry_seconds
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Become leader if no other process is. Returns whether this process leads."""
+        if self._fd is None:
+            self._fd = try_lock_file(self.lock_path)
+        return self._fd is not None
+
+    async def run(self, on_elected: Callable[[], Awaitable[None]]) -> None:
+        """Wait until this process is leader, then run on_elected once.
+
+        Leadership is kept until release(); cancel this to stop waiting.
+        """
+        if not self.try_acquire():
+            logger.info(f"Another worker leads background loops, retrying every {self.retry_seconds}s")
+            while not self.try_acquire():
+                await asyncio.sleep(self.retry_seconds)
+        logger.info(f"Worker {os.getpid()} elected leader, starting background loops")
+        await on_elected()
+
+    def release(self) -> None:
+        """Give up leadership (after stopping the leader's loops)."""
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            unlock_file(fd)
+
+
+leader_election = LeaderElection()
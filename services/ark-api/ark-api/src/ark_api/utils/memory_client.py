@@ -1,11 +1,37 @@
 """Shared memory service client utilities."""
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import httpx
 from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of memory services called at the same time by one request
+MEMORY_FANOUT_CONCURRENCY = int(os.getenv("MEMORY_FANOUT_CONCURRENCY", "8"))
+# Deadline for each memory service call in a fan-out
+MEMORY_SERVICE_TIMEOUT_SECONDS = float(os.getenv("MEMORY_SERVICE_TIMEOUT_SECONDS", "10"))
+
+
+@dataclass
+class MemoryCallResult:
+    """Outcome of calling one memory service during a fan-out."""
+    memory_name: str
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def error_message(self) -> Optional[str]:
+        if self.error is None:
+            return None
+        if isinstance(self.error, HTTPException):
+            return str(self.error.detail)
+        if isinstance(self.error, asyncio.TimeoutError):
+            return f"Memory service {self.memory_name} did not respond within {MEMORY_SERVICE_TIMEOUT_SECONDS:g}s"
+        return str(self.error) or type(self.error).__name__
+
 
 def get_memory_service_address(memory_dict: Dict[str, Any]) -> str:
     """
@@ -34,6 +60,7 @@ def get_memory_service_address(memory_dict: Dict[str, Any]) -> str:
 
 
 async def fetch_memory_service_data(
+    http_client: httpx.AsyncClient,
     service_url: str, 
     endpoint: str, 
     params: Optional[Dict[str, str]] = None,
@@ -43,6 +70,7 @@ async def fetch_memory_service_data(
     Fetch data from a memory service endpoint.
     
     Args:
+        http_client: Shared HTTP client (see core.http.get_http_client)
         service_url: Base URL of the memory service
         endpoint: API endpoint path (e.g., "/messages", "/sessions")
         params: Optional query parameters
@@ -57,21 +85,20 @@ async def fetch_memory_service_data(
     url = f"{service_url}{endpoint}"
     
     try:
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.get(url, params=params, timeout=30.0)
-            
-            if response.status_code == 404:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Resource not found in memory service {memory_name}"
-                )
-            elif not response.is_success:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Memory service {memory_name} error: {response.text}"
-                )
-            
-            return response.json()
+        response = await http_client.get(url, params=params, timeout=30.0)
+        
+        if response.status_code == 404:
+            raise HTTPException(
+                status_code=404, 
+                detail=f"Resource not found in memory service {memory_name}"
+            )
+        elif not response.is_success:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Memory service {memory_name} error: {response.text}"
+            )
+        
+        return response.json()
             
     except httpx.RequestError as e:
         logger.error(f"Error connecting to memory service {memory_name}: {e}")
@@ -100,4 +127,42 @@ async def get_all_memory_resources(client, memory_filter: Optional[str] = None):
             if m.to_dict().get("metadata", {}).get("name") == memory_filter
         ]
     
-    return [memory.to_dict() for memory in memories]
\ No newline at end of file
+    return [memory.to_dict() for memory in memories]
+
+
+async def fan_out_to_memories(
+    memory_dicts: List[Dict[str, Any]],
+    call: Callable[[str, str], Awaitable[Any]],
+    timeout: Optional[float] = None,
+    concurrency: Optional[int] = None
+) -> List[MemoryCallResult]:
+    """
+    Call every memory service concurrently.
+    
+    Each call gets its own deadline and the number of calls in flight is
+    bounded, so one slow or unreachable memory service neither delays nor
+    fails the others.
+    
+    Args:
+        memory_dicts: Memory resource dictionaries
+        call: Coroutine function taking (memory_name, service_url)
+        timeout: Per memory service deadline in seconds
+        concurrency: Maximum number of concurrent calls
+        
+    Returns:
+        One result per memory, in the order of memory_dicts
+    """
+    timeout = timeout if timeout is not None else MEMORY_SERVICE_TIMEOUT_SECONDS
+    semaphore = asyncio.Semaphore(concurrency or MEMORY_FANOUT_CONCURRENCY)
+    
+    async def run(memory_dict: Dict[str, Any]) -> MemoryCallResult:
+        memory_name = memory_dict.get("metadata", {}).get("name", "")
+        async with semaphore:
+            try:
+                service_url = get_memory_service_address(memory_dict)
+                value = await asyncio.wait_for(call(memory_name, service_url), timeout)
+                return MemoryCallResult(memory_name=memory_name, value=value)
+            except Exception as e:
+                return MemoryCallResult(memory_name=memory_name, error=e)
+    
+    return await asyncio.gather(*(run(memory_dict) for memory_dict in memory_dicts))
@@ -0,0 +1,43 @@
+"""Opaque continue tokens for cursor paginated list endpoints.
+
+List endpoints page through the Kubernetes API with limit/continue. When a
+page fills up part way through a Kubernetes chunk (because some items were
+filtered out locally), the next page has to resume inside that chunk. The
+token returned to clients therefore records the Kubernetes continue token the
+chunk was fetched with plus the number of items of that chunk already
+consumed.
+"""
+
+import base64
+import json
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_continue_token(k8s_continue: Optional[str], skip: int = 0) -> str:
+    """Encode a resume position as an opaque, URL safe token."""
+    payload = json.dumps({"c": k8s_continue or "", "s": skip}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_continue_token(token: Optional[str]) -> Tuple[Optional[str], int]:
+    """Decode a token produced by encode_continue_token.
+
+    Returns:
+        Tuple of (Kubernetes continue token or None, items to skip in that chunk)
+
+    Raises:
+        HTTPException: 400 if the token is malformed
+    """
+    if not token:
+        return None, 0
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        skip = int(payload.get("s", 0))
+        if skip < 0:
+            raise ValueError("negative skip")
+        return payload.get("c") or None, skip
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid continue token: {e}")
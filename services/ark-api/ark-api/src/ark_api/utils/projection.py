@@ -0,0 +1,54 @@
+"""Field projection (`?fields=`) for list responses.
+
+Clients that only render a few columns can ask for just those, e.g.
+`fields=name,status.phase,creationTimestamp`. Dotted paths select nested
+keys; the first segment must be a field of the item's response model.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[List[str]]]:
+    """Parse a comma separated fields parameter into key paths.
+
+    Returns:
+        List of key paths, or None if no projection was requested
+
+    Raises:
+        HTTPException: 400 if a field is not one of the allowed top level fields
+    """
+    if not fields:
+        return None
+    allowed = set(allowed)
+    paths = []
+    for field in fields.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        path = field.split(".")
+        if path[0] not in allowed or not all(path):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid field '{field}', expected one of: {', '.join(sorted(allowed))}",
+            )
+        paths.append(path)
+    return paths or None
+
+
+def project(item: Dict[str, Any], paths: List[List[str]]) -> Dict[str, Any]:
+    """Copy only the selected key paths of item. Missing keys are left out."""
+    result: Dict[str, Any] = {}
+    for path in paths:
+        value: Any = item
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = result
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+    return result
@@ -9,10 +9,16 @@ from openai.types.completion_usage import CompletionUsage
 from kubernetes_asyncio import client, watch
 
 from ark_api.core.constants import GROUP
+from ark_api.utils.shared_watch import SharedWatch, custom_resource_watch
 
 logger = logging.getLogger(__name__)
 
 
+def get_query_watch(namespace: str) -> SharedWatch:
+    """Get the shared watch of all queries in a namespace."""
+    return custom_resource_watch("queries", namespace)
+
+
 def _create_chat_completion_response(query_name: str, model: str, content: str, messages: list, query_status: dict = None) -> ChatCompletion:
     """Create OpenAI-compatible chat completion response."""
     # Count tokens from messages array
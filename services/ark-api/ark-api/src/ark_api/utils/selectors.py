@@ -0,0 +1,121 @@
+"""Kubernetes style label and field selectors, evaluated in process.
+
+Shared watches carry every object of a kind in a namespace, so subscribers
+that only want some of them filter locally with the same selector syntax
+the API server accepts:
+
+- labelSelector: `key=value`, `key==value`, `key!=value`, `key`, `!key`,
+  `key in (a,b)` and `key notin (a,b)`, comma separated
+- fieldSelector: `path=value`, `path==value` and `path!=value` where path
+  is a dotted object path such as `metadata.name` or `status.phase`
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+Matcher = Callable[[Dict[str, Any]], bool]
+
+_SET_REQUIREMENT = re.compile(r"^\s*([^\s!=,()]+)\s+(in|notin)\s+\(([^)]*)\)\s*$")
+
+
+def _split_requirements(selector: str) -> List[str]:
+    """Split on commas that are not inside a set, e.g. `a in (x,y),b=z`."""
+    parts, depth, current = [], 0, []
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _equality(requirement: str) -> Optional[tuple]:
+    """Parse `key=value`, `key==value` or `key!=value` into (key, negated, value)."""
+    for operator, negated in (("!=", True), ("==", False), ("=", False)):
+        key, found, value = requirement.partition(operator)
+        if found:
+            if not key.strip():
+                raise ValueError(f"Invalid selector requirement '{requirement}'")
+            return key.strip(), negated, value.strip()
+    return None
+
+
+def _label_requirement(requirement: str) -> Matcher:
+    match = _SET_REQUIREMENT.match(requirement)
+    if match:
+        key, operator, values = match.group(1), match.group(2), {v.strip() for v in match.group(3).split(",")}
+        if operator == "in":
+            return lambda labels: labels.get(key) in values
+        return lambda labels: labels.get(key) not in values
+
+    parsed = _equality(requirement)
+    if parsed:
+        key, negated, value = parsed
+        if negated:
+            return lambda labels: labels.get(key) != value
+        return lambda labels: labels.get(key) == value
+
+    if requirement.startswith("!"):
+        key = requirement[1:].strip()
+        return lambda labels: key not in labels
+    if re.fullmatch(r"[^\s!=,()]+", requirement):
+        return lambda labels: requirement in labels
+    raise ValueError(f"Invalid label selector requirement '{requirement}'")
+
+
+def parse_label_selector(selector: Optional[str]) -> Optional[Matcher]:
+    """Build a matcher for objects whose metadata.labels satisfy a label selector.
+
+    Raises:
+        ValueError: If the selector cannot be parsed
+    """
+    if not selector:
+        return None
+    requirements = [_label_requirement(r) for r in _split_requirements(selector)]
+
+    def matches(obj: Dict[str, Any]) -> bool:
+        labels = (obj.get("metadata") or {}).get("labels") or {}
+        return all(requirement(labels) for requirement in requirements)
+    return matches
+
+
+def _field_value(obj: Dict[str, Any], path: str) -> Optional[str]:
+    value: Any = obj
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def parse_field_selector(selector: Optional[str]) -> Optional[Matcher]:
+    """Build a matcher for objects whose fields satisfy a field selector.
+
+    Raises:
+        ValueError: If the selector cannot be parsed
+    """
+    if not selector:
+        return None
+    requirements = []
+    for requirement in _split_requirements(selector):
+        parsed = _equality(requirement)
+        if parsed is None:
+            raise ValueError(f"Invalid field selector requirement '{requirement}'")
+        requirements.append(parsed)
+
+    def matches(obj: Dict[str, Any]) -> bool:
+        for path, negated, value in requirements:
+            if (_field_value(obj, path) == value) == negated:
+                return False
+        return True
+    return matches
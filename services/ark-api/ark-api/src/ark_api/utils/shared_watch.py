@@ -0,0 +1,275 @@
+"""Shared Kubernetes watches fanned out to many subscribers.
+
+Streaming endpoints should not open one Kubernetes watch per client. A
+SharedWatch runs a single upstream watch for a (resource, namespace) pair and
+copies every event into the bounded buffer of each subscriber. The upstream
+watch starts with the first subscriber and stops when the last one leaves.
+
+Slow subscribers never hold up the watch or other subscribers: when their
+buffer is full the oldest buffered event is dropped and counted.
+
+The upstream watch starts from the collection's current resourceVersion.
+Subscribers that read objects directly and then follow changes should wait
+for ready() before reading; otherwise a change made between the read and
+the start of the watch is never delivered. When the watch has to restart
+from the current state (its resourceVersion expired), the changes in
+between are lost, so every subscriber's `dropped` count is bumped and it
+should read again.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Set
+
+from kubernetes_asyncio import client, watch
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.rest import ApiException
+
+from ..core.constants import GROUP
+
+logger = logging.getLogger(__name__)
+
+# Default number of events buffered per subscriber before dropping the oldest
+DEFAULT_SUBSCRIBER_BUFFER_SIZE = 256
+# Server-side timeout for each watch request, after which it is resumed
+WATCH_TIMEOUT_SECONDS = 300
+# Delay before reconnecting after an upstream error
+WATCH_RETRY_SECONDS = 5
+
+# Given an ApiClient, return the list function to watch (e.g. CoreV1Api(api).list_namespaced_event)
+ListFunctionFactory = Callable[[ApiClient], Callable[..., Any]]
+
+
+def _resource_version(obj: Any) -> Optional[str]:
+    """Read metadata.resourceVersion from a model or a raw dict."""
+    if isinstance(obj, dict):
+        return (obj.get("metadata") or {}).get("resourceVersion")
+    metadata = getattr(obj, "metadata", None)
+    return getattr(metadata, "resource_version", None)
+
+
+class Subscription:
+    """A subscriber's bounded, drop-oldest view of a shared watch."""
+
+    def __init__(self, shared_watch: "SharedWatch", buffer_size: int):
+        self._shared_watch = shared_watch
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        # Set when an event is buffered, a resync is needed or on close
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.closed = False
+
+    def _push(self, event: Dict[str, Any]) -> None:
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(event)
+        self._ready.set()
+
+    def _resync(self) -> None:
+        """Tell the subscriber that events were missed, waking it if it waits."""
+        self.dropped += 1
+        self._ready.set()
+
+    async def ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the shared watch has its starting resourceVersion.
+
+        Objects read after this are covered by the watch. Returns False if
+        the timeout expired first (e.g. the API server is unreachable).
+        """
+        try:
+            await asyncio.wait_for(self._shared_watch._started.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the next event.
+
+        Returns:
+            The next event, or None if the timeout expired, the subscription
+            was closed or events were missed (check `dropped`)
+        """
+        if not self._buffer:
+            if self.closed:
+                return None
+            # Still set if a resync happened since the last get, so it is not missed
+            if not self._ready.is_set():
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+            self._ready.clear()
+            if not self._buffer:
+                return None
+        event = self._buffer.popleft()
+        if not self._buffer:
+            self._ready.clear()
+        return event
+
+    def close(self) -> None:
+        """Leave the shared watch. Safe to call more than once."""
+        if self.closed:
+            return
+        self.closed = True
+        self._ready.set()
+        self._shared_watch._unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SharedWatch:
+    """One upstream Kubernetes watch shared by all of its subscribers."""
+
+    def __init__(
+        self,
+        name: str,
+        list_function: ListFunctionFactory,
+        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        **list_kwargs: Any,
+    ):
+        """
+        Args:
+            name: Human readable name used in logs
+            list_function: Returns the list function to watch for an ApiClient
+            transform: Optional function applied once per event before fan out
+            list_kwargs: Arguments for the list function (namespace, group, ...)
+        """
+        self.name = name
+        self._list_function = list_function
+        self._transform = transform
+        self._list_kwargs = list_kwargs
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        # Set once the running watch has its starting resourceVersion
+        self._started = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, buffer_size: int = DEFAULT_SUBSCRIBER_BUFFER_SIZE) -> Subscription:
+        """Add a subscriber, starting the upstream watch if needed."""
+        subscription = Subscription(self, buffer_size)
+        self._subscribers.add(subscription)
+        if not self.running:
+            self._started.clear()
+            self._task = asyncio.create_task(self._run(), name=f"shared-watch-{self.name}")
+            logger.info(f"Started shared watch {self.name}")
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            logger.info(f"Stopped shared watch {self.name} (no subscribers)")
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Fan an event out to every subscriber."""
+        if self._transform is not None:
+            event = self._transform(event)
+        for subscription in list(self._subscribers):
+            subscription._push(event)
+
+    async def _current_resource_version(self, api: ApiClient) -> Optional[str]:
+        """Get the collection's resourceVersion so the watch only sees new changes."""
+        response = await self._list_function(api)(limit=1, **self._list_kwargs)
+        return _resource_version(response)
+
+    async def _run(self) -> None:
+        resource_version: Optional[str] = None
+        restarted = False
+        while True:
+            try:
+                async with ApiClient() as api:
+                    if resource_version is None:
+                        resource_version = await self._current_resource_version(api)
+                        if restarted:
+                            # Changes before the new starting point were missed
+                            for subscription in list(self._subscribers):
+                                subscription._resync()
+                            restarted = False
+                        self._started.set()
+                    async with watch.Watch() as w:
+                        async for event in w.stream(
+                            self._list_function(api),
+                            resource_version=resource_version,
+                            allow_watch_bookmarks=True,
+                            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                            **self._list_kwargs
+                        ):
+                            resource_version = _resource_version(event["object"]) or resource_version
+                            if event["type"] != "BOOKMARK":
+                                self.publish(event)
+            except asyncio.CancelledError:
+                raise
+            except ApiException as e:
+                if e.status == 410:
+                    # Our resourceVersion is too old, start again from now
+                    logger.info(f"Shared watch {self.name} expired, restarting from current state")
+                    resource_version = None
+                    restarted = True
+                    continue
+                logger.warning(f"Shared watch {self.name} failed, retrying in {WATCH_RETRY_SECONDS}s: {e}")
+                await asyncio.sleep(WATCH_RETRY_SECONDS)
+            except Exception as e:
+                logger.warning(f"Shared watch {self.name} failed, retrying in {WATCH_RETRY_SECONDS}s: {e}")
+                await asyncio.sleep(WATCH_RETRY_SECONDS)
+
+    async def close(self) -> None:
+        """Stop the upstream watch and close all subscriptions."""
+        task, self._task = self._task, None
+        for subscription in list(self._subscribers):
+            subscription.close()
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class SharedWatchRegistry:
+    """Process wide registry of shared watches, keyed by resource and namespace."""
+
+    def __init__(self):
+        self._watches: Dict[Hashable, SharedWatch] = {}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], SharedWatch]) -> SharedWatch:
+        shared_watch = self._watches.get(key)
+        if shared_watch is None:
+            shared_watch = factory()
+            self._watches[key] = shared_watch
+        return shared_watch
+
+    def watches(self) -> Dict[Hashable, SharedWatch]:
+        return dict(self._watches)
+
+    async def close(self) -> None:
+        """Stop every shared watch (used on application shutdown)."""
+        await asyncio.gather(*(w.close() for w in self._watches.values()), return_exceptions=True)
+        self._watches.clear()
+
+
+shared_watches = SharedWatchRegistry()
+
+
+def custom_resource_watch(plural: str, namespace: str, version: str = "v1alpha1") -> SharedWatch:
+    """Get the shared watch of an ARK resource kind in a namespace."""
+    return shared_watches.get_or_create(
+        (plural, namespace),
+        lambda: SharedWatch(
+            f"{plural}/{namespace}",
+            lambda api: client.CustomObjectsApi(api).list_namespaced_custom_object,
+            group=GROUP,
+            version=version,
+            namespace=namespace,
+            plural=plural
+        )
+    )
@@ -0,0 +1,130 @@
+"""Single-flight coalescing of identical concurrent reads.
+
+When many clients poll the same list at the same moment (dashboard tabs
+refreshing together), only the first request reads from the API server;
+identical requests arriving while that read is in flight wait for and share
+its result. Requests are identical when they hit the same route with the
+same namespace, query parameters and authenticated principal.
+
+A route can additionally keep a finished result in a microcache for a
+fraction of a second, which also absorbs requests arriving just after the
+read completed. Results are shared between callers and must not be mutated.
+
+Routes are configured with SINGLE_FLIGHT_ROUTES, a comma separated list of
+`route=setting` pairs where setting is a microcache lifetime in seconds or
+`off` to disable coalescing, e.g. `queries.list=0.5,tools.list=off`.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from starlette.requests import Request
+
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Coalesce identical concurrent reads
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+# Default microcache lifetime for coalesced routes (0 disables it)
+SINGLE_FLIGHT_MICROCACHE_SECONDS = float(os.getenv("SINGLE_FLIGHT_MICROCACHE_SECONDS", "0"))
+# Per route overrides, e.g. "queries.list=0.5,tools.list=off"
+SINGLE_FLIGHT_ROUTES = os.getenv("SINGLE_FLIGHT_ROUTES", "")
+# Distinct keys kept in each route's microcache
+SINGLE_FLIGHT_MICROCACHE_MAX_ENTRIES = 256
+
+
+def _parse_routes(value: str) -> Dict[str, Optional[float]]:
+    """Parse SINGLE_FLIGHT_ROUTES into route -> microcache seconds (None when off)."""
+    routes: Dict[str, Optional[float]] = {}
+    for part in value.split(","):
+        route, _, setting = part.strip().partition("=")
+        if not route or not setting:
+            continue
+        setting = setting.strip().lower()
+        if setting == "off":
+            routes[route.strip()] = None
+            continue
+        try:
+            routes[route.strip()] = float(setting)
+        except ValueError:
+            logger.warning(f"Ignoring invalid SINGLE_FLIGHT_ROUTES setting for {route}: {setting}")
+    return routes
+
+
+class SingleFlight:
+    """Shares one in-flight call (and optionally its result) per key."""
+
+    def __init__(self, name: str, enabled: bool = True, microcache_seconds: float = 0):
+        self.name = name
+        self.enabled = enabled
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._microcache: TTLCache[Tuple[Any]] = TTLCache(
+            microcache_seconds, max_entries=SINGLE_FLIGHT_MICROCACHE_MAX_ENTRIES
+        )
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return fn()'s result, sharing it with identical concurrent calls.
+
+        The shared call runs in its own task, so a caller that disconnects
+        does not cancel it for the others. Errors are raised to every caller
+        and never cached.
+        """
+        if not self.enabled:
+            return await fn()
+
+        cached = self._microcache.get(key)
+        if cached is not None:
+            return cached[0]
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(key, fn), name=f"single-flight-{self.name}")
+            # Retrieve the error even if every caller has gone away
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._calls[key] = task
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            result = await fn()
+            self._microcache.put(key, (result,))
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def single_flight(route: str) -> SingleFlight:
+    """Get the SingleFlight for a route name such as "queries.list"."""
+    flight = _flights.get(route)
+    if flight is None:
+        routes = _parse_routes(SINGLE_FLIGHT_ROUTES)
+        microcache_seconds = routes.get(route, SINGLE_FLIGHT_MICROCACHE_SECONDS)
+        flight = SingleFlight(
+            route,
+            enabled=SINGLE_FLIGHT_ENABLED and microcache_seconds is not None,
+            microcache_seconds=microcache_seconds or 0
+        )
+        _flights[route] = flight
+    return flight
+
+
+def request_key(request: Request, namespace: Optional[str]) -> Hashable:
+    """Coalescing key: route, namespace, query parameters and principal."""
+    route = request.scope.get("route")
+    return (
+        getattr(route, "path", request.url.path),
+        namespace,
+        tuple(sorted(request.query_params.multi_items())),
+        getattr(request.state, "principal", None),
+    )
@@ -1,6 +1,7 @@
 """Streaming utilities for converting responses to SSE format."""
 
-from typing import TypedDict
+import json
+from typing import Any, Dict, Optional, TypedDict
 
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice, ChoiceDelta
@@ -19,6 +20,12 @@ class StreamingErrorResponse(TypedDict):
     error: StreamingErrorDetail
 
 
+def format_sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format one Server-Sent Event, with an optional event name."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
 def create_single_chunk_sse_response(completion: ChatCompletion) -> list[str]:
     """Convert a complete ChatCompletion to SSE format with a single chunk.
 
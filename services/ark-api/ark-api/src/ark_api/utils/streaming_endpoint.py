@@ -0,0 +1,161 @@
+"""Cached resolution of the streaming backend base URL.
+
+Resolving where to stream a query from takes two Kubernetes reads: the
+'ark-config-streaming' ConfigMap and the Service it references (to map the
+port name to a number). The result rarely changes, so it is cached per
+namespace and dropped as soon as a shared watch on the ConfigMap or the
+Service reports a change. A TTL bounds staleness should a watch miss an
+event while reconnecting.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from ark_sdk.streaming_config import STREAMING_CONFIG_NAME, get_streaming_base_url, get_streaming_config
+from kubernetes_asyncio import client as k8s_client
+
+from ..core.metrics import record_cache_lookup
+from .shared_watch import SharedWatch, Subscription, shared_watches
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long a resolved streaming endpoint is reused without a watch event
+STREAMING_ENDPOINT_CACHE_TTL_SECONDS = float(os.getenv("STREAMING_ENDPOINT_CACHE_TTL_SECONDS", "300"))
+
+# Watch subscribers only need to know that something changed
+_INVALIDATION_BUFFER_SIZE = 1
+
+
+@dataclass
+class _Entry:
+    base_url: Optional[str]
+    expires_at: float
+
+
+def _config_map_watch(namespace: str) -> SharedWatch:
+    return shared_watches.get_or_create(
+        ("configmap", namespace, STREAMING_CONFIG_NAME),
+        lambda: SharedWatch(
+            f"configmap/{namespace}/{STREAMING_CONFIG_NAME}",
+            lambda api: k8s_client.CoreV1Api(api).list_namespaced_config_map,
+            namespace=namespace,
+            field_selector=f"metadata.name={STREAMING_CONFIG_NAME}",
+        ),
+    )
+
+
+def _service_watch(namespace: str, name: str) -> SharedWatch:
+    return shared_watches.get_or_create(
+        ("service", namespace, name),
+        lambda: SharedWatch(
+            f"service/{namespace}/{name}",
+            lambda api: k8s_client.CoreV1Api(api).list_namespaced_service,
+            namespace=namespace,
+            field_selector=f"metadata.name={name}",
+        ),
+    )
+
+
+class StreamingEndpointCache:
+    """Per namespace cache of the streaming backend base URL.
+
+    A cached value of None means streaming is not configured (or disabled)
+    for the namespace, which is cached just like a URL.
+    """
+
+    def __init__(self, ttl_seconds: float = STREAMING_ENDPOINT_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Namespaces invalidated by each watched object
+        self._dependents: Dict[Tuple[str, str, str], Set[str]] = {}
+        self._watch_tasks: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+    async def get_base_url(self, namespace: str) -> Optional[str]:
+        """Return the streaming base URL for a namespace, or None if streaming is off.
+
+        Raises:
+            Exception: Kubernetes or configuration errors while resolving; these
+                are not cached
+        """
+        entry = self._entries.get(namespace)
+        hit = entry is not None and entry.expires_at > time.monotonic()
+        record_cache_lookup("streaming_endpoint", hit)
+        if hit:
+            return entry.base_url
+
+        # Concurrent misses for the same namespace share one resolution
+        lock = self._locks.setdefault(namespace, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(namespace)
+            if entry is not None and entry.expires_at > time.monotonic():
+                return entry.base_url
+
+            # Watch before reading so a change made during the read is not missed
+            self._watch(("configmap", namespace, STREAMING_CONFIG_NAME), namespace)
+            async with k8s_client.ApiClient() as api:
+                v1 = k8s_client.CoreV1Api(api)
+                config = await get_streaming_config(v1, namespace)
+                base_url = None
+                if config and config.enabled:
+                    service_namespace = config.serviceRef.namespace or namespace
+                    self._watch(("service", service_namespace, config.serviceRef.name), namespace)
+                    base_url = await get_streaming_base_url(config, namespace, v1)
+
+            self._entries[namespace] = _Entry(base_url, time.monotonic() + self.ttl_seconds)
+            logger.info(f"Resolved streaming endpoint for namespace {namespace}: {base_url or 'disabled'}")
+            return base_url
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop the cached endpoint of one namespace, or of all namespaces."""
+        if namespace is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(namespace, None)
+
+    def _watch(self, key: Tuple[str, str, str], namespace: str) -> None:
+        """Invalidate `namespace` whenever the object identified by key changes."""
+        self._dependents.setdefault(key, set()).add(namespace)
+        task = self._watch_tasks.get(key)
+        if task is not None and not task.done():
+            return
+        kind, watch_namespace, name = key
+        shared_watch = _config_map_watch(watch_namespace) if kind == "configmap" else _service_watch(watch_namespace, name)
+        subscription = shared_watch.subscribe(buffer_size=_INVALIDATION_BUFFER_SIZE)
+        self._watch_tasks[key] = asyncio.create_task(
+            self._invalidate_on_change(key, subscription), name=f"streaming-endpoint-{kind}-{watch_namespace}-{name}"
+        )
+
+    async def _invalidate_on_change(self, key: Tuple[str, str, str], subscription: Subscription) -> None:
+        async with subscription:
+            reported_drops = 0
+            while True:
+                event = await subscription.get()
+                if subscription.dropped > reported_drops:
+                    # Changes may have been missed (dropped or while the watch restarted)
+                    reported_drops = subscription.dropped
+                    event = event or {"type": "RESYNC"}
+                if event is None:
+                    if subscription.closed:
+                        return
+                    continue
+                for namespace in self._dependents.get(key, ()):
+                    logger.info(f"Streaming endpoint for namespace {namespace} invalidated by {key[0]} {key[2]} change")
+                    self.invalidate(namespace)
+
+    async def close(self) -> None:
+        """Stop the invalidation watches and forget cached endpoints."""
+        tasks = list(self._watch_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._watch_tasks.clear()
+        self._dependents.clear()
+        self._entries.clear()
+
+
+streaming_endpoints = StreamingEndpointCache()
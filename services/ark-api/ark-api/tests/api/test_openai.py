@@ -246,3 +246,450 @@ class TestOpenAIChatCompletions(unittest.TestCase):
         session_id = getattr(query_resource.spec, 'sessionId', None)
         self.assertTrue(session_id is None or session_id == "")
 
+
+
+class TestOpenAIStreamingCompletions(unittest.TestCase):
+    """Test cases for streaming /openai/v1/chat/completions requests."""
+
+    def setUp(self):
+        """Set up test client with a mocked streaming backend."""
+        import httpx
+        from ark_api.main import app
+        from ark_api.core.http import get_http_client
+        self.app = app
+        self.get_http_client = get_http_client
+        self.upstream_requests = []
+        self.upstream_response = httpx.Response(
+            200,
+            text='data: {"choices": [{"delta": {"content": "Hi"}}]}\n\ndata: [DONE]\n\n',
+        )
+
+        def handler(request):
+            self.upstream_requests.append(request)
+            return self.upstream_response
+
+        self.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.app.dependency_overrides[get_http_client] = lambda: self.http_client
+        self.client = TestClient(app)
+        self.request_data = {
+            "model": "agent/test-agent",
+            "messages": [{"role": "user", "content": "Hello"}],
+            "stream": True,
+        }
+
+    def tearDown(self):
+        self.app.dependency_overrides.pop(self.get_http_client, None)
+
+    def _mock_ark_client(self, mock_with_ark_client):
+        mock_client = AsyncMock()
+        mock_with_ark_client.return_value.__aenter__.return_value = mock_client
+        mock_client.queries.a_create = AsyncMock()
+        return mock_client
+
+    @patch('ark_api.api.v1.openai.streaming_endpoints')
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    def test_streaming_proxies_upstream_chunks(self, mock_get_namespace, mock_with_ark_client, mock_endpoints):
+        """Test that chunks are relayed from the cached streaming endpoint."""
+        mock_get_namespace.return_value = "default"
+        mock_endpoints.get_base_url = AsyncMock(return_value="http://ark-broker.default.svc.cluster.local:80")
+        mock_client = self._mock_ark_client(mock_with_ark_client)
+
+        response = self.client.post("/openai/v1/chat/completions", json=self.request_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        self.assertEqual(
+            response.text,
+            'data: {"choices": [{"delta": {"content": "Hi"}}]}\n\ndata: [DONE]\n\n',
+        )
+        mock_client.queries.a_create.assert_called_once()
+        mock_endpoints.get_base_url.assert_awaited_once_with("default")
+        self.assertEqual(len(self.upstream_requests), 1)
+        query_name = mock_client.queries.a_create.call_args[0][0].metadata["name"]
+        self.assertEqual(self.upstream_requests[0].url.host, "ark-broker.default.svc.cluster.local")
+        self.assertEqual(self.upstream_requests[0].url.path, f"/stream/{query_name}")
+
+    @patch('ark_api.api.v1.openai.streaming_endpoints')
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    def test_streaming_forwards_upstream_error_status(self, mock_get_namespace, mock_with_ark_client, mock_endpoints):
+        """Test that an upstream error is returned with its own status code."""
+        import httpx
+        mock_get_namespace.return_value = "default"
+        mock_endpoints.get_base_url = AsyncMock(return_value="http://ark-broker.default.svc.cluster.local:80")
+        self._mock_ark_client(mock_with_ark_client)
+        self.upstream_response = httpx.Response(
+            404,
+            json={"error": {"message": "Query not found", "type": "not_found", "code": "query_not_found"}},
+        )
+
+        response = self.client.post("/openai/v1/chat/completions", json=self.request_data)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {
+            "error": {
+                "status": 404,
+                "message": "Query not found",
+                "type": "not_found",
+                "code": "query_not_found",
+            }
+        })
+
+    @patch('ark_api.api.v1.openai.streaming_endpoints')
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    @patch('ark_api.api.v1.openai.watch_query_completion')
+    def test_streaming_falls_back_to_polling_without_backend(self, mock_watch, mock_get_namespace, mock_with_ark_client, mock_endpoints):
+        """Test that a single chunk is sent when no streaming backend is configured."""
+        mock_get_namespace.return_value = "default"
+        mock_endpoints.get_base_url = AsyncMock(return_value=None)
+        self._mock_ark_client(mock_with_ark_client)
+        mock_watch.return_value = ChatCompletion(
+            id="chatcmpl-test",
+            object="chat.completion",
+            created=1234567890,
+            model="test-agent",
+            choices=[
+                Choice(
+                    index=0,
+                    message=ChatCompletionMessage(role="assistant", content="Hello!"),
+                    finish_reason="stop",
+                )
+            ],
+        )
+
+        response = self.client.post("/openai/v1/chat/completions", json=self.request_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('"content":"Hello!"', response.text)
+        self.assertTrue(response.text.endswith("data: [DONE]\n\n"))
+        self.assertEqual(self.upstream_requests, [])
+
+
+class TestOpenAIModels(unittest.TestCase):
+    """Test cases for the /openai/v1/models endpoint."""
+
+    def setUp(self):
+        """Set up test client and an empty models cache."""
+        from ark_api.main import app
+        from ark_api.api.v1 import openai
+        openai._models_cache.clear()
+        self.addCleanup(openai._models_cache.clear)
+        self.client = TestClient(app)
+
+    def _mock_custom_api(self, mock_custom_objects_api, failing_plural=None):
+        async def list_objects(group, version, namespace, plural):
+            if plural == failing_plural:
+                raise RuntimeError("forbidden")
+            return {"items": [{"metadata": {"name": f"{plural}-1", "creationTimestamp": "2024-01-01T00:00:00Z"}}]}
+
+        custom_api = Mock()
+        custom_api.list_namespaced_custom_object = AsyncMock(side_effect=list_objects)
+        mock_custom_objects_api.return_value = custom_api
+        return custom_api
+
+    @patch('ark_api.api.v1.openai.k8s_client.ApiClient')
+    @patch('ark_api.api.v1.openai.k8s_client.CustomObjectsApi')
+    def test_list_models_in_namespace(self, mock_custom_objects_api, mock_api_client):
+        """Test that all four kinds are listed in the requested namespace."""
+        custom_api = self._mock_custom_api(mock_custom_objects_api)
+
+        response = self.client.get("/openai/v1/models?namespace=team-a")
+
+        self.assertEqual(response.status_code, 200)
+        ids = [model["id"] for model in response.json()["data"]]
+        self.assertEqual(ids, ["agent/agents-1", "team/teams-1", "model/models-1", "tool/tools-1"])
+        self.assertIn("ETag", response.headers)
+        namespaces = {call.kwargs["namespace"] for call in custom_api.list_namespaced_custom_object.call_args_list}
+        self.assertEqual(namespaces, {"team-a"})
+
+    @patch('ark_api.api.v1.openai.k8s_client.ApiClient')
+    @patch('ark_api.api.v1.openai.k8s_client.CustomObjectsApi')
+    def test_list_models_cached_with_etag(self, mock_custom_objects_api, mock_api_client):
+        """Test that repeat calls are served from cache and honour If-None-Match."""
+        custom_api = self._mock_custom_api(mock_custom_objects_api)
+
+        first = self.client.get("/openai/v1/models?namespace=default")
+        second = self.client.get(
+            "/openai/v1/models?namespace=default",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(custom_api.list_namespaced_custom_object.await_count, 4)
+
+    @patch('ark_api.api.v1.openai.k8s_client.ApiClient')
+    @patch('ark_api.api.v1.openai.k8s_client.CustomObjectsApi')
+    def test_list_models_partial_results_not_cached(self, mock_custom_objects_api, mock_api_client):
+        """Test that a failing kind is skipped and the listing is not cached."""
+        custom_api = self._mock_custom_api(mock_custom_objects_api, failing_plural="tools")
+
+        response = self.client.get("/openai/v1/models?namespace=default")
+        self.client.get("/openai/v1/models?namespace=default")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 3)
+        self.assertEqual(custom_api.list_namespaced_custom_object.await_count, 8)
+
+
+class TestOpenAIBatches(unittest.TestCase):
+    """Test cases for the /openai/v1/files and /openai/v1/batches endpoints."""
+
+    def setUp(self):
+        """Set up test client with a batch service backed by a temporary directory."""
+        import shutil
+        import tempfile
+        from ark_api.main import app
+        from ark_api.api.v1 import openai_batches
+        from ark_api.services.openai_batches import OpenAIBatchService
+
+        storage_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, storage_dir, ignore_errors=True)
+        self.executor = AsyncMock(return_value=(200, {"id": "chatcmpl-test", "object": "chat.completion"}))
+        patcher = patch.object(
+            openai_batches, "_batch_service",
+            OpenAIBatchService(executor=self.executor, storage_dir=storage_dir),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def _upload(self, content, purpose="batch"):
+        return self.client.post(
+            "/openai/v1/files?namespace=team-a",
+            files={"file": ("input.jsonl", content, "application/jsonl")},
+            data={"purpose": purpose},
+        )
+
+    def test_upload_file_and_create_batch(self):
+        """Test uploading an input file and creating a batch from it."""
+        line = json.dumps({
+            "custom_id": "req-1",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": "agent/test-agent", "messages": [{"role": "user", "content": "Hello"}]},
+        })
+        upload = self._upload(line + "\n")
+        self.assertEqual(upload.status_code, 200)
+        file_object = upload.json()
+        self.assertEqual(file_object["object"], "file")
+        self.assertEqual(file_object["purpose"], "batch")
+        self.assertEqual(file_object["bytes"], len(line) + 1)
+
+        created = self.client.post("/openai/v1/batches?namespace=team-a", json={
+            "input_file_id": file_object["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+        })
+        self.assertEqual(created.status_code, 200)
+        self.assertEqual(created.json()["object"], "batch")
+        self.assertEqual(created.json()["input_file_id"], file_object["id"])
+
+        listed = self.client.get("/openai/v1/batches?namespace=team-a")
+        self.assertEqual([b["id"] for b in listed.json()["data"]], [created.json()["id"]])
+
+        content = self.client.get(f"/openai/v1/files/{file_object['id']}/content?namespace=team-a")
+        self.assertEqual(content.text, line + "\n")
+
+        # Files and batches are scoped to their namespace
+        self.assertEqual(self.client.get("/openai/v1/batches?namespace=team-b").json()["data"], [])
+        other = self.client.get(f"/openai/v1/files/{file_object['id']}/content?namespace=team-b")
+        self.assertEqual(other.status_code, 404)
+
+    def test_upload_rejects_unsupported_purpose(self):
+        """Test that only batch files can be uploaded."""
+        response = self._upload("{}\n", purpose="fine-tune")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["type"], "invalid_request_error")
+
+    def test_get_unknown_batch(self):
+        """Test that unknown batches return an OpenAI formatted 404."""
+        response = self.client.get("/openai/v1/batches/batch_missing")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["error"]["code"], "not_found")
+
+
+class TestOpenAIModelPassthrough(unittest.TestCase):
+    """Test cases for the direct model passthrough of /openai/v1/chat/completions."""
+
+    def setUp(self):
+        """Set up test client with a mocked model provider."""
+        import httpx
+        from ark_api.main import app
+        from ark_api.core.http import get_http_client
+        from ark_api.services.model_passthrough import ResolvedModel
+
+        self.app = app
+        self.get_http_client = get_http_client
+        self.provider_requests = []
+
+        def handler(request):
+            self.provider_requests.append(request)
+            return httpx.Response(200, json={
+                "id": "chatcmpl-direct",
+                "object": "chat.completion",
+                "created": 1234567890,
+                "model": "gpt-4o-2024-08-06",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hi!"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+            })
+
+        self.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.app.dependency_overrides[get_http_client] = lambda: self.http_client
+        self.client = TestClient(app)
+        self.resolved = ResolvedModel(
+            name="gpt", namespace="default", uid="uid-1", type="openai", model="gpt-4o",
+            url="https://api.openai.com/v1/chat/completions",
+            headers={"Authorization": "Bearer sk-test"},
+        )
+
+    def tearDown(self):
+        self.app.dependency_overrides.pop(self.get_http_client, None)
+
+    @patch('ark_api.api.v1.openai.schedule_audit')
+    @patch('ark_api.api.v1.openai.resolve_model')
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    @patch('ark_api.api.v1.openai.OPENAI_MODEL_PASSTHROUGH', True)
+    def test_model_target_calls_provider_directly(self, mock_get_namespace, mock_with_ark_client, mock_resolve, mock_audit):
+        """Test that model/ targets skip the Query and are audited."""
+        mock_get_namespace.return_value = "default"
+        mock_resolve.return_value = self.resolved
+
+        response = self.client.post("/openai/v1/chat/completions", json={
+            "model": "model/gpt",
+            "messages": [{"role": "user", "content": "Hello"}],
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["model"], "model/gpt")
+        self.assertEqual(response.json()["choices"][0]["message"]["content"], "Hi!")
+        mock_with_ark_client.assert_not_called()
+        mock_resolve.assert_awaited_once_with("default", "gpt")
+        self.assertEqual(self.provider_requests[0].headers["authorization"], "Bearer sk-test")
+        self.assertEqual(json.loads(self.provider_requests[0].content)["model"], "gpt-4o")
+        mock_audit.assert_called_once()
+
+    @patch('ark_api.api.v1.openai.resolve_model')
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    @patch('ark_api.api.v1.openai.watch_query_completion')
+    @patch('ark_api.api.v1.openai.OPENAI_MODEL_PASSTHROUGH', True)
+    def test_session_requests_use_query(self, mock_watch, mock_get_namespace, mock_with_ark_client, mock_resolve):
+        """Test that requests relying on Query features are not passed through."""
+        mock_get_namespace.return_value = "default"
+        mock_client = AsyncMock()
+        mock_with_ark_client.return_value.__aenter__.return_value = mock_client
+        mock_watch.return_value = ChatCompletion(
+            id="chatcmpl-test", object="chat.completion", created=1234567890, model="model/gpt",
+            choices=[Choice(index=0, message=ChatCompletionMessage(role="assistant", content="Hi"), finish_reason="stop")],
+        )
+
+        response = self.client.post("/openai/v1/chat/completions", json={
+            "model": "model/gpt",
+            "messages": [{"role": "user", "content": "Hello"}],
+            "metadata": {"sessionId": "session-1"},
+        })
+
+        self.assertEqual(response.status_code, 200)
+        mock_resolve.assert_not_called()
+        mock_client.queries.a_create.assert_called_once()
+        self.assertEqual(self.provider_requests, [])
+
+class TestOpenAICompletionCache(unittest.TestCase):
+    """Test cases for the opt-in completion cache."""
+
+    def setUp(self):
+        """Set up test client and an empty cache."""
+        from ark_api.main import app
+        from ark_api.utils.completion_cache import completion_cache
+        self.client = TestClient(app)
+        completion_cache.clear()
+        self.addCleanup(completion_cache.clear)
+
+    def _request(self, content="Hello", cache=True, ttl=None):
+        annotations = {"ark.mckinsey.com/completion-cache": "true"} if cache else {}
+        if ttl:
+            annotations["ark.mckinsey.com/completion-cache-ttl"] = ttl
+        return {
+            "model": "agent/test-agent",
+            "messages": [{"role": "user", "content": content}],
+            "metadata": {"ark": json.dumps({"annotations": annotations})},
+        }
+
+    def _mock_query(self, mock_with_ark_client, mock_watch):
+        mock_client = AsyncMock()
+        mock_with_ark_client.return_value.__aenter__.return_value = mock_client
+        mock_client.queries.a_create = AsyncMock()
+        mock_watch.side_effect = lambda *args, **kwargs: ChatCompletion(
+            id="chatcmpl-test",
+            object="chat.completion",
+            created=1234567890,
+            model="agent/test-agent",
+            choices=[Choice(index=0, message=ChatCompletionMessage(role="assistant", content="Hi!"), finish_reason="stop")],
+        )
+        return mock_client
+
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    @patch('ark_api.api.v1.openai.watch_query_completion')
+    def test_identical_request_is_served_from_cache(self, mock_watch, mock_get_namespace, mock_with_ark_client):
+        """Test that a repeated opt-in request skips the query and is marked as a hit."""
+        mock_get_namespace.return_value = "default"
+        mock_client = self._mock_query(mock_with_ark_client, mock_watch)
+
+        first = self.client.post("/openai/v1/chat/completions", json=self._request())
+        second = self.client.post("/openai/v1/chat/completions", json=self._request())
+
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.json()["ark"]["cache"]["hit"])
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.json()["ark"]["cache"]["hit"])
+        self.assertEqual(second.headers["X-Ark-Cache"], "hit")
+        self.assertEqual(second.json()["choices"][0]["message"]["content"], "Hi!")
+        mock_client.queries.a_create.assert_called_once()
+        annotations = mock_client.queries.a_create.call_args[0][0].metadata["annotations"]
+        self.assertEqual(annotations["ark.mckinsey.com/completion-cache"], "true")
+
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    @patch('ark_api.api.v1.openai.watch_query_completion')
+    def test_cached_completion_streams_as_single_chunk(self, mock_watch, mock_get_namespace, mock_with_ark_client):
+        """Test that a streaming request can be answered from the cache."""
+        mock_get_namespace.return_value = "default"
+        mock_client = self._mock_query(mock_with_ark_client, mock_watch)
+        self.client.post("/openai/v1/chat/completions", json=self._request())
+
+        response = self.client.post("/openai/v1/chat/completions", json={**self._request(), "stream": True})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Ark-Cache"], "hit")
+        self.assertIn('"content":"Hi!"', response.text)
+        self.assertIn("data: [DONE]", response.text)
+        mock_client.queries.a_create.assert_called_once()
+
+    @patch('ark_api.api.v1.openai.with_ark_client')
+    @patch('ark_api.api.v1.openai.get_namespace')
+    @patch('ark_api.api.v1.openai.watch_query_completion')
+    def test_requests_are_not_cached_without_opt_in(self, mock_watch, mock_get_namespace, mock_with_ark_client):
+        """Test that caching only applies to requests that ask for it and match exactly."""
+        mock_get_namespace.return_value = "default"
+        mock_client = self._mock_query(mock_with_ark_client, mock_watch)
+
+        self.client.post("/openai/v1/chat/completions", json=self._request(cache=False))
+        self.client.post("/openai/v1/chat/completions", json=self._request(cache=False))
+        self.client.post("/openai/v1/chat/completions", json=self._request("Hello"))
+        self.client.post("/openai/v1/chat/completions", json=self._request("Hello again"))
+
+        self.assertEqual(mock_client.queries.a_create.call_count, 4)
+
+    def test_invalid_cache_ttl_is_rejected(self):
+        """Test that an unparseable TTL annotation returns 400."""
+        response = self.client.post("/openai/v1/chat/completions", json=self._request(ttl="soon"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "invalid_ark_metadata")
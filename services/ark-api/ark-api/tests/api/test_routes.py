@@ -1,10 +1,15 @@
 """Tests for API routes."""
+import asyncio
+import json
 import os
 import unittest
 import unittest.mock
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
 
+from kubernetes_asyncio.client.rest import ApiException
+from ark_api.core.http import get_http_client
+
 # Set environment variable to skip authentication before importing the app
 os.environ["AUTH_MODE"] = "open"
 
@@ -268,12 +273,16 @@ class TestSessionEndpoints(unittest.TestCase):
     def setUp(self):
         """Set up test client."""
         from ark_api.main import app
+        self.app = app
         self.client = TestClient(app)
     
+    def tearDown(self):
+        """Remove HTTP client overrides."""
+        self.app.dependency_overrides.pop(get_http_client, None)
+    
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_session_success(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_session_success(self, mock_get_memory_resources, mock_with_ark_client):
         """Test successful session deletion."""
         # Setup mocks
         mock_client = AsyncMock()
@@ -292,7 +301,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = True
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete = AsyncMock(return_value=mock_http_response)
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         # Make the request
         response = self.client.delete("/v1/sessions/test-session")
@@ -305,8 +314,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_all_sessions_success(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_all_sessions_success(self, mock_get_memory_resources, mock_with_ark_client):
         """Test successful deletion of all sessions."""
         # Setup mocks
         mock_client = AsyncMock()
@@ -325,7 +333,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = True
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         # Make the request
         response = self.client.delete("/v1/sessions")
@@ -338,8 +346,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_query_messages_success(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_query_messages_success(self, mock_get_memory_resources, mock_with_ark_client):
         """Test successful query message deletion."""
         # Setup mocks
         mock_client = AsyncMock()
@@ -358,7 +365,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = True
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         # Make the request
         response = self.client.delete("/v1/sessions/test-session/queries/test-query/messages")
@@ -370,8 +377,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_session_all_services_unreachable(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_session_all_services_unreachable(self, mock_get_memory_resources, mock_with_ark_client):
         """Test session deletion when all memory services are unreachable (503)."""
         # Setup mocks
         mock_client = AsyncMock()
@@ -388,7 +394,7 @@ class TestSessionEndpoints(unittest.TestCase):
         # Simulate network error
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.side_effect = Exception("Connection refused")
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         # Make the request
         response = self.client.delete("/v1/sessions/test-session")
@@ -400,8 +406,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_session_multiple_services(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_session_multiple_services(self, mock_get_memory_resources, mock_with_ark_client):
         """Test session deletion across multiple memory services."""
         # Setup mocks
         mock_client = AsyncMock()
@@ -426,7 +431,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = True
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         # Make the request
         response = self.client.delete("/v1/sessions/test-session")
@@ -438,8 +443,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_session_database_error_500(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_session_database_error_500(self, mock_get_memory_resources, mock_with_ark_client):
         """Test session deletion when database returns 500 error."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -457,7 +461,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = False
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions/test-session")
         
@@ -468,8 +472,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_session_idempotent_404(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_session_idempotent_404(self, mock_get_memory_resources, mock_with_ark_client):
         """Test session deletion when session is not found (404) - should succeed as idempotent."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -487,7 +490,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = False
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions/test-session")
         
@@ -497,8 +500,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_session_partial_failure(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_session_partial_failure(self, mock_get_memory_resources, mock_with_ark_client):
         """Test session deletion when some services succeed and some fail."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -529,7 +531,7 @@ class TestSessionEndpoints(unittest.TestCase):
         
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.side_effect = side_effect
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions/test-session")
         
@@ -555,8 +557,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_all_sessions_database_error_500(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_all_sessions_database_error_500(self, mock_get_memory_resources, mock_with_ark_client):
         """Test delete all sessions when database returns 500 error."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -574,7 +575,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = False
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions")
         
@@ -584,8 +585,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_all_sessions_all_unreachable(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_all_sessions_all_unreachable(self, mock_get_memory_resources, mock_with_ark_client):
         """Test delete all sessions when all memory services are unreachable."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -605,7 +605,7 @@ class TestSessionEndpoints(unittest.TestCase):
         
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.side_effect = Exception("Connection refused")
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions")
         
@@ -617,8 +617,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_all_sessions_multiple_services(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_all_sessions_multiple_services(self, mock_get_memory_resources, mock_with_ark_client):
         """Test delete all sessions across multiple memory services."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -641,7 +640,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = True
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions")
         
@@ -651,8 +650,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_query_messages_database_error_500(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_query_messages_database_error_500(self, mock_get_memory_resources, mock_with_ark_client):
         """Test query messages deletion when database returns 500 error."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -670,7 +668,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = False
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions/test-session/queries/test-query/messages")
         
@@ -681,8 +679,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_query_messages_all_unreachable(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_query_messages_all_unreachable(self, mock_get_memory_resources, mock_with_ark_client):
         """Test query messages deletion when all memory services are unreachable."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -697,7 +694,7 @@ class TestSessionEndpoints(unittest.TestCase):
         
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.side_effect = Exception("Connection refused")
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions/test-session/queries/test-query/messages")
         
@@ -707,8 +704,7 @@ class TestSessionEndpoints(unittest.TestCase):
     
     @patch('ark_api.api.v1.sessions.with_ark_client')
     @patch('ark_api.api.v1.sessions.get_all_memory_resources')
-    @patch('ark_api.api.v1.sessions.httpx.AsyncClient')
-    def test_delete_query_messages_multiple_services(self, mock_httpx_client, mock_get_memory_resources, mock_with_ark_client):
+    def test_delete_query_messages_multiple_services(self, mock_get_memory_resources, mock_with_ark_client):
         """Test query messages deletion across multiple memory services."""
         mock_client = AsyncMock()
         mock_with_ark_client.return_value.__aenter__.return_value = mock_client
@@ -731,7 +727,7 @@ class TestSessionEndpoints(unittest.TestCase):
         mock_http_response.is_success = True
         mock_http_client_instance = AsyncMock()
         mock_http_client_instance.delete.return_value = mock_http_response
-        mock_httpx_client.return_value.__aenter__.return_value = mock_http_client_instance
+        self.app.dependency_overrides[get_http_client] = lambda: mock_http_client_instance
         
         response = self.client.delete("/v1/sessions/test-session/queries/test-query/messages")
         
@@ -740,6 +736,36 @@ class TestSessionEndpoints(unittest.TestCase):
         self.assertIn("deleted successfully from 2 memory service(s)", data["message"])
 
 
+    @patch('ark_api.api.v1.sessions.with_ark_client')
+    @patch('ark_api.api.v1.sessions.get_all_memory_resources')
+    @patch('ark_api.api.v1.sessions.fetch_memory_service_data')
+    def test_list_sessions_partial_results(self, mock_fetch, mock_get_memory_resources, mock_with_ark_client):
+        """Test that sessions from healthy memories are returned with errors for failing ones."""
+        from fastapi import HTTPException
+        mock_with_ark_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_get_memory_resources.return_value = [
+            {"metadata": {"name": "memory-ok"}, "status": {"lastResolvedAddress": "http://ok:8080"}},
+            {"metadata": {"name": "memory-down"}, "status": {"lastResolvedAddress": "http://down:8080"}},
+        ]
+
+        async def fetch(service_url, endpoint, params=None, memory_name="unknown"):
+            if memory_name == "memory-down":
+                raise HTTPException(status_code=503, detail="Failed to connect to memory service memory-down")
+            return {"sessions": ["session-1", "session-2"]}
+
+        mock_fetch.side_effect = fetch
+
+        response = self.client.get("/v1/sessions")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total"], 2)
+        self.assertEqual({item["memoryName"] for item in data["items"]}, {"memory-ok"})
+        self.assertEqual(len(data["errors"]), 1)
+        self.assertEqual(data["errors"][0]["memoryName"], "memory-down")
+        self.assertIn("Failed to connect", data["errors"][0]["error"])
+
+
 class TestAgentsEndpoint(unittest.TestCase):
     """Test cases for the /namespaces/{namespace}/agents endpoint."""
     
@@ -819,6 +845,57 @@ class TestAgentsEndpoint(unittest.TestCase):
         data = response.json()
         self.assertEqual(data["count"], 0)
         self.assertEqual(data["items"], [])
+
+    @patch('ark_api.api.v1.agents.with_ark_client')
+    def test_list_agents_conditional_get(self, mock_ark_client):
+        """Test that an unchanged list returns 304 and a changed one a new ETag."""
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        agent = Mock()
+        agent.to_dict.return_value = {
+            "metadata": {"name": "test-agent", "namespace": "default", "resourceVersion": "1"},
+            "spec": {"prompt": "You are a helpful assistant"},
+        }
+        mock_client.agents.a_list = AsyncMock(return_value=[agent])
+
+        first = self.client.get("/v1/agents?namespace=default")
+        etag = first.headers["ETag"]
+        unchanged = self.client.get("/v1/agents?namespace=default", headers={"If-None-Match": etag})
+        other_namespace = self.client.get("/v1/agents?namespace=other", headers={"If-None-Match": etag})
+        agent.to_dict.return_value["metadata"]["resourceVersion"] = "2"
+        changed = self.client.get("/v1/agents?namespace=default", headers={"If-None-Match": etag})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["Cache-Control"], "no-cache")
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.content, b"")
+        self.assertEqual(other_namespace.status_code, 200)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    @patch('ark_api.utils.delta.custom_resource_informer')
+    @patch('ark_api.api.v1.agents.with_ark_client')
+    def test_list_agents_since(self, mock_ark_client, mock_get_informer):
+        """Test that since returns only the changes from the agent informer."""
+        informer = mock_get_informer.return_value
+        informer.wait_synced = AsyncMock(return_value=True)
+        informer.resource_version = "12"
+        informer.changes_since.return_value = [
+            ("MODIFIED", {"metadata": {"name": "a1", "namespace": "default"}, "spec": {}, "status": {}}),
+            ("DELETED", {"metadata": {"name": "a2", "namespace": "default"}}),
+        ]
+
+        response = self.client.get("/v1/agents?namespace=default&since=10")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        mock_get_informer.assert_called_once_with("agents", "default")
+        informer.changes_since.assert_called_once_with("10")
+        mock_ark_client.assert_not_called()
+        self.assertEqual(data["resourceVersion"], "12")
+        self.assertFalse(data["resyncRequired"])
+        self.assertEqual([a["name"] for a in data["modified"]], ["a1"])
+        self.assertEqual(data["deleted"], ["a2"])
     
     @patch('ark_api.api.v1.agents.with_ark_client')
     def test_create_agent_success(self, mock_ark_client):
@@ -1569,7 +1646,257 @@ class TestQueriesEndpoint(unittest.TestCase):
         data = response.json()
         self.assertEqual(data["count"], 0)
         self.assertEqual(data["items"], [])
-    
+
+    def _raw_query(self, name, created, content="answer"):
+        return {
+            "metadata": {"name": name, "namespace": "default", "creationTimestamp": created},
+            "spec": {"input": "question", "type": "user"},
+            "status": {"phase": "done", "responses": [{"content": content}]},
+        }
+
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_list_queries_fields_and_sort(self, mock_ark_client):
+        """Test that fields projects each item and sort orders by creation time."""
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        queries = []
+        for name, created in [("b", "2024-01-02T00:00:00Z"), ("a", "2024-01-03T00:00:00Z"), ("c", "2024-01-01T00:00:00Z")]:
+            query = Mock()
+            query.to_dict.return_value = self._raw_query(name, created)
+            queries.append(query)
+        mock_client.queries.a_list = AsyncMock(return_value=queries)
+
+        response = self.client.get("/v1/queries?namespace=default&sort=-creationTimestamp&limit=2&fields=name,status.phase")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["items"], [{"name": "a", "status": {"phase": "done"}}, {"name": "b", "status": {"phase": "done"}}])
+        self.assertEqual(data["count"], 2)
+
+        response = self.client.get(f"/v1/queries?namespace=default&sort=-creationTimestamp&limit=2&continue={data['continue']}")
+
+        data = response.json()
+        self.assertEqual([item["name"] for item in data["items"]], ["c"])
+        self.assertEqual(data["items"][0]["status"]["responses"][0]["content"], "answer")
+        self.assertIsNone(data["continue"])
+
+    def test_list_queries_invalid_field(self):
+        """Test that unknown fields are rejected."""
+        response = self.client.get("/v1/queries?namespace=default&fields=name,secret")
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('ark_api.api.v1.queries.ApiClient')
+    @patch('ark_api.api.v1.queries.client.CustomObjectsApi')
+    def test_list_queries_live_pagination(self, mock_custom_api, mock_api_client):
+        """Test that unsorted pages are read from the API server with limit/continue."""
+        mock_api_client.return_value.__aenter__ = AsyncMock()
+        mock_api_client.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_list = AsyncMock(side_effect=[
+            {"items": [self._raw_query("a", "2024-01-01T00:00:00Z")], "metadata": {"continue": "k8s-token"}},
+            {"items": [self._raw_query("b", "2024-01-02T00:00:00Z")], "metadata": {}},
+        ])
+        mock_custom_api.return_value.list_namespaced_custom_object = mock_list
+
+        first = self.client.get("/v1/queries?namespace=default&limit=1").json()
+        second = self.client.get(f"/v1/queries?namespace=default&limit=1&continue={first['continue']}").json()
+
+        self.assertEqual([item["name"] for item in first["items"]], ["a"])
+        self.assertEqual([item["name"] for item in second["items"]], ["b"])
+        self.assertIsNone(second["continue"])
+        self.assertEqual([c.kwargs["_continue"] for c in mock_list.call_args_list], [None, "k8s-token"])
+        self.assertEqual(mock_list.call_args_list[0].kwargs["limit"], 1)
+
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    @patch('ark_api.api.v1.queries.get_query_informer')
+    @patch('ark_api.api.v1.queries.QUERY_LIST_INFORMER', True)
+    def test_list_queries_from_informer(self, mock_get_informer, mock_ark_client):
+        """Test that a synced informer serves the list without an API call."""
+        mock_get_informer.return_value.synced = True
+        mock_get_informer.return_value.items.return_value = [
+            self._raw_query("b", "2024-01-02T00:00:00Z"),
+            self._raw_query("a", "2024-01-01T00:00:00Z"),
+        ]
+
+        response = self.client.get("/v1/queries?namespace=default&sort=creationTimestamp")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["name"] for item in response.json()["items"]], ["a", "b"])
+        mock_get_informer.assert_called_once_with("default")
+        mock_ark_client.assert_not_called()
+
+    @patch('ark_api.api.v1.queries.ApiClient')
+    @patch('ark_api.api.v1.queries.client.CustomObjectsApi')
+    @patch('ark_api.api.v1.queries.get_query_informer')
+    @patch('ark_api.api.v1.queries.QUERY_LIST_INFORMER', True)
+    def test_list_queries_continue_across_informer_state(self, mock_get_informer, mock_custom_api, mock_api_client):
+        """Test that a continue token from the other list path restarts the list instead of failing."""
+        mock_api_client.return_value.__aenter__ = AsyncMock()
+        mock_api_client.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_list = AsyncMock(return_value={
+            "items": [self._raw_query("a", "2024-01-01T00:00:00Z")], "metadata": {"continue": "k8s-token"}
+        })
+        mock_custom_api.return_value.list_namespaced_custom_object = mock_list
+        mock_get_informer.return_value.items.return_value = [
+            self._raw_query("a", "2024-01-01T00:00:00Z"),
+            self._raw_query("b", "2024-01-02T00:00:00Z"),
+        ]
+
+        # Informer synced: page one comes from memory
+        mock_get_informer.return_value.synced = True
+        memory_token = self.client.get("/v1/queries?namespace=default&limit=1").json()["continue"]
+
+        # Informer no longer synced: the memory token restarts the live list
+        mock_get_informer.return_value.synced = False
+        live = self.client.get(f"/v1/queries?namespace=default&limit=1&continue={memory_token}")
+        self.assertEqual(live.status_code, 200)
+        self.assertIsNone(mock_list.call_args.kwargs["_continue"])
+
+        # Informer synced again: the live token restarts the in-memory list
+        mock_get_informer.return_value.synced = True
+        memory = self.client.get(f"/v1/queries?namespace=default&limit=1&continue={live.json()['continue']}")
+        self.assertEqual(memory.status_code, 200)
+        self.assertEqual([item["name"] for item in memory.json()["items"]], ["a"])
+
+    @patch('ark_api.api.v1.queries.QUERY_BULK_CONCURRENCY', 2)
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_create_queries_batch(self, mock_ark_client):
+        """Test that queries are created with bounded concurrency and per-item results."""
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        in_flight = {"now": 0, "max": 0}
+
+        async def create(resource):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            if resource.metadata["name"] == "q-1":
+                raise ApiException(status=409, reason="AlreadyExists")
+            created = Mock()
+            created.to_dict.return_value = {
+                "metadata": {"name": resource.metadata["name"], "namespace": "default"},
+                "spec": {"input": "hello", "type": "user"},
+            }
+            return created
+        mock_client.queries.a_create = AsyncMock(side_effect=create)
+
+        response = self.client.post("/v1/queries:batch?namespace=default", json={
+            "queries": [{"name": f"q-{i}", "input": "hello"} for i in range(5)]
+        })
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["succeeded"], data["failed"]), (4, 1))
+        self.assertEqual([item["name"] for item in data["items"]], [f"q-{i}" for i in range(5)])
+        self.assertEqual(data["items"][1]["statusCode"], 409)
+        self.assertEqual(data["items"][0]["query"]["name"], "q-0")
+        self.assertEqual(in_flight["max"], 2)
+
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_cancel_queries_by_name(self, mock_ark_client):
+        """Test cancelling a list of queries by name."""
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        mock_client.queries.a_patch = AsyncMock()
+
+        response = self.client.post("/v1/queries:cancel?namespace=default", json={"names": ["a", "b"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["succeeded"], 2)
+        mock_client.queries.a_patch.assert_any_call("a", {"spec": {"cancel": True}})
+        mock_client.queries.a_patch.assert_any_call("b", {"spec": {"cancel": True}})
+
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    @patch('ark_api.api.v1.queries.ApiClient')
+    @patch('ark_api.api.v1.queries.client.CustomObjectsApi')
+    def test_cancel_queries_by_session(self, mock_custom_api, mock_api_client, mock_ark_client):
+        """Test that a session cancel only patches the session's unfinished queries."""
+        mock_api_client.return_value.__aenter__ = AsyncMock()
+        mock_api_client.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_custom_api.return_value.list_namespaced_custom_object = AsyncMock(return_value={
+            "items": [
+                {"metadata": {"name": "running"}, "spec": {"sessionId": "s1"}, "status": {"phase": "running"}},
+                {"metadata": {"name": "finished"}, "spec": {"sessionId": "s1"}, "status": {"phase": "done"}},
+                {"metadata": {"name": "other"}, "spec": {"sessionId": "s2"}, "status": {"phase": "running"}},
+            ],
+            "metadata": {},
+        })
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        mock_client.queries.a_patch = AsyncMock()
+
+        response = self.client.post("/v1/queries:cancel?namespace=default", json={"sessionId": "s1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["name"] for item in response.json()["items"]], ["running"])
+        mock_client.queries.a_patch.assert_called_once_with("running", {"spec": {"cancel": True}})
+
+    def test_cancel_queries_requires_one_selector(self):
+        """Test that cancel rejects requests with zero or several selectors."""
+        for body in [{}, {"names": ["a"], "sessionId": "s1"}]:
+            response = self.client.post("/v1/queries:cancel?namespace=default", json=body)
+            self.assertEqual(response.status_code, 400)
+
+    @patch('ark_api.api.v1.queries.validate_callback_url', new_callable=AsyncMock)
+    @patch('ark_api.api.v1.queries.query_callbacks')
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_create_query_with_callback(self, mock_ark_client, mock_callbacks, mock_validate):
+        """Test that a callback URL is stored as an annotation and its namespace registered."""
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        created = Mock()
+        created.to_dict.return_value = {
+            "metadata": {"name": "q", "namespace": "default"},
+            "spec": {"input": "hello", "type": "user"},
+        }
+        mock_client.queries.a_create = AsyncMock(return_value=created)
+        mock_callbacks.register_namespace = AsyncMock()
+
+        response = self.client.post("/v1/queries?namespace=default", json={
+            "name": "q",
+            "input": "hello",
+            "metadata": {"annotations": {"team": "a"}},
+            "callback": "https://hooks.example.com/ark",
+        })
+
+        self.assertEqual(response.status_code, 200)
+        annotations = mock_client.queries.a_create.call_args[0][0].metadata["annotations"]
+        self.assertEqual(annotations["ark.mckinsey.com/completion-callback"], "https://hooks.example.com/ark")
+        self.assertEqual(annotations["team"], "a")
+        mock_callbacks.register_namespace.assert_awaited_once_with("default")
+        mock_validate.assert_awaited_once_with("https://hooks.example.com/ark")
+
+    @patch('ark_api.services.query_callbacks.QUERY_CALLBACK_ALLOWED_HOSTS', ["hooks.example.com"])
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_create_query_rejects_disallowed_callback(self, mock_ark_client):
+        """Test that callbacks to hosts outside the allowlist fail before the query is created."""
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+
+        for body in [
+            {"name": "q", "input": "hello", "callback": "https://169.254.169.254/latest"},
+            {"name": "q", "input": "hello",
+             "metadata": {"annotations": {"ark.mckinsey.com/completion-callback": "http://localhost:8080/"}}},
+        ]:
+            response = self.client.post("/v1/queries?namespace=default", json=body)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("QUERY_CALLBACK_ALLOWED_HOSTS", response.json()["detail"])
+
+        response = self.client.post("/v1/queries:batch?namespace=default", json={"queries": [
+            {"name": "q", "input": "hello", "callback": "https://internal.svc/hook"},
+        ]})
+        self.assertEqual(response.json()["items"][0]["statusCode"], 400)
+        mock_client.queries.a_create.assert_not_called()
+
+    def test_create_query_rejects_invalid_callback(self):
+        """Test that the callback must be an http(s) URL."""
+        response = self.client.post("/v1/queries?namespace=default", json={
+            "name": "q", "input": "hello", "callback": "not a url"
+        })
+
+        self.assertEqual(response.status_code, 422)
+
     @patch('ark_api.api.v1.queries.with_ark_client')
     def test_create_query_simple(self, mock_ark_client):
         """Test creating a simple query."""
@@ -1858,6 +2185,154 @@ class TestQueriesEndpoint(unittest.TestCase):
         mock_client.queries.a_delete.assert_called_once_with("test-query")
 
 
+class _ScriptedSubscription:
+    """Stands in for a shared watch subscription, returning scripted events."""
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.dropped = 0
+        self.closed = False
+
+    async def get(self, timeout=None):
+        return self.events.pop(0) if self.events else None
+
+    async def ready(self, timeout=None):
+        return True
+
+    def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+
+class TestQueryWaitEndpoints(unittest.TestCase):
+    """Test cases for the query wait and events endpoints."""
+
+    def setUp(self):
+        """Set up test client."""
+        from ark_api.main import app
+        self.client = TestClient(app)
+
+    def _query(self, name, phase):
+        return {
+            "metadata": {"name": name, "namespace": "default"},
+            "spec": {"input": "hello", "type": "user"},
+            "status": {"phase": phase},
+        }
+
+    def _mock_get(self, mock_ark_client, phase):
+        mock_client = AsyncMock()
+        mock_ark_client.return_value.__aenter__.return_value = mock_client
+        current = Mock()
+        current.to_dict.return_value = self._query("q", phase)
+        mock_client.queries.a_get = AsyncMock(return_value=current)
+        return mock_client
+
+    @patch('ark_api.api.v1.queries.get_query_watch')
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_wait_returns_when_query_finishes(self, mock_ark_client, mock_get_watch):
+        """Test that wait returns the query once a watch event reports a terminal phase."""
+        self._mock_get(mock_ark_client, "running")
+        subscription = _ScriptedSubscription([
+            {"type": "MODIFIED", "object": self._query("other", "done")},
+            {"type": "MODIFIED", "object": self._query("q", "done")},
+        ])
+        mock_get_watch.return_value.subscribe.return_value = subscription
+
+        response = self.client.get("/v1/queries/q/wait?namespace=default&timeout=10s")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"]["phase"], "done")
+        self.assertEqual(subscription.events, [])
+        self.assertTrue(subscription.closed)
+
+    @patch('ark_api.api.v1.queries.get_query_watch')
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_wait_times_out_with_current_state(self, mock_ark_client, mock_get_watch):
+        """Test that wait returns the unfinished query when the timeout expires."""
+        self._mock_get(mock_ark_client, "running")
+        mock_get_watch.return_value.subscribe.return_value = _ScriptedSubscription([])
+
+        response = self.client.get("/v1/queries/q/wait?namespace=default&timeout=1s")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"]["phase"], "running")
+
+    @patch('ark_api.api.v1.queries.get_query_watch')
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_wait_reports_deleted_query(self, mock_ark_client, mock_get_watch):
+        """Test that wait returns 404 if the query is deleted while waiting."""
+        self._mock_get(mock_ark_client, "running")
+        mock_get_watch.return_value.subscribe.return_value = _ScriptedSubscription([
+            {"type": "DELETED", "object": self._query("q", "running")},
+        ])
+
+        response = self.client.get("/v1/queries/q/wait?namespace=default")
+
+        self.assertEqual(response.status_code, 404)
+
+    @patch('ark_api.utils.shared_watch.ApiClient')
+    @patch('ark_api.utils.shared_watch.watch.Watch')
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_wait_sees_change_between_read_and_watch_start(self, mock_ark_client, mock_watch, mock_api_client):
+        """Test that a query finishing while the shared watch starts is not missed."""
+        from ark_api.utils.shared_watch import SharedWatch
+
+        mock_client = self._mock_get(mock_ark_client, "running")
+        done = Mock()
+        done.to_dict.return_value = self._query("q", "done")
+        mock_api_client.return_value.__aenter__ = AsyncMock()
+        mock_api_client.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        async def list_queries(**kwargs):
+            # The query finishes just before the watch takes its starting resourceVersion
+            mock_client.queries.a_get.return_value = done
+            return {"metadata": {"resourceVersion": "10"}}
+
+        async def no_events():
+            await asyncio.Event().wait()
+            yield
+
+        mock_watch.return_value.__aenter__ = AsyncMock(return_value=Mock(stream=Mock(side_effect=lambda *a, **k: no_events())))
+        mock_watch.return_value.__aexit__ = AsyncMock(return_value=None)
+        shared_watch = SharedWatch("queries/default", lambda api: list_queries)
+
+        with patch('ark_api.api.v1.queries.get_query_watch', return_value=shared_watch):
+            response = self.client.get("/v1/queries/q/wait?namespace=default&timeout=2s")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"]["phase"], "done")
+
+    def test_wait_rejects_invalid_timeout(self):
+        """Test that an unparseable timeout returns 400."""
+        response = self.client.get("/v1/queries/q/wait?namespace=default&timeout=soon")
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('ark_api.api.v1.queries.get_query_watch')
+    @patch('ark_api.api.v1.queries.with_ark_client')
+    def test_events_stream_phase_transitions(self, mock_ark_client, mock_get_watch):
+        """Test that the stream sends the current phase, each change, then ends."""
+        self._mock_get(mock_ark_client, "pending")
+        subscription = _ScriptedSubscription([
+            {"type": "MODIFIED", "object": self._query("q", "running")},
+            {"type": "MODIFIED", "object": self._query("q", "running")},
+            {"type": "MODIFIED", "object": self._query("q", "done")},
+        ])
+        mock_get_watch.return_value.subscribe.return_value = subscription
+
+        response = self.client.get("/v1/queries/q/events?namespace=default")
+
+        self.assertEqual(response.status_code, 200)
+        phases = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+        self.assertEqual([(p["previousPhase"], p["phase"]) for p in phases], [(None, "pending"), ("pending", "running"), ("running", "done")])
+        self.assertTrue(subscription.closed)
+
+
 class TestTeamsEndpoint(unittest.TestCase):
     """Test cases for the /namespaces/{namespace}/teams endpoint."""
     
@@ -2362,4 +2837,327 @@ class TestTeamsEndpoint(unittest.TestCase):
         self.assertEqual(response.status_code, 403)
         data = response.json()
         self.assertIn("graph strategy requires maxTurns", data["detail"])
-        self.assertIn("admission webhook", data["detail"])
\ No newline at end of file
+        self.assertIn("admission webhook", data["detail"])
+
+class TestEventsEndpoint(unittest.TestCase):
+    """Test cases for the /v1/events endpoint."""
+
+    def setUp(self):
+        """Set up test client."""
+        from ark_api.main import app
+        self.client = TestClient(app)
+
+    def _event(self, name: str, object_name: str) -> Mock:
+        event = Mock()
+        event.involved_object.name = object_name
+        event.to_dict.return_value = {
+            "metadata": {
+                "name": name,
+                "namespace": "default",
+                "uid": f"uid-{name}",
+                "creation_timestamp": "2024-01-01T00:00:00Z"
+            },
+            "type": "Normal",
+            "reason": "Created",
+            "message": "created",
+            "involved_object": {"kind": "Agent", "name": object_name},
+            "source": {},
+            "count": 1
+        }
+        return event
+
+    def _list_response(self, items, continue_token=None, remaining=None) -> Mock:
+        response = Mock()
+        response.items = items
+        response.metadata._continue = continue_token
+        response.metadata.remaining_item_count = remaining
+        return response
+
+    @patch('ark_api.api.v1.events.ApiClient')
+    @patch('ark_api.api.v1.events.client.CoreV1Api')
+    def test_list_events_pushes_filters_to_field_selector(self, mock_v1_api, mock_api_client):
+        """Test that type and kind become field selectors and limit/continue are used."""
+        mock_api_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_api_instance = mock_v1_api.return_value
+        mock_api_instance.list_namespaced_event = AsyncMock(return_value=self._list_response(
+            [self._event("e1", "agent-a"), self._event("e2", "agent-b")], continue_token="k8s-token", remaining=10
+        ))
+
+        response = self.client.get("/v1/events?namespace=default&type=Warning&kind=Agent&limit=2")
+
+        self.assertEqual(response.status_code, 200)
+        mock_api_instance.list_namespaced_event.assert_called_once_with(
+            namespace="default",
+            field_selector="type=Warning,involvedObject.kind=Agent",
+            limit=2,
+            _continue=None
+        )
+        data = response.json()
+        self.assertEqual(len(data["items"]), 2)
+        self.assertEqual(data["total"], 12)
+        self.assertIsNotNone(data["continue"])
+
+        # The returned token resumes from the Kubernetes continue token
+        self.client.get(f"/v1/events?namespace=default&limit=2&continue={data['continue']}")
+        self.assertEqual(mock_api_instance.list_namespaced_event.call_args[1]["_continue"], "k8s-token")
+
+    @patch('ark_api.api.v1.events.ApiClient')
+    @patch('ark_api.api.v1.events.client.CoreV1Api')
+    def test_list_events_name_filter_resumes_inside_chunk(self, mock_v1_api, mock_api_client):
+        """Test that a page filled part way through a chunk resumes after the last match."""
+        mock_api_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_api_instance = mock_v1_api.return_value
+        events = [
+            self._event("e1", "agent-a"),
+            self._event("e2", "other"),
+            self._event("e3", "my-agent-a"),
+            self._event("e4", "agent-a-2"),
+        ]
+        mock_api_instance.list_namespaced_event = AsyncMock(return_value=self._list_response(events))
+
+        first = self.client.get("/v1/events?namespace=default&name=AGENT-A&limit=2").json()
+        self.assertEqual({item["name"] for item in first["items"]}, {"e1", "e3"})
+        self.assertIsNotNone(first["continue"])
+
+        second = self.client.get(f"/v1/events?namespace=default&name=agent-a&limit=2&continue={first['continue']}").json()
+        self.assertEqual([item["name"] for item in second["items"]], ["e4"])
+        self.assertIsNone(second["continue"])
+
+    def test_list_events_invalid_continue_token(self):
+        """Test that a malformed continue token is rejected."""
+        response = self.client.get("/v1/events?namespace=default&continue=not-a-token")
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_events_filters_and_formats_sse(self):
+        """Test that streamed events are filtered and sent as SSE messages."""
+        from ark_api.utils.shared_watch import SharedWatch
+
+        warning = self._event("e1", "agent-a")
+        warning.to_dict.return_value["type"] = "Warning"
+        normal = self._event("e2", "agent-a")
+
+        async def fake_run(shared_watch):
+            shared_watch.publish({"type": "ADDED", "object": normal})
+            shared_watch.publish({"type": "MODIFIED", "object": warning})
+            for subscription in list(shared_watch._subscribers):
+                subscription.close()
+
+        with patch.object(SharedWatch, '_run', fake_run), \
+                patch('ark_api.api.v1.events.shared_watches.get_or_create',
+                      side_effect=lambda key, factory: factory()):
+            with self.client.stream("GET", "/v1/events/stream?namespace=default&type=Warning") as response:
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+                body = response.read().decode()
+
+        data_lines = [line for line in body.splitlines() if line.startswith("data: ")]
+        self.assertEqual(len(data_lines), 1)
+        message = json.loads(data_lines[0][len("data: "):])
+        self.assertEqual(message["type"], "MODIFIED")
+        self.assertEqual(message["event"]["name"], "e1")
+
+
+class TestSummaryEndpoint(unittest.TestCase):
+    """Test cases for the /v1/summary endpoint."""
+
+    def setUp(self):
+        """Set up test client."""
+        from ark_api.main import app
+        self.client = TestClient(app)
+
+    @staticmethod
+    def _item(name, phase=None, conditions=None, created="2024-01-01T00:00:00Z"):
+        status = {}
+        if phase:
+            status["phase"] = phase
+        if conditions:
+            status["conditions"] = conditions
+        return {"metadata": {"name": name, "creationTimestamp": created}, "status": status}
+
+    @patch('ark_api.api.v1.summary.ApiClient')
+    @patch('ark_api.api.v1.summary.client.CustomObjectsApi')
+    def test_summary_counts_histograms_and_failures(self, mock_custom_api, mock_api_client):
+        """Test that every kind is listed once and summarized."""
+        mock_api_client.return_value.__aenter__.return_value = Mock()
+        unavailable = [{"type": "Available", "status": "False", "reason": "ModelNotFound",
+                        "message": "model missing", "lastTransitionTime": "2024-01-02T00:00:00Z"}]
+        listings = {
+            "agents": [self._item("a1", conditions=[{"type": "Available", "status": "True"}]),
+                       self._item("a2", conditions=unavailable)],
+            "queries": [self._item("q1", "done"), self._item("q2", "error", created="2024-01-03T00:00:00Z"),
+                        self._item("q3", "error", created="2024-01-04T00:00:00Z")],
+        }
+
+        async def list_objects(**kwargs):
+            if kwargs["plural"] == "tools":
+                raise ApiException(status=403, reason="Forbidden")
+            return {"items": listings.get(kwargs["plural"], []), "metadata": {}}
+
+        mock_custom_api.return_value.list_namespaced_custom_object = AsyncMock(side_effect=list_objects)
+
+        response = self.client.get("/v1/summary?namespace=default")
+
+        self.assertEqual(response.status_code, 200)
+        kinds = response.json()["kinds"]
+        self.assertEqual(mock_custom_api.return_value.list_namespaced_custom_object.call_count, 8)
+        self.assertEqual(kinds["agents"]["count"], 2)
+        self.assertEqual(kinds["agents"]["availability"], {"True": 1, "False": 1, "Unknown": 0})
+        self.assertEqual(kinds["agents"]["recentFailures"][0]["reason"], "ModelNotFound")
+        self.assertEqual(kinds["queries"]["phases"], {"done": 1, "error": 2})
+        self.assertIsNone(kinds["queries"]["availability"])
+        self.assertEqual([f["name"] for f in kinds["queries"]["recentFailures"]], ["q3", "q2"])
+        self.assertEqual(kinds["mcpServers"]["count"], 0)
+        self.assertEqual(kinds["tools"]["error"], "403 Forbidden")
+
+
+class TestWatchEndpoint(unittest.TestCase):
+    """Test cases for the /v1/watch/{kind} endpoint."""
+
+    def setUp(self):
+        """Set up test client."""
+        from ark_api.main import app
+        self.client = TestClient(app)
+
+    @staticmethod
+    def _agent(name, labels=None, phase=None):
+        return {"metadata": {"name": name, "labels": labels or {}}, "status": {"phase": phase}}
+
+    def _watch(self, events):
+        """Patch shared watches to publish the given events and then end."""
+        from ark_api.utils.shared_watch import SharedWatch
+
+        async def fake_run(shared_watch):
+            for event in events:
+                shared_watch.publish(event)
+            for subscription in list(shared_watch._subscribers):
+                subscription.close()
+
+        run = patch.object(SharedWatch, '_run', fake_run)
+        registry = patch('ark_api.utils.shared_watch.shared_watches.get_or_create',
+                         side_effect=lambda key, factory: factory())
+        run.start()
+        registry.start()
+        self.addCleanup(run.stop)
+        self.addCleanup(registry.stop)
+
+    def test_watch_sse_applies_label_and_field_selectors(self):
+        """Test that only events for matching objects are streamed."""
+        self._watch([
+            {"type": "ADDED", "object": self._agent("a1", {"team": "red"}, "ready")},
+            {"type": "ADDED", "object": self._agent("a2", {"team": "blue"}, "ready")},
+            {"type": "MODIFIED", "object": self._agent("a3", {"team": "red"}, "error")},
+        ])
+
+        with self.client.stream(
+            "GET", "/v1/watch/agents?namespace=default&labelSelector=team%3Dred&fieldSelector=status.phase!%3Derror"
+        ) as response:
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+            body = response.read().decode()
+
+        data_lines = [line for line in body.splitlines() if line.startswith("data: ")]
+        self.assertEqual(len(data_lines), 1)
+        message = json.loads(data_lines[0][len("data: "):])
+        self.assertEqual(message["type"], "ADDED")
+        self.assertEqual(message["object"]["metadata"]["name"], "a1")
+
+    def test_watch_unknown_kind(self):
+        """Test that an unknown kind is rejected."""
+        response = self.client.get("/v1/watch/widgets?namespace=default")
+        self.assertEqual(response.status_code, 404)
+
+    def test_watch_invalid_selector(self):
+        """Test that an unparseable selector is rejected."""
+        response = self.client.get("/v1/watch/agents?namespace=default&fieldSelector=status.phase")
+        self.assertEqual(response.status_code, 400)
+
+    def test_watch_websocket_streams_events(self):
+        """Test that events are sent as JSON messages over a WebSocket."""
+        self._watch([
+            {"type": "ADDED", "object": self._agent("a1")},
+            {"type": "DELETED", "object": self._agent("a2")},
+        ])
+
+        with self.client.websocket_connect("/v1/watch/agents?namespace=default") as websocket:
+            first = websocket.receive_json()
+            second = websocket.receive_json()
+
+        self.assertEqual(first["type"], "ADDED")
+        self.assertEqual(first["object"]["metadata"]["name"], "a1")
+        self.assertEqual(second["type"], "DELETED")
+
+    def test_watch_websocket_refuses_unknown_kind(self):
+        """Test that a WebSocket for an unknown kind is closed before it is accepted."""
+        from starlette.websockets import WebSocketDisconnect
+
+        with self.assertRaises(WebSocketDisconnect) as context:
+            with self.client.websocket_connect("/v1/watch/widgets?namespace=default"):
+                pass
+        self.assertEqual(context.exception.code, 1008)
+
+
+class TestWatchConnections(unittest.IsolatedAsyncioTestCase):
+    """Test that watch connections are released however the client leaves."""
+
+    async def asyncSetUp(self):
+        from ark_api.utils.shared_watch import SharedWatch
+
+        async def idle_run(shared_watch):
+            await asyncio.Event().wait()
+
+        self.shared_watch = SharedWatch("agents/default", Mock())
+        for patcher in [
+            patch.object(SharedWatch, '_run', idle_run),
+            patch('ark_api.api.v1.watch.custom_resource_watch', return_value=self.shared_watch),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.shared_watch.close()
+
+    async def test_disconnect_before_first_event_releases_subscription(self):
+        """Test that an SSE client leaving after the connected comment leaves the shared watch."""
+        from ark_api.api.v1 import watch
+
+        response = await watch.watch_sse("agents", namespace="default", label_selector=None, field_selector=None)
+        body = response.body_iterator
+        self.assertEqual(await body.__anext__(), ": connected\n\n")
+        self.assertEqual(self.shared_watch.subscriber_count, 1)
+
+        await body.aclose()
+
+        self.assertEqual(self.shared_watch.subscriber_count, 0)
+        self.assertEqual(watch._open_subscriptions, set())
+
+    async def test_disconnect_before_stream_starts_releases_subscription(self):
+        """Test that a response whose stream never started still releases its connection."""
+        from ark_api.api.v1 import watch
+
+        response = await watch.watch_sse("agents", namespace="default", label_selector=None, field_selector=None)
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        with self.assertRaises(Exception):
+            await response({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send)
+
+        self.assertEqual(self.shared_watch.subscriber_count, 0)
+        self.assertEqual(watch._open_subscriptions, set())
+
+    @patch('ark_api.api.v1.watch.WATCH_MAX_CONNECTIONS', 1)
+    async def test_connection_limit_counts_on_subscribe(self):
+        """Test that the limit applies as soon as a connection subscribes."""
+        from fastapi import HTTPException
+        from ark_api.api.v1 import watch
+
+        first = await watch.watch_sse("agents", namespace="default", label_selector=None, field_selector=None)
+        with self.assertRaises(HTTPException) as context:
+            await watch.watch_sse("agents", namespace="default", label_selector=None, field_selector=None)
+
+        self.assertEqual(context.exception.status_code, 503)
+        watch._release(first.subscription)
+        self.assertEqual(watch._open_subscriptions, set())
@@ -7,6 +7,7 @@ import base64
 import json
 
 from ark_api.services.api_keys import APIKeyService, API_KEY_TYPE, API_KEY_ANNOTATION
+from ark_api.services.api_key_cache import APIKeyVerificationCache, last_used_buffer, verification_cache
 from ark_api.models.auth import APIKeyCreateRequest
 
 
@@ -451,5 +452,148 @@ class TestAPIKeyNamespaceScoping(unittest.TestCase):
         self.assertIsNone(result_b)
 
 
+def _api_key_secret(public_key: str, secret_key_hash: str, name: str = "api-key-test") -> Mock:
+    """Build a mock API key secret as returned by the Kubernetes API."""
+    secret = Mock()
+    secret.type = API_KEY_TYPE
+    secret.metadata.uid = "test-uid"
+    secret.metadata.name = name
+    secret.metadata.annotations = {
+        API_KEY_ANNOTATION: json.dumps({"name": "Test Key", "createdAt": "2024-01-01T00:00:00+00:00"})
+    }
+    secret.data = {
+        "public_key": base64.b64encode(public_key.encode()).decode(),
+        "secret_key_hash": base64.b64encode(secret_key_hash.encode()).decode(),
+        "is_active": base64.b64encode(b"true").decode()
+    }
+    return secret
+
+
+class TestAPIKeyVerificationCache(unittest.IsolatedAsyncioTestCase):
+    """Test cached API key verification and buffered last used updates."""
+
+    @patch('ark_api.services.api_keys.get_context')
+    def setUp(self, mock_get_context):
+        """Set up test fixtures."""
+        mock_get_context.return_value = {"namespace": "test-namespace", "cluster": "test"}
+        self.service = APIKeyService()
+        self.secret_key = "sk-ark-test-secret"
+        self.hashed = self.service._hash_secret_key(self.secret_key)
+        self.secret = _api_key_secret("pk-ark-test", self.hashed, name="api-key-test")
+        verification_cache.clear()
+        last_used_buffer.drain()
+
+    def tearDown(self):
+        verification_cache.clear()
+        last_used_buffer.drain()
+
+    @patch('ark_api.services.api_keys.ApiClient')
+    @patch('ark_api.services.api_keys.client.CoreV1Api')
+    async def test_verified_key_is_cached(self, mock_v1_api, mock_api_client):
+        """Test that repeated verifications skip the secret read and bcrypt."""
+        mock_api_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_api_instance = mock_v1_api.return_value
+        mock_api_instance.read_namespaced_secret = AsyncMock(return_value=self.secret)
+        mock_api_instance.patch_namespaced_secret = AsyncMock()
+
+        with patch.object(self.service, '_verify_secret_key', wraps=self.service._verify_secret_key) as mock_verify:
+            for _ in range(3):
+                result = await self.service.verify_api_key("pk-ark-test", self.secret_key)
+                self.assertEqual(result["public_key"], "pk-ark-test")
+
+        mock_api_instance.read_namespaced_secret.assert_called_once()
+        mock_verify.assert_called_once()
+        # Last used updates are buffered, not written per request
+        mock_api_instance.patch_namespaced_secret.assert_not_called()
+        self.assertEqual(len(last_used_buffer), 1)
+
+    @patch('ark_api.services.api_keys.ApiClient')
+    @patch('ark_api.services.api_keys.client.CoreV1Api')
+    async def test_wrong_secret_is_not_served_from_cache(self, mock_v1_api, mock_api_client):
+        """Test that the cache is keyed on the secret as well as the public key."""
+        mock_api_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_v1_api.return_value.read_namespaced_secret = AsyncMock(return_value=self.secret)
+
+        self.assertIsNotNone(await self.service.verify_api_key("pk-ark-test", self.secret_key))
+        self.assertIsNone(await self.service.verify_api_key("pk-ark-test", "sk-ark-wrong"))
+        self.assertEqual(len(verification_cache), 1)
+
+    def test_secret_change_invalidates_cache(self):
+        """Test that watch events drop entries only when the key changes."""
+        api_key_data = self.service._api_key_data_from_secret(self.secret)
+        verification_cache.put("pk-ark-test", self.secret_key, api_key_data)
+
+        # Unrelated change (e.g. last used timestamp) keeps the entry
+        verification_cache.update_secret("api-key-test", dict(api_key_data))
+        self.assertIsNotNone(verification_cache.get("pk-ark-test", self.secret_key))
+
+        # Soft delete drops it
+        self.secret.data["is_active"] = base64.b64encode(b"false").decode()
+        verification_cache.update_secret("api-key-test", self.service._api_key_data_from_secret(self.secret))
+        self.assertIsNone(verification_cache.get("pk-ark-test", self.secret_key))
+
+    @patch('ark_api.services.api_keys.ApiClient')
+    @patch('ark_api.services.api_keys.client.CoreV1Api')
+    async def test_revocation_during_verification_is_not_cached_over(self, mock_v1_api, mock_api_client):
+        """Test that a key revoked between the secret read and the cache put is not cached."""
+        mock_api_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_v1_api.return_value.read_namespaced_secret = AsyncMock(return_value=self.secret)
+        verify = self.service._verify_secret_key
+
+        def verify_then_revoke(secret_key, hashed):
+            # The secret watch delivers the soft delete while bcrypt runs
+            verification_cache.invalidate_secret("api-key-test")
+            return verify(secret_key, hashed)
+
+        with patch.object(self.service, '_verify_secret_key', side_effect=verify_then_revoke):
+            self.assertIsNotNone(await self.service.verify_api_key("pk-ark-test", self.secret_key))
+
+        self.assertEqual(len(verification_cache), 0)
+        self.assertIsNone(verification_cache.get("pk-ark-test", self.secret_key))
+
+        # A later verification, after the change, is cached again
+        self.assertIsNotNone(await self.service.verify_api_key("pk-ark-test", self.secret_key))
+        self.assertEqual(len(verification_cache), 1)
+
+    def test_cache_entries_expire(self):
+        """Test that cached verifications expire after the TTL."""
+        cache = APIKeyVerificationCache(ttl_seconds=60, max_entries=2)
+        api_key_data = self.service._api_key_data_from_secret(self.secret)
+        with patch('ark_api.services.api_key_cache.time.monotonic', return_value=1000.0):
+            cache.put("pk-ark-test", self.secret_key, api_key_data)
+        with patch('ark_api.services.api_key_cache.time.monotonic', return_value=1030.0):
+            self.assertIsNotNone(cache.get("pk-ark-test", self.secret_key))
+        with patch('ark_api.services.api_key_cache.time.monotonic', return_value=1061.0):
+            self.assertIsNone(cache.get("pk-ark-test", self.secret_key))
+
+    def test_cache_is_bounded(self):
+        """Test that the oldest entries are evicted at capacity."""
+        cache = APIKeyVerificationCache(ttl_seconds=60, max_entries=2)
+        api_key_data = self.service._api_key_data_from_secret(self.secret)
+        for secret_key in ("sk-1", "sk-2", "sk-3"):
+            cache.put("pk-ark-test", secret_key, api_key_data)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("pk-ark-test", "sk-1"))
+
+    @patch('ark_api.services.api_keys.ApiClient')
+    @patch('ark_api.services.api_keys.client.CoreV1Api')
+    async def test_flush_last_used_coalesces_updates(self, mock_v1_api, mock_api_client):
+        """Test that many uses of one key result in a single patch."""
+        mock_api_client.return_value.__aenter__.return_value = AsyncMock()
+        mock_api_instance = mock_v1_api.return_value
+        mock_api_instance.read_namespaced_secret = AsyncMock(return_value=self.secret)
+        mock_api_instance.patch_namespaced_secret = AsyncMock()
+
+        for _ in range(5):
+            last_used_buffer.record("api-key-test")
+        await self.service.flush_last_used()
+
+        mock_api_instance.patch_namespaced_secret.assert_called_once()
+        body = mock_api_instance.patch_namespaced_secret.call_args[1]["body"]
+        metadata = json.loads(body["metadata"]["annotations"][API_KEY_ANNOTATION])
+        self.assertIn("lastUsedAt", metadata)
+        self.assertEqual(len(last_used_buffer), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
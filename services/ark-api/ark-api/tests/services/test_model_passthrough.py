@@ -0,0 +1,125 @@
+"""Test cases for direct model passthrough."""
+
+import base64
+import unittest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from ark_api.services import model_passthrough
+from ark_api.services.model_passthrough import (
+    PassthroughUnavailable,
+    ResolvedModel,
+    build_request_body,
+    resolve_model,
+)
+
+
+def _model(model_type="openai", config=None, properties=None):
+    config = config or {
+        "baseUrl": {"value": "https://api.openai.com/v1/"},
+        "apiKey": {"valueFrom": {"secretKeyRef": {"name": "openai-secret", "key": "token"}}},
+    }
+    if properties:
+        config["properties"] = properties
+    return {
+        "metadata": {"name": "gpt", "namespace": "default", "uid": "uid-1"},
+        "spec": {"type": model_type, "model": {"value": "gpt-4o"}, "config": {model_type: config}},
+    }
+
+
+class TestResolveModel(unittest.IsolatedAsyncioTestCase):
+    """Test Model resolution and caching."""
+
+    def setUp(self):
+        model_passthrough._model_cache.clear()
+        self.addCleanup(model_passthrough._model_cache.clear)
+        self.custom_api = Mock()
+        self.core_api = Mock()
+        self.core_api.read_namespaced_secret = AsyncMock(
+            return_value=Mock(data={"token": base64.b64encode(b"sk-test").decode()})
+        )
+        for target, value in (
+            ('ark_api.services.model_passthrough.ApiClient', MagicMock()),
+            ('ark_api.services.model_passthrough.client.CustomObjectsApi', Mock(return_value=self.custom_api)),
+            ('ark_api.services.model_passthrough.client.CoreV1Api', Mock(return_value=self.core_api)),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_resolve_openai_model(self):
+        """Test that value sources and the endpoint URL are resolved."""
+        self.custom_api.get_namespaced_custom_object = AsyncMock(return_value=_model(properties={"temperature": {"value": "0.2"}}))
+
+        resolved = await resolve_model("default", "gpt")
+
+        self.assertEqual(resolved.url, "https://api.openai.com/v1/chat/completions")
+        self.assertEqual(resolved.model, "gpt-4o")
+        self.assertEqual(resolved.headers["Authorization"], "Bearer sk-test")
+        self.assertEqual(resolved.properties, {"temperature": "0.2"})
+        self.assertEqual(resolved.uid, "uid-1")
+
+    async def test_resolve_azure_model(self):
+        """Test that Azure models use the deployment URL and api-key header."""
+        self.custom_api.get_namespaced_custom_object = AsyncMock(return_value=_model("azure", config={
+            "baseUrl": {"value": "https://example.openai.azure.com"},
+            "apiKey": {"value": "azure-key"},
+            "apiVersion": {"value": "2024-02-01"},
+        }))
+
+        resolved = await resolve_model("default", "gpt")
+
+        self.assertEqual(
+            resolved.url,
+            "https://example.openai.azure.com/openai/deployments/gpt-4o/chat/completions?api-version=2024-02-01",
+        )
+        self.assertEqual(resolved.headers["api-key"], "azure-key")
+
+    async def test_resolution_is_cached(self):
+        """Test that repeated lookups do not read the Model again."""
+        self.custom_api.get_namespaced_custom_object = AsyncMock(return_value=_model())
+
+        await resolve_model("default", "gpt")
+        await resolve_model("default", "gpt")
+
+        self.custom_api.get_namespaced_custom_object.assert_awaited_once()
+        self.core_api.read_namespaced_secret.assert_awaited_once()
+
+    async def test_unsupported_model_type(self):
+        """Test that bedrock models fall back to the Query path."""
+        self.custom_api.get_namespaced_custom_object = AsyncMock(return_value=_model("bedrock", config={"region": {"value": "us-east-1"}}))
+
+        with self.assertRaises(PassthroughUnavailable):
+            await resolve_model("default", "gpt")
+
+    async def test_query_parameter_value_source_not_supported(self):
+        """Test that values only available within a Query are rejected."""
+        model = _model()
+        model["spec"]["config"]["openai"]["baseUrl"] = {"valueFrom": {"queryParameterRef": {"name": "url"}}}
+        self.custom_api.get_namespaced_custom_object = AsyncMock(return_value=model)
+
+        with self.assertRaises(PassthroughUnavailable):
+            await resolve_model("default", "gpt")
+
+
+class TestBuildRequestBody(unittest.TestCase):
+    """Test provider request bodies."""
+
+    def test_properties_override_defaults(self):
+        resolved = ResolvedModel(
+            name="gpt", namespace="default", uid=None, type="openai", model="gpt-4o",
+            url="https://api.openai.com/v1/chat/completions",
+            properties={"temperature": "0.2", "max_tokens": "100", "reasoning_effort": "low"},
+        )
+
+        body = build_request_body(resolved, [{"role": "user", "content": "Hi"}], stream=False)
+
+        self.assertEqual(body["model"], "gpt-4o")
+        self.assertEqual(body["temperature"], 0.2)
+        self.assertEqual(body["max_tokens"], 100)
+        self.assertEqual(body["reasoning_effort"], "low")
+        self.assertEqual(body["n"], 1)
+        self.assertNotIn("stream", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+"""Test cases for the OpenAI batch service."""
+
+import asyncio
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import UploadFile
+
+from ark_api.services.openai_batches import BatchAPIError, OpenAIBatchService
+
+
+def _line(custom_id, content="Hello", url="/v1/chat/completions"):
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": url,
+        "body": {"model": "agent/test-agent", "messages": [{"role": "user", "content": content}]},
+    })
+
+
+def _upload(lines):
+    return UploadFile(file=io.BytesIO(("\n".join(lines) + "\n").encode("utf-8")), filename="input.jsonl")
+
+
+class TestOpenAIBatchService(unittest.IsolatedAsyncioTestCase):
+    """Test file storage and batch execution."""
+
+    def setUp(self):
+        self.storage_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_dir, ignore_errors=True)
+        self.executed = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _executor(self, body, namespace):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            content = body["messages"][0]["content"]
+            self.executed.append(content)
+            if content == "fail":
+                return 500, {"error": {"message": "boom", "type": "server_error", "code": "query_failed"}}
+            return 200, {"id": f"chatcmpl-{content}", "object": "chat.completion", "namespace": namespace}
+        finally:
+            self.in_flight -= 1
+
+    def _service(self, **kwargs):
+        return OpenAIBatchService(executor=self._executor, storage_dir=self.storage_dir, **kwargs)
+
+    async def _wait(self, service, batch_id, namespace="default", owner=None):
+        task = service._tasks.get(batch_id)
+        if task is not None:
+            await task
+        return await service.get_batch(batch_id, namespace=namespace, owner=owner)
+
+    async def _read(self, service, file_id, namespace="default"):
+        with open(await service.file_content_path(file_id, namespace=namespace)) as f:
+            return [json.loads(line) for line in f]
+
+    async def test_batch_runs_all_requests(self):
+        """Test that successes and failures go to the output and error files."""
+        service = self._service()
+        input_file = await service.create_file(_upload([_line("a"), _line("b", "fail"), _line("c")]), "batch", namespace="team-a")
+
+        batch = await service.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="team-a")
+        batch = await self._wait(service, batch.id, "team-a")
+
+        self.assertEqual(batch.status, "completed")
+        self.assertEqual((batch.request_counts.total, batch.request_counts.completed, batch.request_counts.failed), (3, 2, 1))
+        output = await self._read(service, batch.output_file_id, "team-a")
+        self.assertEqual(sorted(r["custom_id"] for r in output), ["a", "c"])
+        self.assertEqual(output[0]["response"]["status_code"], 200)
+        self.assertEqual(output[0]["response"]["body"]["namespace"], "team-a")
+        errors = await self._read(service, batch.error_file_id, "team-a")
+        self.assertEqual([(r["custom_id"], r["response"]["status_code"]) for r in errors], [("b", 500)])
+        self.assertEqual((await service.get_file(batch.output_file_id, namespace="team-a")).purpose, "batch_output")
+
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than `concurrency` requests run at once."""
+        service = self._service(concurrency=2)
+        input_file = await service.create_file(_upload([_line(str(i), str(i)) for i in range(10)]), "batch", namespace="default")
+
+        batch = await service.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="default")
+        batch = await self._wait(service, batch.id)
+
+        self.assertEqual(batch.request_counts.completed, 10)
+        self.assertEqual(self.max_in_flight, 2)
+
+    async def test_invalid_input_fails_validation(self):
+        """Test that malformed lines fail the batch without running anything."""
+        service = self._service()
+        input_file = await service.create_file(
+            _upload([_line("a"), _line("a"), _line("b", url="/v1/embeddings"), "not json"]), "batch", namespace="default"
+        )
+
+        batch = await service.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="default")
+        batch = await self._wait(service, batch.id)
+
+        self.assertEqual(batch.status, "failed")
+        self.assertEqual([e.line for e in batch.errors.data], [2, 3, 4])
+        self.assertEqual(self.executed, [])
+
+    async def test_create_batch_rejects_unsupported_endpoint(self):
+        """Test that only chat completions batches are accepted."""
+        service = self._service()
+        input_file = await service.create_file(_upload([_line("a")]), "batch", namespace="default")
+
+        with self.assertRaises(BatchAPIError) as ctx:
+            await service.create_batch(input_file.id, "/v1/embeddings", "24h", namespace="default")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    async def test_upload_size_limit(self):
+        """Test that oversized uploads are rejected and not kept."""
+        service = self._service(max_file_bytes=10)
+
+        with self.assertRaises(BatchAPIError) as ctx:
+            await service.create_file(_upload([_line("a")]), "batch", namespace="default")
+        self.assertEqual(ctx.exception.status_code, 413)
+        self.assertEqual(await service.list_files(namespace="default"), [])
+
+    async def test_cancel_stops_scheduling(self):
+        """Test that a cancelled batch stops starting new requests."""
+        service = self._service(concurrency=1)
+        input_file = await service.create_file(_upload([_line(str(i), str(i)) for i in range(20)]), "batch", namespace="default")
+        batch = await service.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="default")
+
+        while not self.executed:
+            await asyncio.sleep(0.005)
+        await service.cancel_batch(batch.id, namespace="default")
+        batch = await self._wait(service, batch.id)
+
+        self.assertEqual(batch.status, "cancelled")
+        self.assertLess(len(self.executed), 20)
+        self.assertEqual(batch.request_counts.completed, len(self.executed))
+
+    async def test_interrupted_batch_resumes_without_repeating_requests(self):
+        """Test that a restarted service skips requests that already have results."""
+        service = self._service(concurrency=1)
+        input_file = await service.create_file(_upload([_line(str(i), str(i)) for i in range(6)]), "batch", namespace="default")
+        batch = await service.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="default")
+        while len(self.executed) < 2:
+            await asyncio.sleep(0.005)
+        await service.close()
+        with open(service._content_path(service._batches[batch.id].output_file_id)) as f:
+            written_before_restart = {json.loads(line)["custom_id"] for line in f}
+        executed_before_restart = len(self.executed)
+
+        restarted = self._service()
+        await restarted.start()
+        batch = await self._wait(restarted, batch.id)
+
+        self.assertEqual(batch.status, "completed")
+        self.assertEqual(batch.request_counts.completed, 6)
+        self.assertTrue(written_before_restart)
+        self.assertFalse(written_before_restart & set(self.executed[executed_before_restart:]))
+        self.assertEqual(sorted(r["custom_id"] for r in await self._read(restarted, batch.output_file_id)), [str(i) for i in range(6)])
+
+    async def test_workers_share_batches_without_running_them_twice(self):
+        """Test that a second worker sees, does not resume and can cancel a running batch."""
+        running = self._service(concurrency=1)
+        other = self._service()
+        input_file = await running.create_file(_upload([_line(str(i), str(i)) for i in range(20)]), "batch", namespace="default")
+        batch = await running.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="default")
+        while not self.executed:
+            await asyncio.sleep(0.005)
+
+        await other.start()
+        self.assertNotIn(batch.id, other._tasks)
+        self.assertEqual((await other.get_file(input_file.id, namespace="default")).id, input_file.id)
+        self.assertEqual([b.id for b in (await other.list_batches(namespace="default"))[0]], [batch.id])
+
+        await other.cancel_batch(batch.id, namespace="default")
+        batch = await self._wait(running, batch.id)
+
+        self.assertEqual(batch.status, "cancelled")
+        self.assertLess(len(self.executed), 20)
+        self.assertEqual((await other.get_batch(batch.id, namespace="default")).status, "cancelled")
+
+    @patch('ark_api.services.openai_batches.OPENAI_BATCH_RESUME_SECONDS', 0.01)
+    async def test_leader_resumes_batches_left_by_a_dead_worker(self):
+        """Test that the leader runs a batch whose run lock was released before it finished."""
+        worker = self._service(concurrency=1)
+        leader = self._service()
+        input_file = await worker.create_file(_upload([_line(str(i), str(i)) for i in range(6)]), "batch", namespace="default")
+        batch = await worker.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace="default")
+        while not self.executed:
+            await asyncio.sleep(0.005)
+        await leader.start()
+        await asyncio.sleep(0.03)
+        self.assertNotIn(batch.id, leader._tasks)
+
+        # The worker goes away mid-batch, releasing its run lock
+        await worker.close()
+        for _ in range(100):
+            if batch.id in leader._tasks:
+                break
+            await asyncio.sleep(0.01)
+        batch = await self._wait(leader, batch.id)
+        await leader.close()
+
+        self.assertEqual(batch.status, "completed")
+        self.assertEqual(batch.request_counts.completed, 6)
+        self.assertEqual(sorted(r["custom_id"] for r in await self._read(leader, batch.output_file_id)), [str(i) for i in range(6)])
+
+    async def test_files_and_batches_are_scoped_to_owner_and_namespace(self):
+        """Test that other principals and namespaces cannot see or use a tenant's files and batches."""
+        service = self._service()
+        input_file = await service.create_file(_upload([_line("a")]), "batch", namespace="team-a", owner="api-key:pk-a")
+        batch = await service.create_batch(
+            input_file.id, "/v1/chat/completions", "24h", namespace="team-a", owner="api-key:pk-a"
+        )
+        batch = await self._wait(service, batch.id, "team-a", "api-key:pk-a")
+
+        for namespace, owner in (("team-a", "api-key:pk-b"), ("team-b", "api-key:pk-a"), ("team-a", None)):
+            self.assertEqual(await service.list_files(namespace=namespace, owner=owner), [])
+            self.assertEqual((await service.list_batches(namespace=namespace, owner=owner))[0], [])
+            for call in (
+                service.get_file(input_file.id, namespace=namespace, owner=owner),
+                service.file_content_path(batch.output_file_id, namespace=namespace, owner=owner),
+                service.delete_file(input_file.id, namespace=namespace, owner=owner),
+                service.get_batch(batch.id, namespace=namespace, owner=owner),
+                service.cancel_batch(batch.id, namespace=namespace, owner=owner),
+                service.create_batch(input_file.id, "/v1/chat/completions", "24h", namespace=namespace, owner=owner),
+            ):
+                with self.assertRaises(BatchAPIError) as ctx:
+                    await call
+                self.assertEqual(ctx.exception.status_code, 404)
+
+        files = await service.list_files(namespace="team-a", owner="api-key:pk-a")
+        self.assertEqual({f.id for f in files}, {input_file.id, batch.output_file_id})
+
+    async def test_unchanged_records_are_not_read_again(self):
+        """Test that listing only parses JSON files changed since the last read."""
+        service = self._service()
+        other = self._service()
+        input_file = await service.create_file(_upload([_line("a")]), "batch", namespace="default")
+        await other.list_files(namespace="default")
+        first = other._files[input_file.id]
+
+        await other.list_files(namespace="default")
+        self.assertIs(other._files[input_file.id], first)
+
+        await service.delete_file(input_file.id, namespace="default")
+        self.assertEqual(await other.list_files(namespace="default"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
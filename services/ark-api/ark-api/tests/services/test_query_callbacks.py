@@ -0,0 +1,220 @@
+"""Test cases for query completion callbacks."""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from ark_api.constants.annotations import QUERY_CALLBACK_ANNOTATION, QUERY_CALLBACK_STATUS_ANNOTATION
+from ark_api.services.query_callbacks import (
+    CallbackURLError, QueryCallbackNotifier, sign_callback, validate_callback_url
+)
+
+
+def _query(phase="done", annotations=None):
+    return {
+        "metadata": {
+            "name": "q",
+            "namespace": "default",
+            "annotations": {QUERY_CALLBACK_ANNOTATION: "https://hooks.example.com/ark", **(annotations or {})},
+        },
+        "status": {"phase": phase, "responses": [{"content": "42"}]},
+    }
+
+
+@patch('ark_api.services.query_callbacks.QUERY_CALLBACK_RETRY_BASE_SECONDS', 0)
+class TestQueryCallbackNotifier(unittest.IsolatedAsyncioTestCase):
+    """Test callback delivery, retries, signing and result recording."""
+
+    def setUp(self):
+        self.requests = []
+        self.responses = []
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(self.responses.pop(0) if self.responses else 200)
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        patcher = patch('ark_api.services.query_callbacks.get_http_client', return_value=http_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        api_client = MagicMock()
+        api_client.__aenter__ = AsyncMock(return_value=api_client)
+        api_client.__aexit__ = AsyncMock(return_value=None)
+        patcher = patch('ark_api.services.query_callbacks.ApiClient', return_value=api_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.patch_query = AsyncMock()
+        patcher = patch('ark_api.services.query_callbacks.client.CustomObjectsApi')
+        custom_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        custom_api.return_value.patch_namespaced_custom_object = self.patch_query
+        patcher = patch('ark_api.services.query_callbacks.QUERY_CALLBACK_ALLOWED_HOSTS', ["hooks.example.com"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addresses = ["93.184.216.34"]
+        patcher = patch('asyncio.base_events.BaseEventLoop.getaddrinfo', new=self._getaddrinfo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _getaddrinfo(self, host, port, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)) for address in self.addresses]
+
+    async def _notify(self, query):
+        notifier = QueryCallbackNotifier()
+        notifier.notify(query)
+        await asyncio.gather(*notifier._deliveries.values())
+        return notifier
+
+    def _recorded_result(self):
+        body = self.patch_query.call_args.kwargs["body"]
+        return body["metadata"]["annotations"][QUERY_CALLBACK_STATUS_ANNOTATION]
+
+    @patch('ark_api.services.query_callbacks.QUERY_CALLBACK_SIGNING_SECRET', "s3cret")
+    async def test_delivers_signed_final_status(self):
+        """Test that the final status is POSTed with a verifiable signature."""
+        await self._notify(_query())
+
+        self.assertEqual(len(self.requests), 1)
+        request = self.requests[0]
+        self.assertEqual(str(request.url), "https://hooks.example.com/ark")
+        self.assertEqual(json.loads(request.content)["status"]["responses"][0]["content"], "42")
+        expected = sign_callback("s3cret", request.headers["X-Ark-Timestamp"], request.content)
+        self.assertEqual(request.headers["X-Ark-Signature"], expected)
+        self.assertEqual(self._recorded_result(), "delivered")
+        self.assertEqual(self.patch_query.call_args.kwargs["_content_type"], "application/merge-patch+json")
+
+    async def test_retries_server_errors(self):
+        """Test that 5xx responses are retried until the callback succeeds."""
+        self.responses = [503, 500, 200]
+
+        await self._notify(_query())
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertNotIn("X-Ark-Signature", self.requests[0].headers)
+        self.assertEqual(self._recorded_result(), "delivered")
+
+    @patch('ark_api.services.query_callbacks.QUERY_CALLBACK_MAX_ATTEMPTS', 3)
+    async def test_gives_up_after_max_attempts(self):
+        """Test that a callback is marked failed once attempts are exhausted."""
+        self.responses = [503, 503, 503]
+
+        await self._notify(_query())
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self._recorded_result(), "failed")
+
+    async def test_client_errors_are_not_retried(self):
+        """Test that a 4xx response fails the callback immediately."""
+        self.responses = [404]
+
+        await self._notify(_query())
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self._recorded_result(), "failed")
+
+    async def test_refused_urls_are_never_requested(self):
+        """Test that a callback to a private address is marked failed without a request."""
+        self.addresses = ["169.254.169.254"]
+
+        await self._notify(_query())
+
+        self.assertEqual(self.requests, [])
+        self.assertEqual(self._recorded_result(), "failed")
+
+    async def test_validate_callback_url(self):
+        """Test the allowlist, scheme and resolved address checks."""
+        await validate_callback_url("https://hooks.example.com/ark")
+
+        refused = {
+            "ftp://hooks.example.com/ark": [],
+            "https://other.example.com/ark": [],
+            "https://hooks.example.com:8443/ark": ["10.0.0.5"],
+            "http://hooks.example.com/ark": ["93.184.216.34", "127.0.0.1"],
+            "https://hooks.example.com/": ["::ffff:169.254.169.254"],
+        }
+        for url, addresses in refused.items():
+            if addresses:
+                self.addresses = addresses
+            with self.subTest(url=url), self.assertRaises(CallbackURLError):
+                await validate_callback_url(url)
+
+        with patch('ark_api.services.query_callbacks.QUERY_CALLBACK_ALLOWED_HOSTS', ["*.example.com"]):
+            self.addresses = ["93.184.216.34"]
+            await validate_callback_url("https://a.b.example.com/ark")
+            with self.assertRaises(CallbackURLError):
+                await validate_callback_url("https://example.com.evil.io/ark")
+
+        with patch('ark_api.services.query_callbacks.QUERY_CALLBACK_ALLOWED_HOSTS', []), \
+                self.assertRaisesRegex(CallbackURLError, "disabled"):
+            await validate_callback_url("https://hooks.example.com/ark")
+
+    async def test_only_finished_queries_still_owed_a_callback_are_notified(self):
+        """Test that running and already notified queries are skipped."""
+        notifier = QueryCallbackNotifier()
+
+        notifier.notify(_query(phase="running"))
+        notifier.notify(_query(annotations={QUERY_CALLBACK_STATUS_ANNOTATION: "delivered"}))
+        notifier.notify({"metadata": {"name": "plain", "namespace": "default"}, "status": {"phase": "done"}})
+
+        self.assertEqual(notifier._deliveries, {})
+
+
+
+class TestCallbackNamespaces(unittest.IsolatedAsyncioTestCase):
+    """Test that only the leader watches namespaces, including those recorded by other workers."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "namespaces")
+        patcher = patch('ark_api.services.query_callbacks.QUERY_CALLBACK_NAMESPACES_PATH', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.watch = patch.object(QueryCallbackNotifier, 'watch_namespace').start()
+        self.addCleanup(patch.stopall)
+
+    def _watched(self):
+        return sorted(c.args[0] for c in self.watch.call_args_list)
+
+    async def test_followers_only_record_namespaces(self):
+        """Test that a worker that is not leading records namespaces without watching them."""
+        follower = QueryCallbackNotifier()
+
+        await follower.register_namespace("team-a")
+        await follower.register_namespace("team-a")
+        await follower.register_namespace("team-b")
+        await follower.register_namespace("not\na namespace")
+
+        self.watch.assert_not_called()
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "team-a\nteam-b\n")
+
+    @patch('ark_api.services.query_callbacks.QUERY_CALLBACK_NAMESPACES_POLL_SECONDS', 0)
+    async def test_leader_watches_recorded_namespaces(self):
+        """Test that the leader watches namespaces recorded before it started and since."""
+        await QueryCallbackNotifier().register_namespace("team-a")
+        leader = QueryCallbackNotifier()
+
+        await leader.start("default")
+        self.assertEqual(self._watched(), ["default", "team-a"])
+
+        # Recorded by another worker, then by the leader itself
+        await QueryCallbackNotifier().register_namespace("team-b")
+        for _ in range(100):
+            if "team-b" in self._watched():
+                break
+            await asyncio.sleep(0.01)
+        self.assertIn("team-b", self._watched())
+        await leader.register_namespace("team-c")
+        self.assertIn("team-c", self._watched())
+        await leader.close()
+        self.assertFalse(leader.leading)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -105,6 +105,46 @@ class TestAuthConfig(unittest.TestCase):
                 self.assertEqual(auth_mode, AuthMode.OPEN, 
                                f"Empty/None mode '{empty_value}' should default to 'open'")
 
+    def test_resolve_auth_config(self):
+        """Test that the auth configuration is resolved from the environment."""
+        from ark_api.auth.config import resolve_auth_config
+
+        with patch.dict(os.environ, {
+            'AUTH_MODE': 'HYBRID',
+            'OIDC_ISSUER_URL': 'https://auth.example.com/realms/test',
+            'OIDC_APPLICATION_ID': 'app-123'
+        }):
+            config = resolve_auth_config()
+        self.assertEqual(config.mode, AuthMode.HYBRID)
+        self.assertTrue(config.jwt_enabled)
+        self.assertTrue(config.basic_enabled)
+        self.assertFalse(config.auth_disabled)
+
+        with patch.dict(os.environ, {}):
+            config = resolve_auth_config()
+        self.assertEqual(config.mode, AuthMode.OPEN)
+        self.assertTrue(config.auth_disabled)
+
+        with patch.dict(os.environ, {'AUTH_MODE': 'sso'}):
+            with self.assertRaises(ValueError):
+                resolve_auth_config()
+
+    def test_public_route_matcher_tracks_changes(self):
+        """Test that the precompiled public route matcher follows add/remove."""
+        from ark_api.auth.config import (
+            is_route_authenticated, add_public_route, remove_public_route
+        )
+
+        self.assertFalse(is_route_authenticated("/health"))
+        self.assertTrue(is_route_authenticated("/v1/agents"))
+
+        add_public_route("/v1/public-test")
+        try:
+            self.assertFalse(is_route_authenticated("/v1/public-test"))
+        finally:
+            remove_public_route("/v1/public-test")
+        self.assertTrue(is_route_authenticated("/v1/public-test"))
+
 
 
 if __name__ == '__main__':
@@ -9,294 +9,254 @@ from unittest.mock import Mock, patch, AsyncMock
 import os
 
 from ark_api.auth.middleware import AuthMiddleware, TokenValidationError
+from ark_api.core.metrics import REGISTRY
 
 
-class TestAuthMiddleware(unittest.TestCase):
+def _http_scope(path: str, headers: dict | None = None) -> dict:
+    """Build a minimal ASGI HTTP scope."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+
+
+class _RecordingApp:
+    """Downstream ASGI app that records calls and streams two body chunks."""
+
+    def __init__(self):
+        self.called = False
+
+    async def __call__(self, scope, receive, send):
+        self.called = True
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"chunk-1", "more_body": True})
+        await send({"type": "http.response.body", "body": b"chunk-2", "more_body": False})
+
+
+async def _call(middleware, scope):
+    """Invoke an ASGI middleware and collect the messages it sends."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def _status(messages) -> int:
+    return next(m["status"] for m in messages if m["type"] == "http.response.start")
+
+
+def _body(messages) -> str:
+    return b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body").decode()
+
+
+def _auth_count(method: str, outcome: str) -> float:
+    return REGISTRY.get_sample_value("ark_api_auth_requests_total", {"method": method, "outcome": outcome}) or 0
+
+
+@patch('ark_api.auth.middleware.APIKeyService', Mock())
+class TestAuthMiddleware(unittest.IsolatedAsyncioTestCase):
     """Test cases for AuthMiddleware."""
 
     def setUp(self):
         """Set up test fixtures."""
-        self.middleware = AuthMiddleware(Mock())
+        self.app = _RecordingApp()
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'open',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
     async def test_skip_auth_enabled(self):
         """Test that authentication is skipped when AUTH_MODE=open."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
-
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
+        middleware = AuthMiddleware(self.app)
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
+        messages = await _call(middleware, _http_scope("/v1/agents"))
 
-        # Verify that call_next was called and response was returned
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+        self.assertTrue(self.app.called)
+        self.assertEqual(_status(messages), 200)
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
     async def test_skip_auth_disabled_missing_header(self):
         """Test that authentication is required when AUTH_MODE=sso."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
-
-        # Mock call_next
-        call_next = AsyncMock()
+        middleware = AuthMiddleware(self.app)
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
+        messages = await _call(middleware, _http_scope("/v1/agents"))
 
-        # Verify that a 401 response is returned
-        self.assertEqual(response.status_code, 401)
-        self.assertIn("Missing or invalid authorization header", response.body.decode())
+        self.assertFalse(self.app.called)
+        self.assertEqual(_status(messages), 401)
+        self.assertIn("Missing authorization header", _body(messages))
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
     async def test_skip_auth_disabled_invalid_header(self):
         """Test that authentication fails with invalid authorization header."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {"Authorization": "Invalid token"}
-
-        # Mock call_next
-        call_next = AsyncMock()
+        middleware = AuthMiddleware(self.app)
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
+        messages = await _call(middleware, _http_scope("/v1/agents", {"Authorization": "Invalid token"}))
 
-        # Verify that a 401 response is returned
-        self.assertEqual(response.status_code, 401)
-        self.assertIn("Missing or invalid authorization header", response.body.decode())
+        self.assertFalse(self.app.called)
+        self.assertEqual(_status(messages), 401)
+        self.assertIn("Invalid authorization header", _body(messages))
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    @patch('ark_sdk.auth.validator.TokenValidator')
+    @patch('ark_api.auth.middleware.CachingTokenValidator')
     async def test_skip_auth_disabled_valid_token(self, mock_validator_class):
         """Test that authentication succeeds with valid token."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {"Authorization": "Bearer valid-token"}
-
-        # Mock validator instance
         mock_validator = AsyncMock()
         mock_validator_class.return_value = mock_validator
         mock_validator.validate_token.return_value = {"sub": "test-user"}
+        middleware = AuthMiddleware(self.app)
 
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
+        scope = _http_scope("/v1/agents", {"Authorization": "Bearer valid-token"})
+        messages = await _call(middleware, scope)
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that validator was called and call_next was called
         mock_validator.validate_token.assert_called_once_with("valid-token")
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+        self.assertTrue(self.app.called)
+        self.assertEqual(_status(messages), 200)
+        self.assertEqual(scope["state"]["principal"], "jwt:test-user")
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    @patch('ark_sdk.auth.validator.TokenValidator')
+    @patch('ark_api.auth.middleware.CachingTokenValidator')
     async def test_skip_auth_disabled_invalid_token(self, mock_validator_class):
         """Test that authentication fails with invalid token."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {"Authorization": "Bearer invalid-token"}
-
-        # Mock validator instance to raise TokenValidationError
         mock_validator = AsyncMock()
         mock_validator_class.return_value = mock_validator
         mock_validator.validate_token.side_effect = TokenValidationError("Invalid token")
+        middleware = AuthMiddleware(self.app)
+        failures_before = _auth_count("jwt", "failure")
 
-        # Mock call_next
-        call_next = AsyncMock()
-
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that a 401 response is returned
-        self.assertEqual(response.status_code, 401)
-        self.assertIn("Invalid token", response.body.decode())
+        messages = await _call(middleware, _http_scope("/v1/agents", {"Authorization": "Bearer invalid-token"}))
 
-    async def test_public_route_skips_auth(self):
-        """Test that public routes skip authentication."""
-        # Mock request for public route
-        request = Mock()
-        request.url.path = "/health"
-        request.headers = {}
-
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
-
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that call_next was called (authentication was skipped)
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+        self.assertFalse(self.app.called)
+        self.assertEqual(_status(messages), 401)
+        self.assertIn("Invalid token", _body(messages))
+        self.assertEqual(_auth_count("jwt", "failure"), failures_before + 1)
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    async def test_auth_mode_sso_enables_auth(self):
-        """Test that AUTH_MODE=sso enables authentication."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
+    @patch('ark_api.auth.middleware.CachingTokenValidator')
+    async def test_token_validator_shared_across_requests(self, mock_validator_class):
+        """Test that one validator is built at startup and reused per request."""
+        mock_validator_class.return_value = AsyncMock()
+        middleware = AuthMiddleware(self.app)
 
-        # Mock call_next
-        call_next = AsyncMock()
+        for _ in range(3):
+            await _call(middleware, _http_scope("/v1/agents", {"Authorization": "Bearer valid-token"}))
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that a 401 response is returned (authentication required)
-        self.assertEqual(response.status_code, 401)
-        self.assertIn("Missing or invalid authorization header", response.body.decode())
+        mock_validator_class.assert_called_once()
+        self.assertEqual(mock_validator_class.return_value.validate_token.call_count, 3)
 
     @patch.dict(os.environ, {
-        'AUTH_MODE': 'open',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'AUTH_MODE': 'sso',
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    async def test_auth_mode_open_disables_auth(self):
-        """Test that AUTH_MODE=open disables authentication."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
+    async def test_public_route_skips_auth(self):
+        """Test that public routes skip authentication."""
+        middleware = AuthMiddleware(self.app)
 
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
+        messages = await _call(middleware, _http_scope("/health"))
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
+        self.assertTrue(self.app.called)
+        self.assertEqual(_status(messages), 200)
 
-        # Verify that call_next was called (authentication was skipped)
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+    @patch.dict(os.environ, {'AUTH_MODE': 'invalid'})
+    def test_auth_mode_invalid_rejected_at_startup(self):
+        """Test that an unknown AUTH_MODE fails fast at startup."""
+        with self.assertRaises(ValueError):
+            AuthMiddleware(self.app)
 
     @patch.dict(os.environ, {
-        'AUTH_MODE': 'invalid',
-        'ARK_OKTA_ISSUER': 'https://test-issuer.com',
+        'AUTH_MODE': 'sso',
+        'OIDC_ISSUER_URL': '',
         'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    async def test_auth_mode_invalid_disables_auth(self):
-        """Test that any AUTH_MODE other than 'sso' disables authentication."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
-
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
-
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that call_next was called (authentication was skipped)
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+    def test_missing_oidc_issuer_rejected_at_startup(self):
+        """Test that missing OIDC_ISSUER_URL fails fast with AUTH_MODE=sso."""
+        with self.assertRaises(ValueError):
+            AuthMiddleware(self.app)
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'OIDC_ISSUER_URL': '',
-        'OIDC_APPLICATION_ID': 'test-app-id'
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
+        'OIDC_APPLICATION_ID': ''
     })
-    async def test_missing_oidc_issuer_disables_auth(self):
-        """Test that missing OIDC_ISSUER_URL disables authentication even with AUTH_MODE=sso."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
+    def test_missing_oidc_app_id_rejected_at_startup(self):
+        """Test that missing OIDC_APPLICATION_ID fails fast with AUTH_MODE=sso."""
+        with self.assertRaises(ValueError):
+            AuthMiddleware(self.app)
 
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
+    @patch.dict(os.environ, {'AUTH_MODE': 'open'})
+    async def test_streaming_body_is_not_buffered(self):
+        """Test that response chunks are forwarded one by one."""
+        middleware = AuthMiddleware(self.app)
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
+        messages = await _call(middleware, _http_scope("/v1/agents"))
 
-        # Verify that call_next was called (authentication was skipped)
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+        bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+        self.assertEqual(bodies, [b"chunk-1", b"chunk-2"])
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
         'OIDC_ISSUER_URL': 'https://test-issuer.com',
-        'OIDC_APPLICATION_ID': ''
+        'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    async def test_missing_oidc_app_id_disables_auth(self):
-        """Test that missing OIDC_APPLICATION_ID disables authentication even with AUTH_MODE=sso."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
+    async def test_non_http_scopes_pass_through(self):
+        """Test that non-HTTP scopes are not authenticated."""
+        inner = AsyncMock()
+        middleware = AuthMiddleware(inner)
+        scope = {"type": "lifespan"}
 
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
+        await middleware(scope, AsyncMock(), AsyncMock())
 
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that call_next was called (authentication was skipped)
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+        inner.assert_called_once()
 
     @patch.dict(os.environ, {
         'AUTH_MODE': 'sso',
-        'OIDC_ISSUER_URL': '',
-        'OIDC_APPLICATION_ID': ''
+        'OIDC_ISSUER_URL': 'https://test-issuer.com',
+        'OIDC_APPLICATION_ID': 'test-app-id'
     })
-    async def test_missing_both_oidc_configs_disables_auth(self):
-        """Test that missing both OIDC configs disables authentication even with AUTH_MODE=sso."""
-        # Mock request
-        request = Mock()
-        request.url.path = "/api/v1/agents"
-        request.headers = {}
-
-        # Mock call_next
-        call_next = AsyncMock()
-        call_next.return_value = Mock()
-
-        # Test middleware
-        response = await self.middleware.dispatch(request, call_next)
-
-        # Verify that call_next was called (authentication was skipped)
-        call_next.assert_called_once_with(request)
-        self.assertIsNotNone(response)
+    async def test_websocket_without_credentials_is_refused(self):
+        """Test that an unauthenticated websocket handshake is closed with 1008."""
+        inner = AsyncMock()
+        middleware = AuthMiddleware(inner)
+        scope = {**_http_scope("/v1/watch/agents"), "type": "websocket"}
+
+        messages = await _call(middleware, scope)
+
+        inner.assert_not_called()
+        self.assertEqual(messages, [{"type": "websocket.close", "code": 1008, "reason": "Missing authorization header"}])
 
 
 if __name__ == '__main__':
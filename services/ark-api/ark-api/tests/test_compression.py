@@ -0,0 +1,77 @@
+"""Tests for negotiated response compression."""
+
+import gzip
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from ark_api.core.compression import CompressionMiddleware, select_encoding
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large():
+        return JSONResponse({"items": ["x" * 50] * 50}, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter(["data: 1\n\n"] * 100), media_type="text/event-stream")
+
+    return app
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    """Test when and how responses are compressed."""
+
+    def setUp(self):
+        self.client = TestClient(_app())
+
+    def test_large_json_is_gzipped(self):
+        """Test that large JSON responses are gzipped with a weak ETag."""
+        response = self.client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(response.headers["ETag"], 'W/"abc"')
+        self.assertEqual(len(response.json()["items"]), 50)
+        self.assertLess(int(response.headers["Content-Length"]), 2500)
+
+    def test_small_and_streamed_responses_are_not_compressed(self):
+        """Test that small bodies and streams pass through."""
+        small = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        stream = self.client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        self.assertNotIn("Content-Encoding", small.headers)
+        self.assertNotIn("Content-Encoding", stream.headers)
+        self.assertEqual(stream.text.count("data: 1"), 100)
+
+    def test_uncompressed_without_accept_encoding(self):
+        """Test that clients that do not accept compression get plain bodies."""
+        response = self.client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.headers["ETag"], '"abc"')
+
+    def test_select_encoding(self):
+        """Test Accept-Encoding negotiation, with and without brotli installed."""
+        self.assertEqual(select_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(select_encoding("gzip;q=0, deflate"))
+        with patch('ark_api.core.compression.brotli', None):
+            self.assertEqual(select_encoding("br, gzip"), "gzip")
+        with patch('ark_api.core.compression.brotli', object()):
+            self.assertEqual(select_encoding("gzip;q=0.5, br"), "br")
+            self.assertEqual(select_encoding("gzip, br;q=0.5"), "gzip")
+
+
+if __name__ == "__main__":
+    unittest.main()
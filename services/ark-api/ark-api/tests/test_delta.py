@@ -0,0 +1,87 @@
+"""Tests for delta sync of list endpoints."""
+
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi import HTTPException
+
+from ark_api.utils.delta import collapse_changes, list_delta
+
+
+def _obj(name, phase="running"):
+    return {"metadata": {"name": name}, "status": {"phase": phase}}
+
+
+def _name(obj):
+    return obj["metadata"]["name"]
+
+
+class TestCollapseChanges(unittest.TestCase):
+    """Test reducing watch events to net changes."""
+
+    def test_net_change_per_object(self):
+        changes = [
+            ("ADDED", _obj("new")),
+            ("MODIFIED", _obj("new", "done")),
+            ("MODIFIED", _obj("changed")),
+            ("DELETED", _obj("removed")),
+            ("ADDED", _obj("transient")),
+            ("DELETED", _obj("transient")),
+            ("DELETED", _obj("recreated")),
+            ("ADDED", _obj("recreated")),
+        ]
+
+        added, modified, deleted = collapse_changes(changes, lambda o: o)
+
+        self.assertEqual([(_name(o), o["status"]["phase"]) for o in added], [("new", "done")])
+        self.assertEqual([_name(o) for o in modified], ["changed", "recreated"])
+        self.assertEqual(deleted, ["removed"])
+
+    def test_objects_leaving_the_filter_are_deleted(self):
+        changes = [("MODIFIED", _obj("a", "done")), ("MODIFIED", _obj("b", "error")), ("ADDED", _obj("c", "error"))]
+
+        added, modified, deleted = collapse_changes(changes, _name, include=lambda o: o["status"]["phase"] == "done")
+
+        self.assertEqual((added, modified, deleted), ([], ["a"], ["b"]))
+
+
+class TestListDelta(unittest.IsolatedAsyncioTestCase):
+    """Test delta responses from an informer."""
+
+    def _informer(self, changes, synced=True):
+        informer = Mock()
+        informer.wait_synced = AsyncMock(return_value=synced)
+        informer.resource_version = "42"
+        informer.changes_since.return_value = changes
+        informer.items.return_value = [_obj("a"), _obj("b")]
+        return informer
+
+    async def test_changes_since_version(self):
+        informer = self._informer([("MODIFIED", _obj("a"))])
+        with patch('ark_api.utils.delta.custom_resource_informer', return_value=informer) as get_informer:
+            delta = await list_delta("queries", "default", "40", _name)
+
+        get_informer.assert_called_once_with("queries", "default")
+        informer.changes_since.assert_called_once_with("40")
+        self.assertEqual(delta, {
+            "resourceVersion": "42", "resyncRequired": False, "added": [], "modified": ["a"], "deleted": []
+        })
+
+    async def test_resync_returns_the_whole_list(self):
+        informer = self._informer(None)
+        with patch('ark_api.utils.delta.custom_resource_informer', return_value=informer):
+            delta = await list_delta("queries", "default", "0", _name)
+
+        self.assertTrue(delta["resyncRequired"])
+        self.assertEqual(delta["added"], ["a", "b"])
+
+    async def test_unsynced_informer_is_unavailable(self):
+        with patch('ark_api.utils.delta.custom_resource_informer', return_value=self._informer([], synced=False)):
+            with self.assertRaises(HTTPException) as ctx:
+                await list_delta("queries", "default", "40", _name)
+
+        self.assertEqual(ctx.exception.status_code, 503)
+
+
+if __name__ == "__main__":
+    unittest.main()
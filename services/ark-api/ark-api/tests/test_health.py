@@ -96,3 +96,42 @@ class TestHealthEndpoints(unittest.TestCase):
         self.assertEqual(data["service"], "ark-api")
         self.assertIn("error", data)
         self.assertEqual(data["error"], "An internal error occurred during readiness check.")
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """Test cases for the Prometheus metrics endpoint."""
+
+    def setUp(self):
+        """Set up test client."""
+        from ark_api.main import app
+        self.client = TestClient(app)
+
+    def test_metrics_exposed(self):
+        """Test that /metrics serves Prometheus text including pool metrics."""
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn("ark_api_http_client_max_connections", response.text)
+        self.assertIn('ark_api_http_client_connections{state="idle"}', response.text)
+
+    def test_request_metrics_use_route_templates(self):
+        """Test that requests are counted by route template, never by raw path."""
+        from ark_api.core.metrics import REGISTRY
+
+        def count(route, status):
+            labels = {"method": "GET", "route": route, "status": status}
+            return REGISTRY.get_sample_value("ark_api_http_requests_total", labels) or 0
+
+        before = (count("/health", "200"), count("/v1/watch/{kind}", "404"), count("unmatched", "404"))
+
+        self.client.get("/health")
+        self.client.get("/v1/watch/widgets")
+        self.client.get("/no/such/path")
+
+        after = (count("/health", "200"), count("/v1/watch/{kind}", "404"), count("unmatched", "404"))
+        self.assertEqual(after, tuple(n + 1 for n in before))
+        self.assertEqual(REGISTRY.get_sample_value("ark_api_http_requests_in_flight"), 0)
+        self.assertIsNotNone(REGISTRY.get_sample_value(
+            "ark_api_http_request_duration_seconds_count", {"method": "GET", "route": "/health"}
+        ))
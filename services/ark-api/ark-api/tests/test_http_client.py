@@ -0,0 +1,53 @@
+"""Tests for the shared outbound HTTP client."""
+
+import unittest
+
+from ark_api.core import http
+from ark_api.core.metrics import REGISTRY
+
+
+class TestSharedHTTPClient(unittest.IsolatedAsyncioTestCase):
+    """Test lifecycle, configuration and metrics of the shared client."""
+
+    async def asyncTearDown(self):
+        await http.close_http_client()
+
+    async def test_client_is_shared(self):
+        """Test that every dependency call returns the same pooled client."""
+        started = await http.start_http_client()
+
+        self.assertIs(http.get_http_client(), started)
+        self.assertIs(http.get_http_client(), http.get_http_client())
+
+    async def test_client_recreated_after_close(self):
+        """Test that a closed client is replaced instead of reused."""
+        first = await http.start_http_client()
+        await http.close_http_client()
+
+        self.assertTrue(first.is_closed)
+        self.assertIsNot(http.get_http_client(), first)
+
+    async def test_pool_limits_applied(self):
+        """Test that the pool is sized from the HTTP_CLIENT_* settings."""
+        client = await http.start_http_client()
+        pool = client._transport._pool
+
+        self.assertEqual(pool._max_connections, http.HTTP_CLIENT_MAX_CONNECTIONS)
+        self.assertEqual(pool._max_keepalive_connections, http.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS)
+
+    async def test_pool_metrics_exposed(self):
+        """Test that connections are reported by the pool collector."""
+        await http.start_http_client()
+        stats = http.get_pool_stats()
+        self.assertEqual(stats["active"] + stats["idle"], 0)
+
+        self.assertEqual(
+            REGISTRY.get_sample_value("ark_api_http_client_max_connections"),
+            http.HTTP_CLIENT_MAX_CONNECTIONS
+        )
+        self.assertEqual(REGISTRY.get_sample_value("ark_api_http_client_connections", {"state": "idle"}), 0)
+        self.assertEqual(REGISTRY.get_sample_value("ark_api_http_client_requests_waiting"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+"""Tests for in-memory informers."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from ark_api.utils.informer import Informer, InformerRegistry
+
+
+def _query(name, resource_version="1"):
+    return {"metadata": {"name": name, "resourceVersion": resource_version}}
+
+
+class _FakeWatch:
+    """Replays one batch of events per stream() call, then blocks."""
+
+    def __init__(self, batches):
+        self._batches = batches
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    def stream(self, *args, **kwargs):
+        batch = self._batches.pop(0) if self._batches else None
+
+        async def generate():
+            if batch is None:
+                await asyncio.Event().wait()
+            for event in batch:
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        return generate()
+
+
+class TestInformer(unittest.IsolatedAsyncioTestCase):
+    """Test listing, watch event handling and relisting."""
+
+    def setUp(self):
+        self.list_calls = []
+        self.pages = []
+        api_client = MagicMock()
+        api_client.__aenter__ = AsyncMock(return_value=api_client)
+        api_client.__aexit__ = AsyncMock(return_value=None)
+        patcher = patch('ark_api.utils.informer.ApiClient', return_value=api_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _list(self, **kwargs):
+        self.list_calls.append(kwargs)
+        return self.pages.pop(0)
+
+    def _informer(self):
+        return Informer("queries/default", lambda api: self._list, namespace="default")
+
+    async def test_lists_in_pages_then_applies_watch_events(self):
+        """Test that the store reflects the paged list plus later watch events."""
+        self.pages = [
+            {"items": [_query("a")], "metadata": {"continue": "next"}},
+            {"items": [_query("b")], "metadata": {"resourceVersion": "10"}},
+        ]
+        events = [[
+            {"type": "ADDED", "object": _query("c", "11")},
+            {"type": "MODIFIED", "object": _query("a", "12")},
+            {"type": "DELETED", "object": _query("b", "13")},
+            {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "14"}}},
+        ]]
+        with patch('ark_api.utils.informer.watch.Watch', side_effect=lambda: _FakeWatch(events)):
+            informer = self._informer()
+            informer.start()
+            self.assertTrue(await informer.wait_synced(timeout=1))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            await informer.close()
+
+        self.assertEqual([c["_continue"] for c in self.list_calls], [None, "next"])
+        self.assertEqual(sorted(q["metadata"]["name"] for q in informer.items()), ["a", "c"])
+        self.assertEqual(informer.get("a")["metadata"]["resourceVersion"], "12")
+        self.assertEqual(informer.resource_version, "14")
+
+    async def test_relists_when_resource_version_expires(self):
+        """Test that a 410 from the watch triggers a fresh list."""
+        self.pages = [
+            {"items": [_query("a")], "metadata": {"resourceVersion": "10"}},
+            {"items": [_query("b")], "metadata": {"resourceVersion": "20"}},
+        ]
+        events = [[ApiException(status=410, reason="Expired")]]
+        with patch('ark_api.utils.informer.watch.Watch', side_effect=lambda: _FakeWatch(events)):
+            informer = self._informer()
+            informer.start()
+            for _ in range(20):
+                await asyncio.sleep(0)
+            await informer.close()
+
+        self.assertEqual(len(self.list_calls), 2)
+        self.assertEqual([q["metadata"]["name"] for q in informer.items()], ["b"])
+        self.assertEqual(informer.resource_version, "20")
+
+    async def test_repeated_failures_clear_synced_until_recovery(self):
+        """Test that a failing watch stops the informer from serving a frozen store."""
+        self.pages = [{"items": [_query("a")], "metadata": {"resourceVersion": "10"}}]
+        forbidden = ApiException(status=403, reason="Forbidden")
+        events = [[forbidden], [forbidden], [forbidden], [{"type": "ADDED", "object": _query("b", "11")}]]
+        with patch('ark_api.utils.informer.watch.Watch', side_effect=lambda: _FakeWatch(events)), \
+                patch('ark_api.utils.informer.WATCH_RETRY_SECONDS', 0):
+            informer = self._informer()
+            synced = []
+            original_failed = informer._failed
+
+            async def failed(e):
+                await original_failed(e)
+                synced.append(informer.synced)
+            informer._failed = failed
+            informer.start()
+            for _ in range(30):
+                await asyncio.sleep(0)
+            await informer.close()
+
+        self.assertEqual(synced, [True, True, False])
+        # The watch resumed from its resourceVersion without relisting
+        self.assertTrue(informer.synced)
+        self.assertEqual(len(self.list_calls), 1)
+        self.assertIsNotNone(informer.get("b"))
+
+    async def test_changes_since(self):
+        """Test that the changelog answers delta requests within its window only."""
+        self.pages = [{"items": [_query("a")], "metadata": {"resourceVersion": "10"}}]
+        events = [[
+            {"type": "ADDED", "object": _query("b", "11")},
+            {"type": "MODIFIED", "object": _query("a", "12")},
+            {"type": "DELETED", "object": _query("b", "13")},
+        ]]
+        with patch('ark_api.utils.informer.watch.Watch', side_effect=lambda: _FakeWatch(events)), \
+                patch('ark_api.utils.informer.INFORMER_CHANGELOG_SIZE', 2):
+            informer = self._informer()
+            informer.start()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            await informer.close()
+
+        # Only the last two events fit, so changes after 11 are complete but after 10 are not
+        self.assertIsNone(informer.changes_since("10"))
+        self.assertEqual([t for t, _ in informer.changes_since("11")], ["MODIFIED", "DELETED"])
+        self.assertEqual(informer.changes_since("13"), [])
+        self.assertIsNone(informer.changes_since("14"))
+        self.assertIsNone(informer.changes_since("not-a-version"))
+
+    async def test_registry_reuses_and_closes_informers(self):
+        """Test that one informer is created per key and stopped on close."""
+        registry = InformerRegistry()
+        factory = Mock(side_effect=lambda: Informer("test", Mock()))
+        with patch.object(Informer, '_run', new=lambda self: asyncio.Event().wait()):
+            first = registry.get_or_create(("queries", "default"), factory)
+            second = registry.get_or_create(("queries", "default"), factory)
+            self.assertIs(first, second)
+            self.assertTrue(first.running)
+            await registry.close()
+
+        factory.assert_called_once()
+        self.assertFalse(first.running)
+
+    async def test_registry_stops_idle_and_least_recently_read_informers(self):
+        """Test that informers for namespaces nobody reads are stopped."""
+        registry = InformerRegistry(idle_seconds=60, max_count=2)
+        factory = lambda: Informer("test", Mock())
+        with patch.object(Informer, '_run', new=lambda self: asyncio.Event().wait()), \
+                patch('ark_api.utils.informer.time.monotonic', return_value=100.0):
+            a = registry.get_or_create("a", factory)
+            b = registry.get_or_create("b", factory)
+            registry.get_or_create("a", factory)
+            c = registry.get_or_create("c", factory)
+
+            # Over max_count, the least recently read informer is stopped
+            self.assertEqual(list(registry.informers()), ["a", "c"])
+            self.assertFalse(b.running)
+
+        with patch.object(Informer, '_run', new=lambda self: asyncio.Event().wait()), \
+                patch('ark_api.utils.informer.time.monotonic', return_value=200.0):
+            self.assertIs(registry.get_or_create("c", factory), c)
+
+        self.assertEqual(list(registry.informers()), ["c"])
+        self.assertFalse(a.running)
+        self.assertTrue(c.running)
+        await registry.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
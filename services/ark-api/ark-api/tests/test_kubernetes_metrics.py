@@ -0,0 +1,38 @@
+"""Tests for Kubernetes API call metrics."""
+
+import unittest
+
+from kubernetes_asyncio.client.rest import RESTClientObject
+
+from ark_api.core.kubernetes import instrument_kubernetes_client, request_labels
+
+BASE = "https://10.0.0.1:443"
+
+
+class TestRequestLabels(unittest.TestCase):
+    def test_custom_resources(self):
+        path = f"{BASE}/apis/ark.mckinsey.com/v1alpha1/namespaces/default/queries"
+        self.assertEqual(request_labels("GET", path), ("list", "queries"))
+        self.assertEqual(request_labels("GET", path, [("watch", True)]), ("watch", "queries"))
+        self.assertEqual(request_labels("POST", path), ("create", "queries"))
+        self.assertEqual(request_labels("GET", f"{path}/q1"), ("get", "queries"))
+        self.assertEqual(request_labels("PATCH", f"{path}/q1/status"), ("patch", "queries/status"))
+        self.assertEqual(request_labels("DELETE", f"{path}/q1"), ("delete", "queries"))
+        self.assertEqual(request_labels("DELETE", path), ("deletecollection", "queries"))
+
+    def test_core_resources(self):
+        self.assertEqual(request_labels("GET", f"{BASE}/api/v1/namespaces"), ("list", "namespaces"))
+        self.assertEqual(request_labels("GET", f"{BASE}/api/v1/namespaces/default"), ("get", "namespaces"))
+        self.assertEqual(request_labels("PUT", f"{BASE}/api/v1/namespaces/default/secrets/s1"), ("update", "secrets"))
+
+    def test_instrumentation_is_idempotent(self):
+        instrument_kubernetes_client()
+        instrumented = RESTClientObject.request
+        instrument_kubernetes_client()
+
+        self.assertIs(RESTClientObject.request, instrumented)
+        self.assertTrue(instrumented._ark_instrumented)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Tests for leader election between worker processes."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from ark_api.utils.leader_election import LeaderElection
+
+
+class TestLeaderElection(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.lock_path = os.path.join(directory, "leader.lock")
+
+    def _election(self):
+        election = LeaderElection(self.lock_path, retry_seconds=0.01)
+        self.addCleanup(election.release)
+        return election
+
+    def test_only_one_leader(self):
+        first, second = self._election(), self._election()
+
+        self.assertTrue(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(first.is_leader)
+        self.assertFalse(second.is_leader)
+
+    async def test_follower_takes_over_when_leader_releases(self):
+        leader, follower = self._election(), self._election()
+        elected = asyncio.Event()
+
+        async def on_elected():
+            elected.set()
+
+        self.assertTrue(leader.try_acquire())
+        waiting = asyncio.create_task(follower.run(on_elected))
+        await asyncio.sleep(0.05)
+        self.assertFalse(elected.is_set())
+
+        leader.release()
+        await asyncio.wait_for(waiting, timeout=1)
+        self.assertTrue(elected.is_set())
+        self.assertTrue(follower.is_leader)
+
+
+if __name__ == '__main__':
+    unittest.main()
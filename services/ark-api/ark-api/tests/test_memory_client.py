@@ -0,0 +1,74 @@
+"""Tests for memory service fan-out."""
+
+import asyncio
+import time
+import unittest
+
+from fastapi import HTTPException
+
+from ark_api.utils.memory_client import fan_out_to_memories
+
+
+def _memory(name: str, address: str | None = "http://memory:8080") -> dict:
+    status = {"lastResolvedAddress": address} if address else {}
+    return {"metadata": {"name": name}, "status": status}
+
+
+class TestFanOutToMemories(unittest.IsolatedAsyncioTestCase):
+    """Test concurrent calls to memory services."""
+
+    async def test_calls_run_concurrently(self):
+        """Test that latency is the slowest call, not the sum of all calls."""
+        async def call(memory_name, service_url):
+            await asyncio.sleep(0.1)
+            return memory_name
+
+        start = time.monotonic()
+        results = await fan_out_to_memories([_memory(f"m{i}") for i in range(5)], call, timeout=1)
+
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertEqual([r.value for r in results], ["m0", "m1", "m2", "m3", "m4"])
+
+    async def test_slow_service_times_out_without_failing_others(self):
+        """Test that each memory service has its own deadline."""
+        async def call(memory_name, service_url):
+            if memory_name == "slow":
+                await asyncio.sleep(10)
+            return memory_name
+
+        results = await fan_out_to_memories([_memory("fast"), _memory("slow")], call, timeout=0.05)
+
+        self.assertEqual(results[0].value, "fast")
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, asyncio.TimeoutError)
+        self.assertIn("did not respond", results[1].error_message)
+
+    async def test_errors_are_reported_per_memory(self):
+        """Test that unready memories and failing calls become per-memory errors."""
+        async def call(memory_name, service_url):
+            raise HTTPException(status_code=503, detail=f"{memory_name} unavailable")
+
+        results = await fan_out_to_memories([_memory("unready", address=None), _memory("broken")], call)
+
+        self.assertIn("not ready", results[0].error_message)
+        self.assertEqual(results[1].error_message, "broken unavailable")
+
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than the configured number of calls run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def call(memory_name, service_url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        await fan_out_to_memories([_memory(f"m{i}") for i in range(10)], call, concurrency=3)
+
+        self.assertEqual(peak, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
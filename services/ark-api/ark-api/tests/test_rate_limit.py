@@ -0,0 +1,139 @@
+"""Tests for per-principal rate limits and in-flight quotas."""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from ark_api.core.metrics import REGISTRY
+from ark_api.core.rate_limit import RateLimit, RateLimitMiddleware, parse_rate_limits, route_group
+
+
+def _scope(path: str, principal: str | None = "api-key:pk-1") -> dict:
+    scope = {"type": "http", "method": "POST", "path": path, "headers": [], "client": ("10.0.0.1", 1234)}
+    if principal:
+        scope["state"] = {"principal": principal}
+    return scope
+
+
+class _App:
+    """Downstream app that can be held open to keep requests in flight."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _call(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def _status(messages) -> int:
+    return next(m["status"] for m in messages if m["type"] == "http.response.start")
+
+
+def _header(messages, name: str) -> str | None:
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    return dict(start["headers"]).get(name.encode(), b"").decode() or None
+
+
+class TestParseRateLimits(unittest.TestCase):
+    def test_fields_are_optional(self):
+        limits = parse_rate_limits("completions=5:20:10, queries=2,default=::100,bad=x:1")
+        self.assertEqual(limits["completions"], RateLimit(rate=5, burst=20, max_in_flight=10))
+        self.assertEqual(limits["queries"], RateLimit(rate=2, burst=2))
+        self.assertEqual(limits["default"], RateLimit(max_in_flight=100))
+        self.assertNotIn("bad", limits)
+
+    def test_route_groups(self):
+        self.assertEqual(route_group("/openai/v1/chat/completions"), "completions")
+        self.assertEqual(route_group("/openai/v1/batches"), "openai")
+        self.assertEqual(route_group("/v1/queries/q1"), "queries")
+        self.assertEqual(route_group("/v1/agents"), "default")
+
+
+class TestRateLimitMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def test_token_bucket_returns_429_with_retry_after(self):
+        app = _App()
+        middleware = RateLimitMiddleware(app, limits={"completions": RateLimit(rate=0.5, burst=2)})
+
+        with patch("ark_api.core.rate_limit.time.monotonic", return_value=100.0):
+            statuses = [_status(await _call(middleware, _scope("/openai/v1/chat/completions"))) for _ in range(3)]
+            rejected = await _call(middleware, _scope("/openai/v1/chat/completions"))
+
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(_header(rejected, "retry-after"), "2")
+        body = json.loads(b"".join(m.get("body", b"") for m in rejected if m["type"] == "http.response.body"))
+        self.assertIn("completions", body["detail"])
+        self.assertEqual(app.calls, 2)
+
+        # Tokens refill over time
+        with patch("ark_api.core.rate_limit.time.monotonic", return_value=102.0):
+            self.assertEqual(_status(await _call(middleware, _scope("/openai/v1/chat/completions"))), 200)
+
+    async def test_limits_are_per_principal(self):
+        middleware = RateLimitMiddleware(_App(), limits={"completions": RateLimit(rate=1, burst=1)})
+
+        with patch("ark_api.core.rate_limit.time.monotonic", return_value=100.0):
+            first = await _call(middleware, _scope("/openai/v1/chat/completions", "api-key:pk-1"))
+            other = await _call(middleware, _scope("/openai/v1/chat/completions", "jwt:user-2"))
+            again = await _call(middleware, _scope("/openai/v1/chat/completions", "api-key:pk-1"))
+
+        self.assertEqual([_status(first), _status(other), _status(again)], [200, 200, 429])
+
+    async def test_metrics_do_not_label_principals(self):
+        middleware = RateLimitMiddleware(_App(), limits={"completions": RateLimit(rate=1, burst=1)})
+
+        await _call(middleware, _scope("/openai/v1/chat/completions", "jwt:someone@example.com"))
+
+        for metric in REGISTRY.collect():
+            if metric.name.startswith("ark_api_rate_limit"):
+                for sample in metric.samples:
+                    self.assertNotIn("principal", sample.labels)
+                    self.assertNotIn("jwt:someone@example.com", sample.labels.values())
+
+    async def test_in_flight_quota(self):
+        app = _App()
+        app.release.clear()
+        middleware = RateLimitMiddleware(app, limits={"queries": RateLimit(max_in_flight=1)})
+
+        held = asyncio.create_task(_call(middleware, _scope("/v1/queries")))
+        await asyncio.sleep(0)
+        rejected = await _call(middleware, _scope("/v1/queries"))
+        app.release.set()
+        await held
+
+        self.assertEqual(_status(rejected), 429)
+        self.assertEqual(_header(rejected, "retry-after"), "1")
+        self.assertEqual(_status(await _call(middleware, _scope("/v1/queries"))), 200)
+
+    async def test_unlimited_groups_and_public_routes_pass_through(self):
+        app = _App()
+        middleware = RateLimitMiddleware(app, limits={"default": RateLimit(rate=1, burst=1)})
+
+        with patch("ark_api.core.rate_limit.time.monotonic", return_value=100.0):
+            for _ in range(3):
+                await _call(middleware, _scope("/health"))
+                await _call(middleware, _scope("/openai/v1/chat/completions"))
+
+        self.assertEqual(app.calls, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Tests for orjson responses and the list item builders that feed them."""
+
+import json
+import unittest
+from datetime import datetime, timezone
+
+from ark_api.api.v1.memories import memory_to_item
+from ark_api.api.v1.queries import query_to_item
+from ark_api.core.responses import ORJSONResponse
+from ark_api.models.evaluations import EvaluationResponse, evaluation_to_item
+from ark_api.models.memories import MemoryResponse
+from ark_api.models.queries import QueryListResponse, QueryResponse
+
+
+QUERY = {
+    "metadata": {"name": "q1", "namespace": "default", "creationTimestamp": "2025-01-02T03:04:05Z"},
+    "spec": {
+        "type": "messages",
+        "input": [{"role": "user", "content": "hi"}],
+        "memory": {"name": "mem"},
+        "sessionId": "s1",
+    },
+    "status": {"phase": "done"},
+}
+
+
+class TestORJSONResponse(unittest.TestCase):
+    """Test rendering with orjson."""
+
+    def test_renders_models_and_datetimes(self):
+        """Test that pydantic models use their aliases and datetimes are ISO 8601."""
+        model = QueryListResponse(items=[], count=0, continue_="abc")
+        created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            json.loads(ORJSONResponse(model).body),
+            {"items": [], "count": 0, "continue": "abc"},
+        )
+        self.assertEqual(
+            json.loads(ORJSONResponse({"created": created, "model": model, 1: "x"}).body),
+            {"created": "2025-01-02T03:04:05+00:00", "model": model.model_dump(mode="json", by_alias=True), "1": "x"},
+        )
+
+
+class TestListItems(unittest.TestCase):
+    """Test that list item dicts match what the response models would produce."""
+
+    def test_query_item_matches_model(self):
+        item = json.loads(ORJSONResponse(query_to_item(QUERY)).body)
+        self.assertEqual(item, QueryResponse.model_validate(item).model_dump(mode="json"))
+        self.assertEqual(item["memory"], {"name": "mem", "namespace": None})
+        self.assertEqual(item["creationTimestamp"], "2025-01-02T03:04:05Z")
+
+    def test_memory_item_matches_model(self):
+        memory = {"metadata": {"name": "mem", "namespace": "default"}, "spec": {}, "status": {"phase": "ready"}}
+        item = memory_to_item(memory)
+        self.assertEqual(item, MemoryResponse.model_validate(item).model_dump(mode="json"))
+
+    def test_evaluation_item_matches_model(self):
+        evaluation = {
+            "metadata": {"name": "e1", "namespace": "default"},
+            "spec": {"type": "query"},
+            "status": {"phase": "done", "score": "0.9", "passed": True},
+        }
+        item = evaluation_to_item(evaluation)
+        self.assertEqual(item, EvaluationResponse.model_validate(item).model_dump(mode="json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Tests for in-process label and field selectors."""
+
+import unittest
+
+from ark_api.utils.selectors import parse_field_selector, parse_label_selector
+
+
+def _obj(labels=None, **status):
+    return {"metadata": {"name": "a1", "labels": labels or {}}, "status": status}
+
+
+class TestLabelSelector(unittest.TestCase):
+    def test_empty_selector_matches_everything(self):
+        self.assertIsNone(parse_label_selector(None))
+        self.assertIsNone(parse_label_selector(""))
+
+    def test_equality_requirements(self):
+        matches = parse_label_selector("team=red,tier!=gold")
+        self.assertTrue(matches(_obj({"team": "red", "tier": "silver"})))
+        self.assertFalse(matches(_obj({"team": "red", "tier": "gold"})))
+        self.assertFalse(matches(_obj({"team": "blue"})))
+        self.assertTrue(parse_label_selector("team==red")(_obj({"team": "red"})))
+
+    def test_existence_requirements(self):
+        self.assertTrue(parse_label_selector("team")(_obj({"team": "red"})))
+        self.assertFalse(parse_label_selector("team")(_obj()))
+        self.assertTrue(parse_label_selector("!team")(_obj()))
+
+    def test_set_requirements(self):
+        matches = parse_label_selector("team in (red, blue),tier notin (gold)")
+        self.assertTrue(matches(_obj({"team": "blue", "tier": "silver"})))
+        self.assertFalse(matches(_obj({"team": "green"})))
+        self.assertFalse(matches(_obj({"team": "red", "tier": "gold"})))
+
+    def test_invalid_selector(self):
+        with self.assertRaises(ValueError):
+            parse_label_selector("=red")
+        with self.assertRaises(ValueError):
+            parse_label_selector("team in red")
+
+
+class TestFieldSelector(unittest.TestCase):
+    def test_dotted_paths(self):
+        matches = parse_field_selector("metadata.name=a1,status.phase!=error")
+        self.assertTrue(matches(_obj(phase="done")))
+        self.assertFalse(matches(_obj(phase="error")))
+
+    def test_missing_field_does_not_equal_value(self):
+        self.assertFalse(parse_field_selector("status.phase=done")(_obj()))
+        self.assertTrue(parse_field_selector("status.phase!=done")(_obj()))
+
+    def test_booleans_compare_as_lowercase(self):
+        self.assertTrue(parse_field_selector("status.ready=true")(_obj(ready=True)))
+
+    def test_invalid_selector(self):
+        with self.assertRaises(ValueError):
+            parse_field_selector("status.phase")
+
+
+if __name__ == '__main__':
+    unittest.main()
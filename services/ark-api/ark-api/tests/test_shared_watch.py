@@ -0,0 +1,178 @@
+"""Tests for shared Kubernetes watches."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from ark_api.utils.shared_watch import SharedWatch, SharedWatchRegistry
+
+
+async def _idle_run(self):
+    await asyncio.Event().wait()
+
+
+@patch.object(SharedWatch, '_run', _idle_run)
+class TestSharedWatch(unittest.IsolatedAsyncioTestCase):
+    """Test fan out, buffering and lifecycle of SharedWatch."""
+
+    def _watch(self, **kwargs) -> SharedWatch:
+        return SharedWatch("test", Mock(), **kwargs)
+
+    async def test_events_fan_out_to_all_subscribers(self):
+        """Test that every subscriber receives every event."""
+        shared_watch = self._watch()
+        first = shared_watch.subscribe()
+        second = shared_watch.subscribe()
+
+        shared_watch.publish({"type": "ADDED", "object": "a"})
+
+        self.assertEqual((await first.get(timeout=1))["object"], "a")
+        self.assertEqual((await second.get(timeout=1))["object"], "a")
+        await shared_watch.close()
+
+    async def test_transform_applied_once_per_event(self):
+        """Test that events are transformed once, not once per subscriber."""
+        transform = Mock(side_effect=lambda event: {"converted": event["object"]})
+        shared_watch = self._watch(transform=transform)
+        subscriptions = [shared_watch.subscribe() for _ in range(3)]
+
+        shared_watch.publish({"type": "ADDED", "object": "a"})
+
+        transform.assert_called_once()
+        for subscription in subscriptions:
+            self.assertEqual(await subscription.get(timeout=1), {"converted": "a"})
+        await shared_watch.close()
+
+    async def test_slow_subscriber_drops_oldest(self):
+        """Test that a full buffer drops the oldest events and counts them."""
+        shared_watch = self._watch()
+        slow = shared_watch.subscribe(buffer_size=2)
+        fast = shared_watch.subscribe(buffer_size=10)
+
+        for i in range(5):
+            shared_watch.publish({"type": "ADDED", "object": i})
+
+        self.assertEqual(slow.dropped, 3)
+        self.assertEqual([(await slow.get(timeout=1))["object"] for _ in range(2)], [3, 4])
+        self.assertEqual(fast.dropped, 0)
+        await shared_watch.close()
+
+    async def test_upstream_watch_follows_subscribers(self):
+        """Test that the upstream watch runs only while there are subscribers."""
+        shared_watch = self._watch()
+        self.assertFalse(shared_watch.running)
+
+        first = shared_watch.subscribe()
+        second = shared_watch.subscribe()
+        self.assertTrue(shared_watch.running)
+
+        first.close()
+        self.assertTrue(shared_watch.running)
+        second.close()
+        await asyncio.sleep(0)
+        self.assertFalse(shared_watch.running)
+
+    async def test_get_times_out_and_returns_none_when_closed(self):
+        """Test that get returns None on timeout and after close."""
+        shared_watch = self._watch()
+        subscription = shared_watch.subscribe()
+
+        self.assertIsNone(await subscription.get(timeout=0.01))
+        subscription.close()
+        self.assertIsNone(await subscription.get())
+
+    async def test_resync_while_not_waiting_is_not_missed(self):
+        """Test that a resync between two gets wakes the next get."""
+        shared_watch = self._watch()
+        subscription = shared_watch.subscribe()
+        shared_watch.publish({"type": "ADDED", "object": "a"})
+        self.assertEqual((await subscription.get(timeout=1))["object"], "a")
+
+        subscription._resync()
+
+        # Returns at once instead of waiting for the next event
+        self.assertIsNone(await asyncio.wait_for(subscription.get(), timeout=1))
+        self.assertEqual(subscription.dropped, 1)
+        self.assertIsNone(await subscription.get(timeout=0.01))
+        await shared_watch.close()
+
+    async def test_registry_shares_watch_per_key(self):
+        """Test that the registry returns one watch per key."""
+        registry = SharedWatchRegistry()
+        factory = Mock(side_effect=lambda: self._watch())
+
+        first = registry.get_or_create(("events", "default"), factory)
+        second = registry.get_or_create(("events", "default"), factory)
+        other = registry.get_or_create(("events", "other"), factory)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(factory.call_count, 2)
+        await registry.close()
+
+
+
+class TestSharedWatchRestart(unittest.IsolatedAsyncioTestCase):
+    """Test the upstream watch's starting point and restarts."""
+
+    def setUp(self):
+        api_client = MagicMock()
+        api_client.__aenter__ = AsyncMock(return_value=api_client)
+        api_client.__aexit__ = AsyncMock(return_value=None)
+        patcher = patch('ark_api.utils.shared_watch.ApiClient', return_value=api_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.list_calls = 0
+        self.listed = asyncio.Event()
+
+    async def _list(self, **kwargs):
+        self.list_calls += 1
+        await self.listed.wait()
+        return {"metadata": {"resourceVersion": str(self.list_calls * 10)}}
+
+    def _fake_watch(self, streams):
+        w = MagicMock()
+        w.__aenter__ = AsyncMock(return_value=w)
+        w.__aexit__ = AsyncMock(return_value=None)
+
+        def stream(*args, **kwargs):
+            error = streams.pop(0) if streams else None
+
+            async def generate():
+                if error is not None:
+                    raise error
+                await asyncio.Event().wait()
+                yield
+            return generate()
+        w.stream = stream
+        return w
+
+    async def test_ready_waits_for_starting_resource_version(self):
+        """Test that ready() returns only once the watch knows where to start."""
+        with patch('ark_api.utils.shared_watch.watch.Watch', side_effect=lambda: self._fake_watch([])):
+            shared_watch = SharedWatch("test", lambda api: self._list)
+            subscription = shared_watch.subscribe()
+
+            self.assertFalse(await subscription.ready(timeout=0.01))
+            self.listed.set()
+            self.assertTrue(await subscription.ready(timeout=1))
+            await shared_watch.close()
+
+    async def test_expired_watch_tells_subscribers_to_resync(self):
+        """Test that restarting from the current state counts as dropped events and wakes subscribers."""
+        self.listed.set()
+        streams = [ApiException(status=410, reason="Expired")]
+        with patch('ark_api.utils.shared_watch.watch.Watch', side_effect=lambda: self._fake_watch(streams)):
+            shared_watch = SharedWatch("test", lambda api: self._list)
+            subscription = shared_watch.subscribe()
+
+            self.assertIsNone(await subscription.get(timeout=1))
+            self.assertEqual(subscription.dropped, 1)
+            self.assertEqual(self.list_calls, 2)
+            await shared_watch.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
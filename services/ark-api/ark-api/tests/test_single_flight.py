@@ -0,0 +1,118 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from starlette.requests import Request
+
+from ark_api.utils.single_flight import SingleFlight, _parse_routes, request_key, single_flight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Test sharing of in-flight calls and the microcache."""
+
+    async def _slow(self, calls, value="result"):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def test_concurrent_identical_calls_share_one_call(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        results = await asyncio.gather(*(flight.do("key", lambda: self._slow(calls)) for _ in range(50)))
+
+        self.assertEqual(results, ["result"] * 50)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    async def test_different_keys_and_later_calls_are_not_shared(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        await asyncio.gather(flight.do("a", lambda: self._slow(calls)), flight.do("b", lambda: self._slow(calls)))
+        await flight.do("a", lambda: self._slow(calls))
+
+        self.assertEqual(len(calls), 3)
+
+    async def test_errors_reach_every_caller_and_are_not_cached(self):
+        flight = SingleFlight("test", microcache_seconds=60)
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flight.do("key", failing), flight.do("key", failing), return_exceptions=True)
+        await flight.do("key", lambda: self._slow(calls))
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(len(calls), 2)
+
+    async def test_microcache_serves_results_after_the_call(self):
+        flight = SingleFlight("test", microcache_seconds=60)
+        calls = []
+
+        await flight.do("key", lambda: self._slow(calls))
+        result = await flight.do("key", lambda: self._slow(calls, "new"))
+
+        self.assertEqual(result, "result")
+        self.assertEqual(len(calls), 1)
+
+    async def test_cancelled_caller_does_not_cancel_the_shared_call(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        first = asyncio.create_task(flight.do("key", lambda: self._slow(calls)))
+        second = asyncio.create_task(flight.do("key", lambda: self._slow(calls)))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "result")
+        self.assertEqual(len(calls), 1)
+
+    async def test_disabled_flight_calls_every_time(self):
+        flight = SingleFlight("test", enabled=False)
+        calls = []
+
+        await asyncio.gather(*(flight.do("key", lambda: self._slow(calls)) for _ in range(3)))
+
+        self.assertEqual(len(calls), 3)
+
+
+class TestSingleFlightConfig(unittest.TestCase):
+    """Test route configuration and request keys."""
+
+    def test_parse_routes(self):
+        self.assertEqual(
+            _parse_routes("queries.list=0.5, tools.list=off,bad,agents.list=soon"),
+            {"queries.list": 0.5, "tools.list": None},
+        )
+
+    def test_route_settings(self):
+        with patch('ark_api.utils.single_flight._flights', {}), \
+                patch('ark_api.utils.single_flight.SINGLE_FLIGHT_ROUTES', "queries.list=0.5,tools.list=off"):
+            self.assertTrue(single_flight("queries.list").enabled)
+            self.assertEqual(single_flight("queries.list")._microcache.ttl_seconds, 0.5)
+            self.assertFalse(single_flight("tools.list").enabled)
+            self.assertTrue(single_flight("agents.list").enabled)
+
+    def test_request_key_includes_params_and_principal(self):
+        def request(query_string, principal=None):
+            scope = {
+                "type": "http", "method": "GET", "path": "/v1/queries",
+                "query_string": query_string, "headers": [], "state": {},
+            }
+            if principal:
+                scope["state"]["principal"] = principal
+            return Request(scope)
+
+        self.assertEqual(request_key(request(b"a=1&b=2"), "ns"), request_key(request(b"b=2&a=1"), "ns"))
+        self.assertNotEqual(request_key(request(b"a=1"), "ns"), request_key(request(b"a=2"), "ns"))
+        self.assertNotEqual(request_key(request(b"a=1", "jwt:x"), "ns"), request_key(request(b"a=1", "jwt:y"), "ns"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Tests for the cached streaming endpoint resolution."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ark_sdk.streaming_config import ArkStreamingConfig, ServiceRef
+
+from ark_api.utils.shared_watch import SharedWatch, SharedWatchRegistry
+from ark_api.utils.streaming_endpoint import StreamingEndpointCache
+
+
+async def _idle_run(self):
+    await asyncio.Event().wait()
+
+
+@patch.object(SharedWatch, '_run', _idle_run)
+class TestStreamingEndpointCache(unittest.IsolatedAsyncioTestCase):
+    """Test caching and watch based invalidation of streaming endpoints."""
+
+    async def asyncSetUp(self):
+        self.registry = SharedWatchRegistry()
+        self.config = ArkStreamingConfig(enabled=True, serviceRef=ServiceRef(name="ark-broker", port="http"))
+        self.patches = [
+            patch('ark_api.utils.streaming_endpoint.shared_watches', self.registry),
+            patch('ark_api.utils.streaming_endpoint.k8s_client.ApiClient', MagicMock()),
+            patch('ark_api.utils.streaming_endpoint.get_streaming_config', AsyncMock(return_value=self.config)),
+            patch(
+                'ark_api.utils.streaming_endpoint.get_streaming_base_url',
+                AsyncMock(return_value="http://ark-broker.default.svc.cluster.local:80"),
+            ),
+        ]
+        for p in self.patches:
+            p.start()
+        from ark_api.utils import streaming_endpoint
+        self.module = streaming_endpoint
+        self.cache = StreamingEndpointCache(ttl_seconds=300)
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        await self.registry.close()
+        for p in self.patches:
+            p.stop()
+
+    async def test_resolves_once_and_reuses_result(self):
+        """Test that repeated and concurrent lookups only resolve once."""
+        results = await asyncio.gather(*(self.cache.get_base_url("default") for _ in range(5)))
+        await self.cache.get_base_url("default")
+
+        self.assertEqual(set(results), {"http://ark-broker.default.svc.cluster.local:80"})
+        self.module.get_streaming_config.assert_awaited_once()
+        self.module.get_streaming_base_url.assert_awaited_once()
+
+    async def test_disabled_streaming_is_cached(self):
+        """Test that a missing ConfigMap is cached as None."""
+        self.module.get_streaming_config.return_value = None
+
+        self.assertIsNone(await self.cache.get_base_url("default"))
+        self.assertIsNone(await self.cache.get_base_url("default"))
+        self.module.get_streaming_config.assert_awaited_once()
+        self.module.get_streaming_base_url.assert_not_awaited()
+
+    async def test_config_map_change_invalidates(self):
+        """Test that a ConfigMap watch event forces the next lookup to resolve again."""
+        await self.cache.get_base_url("default")
+        config_map_watch = self.registry.watches()[("configmap", "default", "ark-config-streaming")]
+
+        config_map_watch.publish({"type": "MODIFIED", "object": {}})
+        await asyncio.sleep(0)
+        await self.cache.get_base_url("default")
+
+        self.assertEqual(self.module.get_streaming_config.await_count, 2)
+
+    async def test_service_change_invalidates(self):
+        """Test that a change to the referenced Service invalidates the namespace."""
+        await self.cache.get_base_url("default")
+        service_watch = self.registry.watches()[("service", "default", "ark-broker")]
+
+        service_watch.publish({"type": "MODIFIED", "object": {}})
+        await asyncio.sleep(0)
+        await self.cache.get_base_url("default")
+
+        self.assertEqual(self.module.get_streaming_base_url.await_count, 2)
+
+    async def test_watch_restart_invalidates_and_keeps_watching(self):
+        """Test that a resync after an expired watch invalidates without stopping the watch."""
+        await self.cache.get_base_url("default")
+        config_map_watch = self.registry.watches()[("configmap", "default", "ark-config-streaming")]
+        task = self.cache._watch_tasks[("configmap", "default", "ark-config-streaming")]
+
+        for subscription in list(config_map_watch._subscribers):
+            subscription._resync()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await self.cache.get_base_url("default")
+        self.assertEqual(self.module.get_streaming_config.await_count, 2)
+        self.assertFalse(task.done())
+        self.assertEqual(config_map_watch.subscriber_count, 1)
+
+        # Later changes still invalidate
+        config_map_watch.publish({"type": "MODIFIED", "object": {}})
+        await asyncio.sleep(0)
+        await self.cache.get_base_url("default")
+        self.assertEqual(self.module.get_streaming_config.await_count, 3)
+
+    async def test_errors_are_not_cached(self):
+        """Test that a failed resolution is retried on the next lookup."""
+        self.module.get_streaming_config.side_effect = [RuntimeError("api down"), self.config]
+
+        with self.assertRaises(RuntimeError):
+            await self.cache.get_base_url("default")
+        self.assertEqual(await self.cache.get_base_url("default"), "http://ark-broker.default.svc.cluster.local:80")
+
+    async def test_expired_entries_are_resolved_again(self):
+        """Test that the TTL bounds how long an entry is reused."""
+        self.cache.ttl_seconds = 0
+
+        await self.cache.get_base_url("default")
+        await self.cache.get_base_url("default")
+
+        self.assertEqual(self.module.get_streaming_config.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Tests for the shared JWKS caching token validator."""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from ark_sdk.auth.config import AuthConfig
+from ark_sdk.auth.exceptions import TokenValidationError
+
+from ark_api.auth.validator import CachingTokenValidator
+
+JWKS = {"keys": [{"kid": "key-1"}]}
+
+
+class _Validator(CachingTokenValidator):
+    """Validator whose JWKS fetch is counted and can be made to fail."""
+
+    def __init__(self):
+        super().__init__(AuthConfig(jwks_url="https://issuer.example/certs"))
+        self.fetches = 0
+        self.error = None
+        self.fetch_threads = set()
+
+    def _fetch_jwks(self):
+        self.fetches += 1
+        self.fetch_threads.add(threading.get_ident())
+        if self.error:
+            raise self.error
+        return JWKS
+
+
+class TestCachingTokenValidator(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_expired_cache_fetches_once(self):
+        validator = _Validator()
+
+        await asyncio.gather(*(validator._ensure_jwks("token") for _ in range(10)))
+
+        self.assertEqual(validator.fetches, 1)
+        self.assertNotIn(threading.get_ident(), validator.fetch_threads)
+
+    async def test_failed_fetch_raises_and_backs_off(self):
+        validator = _Validator()
+        validator.error = TokenValidationError("Failed to fetch JWKS: unreachable")
+
+        for _ in range(3):
+            with self.assertRaises(TokenValidationError):
+                await validator.validate_token("token")
+
+        # The base validator's blocking fetch is never reached
+        self.assertEqual(validator.fetches, 1)
+        with self.assertRaises(TokenValidationError):
+            validator._get_jwks()
+
+        # After the backoff the fetch is retried
+        validator.error = None
+        with patch("ark_api.auth.validator.JWKS_FAILURE_BACKOFF_SECONDS", 0):
+            await validator._ensure_jwks("token")
+        self.assertEqual(validator.fetches, 2)
+        self.assertEqual(validator._get_jwks(), JWKS)
+
+    async def test_failed_refresh_keeps_stale_keys(self):
+        validator = _Validator()
+        await validator._ensure_jwks("token")
+        validator.error = RuntimeError("unreachable")
+
+        with patch("ark_api.auth.validator.JWKS_CACHE_TTL_SECONDS", -1), \
+                patch("ark_sdk.auth.validator.TokenValidator.validate_token", return_value={"sub": "user"}):
+            payload = await validator.validate_token("token")
+
+        self.assertEqual(payload, {"sub": "user"})
+        self.assertEqual(validator._jwks_cache, JWKS)
+
+
+if __name__ == '__main__':
+    unittest.main()
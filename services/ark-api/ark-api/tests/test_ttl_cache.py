@@ -0,0 +1,57 @@
+"""Tests for the TTL cache and ETag helpers."""
+
+import unittest
+from unittest.mock import patch
+
+from ark_api.utils.etag import compute_etag, etag_matches
+from ark_api.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test expiry and LRU eviction of TTLCache."""
+
+    def test_entries_expire(self):
+        cache = TTLCache(ttl_seconds=10)
+        with patch('ark_api.utils.ttl_cache.time.monotonic', return_value=100.0):
+            cache.put("a", 1)
+        with patch('ark_api.utils.ttl_cache.time.monotonic', return_value=105.0):
+            self.assertEqual(cache.get("a"), 1)
+        with patch('ark_api.utils.ttl_cache.time.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(ttl_seconds=10, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_zero_ttl_disables_caching(self):
+        cache = TTLCache(ttl_seconds=0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+
+class TestETag(unittest.TestCase):
+    """Test ETag computation and If-None-Match matching."""
+
+    def test_etag_is_stable_and_content_dependent(self):
+        self.assertEqual(compute_etag({"a": 1, "b": 2}), compute_etag({"b": 2, "a": 1}))
+        self.assertNotEqual(compute_etag({"a": 1}), compute_etag({"a": 2}))
+
+    def test_if_none_match(self):
+        etag = compute_etag({"a": 1})
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"other"', etag))
+        self.assertFalse(etag_matches(None, etag))
+
+
+if __name__ == "__main__":
+    unittest.main()